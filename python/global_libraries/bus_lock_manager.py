@@ -0,0 +1,543 @@
+"""
+This module arbitrates access to hardware buses (I2C, GPIO pins, pigpio waves) between threads and
+processes (sensor daemon, worker sending infrared signals).
+
+Each bus has a lock file in lock_directory, locked with flock around the critical section, and a
+thread lock for threads of the same process (flock does not exclude them). Locks are released by
+the kernel if a process dies while holding them. Waiting time and contention are counted per bus.
+
+    with bus_lock_manager.get_lock('i2c-1'):
+        ... (TimeoutError if lock could not be acquired within default_timeout)
+
+    bus_lock = bus_lock_manager.get_lock('gpio-4')
+    if bus_lock.acquire(timeout=2.):
+        try: ... finally: bus_lock.release()
+"""
+
+#########################
+# Import Global Packages
+#########################
+import os
+import threading  # Excludes threads of the same process
+import time  # Measures waiting time
+
+try:
+
+    import fcntl  # flock, to exclude other processes (Linux only)
+
+except ImportError:
+
+    fcntl = None
+
+__author__ = 'Adrien Baland'
+
+###########################
+# Declare global variables
+###########################
+lock_directory = '/run/lock/'  # World-writable on Raspbian (tmpfs, emptied at boot)
+lock_file_prefix = 'home_code_'  # Lock file of bus X is lock_directory + lock_file_prefix + X.lock
+default_timeout = 10.  # Seconds to wait for a bus before giving up
+poll_interval = 0.002  # Seconds between two attempts to lock a file held by another process
+
+default_manager = None  # Manager shared by all modules of the process (created on first use)
+default_manager_lock = threading.Lock()
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# BusLock
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Class created
+####################################################################################################
+class BusLock:
+    """
+    Lock of one bus, shared with other processes through flock on its lock file. Can be used as
+    a threading.Lock (acquire/release, with statement).
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def __init__(self, bus_name, lock_filename):
+        """
+        Creates lock. Lock file is opened on first acquisition.
+
+        INPUT:
+            bus_name (str) name of the bus (e.g. i2c-1, gpio-4)
+            lock_filename (str|None) lock file shared with other processes. None for a lock only
+                shared between threads.
+        """
+
+        self.bus_name = bus_name
+        self.lock_filename = lock_filename
+        self.lock_file_descriptor = None
+        self.thread_lock = threading.Lock()
+
+        # Contention metrics (updated while holding thread_lock, or on timeout)
+        self.n_acquisitions = 0  # Times lock was acquired
+        self.n_contended = 0  # Times lock was held by another thread/process when requested
+        self.n_timeouts = 0  # Times lock could not be acquired before timeout
+        self.total_wait_time = 0.  # Seconds spent waiting for lock (successful acquisitions)
+        self.max_wait_time = 0.  # Longest wait for lock, in seconds
+        self.total_hold_time = 0.  # Seconds lock was held
+        self.acquisition_time = 0.  # Time at which lock was last acquired
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # lock_file
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def lock_file(self, deadline):
+        """
+        Locks the bus file, waiting for other processes until deadline. Must be called while
+        holding thread_lock.
+
+        INPUT:
+            deadline (float) time.monotonic() time after which waiting stops
+
+        OUTPUT:
+            (bool) True if file was locked (or if there is no file lock), False on timeout
+        """
+
+        if fcntl is None or self.lock_filename is None:
+
+            ############
+            return True
+            ############
+
+        if self.lock_file_descriptor is None:
+
+            # flock does not need write access : readable file is enough for other users
+            self.lock_file_descriptor = os.open(self.lock_filename, os.O_RDONLY | os.O_CREAT, 0o666)
+
+        while True:
+
+            try:
+
+                fcntl.flock(self.lock_file_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+                ############
+                return True
+                ############
+
+            except BlockingIOError:
+
+                # flock has no timeout : tries again until deadline
+                if time.monotonic() >= deadline:
+
+                    #############
+                    return False
+                    #############
+
+                time.sleep(poll_interval)
+
+    ################
+    # END lock_file
+    ################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # acquire
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def acquire(self, blocking=True, timeout=None):
+        """
+        Acquires bus for this thread, once no other thread or process holds it.
+
+        INPUT:
+            blocking (bool) whether to wait for the bus if it is held
+            timeout (float|None) seconds to wait at most. default_timeout if None.
+
+        OUTPUT:
+            (bool) True if bus was acquired, False otherwise
+        """
+
+        if timeout is None or timeout < 0:
+
+            timeout = default_timeout
+
+        if not blocking:
+
+            timeout = 0.
+
+        request_time = time.monotonic()
+        deadline = request_time + timeout
+
+        # Threads of this process first (file lock would not exclude them)
+        is_contended = not self.thread_lock.acquire(blocking=False)
+
+        if is_contended and not self.thread_lock.acquire(timeout=timeout):
+
+            self.n_timeouts += 1
+
+            #############
+            return False
+            #############
+
+        try:
+
+            is_file_locked = self.lock_file(deadline)
+
+        except OSError:
+
+            # Lock file can not be created (e.g. read-only directory) : only threads are excluded
+            self.lock_filename = None
+            is_file_locked = True
+
+        if not is_file_locked:
+
+            self.n_timeouts += 1
+            self.thread_lock.release()
+
+            #############
+            return False
+            #############
+
+        self.acquisition_time = time.monotonic()
+        wait_time = self.acquisition_time - request_time
+
+        self.n_acquisitions += 1
+        self.n_contended += int(is_contended or wait_time > poll_interval)
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+
+        ############
+        return True
+        ############
+
+    ##############
+    # END acquire
+    ##############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # release
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def release(self):
+        """
+        Releases bus, for other threads and processes.
+        """
+
+        self.total_hold_time += time.monotonic() - self.acquisition_time
+
+        if fcntl is not None and self.lock_file_descriptor is not None:
+
+            fcntl.flock(self.lock_file_descriptor, fcntl.LOCK_UN)
+
+        self.thread_lock.release()
+
+        ######
+        return
+        ######
+
+    ##############
+    # END release
+    ##############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # __enter__
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def __enter__(self):
+        """
+        Acquires bus (with statement). Raises TimeoutError if bus is still held after
+        default_timeout.
+        """
+
+        if not self.acquire():
+
+            raise TimeoutError('Bus %s busy for more than %.1f s.' % (self.bus_name,
+                                                                     default_timeout))
+
+        ############
+        return self
+        ############
+
+    ################
+    # END __enter__
+    ################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # __exit__
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        """
+        Releases bus (end of with statement).
+        """
+
+        self.release()
+
+        #############
+        return False
+        #############
+
+    ###############
+    # END __exit__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_stats
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def get_stats(self):
+        """
+        Returns contention metrics of the bus (in this process).
+
+        OUTPUT:
+            (Dict) acquisitions, contended acquisitions, timeouts, wait/hold times (seconds)
+        """
+
+        mean_wait_time = 0.
+        if self.n_acquisitions > 0:
+
+            mean_wait_time = self.total_wait_time / self.n_acquisitions
+
+        all_stats = {
+            'acquisitions': self.n_acquisitions,
+            'contended': self.n_contended,
+            'timeouts': self.n_timeouts,
+            'mean_wait': round(mean_wait_time, 4),
+            'max_wait': round(self.max_wait_time, 4),
+            'total_hold': round(self.total_hold_time, 3),
+            'shared': self.lock_filename is not None and fcntl is not None
+        }
+
+        #################
+        return all_stats
+        #################
+
+    ################
+    # END get_stats
+    ################
+
+##################
+# END BusLock
+##################
+
+
+####################################################################################################
+# BusLockManager
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Class created
+####################################################################################################
+class BusLockManager:
+    """
+    Creates one BusLock per bus name, with its lock file in a given directory.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def __init__(self, directory=None):
+        """
+        Creates manager without any lock.
+
+        INPUT:
+            directory (str|None) directory of lock files. lock_directory if None, or temporary
+                directory if lock_directory does not exist.
+        """
+
+        if directory is None:
+
+            directory = lock_directory
+
+            if not os.path.isdir(directory):
+
+                directory = '/tmp/'
+
+        self.directory = directory
+        self.all_bus_locks = {}
+        self.creation_lock = threading.Lock()
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_lock
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def get_lock(self, bus_name):
+        """
+        Returns lock of a bus, creating it on first request.
+
+        INPUT:
+            bus_name (str) name of the bus (letters, digits, '-', '_')
+
+        OUTPUT:
+            (BusLock) lock of the bus
+        """
+
+        with self.creation_lock:
+
+            if bus_name not in self.all_bus_locks:
+
+                lock_basename = lock_file_prefix + bus_name.replace('/', '_') + '.lock'
+                lock_filename = os.path.join(self.directory, lock_basename)
+                self.all_bus_locks[bus_name] = BusLock(bus_name, lock_filename)
+
+            bus_lock = self.all_bus_locks[bus_name]
+
+        ################
+        return bus_lock
+        ################
+
+    ###############
+    # END get_lock
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_stats
+    ################################################################################################
+    # Revision History :
+    #   2026-10-19 AdBa : Function created
+    ################################################################################################
+    def get_stats(self):
+        """
+        Returns contention metrics of all buses used by this process.
+
+        OUTPUT:
+            (Dict) bus name => metrics (see BusLock.get_stats)
+        """
+
+        with self.creation_lock:
+
+            all_bus_locks = list(self.all_bus_locks.values())
+
+        all_stats = {bus_lock.bus_name: bus_lock.get_stats() for bus_lock in all_bus_locks}
+
+        #################
+        return all_stats
+        #################
+
+    ################
+    # END get_stats
+    ################
+
+#########################
+# END BusLockManager
+#########################
+
+
+####################################################################################################
+# get_lock
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Function created
+####################################################################################################
+def get_lock(bus_name):
+    """
+    Returns lock of a bus from the manager shared by all modules of the process.
+
+    INPUT:
+        bus_name (str) name of the bus (e.g. i2c-1, gpio-4, pigpio-waves)
+
+    OUTPUT:
+        (BusLock) lock of the bus
+    """
+
+    global default_manager
+
+    with default_manager_lock:
+
+        if default_manager is None:
+
+            default_manager = BusLockManager()
+
+    ##########################################
+    return default_manager.get_lock(bus_name)
+    ##########################################
+
+###############
+# END get_lock
+###############
+
+
+####################################################################################################
+# get_stats
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Function created
+####################################################################################################
+def get_stats():
+    """
+    Returns contention metrics of all buses used by this process (shared manager).
+
+    OUTPUT:
+        (Dict) bus name => metrics (see BusLock.get_stats)
+    """
+
+    if default_manager is None:
+
+        ##########
+        return {}
+        ##########
+
+    ##################################
+    return default_manager.get_stats()
+    ##################################
+
+################
+# END get_stats
+################
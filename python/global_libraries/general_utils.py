@@ -72,8 +72,8 @@ all_error_messages = {
     -413: 'Outlier filtered.',
     -414: 'Redundancy in sensors.',
     -415: 'No sensors found in configuration file.',
-    -416: 'Failed to parse heater information.',
-    -417: 'Failed to control heaters.',
+    -416: 'Failed to parse automation rule.',
+    -417: 'Automation rule action failed.',
     -418: 'Could not load module.',
     -419: 'Failed to connect to website.',
     -420: 'Wrong warmup for sensor.',
@@ -82,6 +82,12 @@ all_error_messages = {
     -423: 'No valid sensor could be found.',
     -424: 'Missing measure from sensor.',
     -425: 'Problem with sensor module.',
+    -426: 'Failed to publish to sensor stream.',
+    -427: 'Failed to write sensor history.',
+    -428: 'Invalid sensor history request.',
+    -429: 'Sensor history is not enabled on this machine.',
+    -430: 'Sensor reads suspended after repeated failures.',
+    -431: 'Sensor bus busy, sample skipped.',
     ###########
     # Infrared
     ###########
@@ -92,6 +98,7 @@ all_error_messages = {
     -505: 'Argument for configuration is invalid.',
     -506: 'Error in SignalSender.',
     -507: 'Pigpio package error',
+    -508: 'Infrared emitter busy (pigpio waves used by another process).',
     ##########
     # OS
     ##########
@@ -485,10 +492,13 @@ def delete_os_file(file_name):
 ####################################################################################################
 # Revision History:
 #    2016/11/26 AdBa: Created the function
+#    2026/10/19 AdBa: File is replaced atomically (readers never see a partial/missing file)
 ####################################################################################################
 def create_os_file(file_name, file_content):
     """
-    Creates and initializes file on OS filesystem.
+    Creates and initializes file on OS filesystem. Content is written to a temporary file in the
+    same directory, synced to disk, then renamed over the file, so that readers see either the
+    previous or the new content.
 
     INPUT:
         file_name (str) : URl of the file to create
@@ -498,15 +508,23 @@ def create_os_file(file_name, file_content):
         (int) 0 if successfull, negative number if error occured
     """
 
+    temporary_file_name = file_name + '.tmp'
+
     try:
 
-        # Creates output file, write value in it, and close the file (Part Latest data)
-        output_file = open(file_name, 'wb')
-        output_file.write(file_content)
-        output_file.close()
+        # Creates temporary file, write value in it, and makes sure it is on disk before renaming
+        with open(temporary_file_name, 'w') as output_file:
+
+            output_file.write(file_content)
+            output_file.flush()
+            os.fsync(output_file.fileno())
+
+        os.replace(temporary_file_name, file_name)
 
     except OSError as e:
 
+        delete_os_file(temporary_file_name)
+
         ##########################################
         return log_error(-410, file_name, str(e))
         ##########################################
@@ -269,21 +269,23 @@ class PikaConnectorManager:
     ################################################################################################
     # Revision History :
     #   2016-11-26 AdBa : Function created
+    #   2026-10-19 AdBa : Added exchange type parameter (topic exchange for sensor stream)
     ################################################################################################
-    def declare_exchange(self, exchange_name):
+    def declare_exchange(self, exchange_name, exchange_type='direct'):
         """
         Declares an exchange in the RabbitMQ system.
 
         INPUT:
             exchange_name (str) : name of the exchange in which the queues must be declared
+            exchange_type (str, opt) : type of the exchange ('direct', 'topic', 'fanout', ...)
         """
 
         declare_failed = True
         while declare_failed:
             try:
 
-                self.rabbit_channel.exchange_declare(exchange=exchange_name, exchange_type='direct',
-                                                     durable=True)
+                self.rabbit_channel.exchange_declare(exchange=exchange_name,
+                                                     exchange_type=exchange_type, durable=True)
 
                 # Successfully declared the exchange
                 general_utils.log_message('Exchange %s successfully created.' % (exchange_name,))
@@ -315,8 +317,10 @@ class PikaConnectorManager:
     ################################################################################################
     # Revision History :
     #   2016-11-26 AdBa : Function created
+    #   2026-10-19 AdBa : Added is_logged parameter (frequent messages are not logged)
     ################################################################################################
-    def publish_message(self, exchange_name, routing_key, message_content, message_properties):
+    def publish_message(self, exchange_name, routing_key, message_content, message_properties,
+                        is_logged=True):
         """
         Publishes a message to the RabbitMQ server
 
@@ -325,6 +329,8 @@ class PikaConnectorManager:
             routing_key (str) routing key to use to transit message (=instruction title for workers)
             message_content (str) message to send
             message_properties (pika BasicProperties) properties of the message to send
+            is_logged (bool, opt) whether sent message is logged. Dropped connections are always
+                logged.
         """
 
         publish_failed = True
@@ -337,8 +343,11 @@ class PikaConnectorManager:
                                                   body=message_content,
                                                   properties=message_properties)
 
-                general_utils.log_message(
-                    'Sent message starting with ' + str(message_content[:200]) + '.')
+                if is_logged:
+
+                    general_utils.log_message(
+                        'Sent message starting with ' + str(message_content[:200]) + '.')
+
                 publish_failed = False
 
             except (pika.exceptions.ChannelClosed, pika.exceptions.ConnectionClosed):
@@ -25,6 +25,7 @@ from time import sleep
 import pigpio
 
 from . import general_utils
+from . import bus_lock_manager  # Waves are shared by all processes using pigpio daemon
 
 # RAW IR ones and zeroes. Specify length for one and zero and simply bitbang the GPIO.
 # The default values are valid for one tested remote which didn't fit in NEC or RC-5 specifications.
@@ -362,6 +363,7 @@ class PigpioInterface:
     #   2017-01-22 AdBa : Function created
     #   2017-01-25 AdBa : Modified whole function.
     #   2017-01-27 AdBa : Reviewed function structure
+    #   2026-10-19 AdBa : Waves sent while holding a lock shared with other processes
     ################################################################################################
     def send_code(self, all_wave_lengths, wave_order):
         """
@@ -375,6 +377,56 @@ class PigpioInterface:
             (int) 0 if successfull, negative number otherwise
         """
 
+        # Waves are global to the pigpio daemon (wave_clear deletes those of other processes) :
+        # only one signal is prepared/sent at a time, by any process.
+        waves_lock = bus_lock_manager.get_lock('pigpio-waves')
+
+        if not waves_lock.acquire():
+
+            ####################################
+            return general_utils.log_error(-508)
+            ####################################
+
+        try:
+
+            send_status = self.send_code_with_waves(all_wave_lengths, wave_order)
+
+        finally:
+
+            waves_lock.release()
+
+        ###################
+        return send_status
+        ###################
+
+    ################
+    # END send_code
+    ################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # send_code_with_waves
+    ################################################################################################
+    # Revision History :
+    #   2017-01-22 AdBa : Function created (as send_code)
+    #   2026-10-19 AdBa : Split from send_code, called while holding pigpio waves lock
+    ################################################################################################
+    def send_code_with_waves(self, all_wave_lengths, wave_order):
+        """
+        Creates waves, sends them and deletes them. Must be called while holding the pigpio waves
+        lock.
+
+        INPUT
+            all_wave_lengths (int[][]) series of 'HIGH' 'LOW' lengths of each wave
+            wave_order (int[]) indexes of waves to send sequentially, in order (repetition allowed)
+
+        OUTPUT:
+            (int) 0 if successfull, negative number otherwise
+        """
+
         # Resets parameter (internal and pigpio-related)
         self.all_wave_ids = []
         self.pigpio = pigpio.pi()
@@ -429,9 +481,9 @@ class PigpioInterface:
         return 0
         #########
 
-    ################
-    # END send_code
-    ################
+    ###########################
+    # END send_code_with_waves
+    ###########################
 
     #
     #
@@ -12,6 +12,8 @@ from . import master_update
 from . import master_remote_control
 from . import master_files
 from . import master_sensors
+from . import master_history
+from . import master_sensor_config
 from . import master_ssh
 
 #############
@@ -21,7 +23,7 @@ from . import master_ssh
 __author__ = 'Adrien Baland'
 
 
-all_instructions = ['remote_control', 'files', 'sensors', 'ssh']
+all_instructions = ['remote_control', 'files', 'sensors', 'history', 'sensor_config', 'ssh']
 
 
 # What message and timeout info to send master program. All of them have 'get_message' and
@@ -32,5 +34,7 @@ instruction_to_functions = {
     'remote_control': master_remote_control,
     'files': master_files,
     'sensors': master_sensors,
+    'history': master_history,
+    'sensor_config': master_sensor_config,
     'ssh': master_ssh,
 }
@@ -0,0 +1,208 @@
+########################
+# Import Global package
+########################
+import argparse
+import time
+
+
+####################################################################################################
+# DEFAULTS
+####################################################################################################
+default_range_hours = 24.  # Range queried if no start is given
+time_format = '%Y-%m-%d %H:%M:%S'  # Format of start/end arguments (local time)
+
+####################################################################################################
+# INSTRUCTION PARSER
+####################################################################################################
+# Creates parser for all options in history
+argument_parser = argparse.ArgumentParser()
+
+# Sensor location. REQUIRED
+sensor_help = 'Sensor (location) to query.\n'
+argument_parser.add_argument('sensor', action='store', type=str, help=sensor_help)
+
+# Measurement type. REQUIRED
+measurement_help = 'Measurement to query (temperature, humidity, pressure, luminosity, ...).\n'
+argument_parser.add_argument('measurement', action='store', type=str, help=measurement_help)
+
+# Range start
+start_help = 'Start of range, as "YYYY-MM-DD hh:mm:ss". %d hours before end by default.\n' % \
+             default_range_hours
+argument_parser.add_argument('--start', '-s', action='store', type=str, help=start_help)
+
+# Range end
+end_help = 'End of range, as "YYYY-MM-DD hh:mm:ss". Now by default.\n'
+argument_parser.add_argument('--end', '-e', action='store', type=str, help=end_help)
+
+# Resolution
+resolution_help = 'Seconds covered by each point returned (0 for raw samples). Increased by ' \
+                  'workers if range contains too many points.\n'
+argument_parser.add_argument('--resolution', '-r', action='store', type=int, default=0,
+                             help=resolution_help)
+
+# Timeout argument
+timeout_help = 'Number of seconds to wait for a response.\n'
+argument_parser.add_argument('--timeout', '-t', action='store', nargs='?', type=int,
+                             help=timeout_help)
+
+#########################
+# END INSTRUCTION PARSER
+#########################
+
+
+####################################################################################################
+# get_help_message
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Function created
+####################################################################################################
+def get_help_message(with_details=False):
+    """
+    Prints information message about instruction.
+
+    INPUT:
+         with_details (Boolean) whether only general information about instruction should be
+            printed, or detailed.
+    """
+
+    print('History.')
+    print('Querries min/max/mean of stored measurements of a sensor over a time range.')
+
+    if with_details:
+
+        argument_parser.print_help()
+
+    #######
+    return
+    #######
+
+#######################
+# END get_help_message
+#######################
+
+
+####################################################################################################
+# get_message
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Function created
+####################################################################################################
+def get_message(rabbit_master_object, base_instruction_message, command_arguments):
+    """
+    Sends a history request to the RabbitMQ server
+
+    INPUT
+         rabbit_master_object (Master) master controller, sending instruction to RabbitMQ server.
+         base_instruction_message (lxml.etree) instruction to complete
+         command_arguments (str[]) sensor, measurement, and optional range/resolution/timeout
+
+    OUTPUT
+        (lxml.etree) XML representation of instruction to send, as
+        <instruction sensor=... measurement=... start=... end=... resolution=...>
+        timeout value to apply
+    """
+
+    try:
+
+        parsed_command_arguments, _ = argument_parser.parse_known_args(command_arguments)
+
+    except SystemExit:
+
+        argument_parser.print_usage()
+
+        #############################################
+        raise ValueError('Could not parse command.')
+        #############################################
+
+    # Range is sent as epoch seconds, so that workers do not depend on master time zone
+    if parsed_command_arguments.end is None:
+
+        end_time = time.time()
+
+    else:
+
+        end_time = time.mktime(time.strptime(parsed_command_arguments.end, time_format))
+
+    if parsed_command_arguments.start is None:
+
+        start_time = end_time - default_range_hours * 3600.
+
+    else:
+
+        start_time = time.mktime(time.strptime(parsed_command_arguments.start, time_format))
+
+    if start_time >= end_time or parsed_command_arguments.resolution < 0:
+
+        ################################################################
+        raise ValueError('Range must not be empty and resolution >= 0.')
+        ################################################################
+
+    base_instruction_message.set('sensor', parsed_command_arguments.sensor)
+    base_instruction_message.set('measurement', parsed_command_arguments.measurement)
+    base_instruction_message.set('start', '%d' % start_time)
+    base_instruction_message.set('end', '%d' % end_time)
+    base_instruction_message.set('resolution', str(parsed_command_arguments.resolution))
+
+    remote_timeout = parsed_command_arguments.timeout
+
+    ####################################################################################
+    return base_instruction_message, rabbit_master_object.parse_timeout(remote_timeout)
+    ####################################################################################
+
+##################
+# END get_message
+##################
+
+
+####################################################################################################
+# process_response
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Function created
+####################################################################################################
+def process_response(_, received_worker_message):
+    """
+    Processes history report from a worker.
+
+    INPUT:
+         master (Master) Unused here.
+         received_worker_message (lxml.etree object) message from worker as
+            <worker id=... status=... sensor=... measurement=... resolution=... points=...>
+            <chunk index=...><point time=... min=... max=... mean=... count=.../>...</chunk>
+            </worker>
+    """
+
+    # Workers without the sensor answer without points
+    if received_worker_message.get('points') is None:
+
+        #######
+        return
+        #######
+
+    print('History response received (%s, %s, %s points, %s s resolution).' % (
+        received_worker_message.get('sensor'), received_worker_message.get('measurement'),
+        received_worker_message.get('points'), received_worker_message.get('resolution')))
+
+    try:
+
+        for chunk_object in received_worker_message.iter('chunk'):
+
+            for point_object in chunk_object.iter('point'):
+
+                point_time = time.strftime(time_format,
+                                           time.localtime(int(point_object.get('time'))))
+                print('%s  mean=%s  min=%s  max=%s  (%s samples)' % (
+                    point_time, point_object.get('mean'), point_object.get('min'),
+                    point_object.get('max'), point_object.get('count')))
+
+    except Exception as e:
+
+        print('Could not parse response' + str(e))
+
+    #######
+    return
+    #######
+
+#######################
+# END process_response
+#######################
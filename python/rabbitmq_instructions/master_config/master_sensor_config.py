@@ -0,0 +1,159 @@
+########################
+# Import Global package
+########################
+import argparse
+
+
+####################################################################################################
+# DEFAULTS
+####################################################################################################
+
+####################################################################################################
+# INSTRUCTION PARSER
+####################################################################################################
+# Creates parser for all options in sensor configuration
+argument_parser = argparse.ArgumentParser()
+
+# New configuration file
+file_help = 'Sensor configuration file to send (replaces the one of workers). Workers reload ' \
+            'their current file if missing.\n'
+argument_parser.add_argument('--file', '-f', action='store', type=str, help=file_help)
+
+# Timeout argument
+timeout_help = 'Number of seconds to wait for a response.\n'
+argument_parser.add_argument('--timeout', '-t', action='store', nargs='?', type=int,
+                             help=timeout_help)
+
+#########################
+# END INSTRUCTION PARSER
+#########################
+
+
+####################################################################################################
+# get_help_message
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Function created
+####################################################################################################
+def get_help_message(with_details=False):
+    """
+    Prints information message about instruction.
+
+    INPUT:
+         with_details (Boolean) whether only general information about instruction should be
+            printed, or detailed.
+    """
+
+    print('Sensor configuration.')
+    print('Sends a new sensor configuration (or reloads current one) without restarting sensors.')
+
+    if with_details:
+
+        argument_parser.print_help()
+
+    #######
+    return
+    #######
+
+#######################
+# END get_help_message
+#######################
+
+
+####################################################################################################
+# get_message
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Function created
+####################################################################################################
+def get_message(rabbit_master_object, base_instruction_message, command_arguments):
+    """
+    Sends a sensor configuration to the RabbitMQ server
+
+    INPUT
+         rabbit_master_object (Master) master controller, sending instruction to RabbitMQ server.
+         base_instruction_message (lxml.etree) instruction to complete
+         command_arguments (str[]) optional configuration file and timeout
+
+    OUTPUT
+        (lxml.etree) XML representation of instruction to send, as
+        <instruction>configuration file content (if any)</instruction>
+        timeout value to apply
+    """
+
+    try:
+
+        parsed_command_arguments, _ = argument_parser.parse_known_args(command_arguments)
+
+    except SystemExit:
+
+        argument_parser.print_usage()
+
+        #############################################
+        raise ValueError('Could not parse command.')
+        #############################################
+
+    if parsed_command_arguments.file is not None:
+
+        try:
+
+            with open(parsed_command_arguments.file, 'r') as config_file:
+
+                base_instruction_message.text = config_file.read()
+
+        except OSError as e:
+
+            ####################################################################
+            raise ValueError('Could not read configuration file (%s).' % str(e))
+            ####################################################################
+
+    remote_timeout = parsed_command_arguments.timeout
+
+    ####################################################################################
+    return base_instruction_message, rabbit_master_object.parse_timeout(remote_timeout)
+    ####################################################################################
+
+##################
+# END get_message
+##################
+
+
+####################################################################################################
+# process_response
+####################################################################################################
+# Revision History :
+#   2026-10-19 AdBa : Function created
+####################################################################################################
+def process_response(_, received_worker_message):
+    """
+    Processes sensor configuration report from a worker.
+
+    INPUT:
+         master (Master) Unused here.
+         received_worker_message (lxml.etree object) message from worker as
+            <worker id=... status=...><change sensor=... type=... action=... options=...>
+            </worker>
+    """
+
+    print('Sensor configuration response received (status %s).' %
+          received_worker_message.get('status'))
+
+    try:
+
+        for change_object in received_worker_message.iter('change'):
+
+            print('%s (%s) %s %s' % (change_object.get('sensor'), change_object.get('type'),
+                                     change_object.get('action'),
+                                     change_object.get('options', '')))
+
+    except Exception as e:
+
+        print('Could not parse response' + str(e))
+
+    #######
+    return
+    #######
+
+#######################
+# END process_response
+#######################
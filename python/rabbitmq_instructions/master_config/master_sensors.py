@@ -104,6 +104,7 @@ def get_message(rabbit_master_object, base_instruction_message, command_argument
 ####################################################################################################
 # Revision History :
 #   2017-05-25 AdBa : Function created
+#   2026-10-19 AdBa : Prints read metrics of each sensor
 ####################################################################################################
 def process_response(_, received_worker_message):
     """
@@ -123,6 +124,11 @@ def process_response(_, received_worker_message):
 
             print(sensor_object.attrib)
 
+            # Read metrics, if worker reads a snapshot file
+            for metrics_object in sensor_object.iter('metrics'):
+
+                print('    metrics: %s' % dict(metrics_object.attrib))
+
     except Exception as e:
         
         print('Could not parse response' + str(e))
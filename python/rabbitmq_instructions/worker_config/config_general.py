@@ -1,18 +1,22 @@
 from . import worker_remote_control
 from . import worker_files
 from . import worker_sensors
+from . import worker_history
+from . import worker_sensor_config
 
 is_default = False
 
 config_version = 2
 
 worker_to_instruction = {
-    'bedroom': ['remote_control', 'files', 'sensors'],
-    'living': ['files', 'sensors']
+    'bedroom': ['remote_control', 'files', 'sensors', 'history', 'sensor_config'],
+    'living': ['files', 'sensors', 'history', 'sensor_config']
 }
 
 instruction_to_module = {
     'remote_control': worker_remote_control,
     'files': worker_files,
-    'sensors': worker_sensors
+    'sensors': worker_sensors,
+    'history': worker_history,
+    'sensor_config': worker_sensor_config
 }
@@ -0,0 +1,176 @@
+from lxml import etree  # Converts worker response element to a tree-like object
+import math
+from rabbitmq_instructions.worker_config import worker_sensors
+from temperature_monitoring import home_environment_sensors
+from temperature_monitoring import sensor_history_store
+from global_libraries import general_utils
+
+
+# Maximum number of points returned for one request (resolution is increased to stay below)
+max_points = 5000
+
+# Number of points in each <chunk> of the response
+points_per_chunk = 500
+
+
+####################################################################################################
+# get_point_seconds
+####################################################################################################
+# Revision History :
+#    2026-10-19 Adba : Function created
+####################################################################################################
+def get_point_seconds(start_time, end_time, requested_seconds):
+    """
+    Gets length of points to return. Requested length is increased if range would contain more
+    than max_points, and then rounded to a multiple of a stored rollup, so that rollups are used.
+
+    INPUT
+        start_time (float) first time included
+        end_time (float) first time excluded
+        requested_seconds (int) point length requested by master (0 for raw samples)
+
+    OUTPUT
+        (int) point length to use
+    """
+
+    minimal_seconds = int(math.ceil((end_time - start_time) / max_points))
+
+    if requested_seconds >= minimal_seconds:
+
+        #########################
+        return requested_seconds
+        #########################
+
+    # Rounds up to a multiple of the coarsest rollup shorter than minimal length
+    point_seconds = minimal_seconds
+
+    for resolution in sensor_history_store.all_resolutions[1:]:
+
+        resolution_seconds = sensor_history_store.resolution_to_seconds[resolution]
+
+        if minimal_seconds >= resolution_seconds:
+
+            point_seconds = int(math.ceil(minimal_seconds / resolution_seconds)) * \
+                resolution_seconds
+
+    #####################
+    return point_seconds
+    #####################
+
+########################
+# END get_point_seconds
+########################
+
+
+####################################################################################################
+# execute
+####################################################################################################
+# Revision History :
+#    2026-10-19 Adba : Function created
+####################################################################################################
+def execute(worker_instance, instruction_as_xml, worker_base_response):
+    """
+    Processes history instruction : aggregates stored samples of a sensor measurement over a time
+    range, and returns them as <chunk> elements of at most points_per_chunk <point> elements.
+    Workers that do not have the sensor return an empty successful response.
+
+    INPUT
+         worker_instance (Worker) worker instance
+         instruction_as_xml (lxml.etree) message to process, as
+            <instruction sensor=... measurement=... start=... end=... resolution=...>
+         worker_base_response (lxml.etree) base of worker response on which to build
+
+    OUTPUT
+         (lxml.etree) worker response, with aggregated points
+    """
+
+    history_response = worker_base_response
+
+    # Sensor list and history configuration come from sensor configuration (parsed once)
+    if 'sensors' not in worker_instance.sand_box.keys():
+
+        worker_sensors.get_sensor_list(worker_instance)
+
+    sensor_name = instruction_as_xml.get('sensor')
+    measurement = instruction_as_xml.get('measurement')
+
+    # Sensor not plugged into this machine : nothing to report
+    if sensor_name not in worker_instance.sand_box['sensors']:
+
+        history_response.set('status', '0')
+
+        ########################
+        return history_response
+        ########################
+
+    try:
+
+        start_time = float(instruction_as_xml.get('start'))
+        end_time = float(instruction_as_xml.get('end'))
+        requested_seconds = int(instruction_as_xml.get('resolution', '0'))
+
+        if end_time <= start_time or requested_seconds < 0:
+
+            raise ValueError('Empty time range or negative resolution.')
+
+    except (TypeError, ValueError) as e:
+
+        details = '(%s, %s)' % (sensor_name, measurement)
+        status_code = general_utils.log_error(-428, details, str(e))
+        history_response.set('status', str(status_code))
+
+        ########################
+        return history_response
+        ########################
+
+    history_store = home_environment_sensors.history_store
+
+    if history_store is None:
+
+        status_code = general_utils.log_error(-429)
+        history_response.set('status', str(status_code))
+
+        ########################
+        return history_response
+        ########################
+
+    point_seconds = get_point_seconds(start_time, end_time, requested_seconds)
+
+    history_response.set('sensor', sensor_name)
+    history_response.set('measurement', measurement)
+    history_response.set('resolution', str(point_seconds))
+
+    # Points are grouped in chunks, so that master can process them without building a huge list
+    current_chunk = None
+    n_points = 0
+
+    for point_start, point_min, point_max, point_mean, point_count in \
+            sensor_history_store.iter_aggregates(history_store.base_directory, sensor_name,
+                                                 measurement, start_time, end_time,
+                                                 point_seconds):
+
+        if n_points >= max_points:
+
+            break
+
+        if n_points % points_per_chunk == 0:
+
+            current_chunk = etree.SubElement(history_response, 'chunk',
+                                             index=str(n_points // points_per_chunk))
+
+        etree.SubElement(current_chunk, 'point', time='%d' % point_start,
+                         min='%0.3f' % point_min, max='%0.3f' % point_max,
+                         mean='%0.3f' % point_mean, count=str(point_count))
+
+        n_points += 1
+
+    history_response.set('points', str(n_points))
+    history_response.set('status', '0')
+
+    ########################
+    return history_response
+    ########################
+
+##############
+# END execute
+##############
@@ -0,0 +1,135 @@
+from lxml import etree  # Converts worker response element to a tree-like object
+import os
+from rabbitmq_instructions.worker_config import worker_sensors
+from temperature_monitoring import home_environment_sensors
+from global_libraries import general_utils
+
+
+####################################################################################################
+# add_sensor_changes
+####################################################################################################
+# Revision History :
+#    2026-10-19 Adba : Function created
+####################################################################################################
+def add_sensor_changes(config_response, all_sensor_changes):
+    """
+    Adds sensors changed by a configuration to the response, as <change> tags.
+
+    INPUT
+        config_response (lxml.etree) response to complete
+        all_sensor_changes (Dict) sensors added, removed and updated (see
+            home_environment_sensors.last_sensor_changes)
+    """
+
+    for action in ('removed', 'added'):
+
+        for sensor_object in all_sensor_changes[action]:
+
+            etree.SubElement(config_response, 'change', sensor=sensor_object.name,
+                             type=sensor_object.type, action=action)
+
+    for sensor_object, all_changed_options in all_sensor_changes['updated']:
+
+        etree.SubElement(config_response, 'change', sensor=sensor_object.name,
+                         type=sensor_object.type, action='updated',
+                         options=','.join(all_changed_options))
+
+    #######
+    return
+    #######
+
+#########################
+# END add_sensor_changes
+#########################
+
+
+####################################################################################################
+# execute
+####################################################################################################
+# Revision History :
+#    2026-10-19 Adba : Function created
+####################################################################################################
+def execute(worker_instance, instruction_as_xml, worker_base_response):
+    """
+    Processes sensor_config instruction : replaces sensor configuration file with the one sent by
+    master (if any), once it is parsed without error, and reports sensors it adds, removes or
+    updates. Without configuration, current file is parsed again and marked as modified.
+    Running home_environment_sensors reloads the file when it is modified, keeping unchanged
+    sensors as they are.
+
+    INPUT
+         worker_instance (Worker) worker instance
+         instruction_as_xml (lxml.etree) message to process, as <instruction>configuration file
+            content (optional)</instruction>
+         worker_base_response (lxml.etree) base of worker response on which to build
+
+    OUTPUT
+         (lxml.etree) worker response, with <change sensor=... type=... action=... options=...>
+            for each sensor changed
+    """
+
+    config_response = worker_base_response
+    config_filename = home_environment_sensors.config_file_url
+    new_config = instruction_as_xml.text
+
+    # Changes are computed from the configuration this worker parsed last
+    if 'sensors' not in worker_instance.sand_box.keys():
+
+        worker_sensors.get_sensor_list(worker_instance)
+
+    if new_config is None or new_config.strip() == '':
+
+        parsed_filename = config_filename
+
+    else:
+
+        # New file is parsed before replacing current one, so that a wrong file is never used
+        parsed_filename = config_filename + '.new'
+
+        if general_utils.create_os_file(parsed_filename, new_config) != 0:
+
+            config_response.set('status', '-410')
+
+            #######################
+            return config_response
+            #######################
+
+    status_code = home_environment_sensors.read_configuration(parsed_filename, is_reload=True,
+                                                              is_read_only=True)
+    all_sensor_changes = home_environment_sensors.last_sensor_changes
+
+    try:
+
+        if status_code == 0 and parsed_filename != config_filename:
+
+            os.replace(parsed_filename, config_filename)
+
+        elif status_code == 0:
+
+            # Same content : modification time makes sensor script reload it
+            os.utime(config_filename)
+
+    except OSError as e:
+
+        status_code = general_utils.log_error(-410, config_filename, str(e))
+
+    if parsed_filename != config_filename and os.path.isfile(parsed_filename):
+
+        general_utils.delete_os_file(parsed_filename)
+
+    if status_code == 0:
+
+        add_sensor_changes(config_response, all_sensor_changes)
+
+        # Sensor list of other instructions follows new configuration
+        worker_sensors.get_sensor_list(worker_instance)
+
+    config_response.set('status', str(status_code))
+
+    #######################
+    return config_response
+    #######################
+
+##############
+# END execute
+##############
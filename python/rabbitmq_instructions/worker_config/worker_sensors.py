@@ -1,4 +1,5 @@
 from lxml import etree  # Converts worker response element to a tree-like object
+import json
 import os
 from temperature_monitoring import home_environment_sensors
 from global_libraries import general_utils
@@ -9,6 +10,8 @@ from global_libraries import general_utils
 ####################################################################################################
 # Revision History :
 #    2017-05-23 Adba : Function created
+#    2026-10-19 Adba : Keeps snapshot file name
+#    2026-10-19 Adba : Configuration read without creating exporters (read-only)
 ####################################################################################################
 def get_sensor_list(rabbit_worker_object):
     """
@@ -19,7 +22,8 @@ def get_sensor_list(rabbit_worker_object):
     """
 
     # Makes home_environment_sensors script read sensor configuration, to update sensor list
-    home_environment_sensors.read_configuration(home_environment_sensors.config_file_url)
+    home_environment_sensors.read_configuration(home_environment_sensors.config_file_url,
+                                                is_read_only=True)
     
     # Gets list of sensors parsed in configuration
     all_sensors = home_environment_sensors.all_sensors
@@ -28,16 +32,19 @@ def get_sensor_list(rabbit_worker_object):
     sensor_to_output_mapping = {}
     
     # Adds sensor mapping one by one. I2C part.
-    for sensor_dictionnary in all_sensors:
+    for sensor_object in all_sensors:
         
-        sensor_to_output_mapping[sensor_dictionnary['name']] = {
-            'type': sensor_dictionnary['type'],
-            'measurement_type': sensor_dictionnary['samples_to_average'].keys(),
-            'output': sensor_dictionnary['output_directory']
+        sensor_to_output_mapping[sensor_object.name] = {
+            'type': sensor_object.type,
+            'measurement_type': sensor_object.measurement_types,
+            'output': sensor_object.output_directory
         }
 
     # Adds sensor mapping to worker internal parameters, to avoid reparsing configuration later
     rabbit_worker_object.sand_box['sensors'] = sensor_to_output_mapping
+
+    # Snapshot file with values of all sensors (None if only .dat files are written)
+    rabbit_worker_object.sand_box['sensor_snapshot'] = home_environment_sensors.snapshot_file
     
     general_utils.log_message('Finished parsing sensor configuration.')
 
@@ -103,12 +110,105 @@ def get_sensor_values(output_directory, measurement_type_list, sensor_status):
 ########################
 
 
+####################################################################################################
+# get_snapshot_values
+####################################################################################################
+# Revision History :
+#    2026-10-19 Adba : Function created
+#    2026-10-19 Adba : Returns read metrics with values
+####################################################################################################
+def get_snapshot_values(snapshot_file):
+    """
+    Reads snapshot file created by home_environment_sensors (code must be running), with current
+    output of all sensors. File is replaced atomically, so it is never read half-written.
+
+    INPUT
+        snapshot_file (str) snapshot file name
+
+    OUTPUT
+        (Dict|None) sensor name => {'values': {measurement: value (None if failed)},
+            'metrics': {read metrics} (empty if not in snapshot)}, None if no snapshot
+    """
+
+    try:
+
+        with open(snapshot_file, 'r') as snapshot:
+
+            snapshot_content = json.load(snapshot)
+
+        all_sensor_values = {}
+        for sensor_name, sensor_snapshot in snapshot_content['sensors'].items():
+
+            all_sensor_values[sensor_name] = {'values': sensor_snapshot['values'],
+                                              'metrics': sensor_snapshot.get('metrics', {})}
+
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+
+        ############
+        return None
+        ############
+
+    #########################
+    return all_sensor_values
+    #########################
+
+##########################
+# END get_snapshot_values
+##########################
+
+
+####################################################################################################
+# get_metrics_element
+####################################################################################################
+# Revision History :
+#    2026-10-19 Adba : Function created
+####################################################################################################
+def get_metrics_element(all_metrics):
+    """
+    Converts read metrics of a sensor (from snapshot file) to an xml tag, to find slow or failing
+    sensors.
+
+    INPUT
+        all_metrics (Dict) read metrics of a sensor (see sensor_metrics.SensorMetrics.get_stats)
+
+    OUTPUT
+        (lxml.etree) xml tag as <metrics reads=... failed_reads=... mean_ms=... p95_ms=...
+            max_ms=... overrun_time=... skipped_warmup=... .../>
+    """
+
+    metrics_element = etree.Element('metrics')
+
+    for metric_name, metric_value in sorted(all_metrics.items()):
+
+        # Skipped samples are given by reason
+        if isinstance(metric_value, dict):
+
+            for sub_metric_name, sub_metric_value in sorted(metric_value.items()):
+
+                metrics_element.set('%s_%s' % (metric_name, sub_metric_name),
+                                    str(sub_metric_value))
+
+        elif metric_value is not None:
+
+            metrics_element.set(metric_name, str(metric_value))
+
+    #######################
+    return metrics_element
+    #######################
+
+##########################
+# END get_metrics_element
+##########################
+
+
 ####################################################################################################
 # execute
 ####################################################################################################
 # Revision History :
 #    2017-05-23 Adba : Function created
 #    2017-05-27 Adba : Fixed missing .sand_box and fixed empty return
+#    2026-10-19 Adba : Reads all values from snapshot file if there is one
+#    2026-10-19 Adba : Read metrics of each sensor (snapshot file only)
 ####################################################################################################
 def execute(worker_instance, instruction_as_xml, worker_base_response):
     """
@@ -137,8 +237,14 @@ def execute(worker_instance, instruction_as_xml, worker_base_response):
     # Gets the relevant directories to go through
     all_sensor_directories = worker_instance.sand_box['sensors']
 
+    # Single file with all values if available (otherwise, one .dat file per measurement)
+    all_snapshot_values = None
+    if worker_instance.sand_box.get('sensor_snapshot') is not None:
+
+        all_snapshot_values = get_snapshot_values(worker_instance.sand_box['sensor_snapshot'])
+
     # Goes through all sensors to get their measurement
-    for sensor_name, sensor_info_dictionary in all_sensor_directories.iteritems():
+    for sensor_name, sensor_info_dictionary in all_sensor_directories.items():
 
         # Initialze lxml tag for current sensor
         sensor_status = etree.Element('sensor', type=sensor_info_dictionary['type'],
@@ -147,8 +253,25 @@ def execute(worker_instance, instruction_as_xml, worker_base_response):
         # Gets list of measurements supported by this sensor
         measurement_list = sensor_info_dictionary['measurement_type']
 
-        # Retrieves latest values for this sensor
-        get_sensor_values(sensor_info_dictionary['output'], measurement_list, sensor_status)
+        # Retrieves latest values for this sensor (failed measurements are not reported)
+        if all_snapshot_values is not None:
+
+            sensor_snapshot = all_snapshot_values.get(sensor_name, {})
+
+            for measurement_type, measurement_value in sensor_snapshot.get('values', {}).items():
+
+                if measurement_type in measurement_list and measurement_value is not None:
+
+                    sensor_status.set(measurement_type, '%0.3f' % measurement_value)
+
+            # Read times, failures and skipped samples, as <metrics .../> inside sensor tag
+            if len(sensor_snapshot.get('metrics', {})) > 0:
+
+                sensor_status.append(get_metrics_element(sensor_snapshot['metrics']))
+
+        else:
+
+            get_sensor_values(sensor_info_dictionary['output'], measurement_list, sensor_status)
 
         # Adds measurement for current sensor to the list
         sensor_response.append(sensor_status)
@@ -3,10 +3,14 @@
 ########################
 
 from . import BME280_Driver_Official_Adafruit  # Official BME280_Driver module, on which this relies
+from . import sensor_handle  # Handle kept open between samples
 import global_libraries.general_utils
 
 __author__ = 'Baland Adrien'
 
+# I2C address => open Handle, for get_measurements (calibration only read once for each sensor)
+all_handles = {}
+
 
 ####################################################################################################
 # FUNCTION (is_valid_address)
@@ -86,56 +90,184 @@ def get_measurement_types():
 
 
 ####################################################################################################
-# Function(get_measurements)
+# FUNCTION (get_bus_name)
 ####################################################################################################
 # Revision History:
-#   2016-11-04 AB - Function Created
+#   2026-10-19 AB - Function Created
 ####################################################################################################
-def get_measurements(address, temperature_correction):
+def get_bus_name(address):
     """
-    Measures and returns all available measurements for the room as a dictionnary.
+    Returns name of the bus the sensor communicates through. Sensors on the same bus are read one
+    after another, sensors on different buses are read in parallel.
 
     INPUT:
-        address (None) address of one-wire sensor
-        temperature_correction (float) correction to apply to measurement value, to account for 
-            external effects.
-
+        address (int) I2C address of the sensor (unused, all sensors on bus 1)
 
     RETURNS:
-        (Dict) dictionnary as {'temperature': value}
+        (str) name of the bus (I2C bus 1)
     """
 
-    # Initializes dictionnary of measurements collected
-    all_values = {
-        'temperature': None,
-        'humidity': None,
-        'pressure': None
-    }
+    del address
 
-    # Creates BME280 object to measurements desired values.
-    sensor_driver_object = BME280_Driver_Official_Adafruit.BME280(address)
+    # Adafruit I2C module uses bus 1 on all recent Raspberry Pis
+    bus_name = 'i2c-1'
 
-    try:
-        # Gets values from object created
-        temperature = sensor_driver_object.read_temperature()
-        humidity = sensor_driver_object.read_humidity()
-        pressure = sensor_driver_object.read_pressure()
+    ################
+    return bus_name
+    ################
 
-        # Applies correction to temperature
-        temperature += temperature_correction
+###################
+# END get_bus_name
+###################
+
+
+####################################################################################################
+# Handle
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created (from get_measurements)
+####################################################################################################
+class Handle(sensor_handle.SensorHandle):
+    """
+    Open BME280 sensor. The BME280 object (with its calibration) is created when opened, and kept
+    for all reads. Each read is one register write and one burst read of all data registers.
+    """
 
-        # Updates dictionnary of values
+    ################################################################################################
+    # open
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def open(self, address):
+        """
+        Reads calibration of the sensor, and configures humidity oversampling.
+
+        INPUT:
+            address (int) I2C address of sensor
+        """
+
+        self.device = BME280_Driver_Official_Adafruit.BME280(address)
+        sensor_handle.SensorHandle.open(self, address)
+
+        ######
+        return
+        ######
+
+    ###########
+    # END open
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # read
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def read(self):
+        """
+        Measures all values. Raises IOError if sensor was disconnected (calibration must be read
+        again).
+
+        RETURNS:
+            (Dict) dictionnary as {'temperature': value, 'humidity': value, 'pressure': value}
+        """
+
+        # Initializes dictionnary of measurements collected
         all_values = {
-            'temperature': temperature,
-            'humidity': humidity,
-            'pressure': pressure
+            'temperature': None,
+            'humidity': None,
+            'pressure': None
         }
 
-    except TypeError as e:
+        try:
+            # Gets values from object created
+            temperature, pressure, humidity = self.device.read_all()
+
+            # Applies correction to temperature
+            temperature += self.correction
+
+            # Updates dictionnary of values
+            all_values = {
+                'temperature': temperature,
+                'humidity': humidity,
+                'pressure': pressure
+            }
+
+        except TypeError as e:
+
+            # Something went wrong when retrieving the values. Log error.
+            details = 'Failed to get measures from BME280. %s' % str(e)
+            global_libraries.general_utils.log_error(-409, details)
+
+        ##################
+        return all_values
+        ##################
+
+    ###########
+    # END read
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # close
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def close(self):
+        """
+        Forgets BME280 object (sensor may be replaced before next open).
+        """
+
+        self.device = None
+        sensor_handle.SensorHandle.close(self)
+
+        ######
+        return
+        ######
+
+    ############
+    # END close
+    ############
+
+###########################
+# END Handle
+###########################
+
+
+####################################################################################################
+# Function(get_measurements)
+####################################################################################################
+# Revision History:
+#   2016-11-04 AB - Function Created
+#   2026-10-19 AB - Device kept between samples. All values from one burst read.
+#   2026-10-19 AB - Reads through a Handle kept open between calls
+####################################################################################################
+def get_measurements(address, temperature_correction):
+    """
+    Measures and returns all available measurements for the room as a dictionnary.
+    The sensor is opened on first measure (see Handle), and kept open for following ones.
+
+    INPUT:
+        address (int) I2C address of sensor
+        temperature_correction (float) correction to apply to measurement value, to account for 
+            external effects.
+
+
+    RETURNS:
+        (Dict) dictionnary as {'temperature': value, 'humidity': value, 'pressure': value}
+    """
 
-        # Something went wrong when retrieving the values. Log error.
-        details = 'Failed to get measures from BME280. %s' % str(e)
-        global_libraries.general_utils.log_error(-409, details)
+    all_values = sensor_handle.read_cached_handle(all_handles, Handle, address,
+                                                  temperature_correction)
 
     ##################
     return all_values
@@ -70,6 +70,8 @@ class BME280(object):
         self._load_calibration()
         self._device.write8(BME280_REGISTER_CONTROL, 0x3F)
         self.t_fine = 0.0
+        # Humidity oversampling is kept by the sensor, and applied on next write of CONTROL.
+        self._device.write8(BME280_REGISTER_CONTROL_HUM, self._mode)
 
     def _load_calibration(self):
 
@@ -146,11 +148,11 @@ class BME280(object):
         raw = (msb << 8) | lsb
         return raw
 
-    def read_temperature(self):
-        """Gets the compensated temperature in degrees celsius."""
+    def compensate_temperature(self, raw_temperature):
+        """Converts a raw temperature into degrees celsius, with calibration data. Updates t_fine,
+        used by pressure and humidity compensations."""
         # float in Python is double precision
-        ut = float(self.read_raw_temp())
-
+        ut = float(raw_temperature)
         var1 = (ut / 16384.0 - self.dig_T1 / 1024.0) * float(self.dig_T2)
         var2 = ((ut / 131072.0 - self.dig_T1 / 8192.0) * (ut / 131072.0 - self.dig_T1 / 8192.0)) * \
             float(self.dig_T3)
@@ -158,9 +160,9 @@ class BME280(object):
         temp = (var1 + var2) / 5120.0
         return temp
 
-    def read_pressure(self):
-        """Gets the compensated pressure in Pascals."""
-        adc = self.read_raw_pressure()
+    def compensate_pressure(self, raw_pressure):
+        """Converts a raw pressure into Pascals, with calibration data. Temperature must have been
+        compensated first (t_fine)."""
         var1 = self.t_fine / 2.0 - 64000.0
         var2 = var1 * var1 * self.dig_P6 / 32768.0
         var2 = var2 + var1 * self.dig_P5 * 2.0
@@ -170,18 +172,18 @@ class BME280(object):
         var1 = (1.0 + var1 / 32768.0) * self.dig_P1
         if var1 == 0:
             return 0
-        p = 1048576.0 - adc
+        p = 1048576.0 - raw_pressure
         p = ((p - var2 / 4096.0) * 6250.0) / var1
         var1 = self.dig_P9 * p * p / 2147483648.0
         var2 = p * self.dig_P8 / 32768.0
         p = p + (var1 + var2 + self.dig_P7) / 16.0
         return p
 
-    def read_humidity(self):
-        adc = self.read_raw_humidity()
-        # print 'Raw humidity = {0:d}'.format (adc)
+    def compensate_humidity(self, raw_humidity):
+        """Converts a raw humidity into %, with calibration data. Temperature must have been
+        compensated first (t_fine)."""
         h = self.t_fine - 76800.0
-        h = (adc - (self.dig_H4 * 64.0 + self.dig_H5 / 16384.8 * h)) * (
+        h = (raw_humidity - (self.dig_H4 * 64.0 + self.dig_H5 / 16384.8 * h)) * (
             self.dig_H2 / 65536.0 * (1.0 + self.dig_H6 / 67108864.0 * h * (
                 1.0 + self.dig_H3 / 67108864.0 * h)))
         h = h * (1.0 - self.dig_H1 * h / 524288.0)
@@ -190,3 +192,36 @@ class BME280(object):
         elif h < 0:
             h = 0
         return h
+
+    def read_temperature(self):
+        """Gets the compensated temperature in degrees celsius."""
+        return self.compensate_temperature(self.read_raw_temp())
+
+    def read_pressure(self):
+        """Gets the compensated pressure in Pascals."""
+        return self.compensate_pressure(self.read_raw_pressure())
+
+    def read_humidity(self):
+        return self.compensate_humidity(self.read_raw_humidity())
+
+    def read_raw_all(self):
+        """Starts a forced measurement, then reads raw pressure, temperature and humidity with a
+        single burst read of the data registers (0xF7 to 0xFE)."""
+        meas = self._mode << 5 | self._mode << 2 | 1
+        self._device.write8(BME280_REGISTER_CONTROL, meas)
+        sleep_time = 0.00125 + 0.0023 * (1 << self._mode)
+        sleep_time = sleep_time + 0.0023 * (1 << self._mode) + 0.000575
+        sleep_time = sleep_time + 0.0023 * (1 << self._mode) + 0.000575
+        time.sleep(sleep_time)  # Wait the required time
+        data = self._device.readList(BME280_REGISTER_PRESSURE_DATA, 8)
+        raw_pressure = ((data[0] << 16) | (data[1] << 8) | data[2]) >> 4
+        raw_temperature = ((data[3] << 16) | (data[4] << 8) | data[5]) >> 4
+        raw_humidity = (data[6] << 8) | data[7]
+        return raw_temperature, raw_pressure, raw_humidity
+
+    def read_all(self):
+        """Gets compensated temperature (degrees celsius), pressure (Pascals) and humidity (%)
+        from one burst read."""
+        raw_temperature, raw_pressure, raw_humidity = self.read_raw_all()
+        temp = self.compensate_temperature(raw_temperature)
+        return temp, self.compensate_pressure(raw_pressure), self.compensate_humidity(raw_humidity)
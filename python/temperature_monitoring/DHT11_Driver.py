@@ -4,29 +4,47 @@
 # Import global packages
 #########################
 
+import threading  # Protects creation of pigpio connection (sensors read from parallel threads)
 from time import sleep  # Waits after sending signal for responses
 from time import time as now
+from time import perf_counter  # Times blocks of pin samples (capture jitter)
 try:
     import RPi.GPIO as GPIO  # Controls and reads GPIO Pins
 except ImportError:
     GPIO = None
+try:
+    import pigpio  # Timestamps pin edges in pigpio daemon (hardware-timed, no busy polling)
+except ImportError:
+    pigpio = None
 
 ########################
 # Import local packages
 ########################
 
 from global_libraries import general_utils
+from . import realtime_capture  # Real-time priority during pin polling, and capture statistics
 
 __author__ = 'Baland Adrien'
 
 ###########################
 # Declare global variables
 ###########################
-pin_gpio_id = -1  # Pin to which DHT11 Sensor is connected.
-
 no_data_bit_error_spacing = 3600.  # Prevents spam log of errors if the "No 40 bits" error occurs.
 no_data_bit_error_last_time = {}  # Each failing sensors should still have its log entry
 
+# Edge acquisition with pigpio (used when pigpio daemon is running, GPIO polling otherwise)
+pigpio_connection = None  # Connection to pigpio daemon, created on first measure
+pigpio_connection_tried = False  # Whether connection was attempted (not retried if daemon is down)
+pigpio_connection_lock = threading.Lock()
+start_signal_duration = 0.018  # Seconds the pin is pulled LOW to ask the sensor for data
+transmission_duration = 0.010  # Seconds to wait for the whole response (about 5ms)
+bit_one_min_width = 50  # Microseconds. HIGH pulses last ~27us for a 0-bit, ~70us for a 1-bit
+min_read_interval = 1.0  # Seconds the sensor needs between two reads (before a retry)
+
+# Pin polling with RPi.GPIO (timing-critical : sample period decides whether bits are decoded)
+sample_block_size = 32  # Pin samples between two timestamps (jitter measured per block)
+all_capture_stats = {}  # GPIO pin => realtime_capture.CaptureStats
+
 
 ####################################################################################################
 # FUNCTION (is_valid_address)
@@ -106,10 +124,79 @@ def get_measurement_types():
 ############################
 
 
+####################################################################################################
+# FUNCTION (get_bus_name)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_bus_name(address):
+    """
+    Returns name of the bus the sensor communicates through. Sensors on the same bus are read one
+    after another, sensors on different buses are read in parallel.
+
+    INPUT:
+        address (int) GPIO pin of the sensor
+
+    RETURNS:
+        (str) name of the bus (one bus per GPIO pin)
+    """
+
+    # Each DHT11 has its own data pin, so they do not interfere with each other
+    bus_name = 'gpio-%d' % (address,)
+
+    ################
+    return bus_name
+    ################
+
+###################
+# END get_bus_name
+###################
+
+
+####################################################################################################
+# FUNCTION (get_capture_stats)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_capture_stats(address):
+    """
+    Returns capture statistics of a sensor : first-try success rate, retries, and sampling jitter
+    of pin polling (see realtime_capture.CaptureStats).
+
+    INPUT:
+        address (int) GPIO pin of the sensor
+
+    RETURNS:
+        (Dict|None) statistics, None if sensor was never read
+    """
+
+    capture_stats = all_capture_stats.get(address)
+
+    if capture_stats is None:
+
+        ############
+        return None
+        ############
+
+    ################################
+    return capture_stats.get_stats()
+    ################################
+
+########################
+# END get_capture_stats
+########################
+
+
 ####################################################################################################
 # Function(collect_pin_values)
 ####################################################################################################
-def collect_pin_values():
+# Revision History:
+#   2026-10-19 AB - Pin passed as argument (sensors can be read from parallel threads)
+#   2026-10-19 AB - Timestamps of sample blocks (sampling jitter)
+####################################################################################################
+def collect_pin_values(pin_gpio_id, capture_stats=None):
     """
     Collect data from DHT11 sensor. Measures as often as possible state (LOW/HIGH) of pin to measure
     The following starting sequence (HIGH, LOW, HIGH) is ignored, as it precedes sensor data 
@@ -117,6 +204,8 @@ def collect_pin_values():
     Collections stop when measurements stay to HIGH for a long enough time.
 
     INPUT:
+        pin_gpio_id (int) GPIO pin to which DHT11 sensor is connected
+        capture_stats (CaptureStats|None) statistics to which sampling periods are added
 
     RETURNS:
         (int[]) array of measurements (HIGH=1, LOW=0) for the given pin.
@@ -133,6 +222,8 @@ def collect_pin_values():
     n_same_value_count = 0  # Number of successive times the same value was observed
     last_value = -1  # Last measured value
     all_values_collected = []  # All measures collected
+    all_block_times = []  # Time at the start of each block of sample_block_size samples
+    n_block_samples = sample_block_size  # Samples collected in current block
 
     #######################################
     # Skips introduction signal (not data)
@@ -170,6 +261,14 @@ def collect_pin_values():
     n_same_value_count = 0
     while True:
 
+        # Timestamp every block only : timing each sample would slow sampling down
+        if n_block_samples == sample_block_size:
+
+            all_block_times.append(perf_counter())
+            n_block_samples = 0
+
+        n_block_samples += 1
+
         try:
             # Get current value and appends it
             current_value = GPIO.input(pin_gpio_id)
@@ -198,6 +297,10 @@ def collect_pin_values():
 
                 break
 
+    if capture_stats is not None:
+
+        capture_stats.add_capture(all_block_times, sample_block_size)
+
     ############################
     return all_values_collected
     ############################
@@ -306,14 +409,148 @@ def get_data_bits(all_high_voltage_counts):
 #####################
 
 
+####################################################################################################
+# Function(decode_pulse_widths)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def decode_pulse_widths(all_edges):
+    """
+    Decodes the data bits of a DHT11 response from a trace of pin edges. Each data bit is a LOW
+    pulse followed by a HIGH pulse, whose width gives the bit value. Only the last 40 HIGH pulses are
+    kept, as the response starts with HIGH pulses that are not data (end of start signal, response
+    of the sensor). Does not depend on hardware, so recorded traces can be decoded offline.
+
+    INPUT:
+        all_edges (list) edges in order, as (tick, level), with tick in microseconds (may wrap
+            around 2^32, as pigpio ticks) and level the pin level after the edge (0 or 1)
+
+    RETURNS:
+        (Boolean[40]|None) data bits, None if trace does not contain 40 HIGH pulses
+    """
+
+    # Widths of all HIGH pulses : rising edge followed by falling edge
+    all_high_widths = [(falling_tick - rising_tick) & 0xFFFFFFFF for
+                       (rising_tick, rising_level), (falling_tick, falling_level) in
+                       zip(all_edges, all_edges[1:]) if rising_level == 1 and falling_level == 0]
+
+    if len(all_high_widths) < 40:
+
+        ############
+        return None
+        ############
+
+    all_data_bits = [high_width > bit_one_min_width for high_width in all_high_widths[-40:]]
+
+    #####################
+    return all_data_bits
+    #####################
+
+##########################
+# END decode_pulse_widths
+##########################
+
+
+####################################################################################################
+# Function(get_pigpio_connection)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_pigpio_connection():
+    """
+    Returns connection to the pigpio daemon, created on first call. Connection is only attempted
+    once : if the daemon is not running, sensors are read by polling with RPi.GPIO.
+
+    RETURNS:
+        (pigpio.pi|None) connection, None if pigpio can not be used
+    """
+
+    global pigpio_connection, pigpio_connection_tried
+
+    with pigpio_connection_lock:
+
+        if not pigpio_connection_tried and pigpio is not None:
+
+            pigpio_connection_tried = True
+            candidate_connection = pigpio.pi()
+
+            if candidate_connection.connected:
+
+                pigpio_connection = candidate_connection
+
+    #########################
+    return pigpio_connection
+    #########################
+
+############################
+# END get_pigpio_connection
+############################
+
+
+####################################################################################################
+# Function(collect_edges)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def collect_edges(connection, pin_gpio_id):
+    """
+    Sends the start signal to a DHT11 sensor, and records all edges of its response with pigpio
+    callbacks. Edges are timestamped by the pigpio daemon, so delays of this process do not
+    change the measured pulse widths, and the thread sleeps during the transmission.
+
+    INPUT:
+        connection (pigpio.pi) connection to pigpio daemon
+        pin_gpio_id (int) GPIO pin to which DHT11 sensor is connected
+
+    RETURNS:
+        (list) edges in order, as (tick, level)
+    """
+
+    all_edges = []
+
+    def record_edge(_, level, tick):
+
+        all_edges.append((tick, level))
+
+    connection.set_pull_up_down(pin_gpio_id, pigpio.PUD_UP)
+    edge_callback = connection.callback(pin_gpio_id, pigpio.EITHER_EDGE, record_edge)
+
+    try:
+
+        # Start signal : pin pulled LOW, then released (pull-up) for the sensor to answer
+        connection.write(pin_gpio_id, 0)
+        sleep(start_signal_duration)
+        connection.set_mode(pin_gpio_id, pigpio.INPUT)
+        sleep(transmission_duration)
+
+    finally:
+
+        edge_callback.cancel()
+
+    #################
+    return all_edges
+    #################
+
+####################
+# END collect_edges
+####################
+
+
 ####################################################################################################
 # Function(send_and_sleep)
 ####################################################################################################
-def send_and_sleep(output, sleep_time):
+# Revision History:
+#   2026-10-19 AB - Pin passed as argument (sensors can be read from parallel threads)
+####################################################################################################
+def send_and_sleep(pin_gpio_id, output, sleep_time):
     """
     Sets output value and waits for a given amount of time.
 
     INPUT:
+        pin_gpio_id (int) GPIO pin to set
         output (0|1) : value to set as output for the pin
         sleep_time (Float) : amount of seconds to wait
 
@@ -425,6 +662,10 @@ def compute_checksum(all_bytes):
 ####################################################################################################
 # Revision History:
 #   2016-11-04 AB - Function Created
+#   2026-10-19 AB - Removed global pin (thread-safe). Fixed endless retries when error is not logged
+#   2026-10-19 AB - Edges timestamped with pigpio callbacks when pigpio daemon is running
+#   2026-10-19 AB - Pin polling in a real-time section. Capture statistics.
+#   2026-10-19 AB - Counts checksum failures and incomplete frames
 ####################################################################################################
 def get_measurements(address, temperature_correction):
     """
@@ -440,9 +681,6 @@ def get_measurements(address, temperature_correction):
         (Dict) dictionnary as {'temperature': value}
     """
 
-    global pin_gpio_id
-    global no_data_bit_error_last_time
-
     max_number_retry = 5  # Times script will try to get data from sensor in case of failure
 
     all_values = {
@@ -450,45 +688,77 @@ def get_measurements(address, temperature_correction):
         'humidity': None
     }
 
-    # Case-handler if the Rpi.GPIO could not be loaded
-    if GPIO is None:
+    # Edges timestamped by pigpio daemon if it runs, polling of pin with RPi.GPIO otherwise
+    connection = get_pigpio_connection()
+
+    # Case-handler if neither pigpio nor Rpi.GPIO could be loaded
+    if connection is None and GPIO is None:
 
         ##################
         return all_values
         ##################
 
-    # Sets the pin to use internally.
-    pin_gpio_id = address
+    if connection is None:
+
+        # Sets appropriate mode for GPIO pins
+        GPIO.setmode(GPIO.BCM)
+
+    if address not in all_capture_stats:
 
-    # Sets appropriate mode for GPIO pins
-    GPIO.setmode(GPIO.BCM)
+        all_capture_stats[address] = realtime_capture.CaptureStats()
+
+    capture_stats = all_capture_stats[address]
+    is_successful = False
+    first_try_end_time = None  # Time spent after the first try is counted as retry time
 
     index_retry = 1  # Current trial for sensor info.
     while True:
 
-        # Sets pins for output (to send start signal)
-        GPIO.setup(address, GPIO.OUT)
+        if index_retry == 2:
 
-        # Set pin high for 500ms (makes sure everything is freed)
-        send_and_sleep(GPIO.HIGH, 0.5)
+            first_try_end_time = perf_counter()
 
-        # MCU sends start signal and pull down voltage for at least 18milliseconds (initial phase)
-        send_and_sleep(GPIO.LOW, 0.020)
+        if connection is not None:
 
-        # Change to input using pull up (prepares for response from sensor)
-        GPIO.setup(address, GPIO.IN, GPIO.PUD_UP)
+            # Pulse widths measured by daemon : no need to free the pin for 500ms beforehand
+            if index_retry > 1:
 
-        # Collect data into an array
-        all_voltage_measurements = collect_pin_values()
+                sleep(min_read_interval)
 
-        # parse lengths of all data pull up periods
-        high_voltage_counts = get_high_voltage_counts(all_voltage_measurements)
+            all_data_bits = decode_pulse_widths(collect_edges(connection, address))
 
-        # Tests if exactly 40-bits of data parsed (otherwise, no point in trying to convert them)
-        if len(high_voltage_counts) == 40:
+        else:
+
+            # Sets pins for output (to send start signal)
+            GPIO.setup(address, GPIO.OUT)
 
-            # Get all 40 data bits value (0 or 1)
-            all_data_bits = get_data_bits(high_voltage_counts)
+            # Set pin high for 500ms (makes sure everything is freed)
+            send_and_sleep(address, GPIO.HIGH, 0.5)
+
+            # Response is sampled by busy polling : no preemption, GIL switch or garbage collection
+            # from the start signal to the last bit (about 25ms)
+            with realtime_capture.RealtimeSection():
+
+                # MCU sends start signal and pull down voltage for at least 18milliseconds
+                send_and_sleep(address, GPIO.LOW, 0.020)
+
+                # Change to input using pull up (prepares for response from sensor)
+                GPIO.setup(address, GPIO.IN, GPIO.PUD_UP)
+
+                # Collect data into an array
+                all_voltage_measurements = collect_pin_values(address, capture_stats)
+
+            # parse lengths of all data pull up periods
+            high_voltage_counts = get_high_voltage_counts(all_voltage_measurements)
+
+            # Only 40 bits of data can be converted (0/1 from relative lengths of pull up periods)
+            all_data_bits = None
+            if len(high_voltage_counts) == 40:
+
+                all_data_bits = get_data_bits(high_voltage_counts)
+
+        # Tests if exactly 40-bits of data parsed (otherwise, no point in trying to convert them)
+        if all_data_bits is not None:
 
             # Aggregate all 40 parsed data bits into 5 data bytes.
             all_data_bytes = convert_data_bits(all_data_bits)
@@ -502,10 +772,13 @@ def get_measurements(address, temperature_correction):
                 all_values['humidity'] = all_data_bytes[0]
 
                 # Success. Can leave the loop
+                is_successful = True
                 break
 
             else:
 
+                capture_stats.n_checksum_failures += 1
+
                 # Log errors if checksum test failed (only log error after n failures)
                 if index_retry == max_number_retry:
 
@@ -514,25 +787,36 @@ def get_measurements(address, temperature_correction):
 
         else:
 
+            capture_stats.n_incomplete_frames += 1
+
             # Log errors if failed to get 40 data bits from sensor (only log error after n failures)
             if index_retry == max_number_retry:
 
                 # Initializes the last time an error has been logged for that particular address
-                if pin_gpio_id not in no_data_bit_error_last_time.keys():
+                if address not in no_data_bit_error_last_time.keys():
 
-                    no_data_bit_error_last_time[pin_gpio_id] = 0
+                    no_data_bit_error_last_time[address] = 0
 
                 # Checks if error should be logged
-                if now() > no_data_bit_error_last_time[pin_gpio_id] + no_data_bit_error_spacing:
+                if now() > no_data_bit_error_last_time[address] + no_data_bit_error_spacing:
 
-                    error_details = 'Address %d.' % (pin_gpio_id,)
+                    error_details = 'Address %d.' % (address,)
                     general_utils.log_error(-409, 'Not 40 data bits for DHT11', error_details)
-                    no_data_bit_error_last_time = now()
-                    break
+                    no_data_bit_error_last_time[address] = now()
+
+                # Gives up after n failures, whether error was logged or not
+                break
 
         # Failed to get measures in current trial, increment counter and try again
         index_retry += 1
 
+    retry_time = 0.
+    if first_try_end_time is not None:
+
+        retry_time = perf_counter() - first_try_end_time
+
+    capture_stats.add_read(index_retry, is_successful, retry_time)
+
     ##################
     return all_values
     ##################
@@ -3,6 +3,7 @@
 #########################
 
 import os  # Allows navigation through filesystem to read values
+import time  # Waits for bulk temperature conversions
 
 ########################
 # Import local packages
@@ -12,6 +13,24 @@ from global_libraries import general_utils
 
 __author__ = 'Baland Adrien'
 
+###########################
+# Declare global variables
+###########################
+w1_devices_directory = '/sys/bus/w1/devices/'  # One link per slave, to its bus master directory
+default_master_directory = '/sys/devices/w1_bus_master1/'  # If link can not be resolved
+bulk_read_filename = 'therm_bulk_read'  # Converts all sensors of a master at once (kernel 5.10+)
+bulk_conversion_timeout = 1.5  # Seconds to wait for a bulk conversion (750ms at 12 bits)
+bulk_poll_interval = 0.05  # Seconds between two checks of bulk conversion status
+bulk_conversion_max_age = 1.  # Seconds after which a bulk conversion is too old to be reused
+
+# Master directory of each sensor address
+all_master_directories = {}
+
+# Master directory => (time.monotonic() at end of last bulk conversion, addresses read since). False
+# if bulk conversions can not be used on this master. Sensors of a master share a bus lock, so only
+# one thread uses an entry.
+all_bulk_conversions = {}
+
 
 ####################################################################################################
 # FUNCTION (is_valid_address)
@@ -72,16 +91,243 @@ def get_measurement_types():
 ############################
 
 
+####################################################################################################
+# FUNCTION (get_bus_name)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - One bus per one-wire master (bulk conversions)
+####################################################################################################
+def get_bus_name(address):
+    """
+    Returns name of the bus the sensor communicates through. Sensors on the same bus are read one
+    after another, sensors on different buses are read in parallel.
+
+    INPUT:
+        address (str) one-wire address of the sensor
+
+    RETURNS:
+        (str) name of the bus (one per one-wire bus master)
+    """
+
+    # Sensors of a master share one bulk conversion (first read converts, others use the results).
+    # Masters convert in parallel.
+    bus_name = os.path.basename(get_master_directory(address).rstrip('/'))
+
+    ################
+    return bus_name
+    ################
+
+###################
+# END get_bus_name
+###################
+
+
+####################################################################################################
+# FUNCTION (get_master_directory)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_master_directory(address):
+    """
+    Finds directory of the one-wire bus master a sensor is connected to.
+
+    INPUT:
+        address (str) one-wire address of the sensor
+
+    RETURNS:
+        (str) master directory, ending with '/'
+    """
+
+    master_directory = all_master_directories.get(address)
+
+    if master_directory is None:
+
+        slave_link = os.path.join(w1_devices_directory, address)
+
+        if os.path.exists(slave_link):
+
+            master_directory = os.path.dirname(os.path.realpath(slave_link)) + '/'
+
+        else:
+
+            master_directory = default_master_directory
+
+        all_master_directories[address] = master_directory
+
+    ########################
+    return master_directory
+    ########################
+
+###########################
+# END get_master_directory
+###########################
+
+
+####################################################################################################
+# FUNCTION (convert_master_temperatures)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def convert_master_temperatures(master_directory):
+    """
+    Starts a temperature conversion on all sensors of a bus master at once, and waits until it is
+    over. Sensor files then return the converted value without a conversion of their own.
+
+    INPUT:
+        master_directory (str) directory of the bus master
+
+    RETURNS:
+        (bool) True if conversion is over, False if bulk conversions can not be used
+    """
+
+    bulk_read_file = master_directory + bulk_read_filename
+
+    try:
+
+        with open(bulk_read_file, 'w') as bulk_file:
+
+            bulk_file.write('trigger\n')
+
+        # Status is -1 while at least one sensor is converting
+        conversion_deadline = time.time() + bulk_conversion_timeout
+        while time.time() < conversion_deadline:
+
+            with open(bulk_read_file, 'r') as bulk_file:
+
+                if bulk_file.read().strip() != '-1':
+
+                    ############
+                    return True
+                    ############
+
+            time.sleep(bulk_poll_interval)
+
+    except OSError as e:
+
+        # Older kernel, or no permission to write : each sensor converts when read
+        general_utils.log_message('No bulk conversion on %s (%s).' % (master_directory, str(e)))
+        all_bulk_conversions[master_directory] = False
+
+    #############
+    return False
+    #############
+
+##################################
+# END convert_master_temperatures
+##################################
+
+
+####################################################################################################
+# FUNCTION (parse_slave_lines)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created (from read_temperature)
+####################################################################################################
+def parse_slave_lines(address, slave_info):
+    """
+    Parses the content of the w1_slave file of a sensor. Does not depend on hardware, so recorded
+    contents can be parsed offline.
+
+    INPUT:
+        address (str) one-wire address of the sensor
+        slave_info (str[]) lines of the file, without linebreaks
+
+    RETURNS:
+        (float|None) temperature in Celsius, None if content is not a valid measure
+    """
+
+    temperature = None
+
+    if len(slave_info) < 2:
+
+        details = '(' + address + '). Bad content in file.'
+        general_utils.log_error(-409, details)
+
+        ##################
+        return temperature
+        ##################
+
+    # First line contain crc/detect info => metadata. Second line contains value at the end
+    meta = slave_info[0]
+    value = slave_info[1]
+
+    # Only process the value if the metadata line says the measure is ok
+    if not meta.startswith('00 00 00 00 00 00 00 00 00') and not meta.endswith('NO'):
+
+        try:
+
+            # Read temperature (written as 28000 for 28C)
+            temperature = float(value.split('t=')[1]) / 1000
+
+        except (ValueError, IndexError) as e:
+
+            details = '(' + address + '). Could not parse temperature.'
+            general_utils.log_error(-409, details, str(e))
+
+    else:
+
+        details = '(' + address + '). Bad content in file.'
+        general_utils.log_error(-409, details)
+
+    ##################
+    return temperature
+    ##################
+
+########################
+# END parse_slave_lines
+########################
+
+
 ####################################################################################################
 # FUNCTION (read_temperature)
 ####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Uses bulk conversion of its bus master if available
+#   2026-10-19 AB - Content parsed by parse_slave_lines (also used on recorded traces)
+#   2026-10-19 AB - Bulk conversions older than bulk_conversion_max_age are not reused
+####################################################################################################
 def read_temperature(address):
+    """
+    Reads temperature of a sensor. If sensor was already read since the last bulk conversion of its
+    master, if there was none, or if it is older than bulk_conversion_max_age (sensors of a master
+    are sampled on their own schedules), starts a new one for all sensors of the master first.
+
+    INPUT:
+        address (str) one-wire address of the sensor
+
+    RETURNS:
+        (float|None) temperature in Celsius, None if it could not be read
+    """
 
     # Initializes temperature
     temperature = None
 
+    master_directory = get_master_directory(address)
+    bulk_conversion = all_bulk_conversions.get(master_directory)
+
+    if bulk_conversion is not False and os.path.isfile(master_directory + bulk_read_filename):
+
+        # New conversion if this sensor already got the result of the last one, or if the last one
+        # is too old (its value would be stamped with the current time)
+        if bulk_conversion is None or address in bulk_conversion[1] or \
+                time.monotonic() - bulk_conversion[0] > bulk_conversion_max_age:
+
+            bulk_conversion = None
+            if convert_master_temperatures(master_directory):
+
+                bulk_conversion = (time.monotonic(), set())
+                all_bulk_conversions[master_directory] = bulk_conversion
+
+        # Otherwise (conversion failed), sensor file starts a conversion of its own when read
+        if bulk_conversion is not None:
+
+            bulk_conversion[1].add(address)
+
     # Address of the file containing the measure
-    url_file = '/sys/devices/w1_bus_master1/' + str(address) + '/w1_slave'
+    url_file = master_directory + str(address) + '/w1_slave'
     
     if os.path.isfile(url_file):
         
@@ -96,28 +342,8 @@ def read_temperature(address):
 
                 # Strips linebreak
                 slave_info.append(line[:-1])
-            
-            # First line contain crc/detect info => metadata. Second line contains value at the end
-            meta = slave_info[0]
-            value = slave_info[1]
-            
-            # Only process the value if the metadata line says the measure is ok
-            if not meta.startswith('00 00 00 00 00 00 00 00 00') and not meta.endswith('NO'):
-                
-                try:
-
-                    # Read temperature (written as 28000 for 28C) and adds correction
-                    temperature = float(value.split('t=')[1]) / 1000
-
-                except ValueError as e:
-    
-                    details = '(' + address + '). Could not parse temperature.'
-                    general_utils.log_error(-409, details, str(e))
-
-            else:
 
-                details = '(' + address + '). Bad content in file.'
-                general_utils.log_error(-409, details)
+        temperature = parse_slave_lines(address, slave_info)
 
     else:
 
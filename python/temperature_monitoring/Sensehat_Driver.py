@@ -3,6 +3,7 @@
 ########################
 
 from global_libraries import general_utils
+from . import sensor_handle  # Handle kept open between samples
 
 #########################
 # Import global packages
@@ -22,6 +23,9 @@ except ImportError as ex:
 
 __author__ = 'Baland Adrien'
 
+# Address (None) => open Handle, for get_measurements (SenseHat only initialized once)
+all_handles = {}
+
 
 ####################################################################################################
 # FUNCTION (is_valid_address)
@@ -83,15 +87,174 @@ def get_measurement_types():
 ############################
 
 
+####################################################################################################
+# FUNCTION (get_bus_name)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_bus_name(address):
+    """
+    Returns name of the bus the sensor communicates through. Sensors on the same bus are read one
+    after another, sensors on different buses are read in parallel.
+
+    INPUT:
+        address (None) address of sensehat (to ignore)
+
+    RETURNS:
+        (str) name of the bus (I2C bus 1)
+    """
+
+    del address
+
+    # Sensehat sensors (HTS221, LPS25H) are on I2C bus 1
+    bus_name = 'i2c-1'
+
+    ################
+    return bus_name
+    ################
+
+###################
+# END get_bus_name
+###################
+
+
+####################################################################################################
+# Handle
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created (from get_measurements)
+####################################################################################################
+class Handle(sensor_handle.SensorHandle):
+    """
+    Open Sensehat. The SenseHat object (IMU settings, LED matrix framebuffer) is created when
+    opened, and kept for all reads.
+    """
+
+    ################################################################################################
+    # open
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def open(self, address):
+        """
+        Initializes Sensehat.
+
+        INPUT:
+            address (None) address of sensehat (to ignore)
+        """
+
+        self.sense = None  # SenseHat object (None if sense_hat package is not installed)
+
+        if SenseHat is not None:
+
+            self.sense = SenseHat()
+
+        sensor_handle.SensorHandle.open(self, address)
+
+        ######
+        return
+        ######
+
+    ###########
+    # END open
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # read
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def read(self):
+        """
+        Measures all values.
+
+        RETURNS:
+            (Dict) dictionnary as {'temperature': value1, 'humidity': value2, 'pressure': value3}
+        """
+
+        # Initializes dictionnary of measurements collected
+        all_values = {
+            'temperature': None,
+            'humidity': None,
+            'pressure': None
+        }
+
+        if self.sense is not None:
+
+            try:
+                # Gets all measurements from Sensehat, and applies correction
+                all_values['temperature'] = self.sense.get_temperature() + self.correction
+                all_values['humidity'] = self.sense.get_humidity()
+                all_values['pressure'] = self.sense.get_pressure()
+
+            except IOError:
+
+                ######
+                raise
+                ######
+
+            except Exception as e:
+
+                # Something went wrong when retrieving the values. Log error.
+                general_utils.log_error(-409, 'Sensehat', str(e))
+
+        ##################
+        return all_values
+        ##################
+
+    ###########
+    # END read
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # close
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def close(self):
+        """
+        Forgets SenseHat object.
+        """
+
+        self.sense = None
+        sensor_handle.SensorHandle.close(self)
+
+        ######
+        return
+        ######
+
+    ############
+    # END close
+    ############
+
+###########################
+# END Handle
+###########################
+
+
 ####################################################################################################
 # Function(get_measurements)
 ####################################################################################################
 # Revision History:
 #   2016-11-04 AB - Function Created
+#   2026-10-19 AB - Reads through a Handle kept open between calls
 ####################################################################################################
 def get_measurements(address, temperature_correction):
     """
     Measures and returns all available measurements for the room as a dictionnary.
+    The Sensehat is opened on first measure (see Handle), and kept open for following ones.
 
     INPUT:
         address (None) address of sensehat (to ignore)
@@ -102,29 +265,8 @@ def get_measurements(address, temperature_correction):
         (Dict) dictionnary as {'temperature': value1, 'humidity': value2, 'pressure': value3}
     """
 
-    # Removes address since it is irrelevant
-    del address
-
-    # Initializes dictionnary of measurements collected
-    all_values = {
-        'temperature': None,
-        'humidity': None,
-        'pressure': None
-    }
-
-    if SenseHat is not None:
-
-        try:
-            # Gets all measurements from Sensehat, and applies correction
-            sense = SenseHat()
-            all_values['temperature'] = sense.get_temperature() + temperature_correction
-            all_values['humidity'] = sense.get_humidity()
-            all_values['pressure'] = sense.get_pressure()
-
-        except Exception as e:
-
-            # Something went wrong when retrieving the values. Log error.
-            general_utils.log_error(-409, 'Sensehat', str(e))
+    all_values = sensor_handle.read_cached_handle(all_handles, Handle, address,
+                                                  temperature_correction)
 
     ##################
     return all_values
@@ -28,8 +28,31 @@ except SyntaxError as ex:
 # Import local packages
 ########################
 
+from . import sensor_handle  # Handle kept open between samples
+
 __author__ = 'Baland Adrien'
 
+###########################
+# Declare global variables
+###########################
+
+# All ranges (integration time register value, gain register value, sensitivity, clipping count),
+# fastest read first. Sensitivity is relative to 402ms/16x (datasheet scale 0.034, 0.252 and 1).
+all_ranges = [
+    (0x00, 0x00, 0.034 / 16, 4900),  # 13ms, 1x
+    (0x00, 0x10, 0.034, 4900),  # 13ms, 16x
+    (0x01, 0x00, 0.252 / 16, 37000),  # 101ms, 1x
+    (0x01, 0x10, 0.252, 37000),  # 101ms, 16x
+    (0x02, 0x00, 1. / 16, 65000),  # 402ms, 1x
+    (0x02, 0x10, 1., 65000),  # 402ms, 16x
+]
+default_range_index = 2  # Range for first read of a sensor (101ms, 1x)
+min_range_counts = 200  # Counts needed on broadband channel for a 0.5% resolution
+max_range_ratio = 0.8  # Fraction of clipping count a range must stay under, for changes in light
+
+# I2C address => open Handle, for get_measurements (sensor only initialized once)
+all_handles = {}
+
 
 ####################################################################################################
 # FUNCTION (is_valid_address)
@@ -108,18 +131,310 @@ def get_measurement_types():
 ############################
 
 
+####################################################################################################
+# FUNCTION (get_bus_name)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_bus_name(address):
+    """
+    Returns name of the bus the sensor communicates through. Sensors on the same bus are read one
+    after another, sensors on different buses are read in parallel.
+
+    INPUT:
+        address (int) I2C address of the sensor (unused, all sensors on bus 1)
+
+    RETURNS:
+        (str) name of the bus (I2C bus 1)
+    """
+
+    del address
+
+    # tsl2561 package uses bus 1 on all recent Raspberry Pis
+    bus_name = 'i2c-1'
+
+    ################
+    return bus_name
+    ################
+
+###################
+# END get_bus_name
+###################
+
+
+####################################################################################################
+# FUNCTION (select_range)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def select_range(range_index, broadband, ir):
+    """
+    Selects range for next read, from counts of the last one : shortest integration time (then
+    lowest gain) whose expected counts are enough for a good resolution, without clipping.
+
+    INPUT:
+        range_index (int) index (in all_ranges) of range used for last read
+        broadband (int) count on broadband channel (visible + infrared) for last read
+        ir (int) count on infrared channel for last read
+
+    RETURNS:
+        (int) index (in all_ranges) of range to use for next read
+    """
+
+    last_sensitivity = all_ranges[range_index][2]
+    brightest_count = max(broadband, ir)
+
+    # If no range is good enough (very dark room), most sensitive range which would not clip
+    selected_index = 0
+    selected_broadband = -1.
+
+    for candidate_index, (_, _, sensitivity, clipping_count) in enumerate(all_ranges):
+
+        expected_broadband = broadband * sensitivity / last_sensitivity
+        expected_brightest = brightest_count * sensitivity / last_sensitivity
+
+        if expected_brightest > max_range_ratio * clipping_count:
+
+            continue
+
+        if expected_broadband >= min_range_counts:
+
+            selected_index = candidate_index
+            break
+
+        if expected_broadband >= selected_broadband:
+
+            selected_index = candidate_index
+            selected_broadband = expected_broadband
+
+    ######################
+    return selected_index
+    ######################
+
+###################
+# END select_range
+###################
+
+
+####################################################################################################
+# FUNCTION (read_counts)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def read_counts(tsl2561_sensor, range_index):
+    """
+    Reads both channels of the sensor, with integration time and gain of a range.
+
+    INPUT:
+        tsl2561_sensor (tsl2561.TSL2561) sensor to read
+        range_index (int) index (in all_ranges) of range to use
+
+    RETURNS:
+        (int) count on broadband channel (visible + infrared)
+        (int) count on infrared channel
+        (bool) whether one of the channels clipped
+    """
+
+    integration_time, gain, _, clipping_count = all_ranges[range_index]
+
+    # Registers are only written when range changes
+    if tsl2561_sensor.integration_time != integration_time:
+
+        tsl2561_sensor.set_integration_time(integration_time)
+
+    if tsl2561_sensor.gain != gain:
+
+        tsl2561_sensor.set_gain(gain)
+
+    # Waits for integration time (13, 101 or 402ms)
+    broadband, ir = tsl2561_sensor._get_data()
+    is_clipped = broadband > clipping_count or ir > clipping_count
+
+    #################################
+    return broadband, ir, is_clipped
+    #################################
+
+##################
+# END read_counts
+##################
+
+
+####################################################################################################
+# Handle
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created (from get_measurements)
+####################################################################################################
+class Handle(sensor_handle.SensorHandle):
+    """
+    Open TSL2561 sensor. The TSL2561 object is created when opened, and kept for all reads.
+    Integration time and gain are selected from the previous read (see select_range), so that
+    bright rooms are read in 13ms, and the sensor does not saturate.
+    """
+
+    ################################################################################################
+    # open
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def open(self, address):
+        """
+        Checks sensor and powers it down until first read.
+
+        INPUT:
+            address (int) I2C address of sensor
+        """
+
+        self.device = None  # TSL2561 object (None if tsl2561 package is not installed)
+        self.range_index = default_range_index  # Index (in all_ranges) of range for next read
+
+        if tsl2561 is not None:
+
+            try:
+
+                self.device = tsl2561.TSL2561(address)
+
+            except IOError:
+
+                ######
+                raise
+                ######
+
+            except Exception as e:
+
+                # Package raises Exception if sensor is not a TSL2561 (e.g. wrong address)
+                raise IOError('TSL2561 not found. %s' % str(e))
+
+        sensor_handle.SensorHandle.open(self, address)
+
+        ######
+        return
+        ######
+
+    ###########
+    # END open
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # read
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def read(self):
+        """
+        Measures luminosity. Raises IOError if sensor was disconnected.
+
+        RETURNS:
+            (Dict) dictionnary as {'luminosity': value1}
+        """
+
+        # Initializes dictionnary of measurements collected
+        all_values = {
+            'luminosity': None
+        }
+
+        if self.device is None:
+
+            ##################
+            return all_values
+            ##################
+
+        try:
+
+            broadband, ir, is_clipped = read_counts(self.device, self.range_index)
+
+            # Light changed a lot since last read : reads again with the least sensitive range
+            if is_clipped and self.range_index != 0:
+
+                self.range_index = 0
+                broadband, ir, is_clipped = read_counts(self.device, self.range_index)
+
+            # Sensor keeps settings of this read until next one (used to compute lux below)
+            self.range_index = select_range(self.range_index, broadband, ir)
+
+            if is_clipped:
+
+                general_utils.log_error(-409, 'TSL2561', 'Sensor is saturated, even at 13ms/1x.')
+
+            else:
+
+                # Scales counts to lux, according to integration time and gain of the read
+                all_values['luminosity'] = self.device._calculate_lux(broadband, ir)
+
+        except IOError:
+
+            ######
+            raise
+            ######
+
+        except Exception as e:
+
+            # Something went wrong when computing the value. Log error.
+            general_utils.log_error(-409, 'TSL2561', str(e))
+
+        ##################
+        return all_values
+        ##################
+
+    ###########
+    # END read
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # close
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def close(self):
+        """
+        Forgets TSL2561 object (sensor may be replaced before next open).
+        """
+
+        self.device = None
+        sensor_handle.SensorHandle.close(self)
+
+        ######
+        return
+        ######
+
+    ############
+    # END close
+    ############
+
+###########################
+# END Handle
+###########################
+
+
 ####################################################################################################
 # Function(get_measurements)
 ####################################################################################################
 # Revision History:
 #   2016-11-04 AB - Function Created
+#   2026-10-19 AB - Sensor kept between samples. Range selected from previous read.
+#   2026-10-19 AB - Reads through a Handle kept open between calls
 ####################################################################################################
 def get_measurements(address, _):
     """
     Measures and returns all available measurements for the room as a dictionnary.
+    The sensor is opened on first measure (see Handle), and kept open for following ones.
 
     INPUT:
-        address (None) address of sensehat (to ignore)
+        address (int) I2C address of sensor
         temperature_correction (float, unused) correction to apply to measurement value, to account 
             for external effects
 
@@ -127,23 +442,16 @@ def get_measurements(address, _):
         (Dict) dictionnary as {'luminosity': value1}
     """
 
-    # Initializes dictionnary of measurements collected
-    all_values = {
-        'luminosity': None
-    }
-
     try:
 
-        if tsl2561 is not None:
-
-            # Gets all measurements from Sensehat, and applies correction
-            tsl2561_sensor = tsl2561.TSL2561(address)
-            all_values['luminosity'] = tsl2561_sensor.lux()
+        all_values = sensor_handle.read_cached_handle(all_handles, Handle, address, 0.)
 
-    except (IOError, Exception) as e:
+    except IOError as e:
 
-        # Something went wrong when retrieving the values. Log error.
-        # NOTE : Happened once with Exception 'Sensor is saturated'.
+        # Sensor may have been disconnected/replaced : opened again on next measure
+        all_values = {
+            'luminosity': None
+        }
         general_utils.log_error(-409, 'TSL2561', str(e))
 
     ##################
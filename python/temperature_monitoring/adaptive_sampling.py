@@ -0,0 +1,170 @@
+"""
+Adaptive sampling interval of a sensor, driven by the variance of its last samples.
+
+While the last samples of all measurements stay within their threshold (standard deviation, in
+measurement unit), the interval grows by growth_factor at each sample, up to max_interval. As
+soon as a sample moves away from the mean of the last ones by more than change_factor thresholds,
+or the variance goes above the threshold, the interval snaps back to min_interval.
+
+Options in the configuration section of each sensor :
+    adaptive_sampling = yes             (fixed sample_interval if missing)
+    min_sample_interval = 5             (sample_interval by default)
+    max_sample_interval = 60            (averaging interval by default, and at most)
+    adaptive_threshold_temperature = 0.1 (one option per measurement, see default_thresholds)
+"""
+
+#########################
+# Import global packages
+#########################
+
+import collections  # Window of last samples of each measurement
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+default_window_size = 5  # Number of last samples on which variance is computed
+default_growth_factor = 1.5  # Interval multiplier for each stable sample
+change_factor = 3.  # Number of thresholds a sample can move away from the mean of the last ones
+
+# Standard deviation under which a measurement is considered stable, in measurement unit
+default_thresholds = {
+    'temperature': 0.1,
+    'humidity': 0.5,
+    'pressure': 5.,
+    'luminosity': 10.
+}
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# AdaptiveInterval
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class AdaptiveInterval:
+    """
+    Sampling interval of a sensor, updated with each new sample. Only used by the thread reading
+    the sensor (interval is read by the main thread, which does not need the window).
+    """
+
+    __slots__ = ('min_interval', 'max_interval', 'growth_factor', 'all_thresholds', 'all_windows',
+                 'interval')
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, min_interval, max_interval, all_thresholds, window_size=default_window_size,
+                 growth_factor=default_growth_factor):
+        """
+        Creates interval, starting at min_interval.
+
+        INPUT:
+            min_interval (float) shortest interval, used while measurements change
+            max_interval (float) longest interval, reached after a stable period
+            all_thresholds (Dict) measurement => standard deviation under which it is stable.
+                Measurements without threshold do not change the interval.
+            window_size (int) number of last samples on which variance is computed
+            growth_factor (float) interval multiplier for each stable sample
+        """
+
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.growth_factor = growth_factor
+        self.all_thresholds = dict(all_thresholds)
+        self.all_windows = {measurement: collections.deque(maxlen=window_size) for measurement in
+                            self.all_thresholds}
+        self.interval = min_interval
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # update
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def update(self, all_values):
+        """
+        Adds the values of a new sample, and updates interval.
+
+        INPUT:
+            all_values (Dict) measurement => value (None if measure failed)
+
+        RETURNS:
+            (float) interval until next sample, in seconds
+        """
+
+        is_changing = False  # A value moved away from the last ones, or variance is too high
+        is_stable = True  # All windows are full (variance known for all measurements)
+
+        for measurement, threshold in self.all_thresholds.items():
+
+            value = all_values.get(measurement)
+            window = self.all_windows[measurement]
+
+            if value is None:
+
+                is_stable = False
+                continue
+
+            # Sudden change : detected on first sample, before it shows in the variance
+            if len(window) > 0:
+
+                last_mean = sum(window) / len(window)
+
+                if abs(value - last_mean) > change_factor * threshold:
+
+                    is_changing = True
+
+            window.append(value)
+
+            if len(window) < window.maxlen:
+
+                is_stable = False
+
+            else:
+
+                # Slow change : variance of the last samples goes above threshold
+                mean = sum(window) / len(window)
+                variance = sum((window_value - mean) ** 2 for window_value in window) / len(window)
+
+                if variance > threshold ** 2:
+
+                    is_changing = True
+
+        if is_changing:
+
+            self.interval = self.min_interval
+
+        elif is_stable:
+
+            self.interval = min(self.interval * self.growth_factor, self.max_interval)
+
+        #####################
+        return self.interval
+        #####################
+
+    #############
+    # END update
+    #############
+
+###########################
+# END AdaptiveInterval
+###########################
@@ -0,0 +1,769 @@
+"""
+Automation rules reacting to averaged sensor values, so that climate control (aircon, ...) follows
+measurements within one averaging period, without a master polling workers.
+
+A rule watches one measurement of one sensor, and is triggered when the value goes above its
+threshold (or below it). It is released once the value came back by more than its hysteresis,
+so that a value oscillating around the threshold does not switch the aircon on and off each cycle.
+An optional schedule (hours and days) restricts when a rule can be triggered : outside of it, the
+rule is released.
+Remote configurations (as in worker_remote_control, e.g. 'on,cold,24,auto,auto') are sent when a
+rule is triggered (on_config) and when it is released (off_config, optional).
+
+Rules are indexed by sensor and measurement : a new average only evaluates rules depending on it.
+Signals are sent from a background thread (infrared signals take time and need the pigpio
+daemon), so that sampling is never delayed.
+
+Configuration (one section per rule, Rule0, Rule1, ...) :
+    [Rule0]
+    sensor = Bedroom
+    measurement = temperature
+    above = 26 (or below = 18)
+    hysteresis = 1
+    hours = 08:00-12:00, 18:00-23:30 (optional)
+    days = mon,tue,wed,thu,fri (optional)
+    remote = aircon
+    gpio_pin = 22 (optional)
+    on_config = on,cold,24,auto,auto
+    off_config = off,cold,24,auto,auto (optional)
+"""
+
+#########################
+# Import global packages
+#########################
+
+import queue  # Bounded queue between sampling loop and thread sending signals
+import threading  # Signals are sent in their own thread
+import time  # Finds hour and day of values for schedules
+
+########################
+# Import local packages
+########################
+
+from global_libraries import general_utils
+from . import driver_registry  # Remote drivers are imported when a rule uses them (need pigpio)
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+# Mapping from remote names usable in rules to the module name of their driver
+all_remote_modules = {
+    'aircon': 'infrared_remote.aircon_driver',
+    'light_bedroom': 'infrared_remote.bedroom_lights_driver',
+    'light_living': 'infrared_remote.living_lights_driver',
+    'tv': 'infrared_remote.tv_remote_driver'
+}
+
+default_gpio_pin = 21  # Pin of infrared emitter, as in remote drivers
+max_queued_actions = 100  # Actions waiting to be sent before oldest ones are dropped
+all_day_names = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']  # As in time.tm_wday
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# Function (parse_time_ranges)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def parse_time_ranges(time_ranges_text):
+    """
+    Parses hours of a rule schedule. Ranges ending before they start go over midnight
+    (e.g. 22:00-06:00). Raises ValueError if a range is not valid.
+
+    INPUT:
+        time_ranges_text (str) comma-separated ranges, as HH:MM-HH:MM
+
+    RETURNS:
+        ((int, int)[]) start and end of each range, in minutes since midnight (end excluded)
+    """
+
+    all_time_ranges = []
+
+    for time_range in time_ranges_text.split(','):
+
+        all_minutes = []
+
+        for hour_text in time_range.strip().split('-'):
+
+            hours, minutes = [int(value) for value in hour_text.strip().split(':')]
+
+            if not (0 <= hours <= 24 and 0 <= minutes < 60 and hours * 60 + minutes <= 1440):
+
+                raise ValueError('Invalid hour %s.' % hour_text.strip())
+
+            all_minutes.append(hours * 60 + minutes)
+
+        if len(all_minutes) != 2:
+
+            raise ValueError('Range must be HH:MM-HH:MM (%s).' % time_range.strip())
+
+        all_time_ranges.append(tuple(all_minutes))
+
+    #######################
+    return all_time_ranges
+    #######################
+
+########################
+# END parse_time_ranges
+########################
+
+
+####################################################################################################
+# Function (parse_rule)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def parse_rule(parsed_config, section_name, all_sensor_measurements):
+    """
+    Parses a rule section of the configuration file. Errors are logged.
+
+    INPUT:
+        parsed_config (ConfigParser object) configuration parsed by ConfigParser
+        section_name (str) name of the rule section (Rule0, Rule1, ...)
+        all_sensor_measurements (Dict) sensor name => measurement types of the sensor
+
+    RETURNS:
+        (AutomationRule|None) parsed rule, None if rule is not valid
+    """
+
+    try:
+
+        for option_name in ('sensor', 'measurement', 'remote', 'on_config'):
+
+            if not parsed_config.has_option(section_name, option_name):
+
+                raise ValueError('Missing option %s.' % option_name)
+
+        sensor_name = parsed_config.get(section_name, 'sensor')
+        measurement = parsed_config.get(section_name, 'measurement')
+
+        if measurement not in all_sensor_measurements.get(sensor_name, []):
+
+            raise ValueError('Sensor %s does not measure %s.' % (sensor_name, measurement))
+
+        # Exactly one threshold : rule is triggered either above or below it
+        is_above = parsed_config.has_option(section_name, 'above')
+
+        if is_above == parsed_config.has_option(section_name, 'below'):
+
+            raise ValueError('One of options above/below is needed.')
+
+        threshold = parsed_config.getfloat(section_name, 'above' if is_above else 'below')
+        hysteresis = 0.
+
+        if parsed_config.has_option(section_name, 'hysteresis'):
+
+            hysteresis = parsed_config.getfloat(section_name, 'hysteresis')
+
+            if hysteresis < 0.:
+
+                raise ValueError('hysteresis must be positive.')
+
+        all_time_ranges = None
+
+        if parsed_config.has_option(section_name, 'hours'):
+
+            all_time_ranges = parse_time_ranges(parsed_config.get(section_name, 'hours'))
+
+        all_days = None
+
+        if parsed_config.has_option(section_name, 'days'):
+
+            all_days = set()
+
+            for day_name in parsed_config.get(section_name, 'days').split(','):
+
+                if day_name.strip().lower() not in all_day_names:
+
+                    raise ValueError('Unknown day %s.' % day_name.strip())
+
+                all_days.add(all_day_names.index(day_name.strip().lower()))
+
+        remote_name = parsed_config.get(section_name, 'remote')
+
+        if remote_name not in all_remote_modules:
+
+            raise ValueError('Unknown remote %s.' % remote_name)
+
+        gpio_pin = default_gpio_pin
+
+        if parsed_config.has_option(section_name, 'gpio_pin'):
+
+            gpio_pin = parsed_config.getint(section_name, 'gpio_pin')
+
+        on_config = parsed_config.get(section_name, 'on_config')
+        off_config = None
+
+        if parsed_config.has_option(section_name, 'off_config'):
+
+            off_config = parsed_config.get(section_name, 'off_config')
+
+    except ValueError as e:
+
+        general_utils.log_error(-416, section_name, str(e))
+
+        ############
+        return None
+        ############
+
+    rule = AutomationRule(section_name, sensor_name, measurement, threshold, is_above, hysteresis,
+                          remote_name, on_config, off_config, gpio_pin, all_time_ranges,
+                          all_days)
+
+    ############
+    return rule
+    ############
+
+#################
+# END parse_rule
+#################
+
+
+####################################################################################################
+# AutomationRule
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class AutomationRule:
+    """
+    Threshold with hysteresis and schedule on one measurement of one sensor, with the remote
+    configurations to send when it is triggered and released.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, name, sensor_name, measurement, threshold, is_above, hysteresis,
+                 remote_name, on_config, off_config=None, gpio_pin=default_gpio_pin,
+                 all_time_ranges=None, all_days=None):
+        """
+        Creates rule, neither triggered nor released until its first value.
+
+        INPUT:
+            name (str) name of the rule (section in configuration)
+            sensor_name (str) name of the sensor watched
+            measurement (str) measurement watched (temperature, humidity, ...)
+            threshold (float) value from which rule is triggered
+            is_above (bool) whether rule is triggered above threshold (below otherwise)
+            hysteresis (float) distance to threshold a value must come back by to release rule
+            remote_name (str) remote to use (key of all_remote_modules)
+            on_config (str) comma-separated remote configuration sent when rule is triggered
+            off_config (str|None) comma-separated remote configuration sent when rule is released
+            gpio_pin (int) pin of infrared emitter
+            all_time_ranges ((int, int)[]|None) minutes since midnight when rule can be triggered.
+                All day if None.
+            all_days (Set|None) week days when rule can be triggered (0 = monday). All if None.
+        """
+
+        self.name = name
+        self.sensor_name = sensor_name
+        self.measurement = measurement
+        self.threshold = threshold
+        self.is_above = is_above
+        self.hysteresis = hysteresis
+        self.remote_name = remote_name
+        self.on_config = on_config
+        self.off_config = off_config
+        self.gpio_pin = gpio_pin
+        self.all_time_ranges = all_time_ranges
+        self.all_days = all_days
+
+        # Whether rule is triggered. None until a value outside the hysteresis band is evaluated.
+        self.is_triggered = None
+        self.n_triggers = 0
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_definition
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_definition(self):
+        """
+        Returns all parameters of the rule, to find rules unchanged by a new configuration.
+
+        RETURNS:
+            (tuple) all parameters given at creation
+        """
+
+        all_time_ranges = tuple(self.all_time_ranges) if self.all_time_ranges is not None else None
+        all_days = tuple(sorted(self.all_days)) if self.all_days is not None else None
+
+        ###########################################################################################
+        return (self.name, self.sensor_name, self.measurement, self.threshold, self.is_above,
+                self.hysteresis, self.remote_name, self.on_config, self.off_config, self.gpio_pin,
+                all_time_ranges, all_days)
+        ###########################################################################################
+
+    #####################
+    # END get_definition
+    #####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # is_scheduled
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def is_scheduled(self, current_time):
+        """
+        Tests whether rule can be triggered at a given time.
+
+        INPUT:
+            current_time (float) seconds since epoch
+
+        RETURNS:
+            (bool) whether time is in the days and hours of the rule
+        """
+
+        local_time = time.localtime(current_time)
+
+        if self.all_days is not None and local_time.tm_wday not in self.all_days:
+
+            #############
+            return False
+            #############
+
+        if self.all_time_ranges is None:
+
+            ############
+            return True
+            ############
+
+        minute_of_day = local_time.tm_hour * 60 + local_time.tm_min
+
+        for start_minute, end_minute in self.all_time_ranges:
+
+            # Range going over midnight
+            if end_minute < start_minute:
+
+                if minute_of_day >= start_minute or minute_of_day < end_minute:
+
+                    ############
+                    return True
+                    ############
+
+            elif start_minute <= minute_of_day < end_minute:
+
+                ############
+                return True
+                ############
+
+        #############
+        return False
+        #############
+
+    ###################
+    # END is_scheduled
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # evaluate
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def evaluate(self, value, current_time):
+        """
+        Updates rule state with a new value, and returns configuration to send if state changed.
+        Inside the hysteresis band, state is kept. A rule released at its first value sends
+        nothing (remote state was not changed by the rule).
+
+        INPUT:
+            value (float) new averaged value of the measurement
+            current_time (float) seconds since epoch at which value was computed
+
+        RETURNS:
+            (str|None) remote configuration to send, None if nothing to send
+        """
+
+        if not self.is_scheduled(current_time):
+
+            is_triggered = False
+
+        elif self.is_above and value > self.threshold:
+
+            is_triggered = True
+
+        elif not self.is_above and value < self.threshold:
+
+            is_triggered = True
+
+        elif abs(value - self.threshold) >= self.hysteresis:
+
+            is_triggered = False
+
+        else:
+
+            is_triggered = self.is_triggered
+
+        if is_triggered is None or is_triggered == self.is_triggered:
+
+            ############
+            return None
+            ############
+
+        was_triggered = self.is_triggered
+        self.is_triggered = is_triggered
+
+        if is_triggered:
+
+            self.n_triggers += 1
+
+            ######################
+            return self.on_config
+            ######################
+
+        if was_triggered is None:
+
+            ############
+            return None
+            ############
+
+        #######################
+        return self.off_config
+        #######################
+
+    ###############
+    # END evaluate
+    ###############
+
+#######################
+# END AutomationRule
+#######################
+
+
+####################################################################################################
+# AutomationRuleEngine
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class AutomationRuleEngine:
+    """
+    Evaluates rules depending on each new averaged value, and sends remote configurations of
+    rules changing state from a background thread.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, all_remote_module_names=None):
+        """
+        Creates engine without rules. No signal is sent until start() is called.
+
+        INPUT:
+            all_remote_module_names (Dict, opt) remote name => driver module name.
+                all_remote_modules by default.
+        """
+
+        if all_remote_module_names is None:
+
+            all_remote_module_names = all_remote_modules
+
+        self.remote_drivers = driver_registry.DriverRegistry(all_remote_module_names)
+
+        # All rules, and rules depending on each (sensor name, measurement). Only used by sampling
+        # thread.
+        self.all_rules = []
+        self.all_rules_by_measurement = {}
+
+        # Actions waiting to be sent, as (rule name, remote name, remote configuration, gpio pin)
+        self.action_queue = queue.Queue(maxsize=max_queued_actions)
+        self.n_dropped_actions = 0
+        self.action_thread = None
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # set_rules
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def set_rules(self, all_new_rules):
+        """
+        Replaces all rules (e.g. when configuration is reloaded). Rules unchanged by the new
+        configuration keep their state, so that no configuration is sent again.
+
+        INPUT:
+            all_new_rules (AutomationRule[]) new rules
+        """
+
+        all_current_rules = {rule.get_definition(): rule for rule in self.all_rules}
+        all_rules_by_measurement = {}
+
+        for rule_index, rule in enumerate(all_new_rules):
+
+            current_rule = all_current_rules.get(rule.get_definition())
+
+            if current_rule is not None:
+
+                rule = current_rule
+                all_new_rules[rule_index] = current_rule
+
+            rule_key = (rule.sensor_name, rule.measurement)
+            all_rules_by_measurement.setdefault(rule_key, []).append(rule)
+
+        self.all_rules = all_new_rules
+        self.all_rules_by_measurement = all_rules_by_measurement
+
+        #######
+        return
+        #######
+
+    ################
+    # END set_rules
+    ################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # on_average
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def on_average(self, sensor_name, measurement, value, current_time):
+        """
+        Evaluates rules depending on a new averaged value, and queues configurations of rules
+        changing state. Never blocks.
+
+        INPUT:
+            sensor_name (str) name of the sensor the value comes from
+            measurement (str) type of measurement
+            value (float) new averaged value
+            current_time (float) seconds since epoch at which value was computed
+        """
+
+        for rule in self.all_rules_by_measurement.get((sensor_name, measurement), []):
+
+            remote_config = rule.evaluate(value, current_time)
+
+            if remote_config is None:
+
+                continue
+
+            general_utils.log_message('Rule %s %s (%s %s = %2.2f) : %s %s' % (
+                rule.name, 'triggered' if rule.is_triggered else 'released', sensor_name,
+                measurement, value, rule.remote_name, remote_config))
+
+            self.queue_action((rule.name, rule.remote_name, remote_config, rule.gpio_pin))
+
+        #######
+        return
+        #######
+
+    #################
+    # END on_average
+    #################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # queue_action
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def queue_action(self, action):
+        """
+        Puts an action in the queue of the sending thread. If the queue is full (thread not
+        started or stuck), the oldest action is dropped.
+
+        INPUT:
+            action (tuple) rule name, remote name, remote configuration and gpio pin
+        """
+
+        while True:
+
+            try:
+
+                self.action_queue.put_nowait(action)
+                break
+
+            except queue.Full:
+
+                try:
+
+                    self.action_queue.get_nowait()
+                    self.n_dropped_actions += 1
+
+                except queue.Empty:
+
+                    pass
+
+        #######
+        return
+        #######
+
+    ###################
+    # END queue_action
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # execute_action
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def execute_action(self, rule_name, remote_name, remote_config, gpio_pin):
+        """
+        Sends a remote configuration with the driver of the remote.
+
+        INPUT:
+            rule_name (str) name of the rule the action comes from (for logs)
+            remote_name (str) remote to use
+            remote_config (str) comma-separated remote configuration (e.g. 'on,cold,24,auto,auto')
+            gpio_pin (int) pin of infrared emitter
+
+        RETURNS:
+            (int) 0 if configuration was sent, negative number otherwise
+        """
+
+        remote_driver = self.remote_drivers.get(remote_name)
+
+        if remote_driver is None:
+
+            details = '%s (%s)' % (all_remote_modules.get(remote_name, remote_name), rule_name)
+
+            ####################################################################################
+            return general_utils.log_error(-418, details,
+                                           self.remote_drivers.import_errors.get(remote_name))
+            ####################################################################################
+
+        details = '(%s, %s, %s)' % (rule_name, remote_name, remote_config)
+
+        try:
+
+            send_status = remote_driver.send_signal(*remote_config.split(','), gpio_pin=gpio_pin)
+
+        except TypeError as e:
+
+            # Number of values in configuration does not match the remote
+            #####################################################
+            return general_utils.log_error(-417, details, str(e))
+            #####################################################
+
+        if send_status != 0:
+
+            #############################################
+            return general_utils.log_error(-417, details)
+            #############################################
+
+        #########
+        return 0
+        #########
+
+    #####################
+    # END execute_action
+    #####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # start
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def start(self):
+        """
+        Starts the background thread sending remote configurations.
+        """
+
+        self.action_thread = threading.Thread(target=self.run_action_loop, name='automation-rules')
+        self.action_thread.daemon = True
+        self.action_thread.start()
+
+        #######
+        return
+        #######
+
+    ############
+    # END start
+    ############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # run_action_loop
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def run_action_loop(self):
+        """
+        Sends queued remote configurations forever. Runs in its own thread.
+        """
+
+        while True:
+
+            rule_name, remote_name, remote_config, gpio_pin = self.action_queue.get()
+
+            # Unexpected errors of a driver must not stop the thread (rules would silently stop)
+            try:
+
+                self.execute_action(rule_name, remote_name, remote_config, gpio_pin)
+
+            except Exception as e:
+
+                general_utils.log_error(-417, '(%s, %s)' % (rule_name, remote_name), str(e))
+
+    ######################
+    # END run_action_loop
+    ######################
+
+#############################
+# END AutomationRuleEngine
+#############################
@@ -0,0 +1,276 @@
+"""
+Circuit breaker for sensor reads : a sensor failing again and again is not read at every sample,
+but retried after a delay doubling with each failed retry.
+
+States :
+    closed      sensor read at every sample (normal operation)
+    open        sensor not read until retry time (after failure_threshold consecutive failures)
+    half-open   one read allowed to test the sensor. Success closes the breaker, failure opens it
+                again with a doubled backoff (up to max_backoff)
+
+Options in the configuration section of each sensor :
+    breaker_failures = 3           (consecutive failed reads before sensor is suspended)
+    breaker_backoff = 30           (seconds before first retry of a suspended sensor)
+    breaker_max_backoff = 3600     (longest delay between two retries, in seconds)
+"""
+
+#########################
+# Import global packages
+#########################
+
+import collections  # Outcomes of last reads, for recent failure rate
+import time  # Monotonic clock for retry times
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+default_failure_threshold = 3
+default_backoff = 30.
+default_max_backoff = 3600.
+n_recent_outcomes = 20  # Number of last reads used for recent failure rate
+
+state_closed = 'closed'
+state_open = 'open'
+state_half_open = 'half-open'
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# CircuitBreaker
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class CircuitBreaker:
+    """
+    Decides whether a sensor should be read, from the outcome of its previous reads. Reads of a
+    sensor never overlap, so no lock is needed.
+    """
+
+    __slots__ = ('failure_threshold', 'base_backoff', 'max_backoff', 'clock_function', 'state',
+                 'n_consecutive_failures', 'current_backoff', 'retry_time', 'n_successes',
+                 'n_failures', 'n_skipped', 'n_openings', 'recent_outcomes')
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, failure_threshold=default_failure_threshold, base_backoff=default_backoff,
+                 max_backoff=default_max_backoff, clock_function=time.monotonic):
+        """
+        Creates closed breaker.
+
+        INPUT:
+            failure_threshold (int) consecutive failures before breaker opens
+            base_backoff (float) seconds before first retry once breaker opened
+            max_backoff (float) longest delay between two retries, in seconds
+            clock_function (function) returns current time in seconds (monotonic)
+        """
+
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max(max_backoff, base_backoff)
+        self.clock_function = clock_function
+        self.state = state_closed
+        self.n_consecutive_failures = 0
+        self.current_backoff = base_backoff  # Delay before next retry, doubled by failed retries
+        self.retry_time = 0.  # Time after which a read is allowed again (breaker open)
+        self.n_successes = 0  # Successful reads since start
+        self.n_failures = 0  # Failed reads since start
+        self.n_skipped = 0  # Reads not made since start, because breaker was open
+        self.n_openings = 0  # Times the breaker opened after a closed state
+        self.recent_outcomes = collections.deque(maxlen=n_recent_outcomes)  # True if failed
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # allow_read
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def allow_read(self):
+        """
+        Tells whether sensor should be read now. Switches open breaker to half-open once retry
+        time is reached.
+
+        RETURNS:
+            (bool) True if sensor should be read, False if read is skipped
+        """
+
+        if self.state == state_open:
+
+            if self.clock_function() < self.retry_time:
+
+                self.n_skipped += 1
+
+                #############
+                return False
+                #############
+
+            self.state = state_half_open
+
+        ############
+        return True
+        ############
+
+    #################
+    # END allow_read
+    #################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # record_success
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def record_success(self):
+        """
+        Records a successful read. Closes breaker if it was testing the sensor.
+
+        RETURNS:
+            (bool) True if breaker was just closed (sensor is back)
+        """
+
+        self.n_successes += 1
+        self.recent_outcomes.append(False)
+        self.n_consecutive_failures = 0
+
+        was_suspended = self.state != state_closed
+        self.state = state_closed
+        self.current_backoff = self.base_backoff
+
+        ######################
+        return was_suspended
+        ######################
+
+    #####################
+    # END record_success
+    #####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # record_failure
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def record_failure(self):
+        """
+        Records a failed read. Opens breaker after failure_threshold consecutive failures, or
+        after a failed retry (with a doubled backoff).
+
+        RETURNS:
+            (bool) True if breaker was just opened after a closed state (sensor suspended)
+        """
+
+        self.n_failures += 1
+        self.recent_outcomes.append(True)
+        self.n_consecutive_failures += 1
+
+        is_suspended = False
+
+        if self.state == state_half_open:
+
+            # Sensor still failing : waits twice as long before next retry
+            self.current_backoff = min(2. * self.current_backoff, self.max_backoff)
+            self.state = state_open
+            self.retry_time = self.clock_function() + self.current_backoff
+
+        elif self.state == state_closed and \
+                self.n_consecutive_failures >= self.failure_threshold:
+
+            self.state = state_open
+            self.retry_time = self.clock_function() + self.current_backoff
+            self.n_openings += 1
+            is_suspended = True
+
+        #####################
+        return is_suspended
+        #####################
+
+    #####################
+    # END record_failure
+    #####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_stats
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_stats(self):
+        """
+        Returns state of breaker and read counts, to be exported with sensor values.
+
+        RETURNS:
+            (Dict) state, counts since start, failure rates (since start, last reads), and seconds
+                before next retry if breaker is open
+        """
+
+        n_reads = self.n_successes + self.n_failures
+        n_recent_reads = len(self.recent_outcomes)
+
+        failure_rate = 0.
+        if n_reads > 0:
+
+            failure_rate = round(float(self.n_failures) / n_reads, 3)
+
+        recent_failure_rate = 0.
+        if n_recent_reads > 0:
+
+            recent_failure_rate = round(float(sum(self.recent_outcomes)) / n_recent_reads, 3)
+
+        all_stats = {
+            'state': self.state,
+            'successes': self.n_successes,
+            'failures': self.n_failures,
+            'skipped': self.n_skipped,
+            'openings': self.n_openings,
+            'consecutive_failures': self.n_consecutive_failures,
+            'failure_rate': failure_rate,
+            'recent_failure_rate': recent_failure_rate,
+            'retry_in': None
+        }
+
+        if self.state == state_open:
+
+            all_stats['retry_in'] = round(max(self.retry_time - self.clock_function(), 0.), 1)
+
+        #################
+        return all_stats
+        #################
+
+    ################
+    # END get_stats
+    ################
+
+###########################
+# END CircuitBreaker
+###########################
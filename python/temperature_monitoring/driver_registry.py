@@ -0,0 +1,319 @@
+"""
+Registry of sensor drivers, imported only when a sensor of their type is configured.
+
+Drivers import hardware packages (RPi.GPIO, smbus, sense_hat, tsl2561, ...), which are slow to
+import and often missing on machines without the sensor. The registry only knows the module name
+of each driver until it is first requested, and measures how long each import took.
+
+Import timing report (all drivers) :
+    python -m temperature_monitoring.driver_registry
+"""
+
+#########################
+# Import global packages
+#########################
+
+import importlib  # Imports drivers from their module name
+import threading  # Drivers can be requested from sensor reading threads
+import time  # Measures import duration
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+# Mapping from all supported sensor types to the module name of their respective driver.
+all_driver_modules = {
+    'BME280': 'temperature_monitoring.BME280_Driver',
+    'DS18B20': 'temperature_monitoring.DS18B20_Driver',
+    'DHT11': 'temperature_monitoring.DHT11_Driver',
+    'Sensehat': 'temperature_monitoring.Sensehat_Driver',
+    'TSL2561': 'temperature_monitoring.TSL2561_Driver'
+}
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# DriverRegistry
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class DriverRegistry:
+    """
+    Sensor type => driver module, imported on first use. Supports the dictionnary operations used
+    on the former sensor_to_driver dictionnary (get, keys, in, []).
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, all_module_names=None):
+        """
+        Creates registry. No driver is imported.
+
+        INPUT:
+            all_module_names (Dict, opt) sensor type => driver module name. all_driver_modules by
+                default.
+        """
+
+        if all_module_names is None:
+
+            all_module_names = all_driver_modules
+
+        self.all_module_names = dict(all_module_names)
+        self.all_loaded_drivers = {}  # Sensor type => driver module, once imported
+        self.import_durations = {}  # Sensor type => seconds spent importing driver
+        self.import_errors = {}  # Sensor type => error message, if driver could not be imported
+        self.lock = threading.Lock()
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get(self, sensor_type, default=None):
+        """
+        Returns driver for a sensor type, importing it if it was not imported yet.
+
+        INPUT:
+            sensor_type (str) type of sensor (BME280, DHT11, ...)
+            default (any) returned if sensor type is unknown or its driver can not be imported
+
+        RETURNS:
+            (module) driver module
+        """
+
+        driver_module = self.all_loaded_drivers.get(sensor_type)
+
+        if driver_module is not None:
+
+            #####################
+            return driver_module
+            #####################
+
+        if sensor_type not in self.all_module_names:
+
+            ###############
+            return default
+            ###############
+
+        with self.lock:
+
+            # Another thread may have imported it while waiting for the lock
+            if sensor_type not in self.all_loaded_drivers:
+
+                import_start_time = time.perf_counter()
+
+                try:
+
+                    driver_module = importlib.import_module(self.all_module_names[sensor_type])
+
+                except ImportError as e:
+
+                    # Kept for the caller to report (e.g. with the name of the sensor)
+                    self.import_errors[sensor_type] = str(e)
+
+                    ###############
+                    return default
+                    ###############
+
+                self.import_durations[sensor_type] = time.perf_counter() - import_start_time
+                self.all_loaded_drivers[sensor_type] = driver_module
+
+        ############################################
+        return self.all_loaded_drivers[sensor_type]
+        ############################################
+
+    ##########
+    # END get
+    ##########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # __getitem__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __getitem__(self, sensor_type):
+        """
+        Returns driver for a sensor type, importing it if needed. Raises KeyError if type is
+        unknown or driver can not be imported.
+        """
+
+        driver_module = self.get(sensor_type)
+
+        if driver_module is None:
+
+            raise KeyError(sensor_type)
+
+        #####################
+        return driver_module
+        #####################
+
+    ##################
+    # END __getitem__
+    ##################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # __setitem__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __setitem__(self, sensor_type, driver_module):
+        """
+        Registers an already imported driver (module or any object with the driver functions).
+        """
+
+        with self.lock:
+
+            self.all_module_names[sensor_type] = getattr(driver_module, '__name__', sensor_type)
+            self.all_loaded_drivers[sensor_type] = driver_module
+
+        ######
+        return
+        ######
+
+    ##################
+    # END __setitem__
+    ##################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # __contains__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __contains__(self, sensor_type):
+        """
+        Whether sensor type is supported (driver is not imported).
+        """
+
+        ############################################
+        return sensor_type in self.all_module_names
+        ############################################
+
+    ###################
+    # END __contains__
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # keys
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def keys(self):
+        """
+        Returns all supported sensor types (drivers are not imported).
+        """
+
+        ####################################
+        return self.all_module_names.keys()
+        ####################################
+
+    ###########
+    # END keys
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_import_report
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_import_report(self):
+        """
+        Describes time spent importing each driver, and drivers that were never imported.
+
+        RETURNS:
+            (str) one line per sensor type, slowest imports first
+        """
+
+        all_report_lines = []
+
+        for sensor_type, import_duration in sorted(self.import_durations.items(),
+                                                   key=lambda item: -item[1]):
+
+            all_report_lines.append('%-10s %8.1f ms  (%s)' % (sensor_type, 1000. * import_duration,
+                                                             self.all_module_names[sensor_type]))
+
+        for sensor_type in sorted(self.all_module_names):
+
+            if sensor_type in self.import_errors:
+
+                all_report_lines.append('%-10s      import failed (%s)' % (
+                    sensor_type, self.import_errors[sensor_type]))
+
+            elif sensor_type not in self.all_loaded_drivers:
+
+                all_report_lines.append('%-10s      not imported' % sensor_type)
+
+            elif sensor_type not in self.import_durations:
+
+                all_report_lines.append('%-10s      registered' % sensor_type)
+
+        total_duration = sum(self.import_durations.values())
+        all_report_lines.append('Total      %8.1f ms' % (1000. * total_duration))
+
+        #################################
+        return '\n'.join(all_report_lines)
+        #################################
+
+    ########################
+    # END get_import_report
+    ########################
+
+###########################
+# END DriverRegistry
+###########################
+
+
+if __name__ == "__main__":
+
+    # Imports every driver, as on a machine with all sensor types configured
+    report_registry = DriverRegistry()
+
+    for report_sensor_type in sorted(report_registry.keys()):
+
+        report_registry.get(report_sensor_type)
+
+    print(report_registry.get_import_report())
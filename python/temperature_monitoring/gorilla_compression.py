@@ -0,0 +1,534 @@
+"""
+Gorilla-style compression of (timestamp, value) series, as described for Facebook's Gorilla
+time-series database, adapted to the sensor history store :
+    - timestamps are integer ticks (ticks_per_second), stored as delta-of-delta with
+      variable-length codes (a regular sampling interval costs 1 bit per sample, read jitter of
+      sensors a few bits),
+    - values are 32-bit floats (as in raw history records), stored as the XOR with the previous
+      value, keeping only the meaningful bits (an unchanged value costs 1 bit per sample).
+
+Series are cut into blocks of at most block_size points. Each block is preceded by a small header
+(first/last timestamp, number of points, payload size), so a reader can skip blocks outside a time
+range without decoding them, and only decode the blocks it needs.
+
+Compression is lossy for timestamps : they are rounded to the nearest tick (1 ms). Time ranges
+are compared on ticks, so a point is always in the range of the original timestamp (unless it is
+less than half a tick away from a bound that is not a whole number of ticks).
+"""
+
+#########################
+# Import global packages
+#########################
+
+import struct  # Block headers and float <=> integer bits conversion
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+block_size = 1024  # Maximum number of points per block
+ticks_per_second = 1000  # Timestamp ticks per second (precision of decoded timestamps)
+block_header = struct.Struct('<ddII')  # first_timestamp (s), last_timestamp (s), n_points, n_bytes
+float_to_bits = struct.Struct('<f')  # Values are 32-bit floats
+bits_to_float = struct.Struct('<I')
+
+# Delta-of-delta codes : (control bits, number of control bits, number of value bits)
+# Values outside all ranges use control '1111' followed by 32 bits.
+all_delta_ranges = [
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12)
+]
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# BitWriter
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class BitWriter:
+    """
+    Appends bits (most significant first) to a byte array.
+    """
+
+    __slots__ = ('all_bytes', 'pending_bits', 'n_pending_bits')
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self):
+        """
+        Creates an empty writer.
+        """
+
+        self.all_bytes = bytearray()
+        self.pending_bits = 0  # Bits not written into all_bytes yet (less than 8)
+        self.n_pending_bits = 0
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # write_bits
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def write_bits(self, value, n_bits):
+        """
+        Appends the n_bits lowest bits of a value.
+
+        INPUT:
+            value (int) bits to write (non-negative)
+            n_bits (int) number of bits to write
+        """
+
+        self.pending_bits = (self.pending_bits << n_bits) | (value & ((1 << n_bits) - 1))
+        self.n_pending_bits += n_bits
+
+        while self.n_pending_bits >= 8:
+
+            self.n_pending_bits -= 8
+            self.all_bytes.append((self.pending_bits >> self.n_pending_bits) & 0xFF)
+
+        self.pending_bits &= (1 << self.n_pending_bits) - 1
+
+        ######
+        return
+        ######
+
+    #################
+    # END write_bits
+    #################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_bytes
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_bytes(self):
+        """
+        Returns written bits, padded with zeros to a whole number of bytes.
+
+        RETURNS:
+            (bytes) written content
+        """
+
+        all_bytes = bytes(self.all_bytes)
+
+        if self.n_pending_bits > 0:
+
+            all_bytes += bytes([(self.pending_bits << (8 - self.n_pending_bits)) & 0xFF])
+
+        #################
+        return all_bytes
+        #################
+
+    ################
+    # END get_bytes
+    ################
+
+#################
+# END BitWriter
+#################
+
+
+####################################################################################################
+# BitReader
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class BitReader:
+    """
+    Reads bits (most significant first) from a block payload.
+    """
+
+    __slots__ = ('payload_as_int', 'n_total_bits', 'position')
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, payload):
+        """
+        Creates reader at the start of a payload.
+
+        INPUT:
+            payload (bytes) content to read
+        """
+
+        # Blocks are small (a few kB), so the payload is read as one integer
+        self.payload_as_int = int.from_bytes(payload, 'big')
+        self.n_total_bits = len(payload) * 8
+        self.position = 0
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # read_bits
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def read_bits(self, n_bits):
+        """
+        Reads the next bits.
+
+        INPUT:
+            n_bits (int) number of bits to read
+
+        RETURNS:
+            (int) bits read, as a non-negative integer
+        """
+
+        self.position += n_bits
+
+        if self.position > self.n_total_bits:
+
+            ##################################################
+            raise ValueError('Compressed block is truncated.')
+            ##################################################
+
+        value = (self.payload_as_int >> (self.n_total_bits - self.position)) & ((1 << n_bits) - 1)
+
+        #############
+        return value
+        #############
+
+    ################
+    # END read_bits
+    ################
+
+#################
+# END BitReader
+#################
+
+
+####################################################################################################
+# Function (encode_block)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Timestamps in 1 ms ticks
+####################################################################################################
+def encode_block(all_points):
+    """
+    Compresses a block of points, sorted by timestamp.
+
+    INPUT:
+        all_points ((float, float)[]) (timestamp in seconds, value) points. Not empty.
+
+    RETURNS:
+        (bytes) block header followed by compressed payload
+    """
+
+    bit_writer = BitWriter()
+
+    previous_timestamp = 0
+    previous_delta = 0
+    previous_value_bits = 0
+    previous_leading_zeros = 33  # No previous meaningful-bits window yet
+    previous_trailing_zeros = 0
+
+    for point_index, (timestamp, value) in enumerate(all_points):
+
+        timestamp_ticks = int(round(timestamp * ticks_per_second))
+        value_bits = bits_to_float.unpack(float_to_bits.pack(value))[0]
+
+        # First point is stored as is
+        if point_index == 0:
+
+            bit_writer.write_bits(timestamp_ticks, 64)
+            bit_writer.write_bits(value_bits, 32)
+            previous_timestamp = timestamp_ticks
+            previous_value_bits = value_bits
+            continue
+
+        #############
+        # Timestamp
+        #############
+        delta = timestamp_ticks - previous_timestamp
+        delta_of_delta = delta - previous_delta
+        previous_timestamp = timestamp_ticks
+        previous_delta = delta
+
+        if delta_of_delta == 0:
+
+            bit_writer.write_bits(0, 1)
+
+        else:
+
+            for control_bits, n_control_bits, n_value_bits in all_delta_ranges:
+
+                # Range is [-2^(n-1) + 1, 2^(n-1)], shifted to be stored unsigned
+                if -(1 << (n_value_bits - 1)) < delta_of_delta <= (1 << (n_value_bits - 1)):
+
+                    bit_writer.write_bits(control_bits, n_control_bits)
+                    bit_writer.write_bits(delta_of_delta + (1 << (n_value_bits - 1)) - 1,
+                                          n_value_bits)
+                    break
+
+            else:
+
+                bit_writer.write_bits(0b1111, 4)
+                bit_writer.write_bits(delta_of_delta & 0xFFFFFFFF, 32)
+
+        ########
+        # Value
+        ########
+        xor_bits = value_bits ^ previous_value_bits
+        previous_value_bits = value_bits
+
+        if xor_bits == 0:
+
+            bit_writer.write_bits(0, 1)
+            continue
+
+        leading_zeros = 32 - xor_bits.bit_length()
+        trailing_zeros = (xor_bits & -xor_bits).bit_length() - 1
+
+        # Meaningful bits fit in previous window : reuse it
+        if leading_zeros >= previous_leading_zeros and trailing_zeros >= previous_trailing_zeros:
+
+            bit_writer.write_bits(0b10, 2)
+            bit_writer.write_bits(xor_bits >> previous_trailing_zeros,
+                                  32 - previous_leading_zeros - previous_trailing_zeros)
+
+        else:
+
+            # Leading zeros are stored on 5 bits, meaningful length - 1 on 5 bits
+            leading_zeros = min(leading_zeros, 31)
+            n_meaningful_bits = 32 - leading_zeros - trailing_zeros
+
+            bit_writer.write_bits(0b11, 2)
+            bit_writer.write_bits(leading_zeros, 5)
+            bit_writer.write_bits(n_meaningful_bits - 1, 5)
+            bit_writer.write_bits(xor_bits >> trailing_zeros, n_meaningful_bits)
+
+            previous_leading_zeros = leading_zeros
+            previous_trailing_zeros = trailing_zeros
+
+    payload = bit_writer.get_bytes()
+    header = block_header.pack(all_points[0][0], all_points[-1][0], len(all_points), len(payload))
+
+    ########################
+    return header + payload
+    ########################
+
+###################
+# END encode_block
+###################
+
+
+####################################################################################################
+# Function (decode_block)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Timestamps in 1 ms ticks
+####################################################################################################
+def decode_block(payload, n_points):
+    """
+    Decompresses the payload of a block.
+
+    INPUT:
+        payload (bytes) compressed payload (without header)
+        n_points (int) number of points in block (from header)
+
+    RETURNS:
+        ((float, float)[]) (timestamp in seconds, value) points
+    """
+
+    bit_reader = BitReader(payload)
+    all_points = []
+
+    timestamp_ticks = 0
+    delta = 0
+    value_bits = 0
+    leading_zeros = 0
+    trailing_zeros = 0
+
+    for point_index in range(n_points):
+
+        if point_index == 0:
+
+            timestamp_ticks = bit_reader.read_bits(64)
+            value_bits = bit_reader.read_bits(32)
+            all_points.append((timestamp_ticks / ticks_per_second, float_to_bits.unpack(
+                bits_to_float.pack(value_bits))[0]))
+            continue
+
+        #############
+        # Timestamp
+        #############
+        if bit_reader.read_bits(1) == 0:
+
+            delta_of_delta = 0
+
+        else:
+
+            # Control bits are '1' repeated, ended by '0' (or four '1' for 32 bits values)
+            n_value_bits = 32
+            for _, _, range_value_bits in all_delta_ranges:
+
+                if bit_reader.read_bits(1) == 0:
+
+                    n_value_bits = range_value_bits
+                    break
+
+            if n_value_bits == 32:
+
+                delta_of_delta = bit_reader.read_bits(32)
+                if delta_of_delta >= 1 << 31:
+
+                    delta_of_delta -= 1 << 32
+
+            else:
+
+                delta_of_delta = bit_reader.read_bits(n_value_bits) - (1 << (n_value_bits - 1)) + 1
+
+        delta += delta_of_delta
+        timestamp_ticks += delta
+
+        ########
+        # Value
+        ########
+        if bit_reader.read_bits(1) == 1:
+
+            if bit_reader.read_bits(1) == 1:
+
+                leading_zeros = bit_reader.read_bits(5)
+                n_meaningful_bits = bit_reader.read_bits(5) + 1
+                trailing_zeros = 32 - leading_zeros - n_meaningful_bits
+
+            value_bits ^= bit_reader.read_bits(32 - leading_zeros - trailing_zeros) << \
+                trailing_zeros
+
+        all_points.append((timestamp_ticks / ticks_per_second, float_to_bits.unpack(
+            bits_to_float.pack(value_bits))[0]))
+
+    ##################
+    return all_points
+    ##################
+
+###################
+# END decode_block
+###################
+
+
+####################################################################################################
+# Function (encode_series)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def encode_series(all_points):
+    """
+    Compresses a whole series into consecutive blocks.
+
+    INPUT:
+        all_points ((float, float)[]) (timestamp in seconds, value) points, sorted by timestamp
+
+    RETURNS:
+        (bytes) all blocks, each with its header
+    """
+
+    all_blocks = [encode_block(all_points[block_start:block_start + block_size])
+                  for block_start in range(0, len(all_points), block_size)]
+
+    ###########################
+    return b''.join(all_blocks)
+    ###########################
+
+####################
+# END encode_series
+####################
+
+
+####################################################################################################
+# Function (iter_series)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Time range compared in ticks
+####################################################################################################
+def iter_series(compressed_series, start_time, end_time):
+    """
+    Yields points of a compressed series with start_time <= timestamp < end_time. Times are
+    compared in ticks (as stored), so that decoded timestamps rounded down to just before
+    start_time are not dropped. Block headers are used to skip blocks outside the range without
+    decoding them. A truncated last block (interrupted write) is ignored.
+
+    INPUT:
+        compressed_series (bytes|mmap) consecutive blocks, as created by encode_series
+        start_time (float) first time included (seconds)
+        end_time (float) first time excluded (seconds)
+
+    YIELDS:
+        (float, float) (timestamp in seconds, value) points, by increasing timestamp
+    """
+
+    start_ticks = int(round(start_time * ticks_per_second))
+    end_ticks = int(round(end_time * ticks_per_second))
+    block_position = 0
+    series_size = len(compressed_series)
+
+    while block_position + block_header.size <= series_size:
+
+        first_timestamp, last_timestamp, n_points, n_bytes = \
+            block_header.unpack_from(compressed_series, block_position)
+        payload_start = block_position + block_header.size
+        block_position = payload_start + n_bytes
+
+        if block_position > series_size or \
+                int(round(first_timestamp * ticks_per_second)) >= end_ticks:
+
+            # Truncated block, or following blocks are all after range
+            ######
+            return
+            ######
+
+        if int(round(last_timestamp * ticks_per_second)) < start_ticks:
+
+            continue
+
+        for timestamp, value in decode_block(compressed_series[payload_start:block_position],
+                                             n_points):
+
+            if start_ticks <= int(round(timestamp * ticks_per_second)) < end_ticks:
+
+                yield timestamp, value
+
+##################
+# END iter_series
+##################
@@ -10,6 +10,17 @@ Example:
      [21, 22, 21], [21, 20, 21], [21, 24, 24].
      Sample averages are 20, 21.33, 20.66 and 23, and the values exported 20, 20.66, 20.66, 21.66
 
+t and n are given in the General section of the configuration, and can be overriden for each sensor
+(sample_interval, n_sample_for_average options in sensor section). Deadlines for samples and averages
+are kept by a scheduler on the monotonic clock, so time spent reading sensors does not cause drift.
+
+Configuration is reloaded on SIGHUP, or when its file is modified (e.g. by the worker sensor_config
+instruction). Only differences are applied : unchanged sensors keep their samples, smoothing
+buffers and open handles.
+
+Automation rules (Rule sections, see automation_rules) are evaluated on each new smoothed average,
+and send remote configurations (e.g. aircon) as soon as a threshold is crossed.
+
 NOTES:
     (1) For unknown reason, calling Sensehat then DHT11 does not work (only 38/40 bits get read). 
     Calling DHT11 then Sensehat works without problem. Other sensors not tested, but to be safe, put
@@ -20,24 +31,34 @@ NOTES:
 # Import global packages
 #########################
 
+import concurrent.futures  # Reads sensors on different buses in parallel
 import configparser  # Reads configuration files for sensor plugged into Raspberry
+import json  # Writes snapshot of all sensor values
 import os  # Allows file creation/deletion (for output values)
+import signal  # Reloads configuration on SIGHUP
+import threading  # Wakes up main loop when a sampling interval changes
 import time  # Measures when to print output, collect samples, ...
-from urllib import request  # Connects to website to post measured data
-import http.client  # Helps catched exceptions from urllib2
 import traceback  # Catches unhandled errors to improve code
 
-from . import BME280_Driver  # BME280 Sensor. Extension to official Adafruit module
-from . import DHT11_Driver  # DHT11 Sensor
-from . import DS18B20_Driver  # DS18B20 (One-wire) Sensor
-from . import TSL2561_Driver  # TSL2561_Driver
-
 ########################
 # Import Local Packages
 ########################
 
 import global_libraries.general_utils as general_utils
-import temperature_monitoring.Sensehat_Driver as Sensehat_Driver  # Sensehat
+import global_libraries.bus_lock_manager as bus_lock_manager  # Bus locks shared between processes
+from . import driver_registry  # Sensor drivers, imported when a sensor of their type is configured
+from . import sensor_stream_publisher  # Publishes averaged values to RabbitMQ (optional)
+from . import thingspeak_exporter  # Exports averaged values to thingspeak website (optional)
+from . import sampling_scheduler  # Deadline scheduler for sampling/averaging of each sensor
+from . import sensor_record  # Sensor record with ring buffers for averaging/smoothing
+from . import sensor_history_store  # Keeps history of samples on disk (optional)
+from . import outlier_filters  # Rejects outlier samples before averaging (optional)
+from . import sensor_handle  # Sensors kept open between samples
+from . import circuit_breaker  # Suspends reads of sensors failing again and again
+from . import adaptive_sampling  # Sampling interval following variance of samples (optional)
+from . import realtime_capture  # Real-time settings of timing-critical captures (optional)
+from . import sensor_metrics  # Read latency and failure metrics of each sensor
+from . import automation_rules  # Remote actions triggered by averaged values (optional)
 
 __author__ = 'Baland Adrien'  # That's me, yeay.
 
@@ -53,37 +74,50 @@ sample_interval = 5  # Seconds to wait between two successive sensor reads
 n_sample_for_average = 6  # Number of samples taken before they are averaged and output is made
 n_average_for_smooth = 5  # Number of averaged samples used for smoothing (value printed)
 
-thingspeak_url = None  # Address where to post data online if thingspeak_key present in config file.
-
-list_all_output_directories = []  # List of output directories to use, to avoid redundancy
-
-# Mapping from all supported sensor types to their respective driver module.
-sensor_to_driver = {
-    'BME280': BME280_Driver,
-    'DS18B20': DS18B20_Driver,
-    'DHT11': DHT11_Driver,
-    'Sensehat': Sensehat_Driver,
-    'TSL2561': TSL2561_Driver
-}
-
-##############################################
-# Characteristics for each of the sensors
-##############################################
-all_sensors = [
-    # Each entry has the form
-    {
-        'name': 'sensor_name',  # additional info about sensor (e.g. where it is)
-        'type': 'BME280',  # Sensor type. One of BME280, DS18B20, Sensehat, DHT11
-        'address': 0x76,  # Sensor address. BME280: I2C, DS18B20: 1wire, DHT11: GPIO, Sensehat: None
-        'correction': 0.0,  # Sensor correction (only for temperature now, might be changed later)
-        'warmup': 0.0,  # Time necessary for a sensor to warmup (measures ignored during warmup)
-        'last_failed_measure_time': 0.0,  # Last time a sensor measurement could not be made
-        'output_directory': '/home/pi/...',  # Where to create .dat files with measure values,
-        'samples_to_average': {},  # Samples for available measurements, before being averaged
-        'n_last_averages': {},  # Previous measurements averages, to averaged for output (smoothing)
-        'smoothed_average': {}  # Last smoothed average measurements.
-    }
-]
+thingspeak = None  # Exports data online (background thread) if thingspeak_key in config file.
+
+stream_publisher = None  # Publishes averaged values to RabbitMQ if Stream section in config file.
+
+history_store = None  # Keeps history of all samples on disk if History section in config file.
+
+trace_recorder = None  # Records raw data of sensors if Simulation section is in record mode.
+
+# Output files (Output section in config file). Legacy .dat files, and/or one snapshot file.
+write_dat_files = True  # Whether to write one .dat file per sensor measurement
+snapshot_file = None  # JSON file with smoothed values of all sensors, written once per cycle
+snapshot_refresh = 600.  # Seconds after which an unchanged snapshot is rewritten (shows freshness)
+last_snapshot_values = None  # Sensor values/states in last snapshot (unchanged ones are skipped)
+last_snapshot_time = 0.  # Time at which last snapshot was written
+metrics_file = None  # Prometheus textfile with read metrics of all sensors, written once per cycle
+
+config_mtime = None  # Modification time of configuration file when it was last read
+sensor_read_pool = None  # Thread pool reading sensor buses in parallel (created on first read)
+sensor_read_pool_size = 0  # Number of threads in sensor_read_pool
+bus_lock_timeout = 10.  # Seconds to wait for a bus held by another thread/process before skipping
+
+# Set by reading threads when the sampling interval of a sensor changed (adaptive sampling). Wakes
+# up the main loop, which updates the scheduler.
+sampling_intervals_changed = threading.Event()
+
+# Set on SIGHUP. Configuration is reloaded by the main loop (also when configuration file changes).
+reload_requested = threading.Event()
+
+# Mapping from all supported sensor types to their respective driver module. Drivers (and their
+# hardware packages) are only imported when a sensor of their type is parsed.
+sensor_to_driver = driver_registry.DriverRegistry()
+
+# Characteristics and collected data for each of the sensors (sensor_record.Sensor objects)
+all_sensors = []
+
+# Sensors added, removed (Sensor[]) and updated ((Sensor, option names) list) by last configuration
+last_sensor_changes = {'added': [], 'removed': [], 'updated': []}
+
+# Read latency, failures and skipped samples of each sensor (by sensor name)
+read_metrics = sensor_metrics.MetricsRegistry()
+
+# Rules of Rule sections in config file, evaluated on each new average. Remote configurations are
+# sent from a background thread, started by main.
+rule_engine = automation_rules.AutomationRuleEngine()
 
 
 ####################################################################################################
@@ -115,14 +149,89 @@ def convert_localtime_to_string(stamp):
 ##################################
 
 
+####################################################################################################
+# Function (parse_positive_option)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def parse_positive_option(parsed_config, section_name, option_name, default_value,
+                          is_integer=False):
+    """
+    Parses an optional positive number from the configuration file. Logs an error and uses the
+    default value if option is not a positive number.
+
+    INPUT
+        parsed_config (ConfigParser object) : configuration parsed by ConfigParser
+        section_name (str) : section of the option
+        option_name (str) : name of the option
+        default_value (int|float) : value to use if option is missing or wrong
+        is_integer (bool) : whether value must be an integer (float otherwise)
+
+    OUTPUT
+        (int|float) parsed value, or default value
+    """
+
+    if not parsed_config.has_option(section_name, option_name):
+
+        #####################
+        return default_value
+        #####################
+
+    value_from_config = parsed_config.get(section_name, option_name)
+
+    try:
+
+        # Reads value from config file.
+        if is_integer:
+
+            candidate_value = parsed_config.getint(section_name, option_name)
+
+        else:
+
+            candidate_value = parsed_config.getfloat(section_name, option_name)
+
+    except ValueError as e:
+
+        # Value was not a number
+        details = '%s must be a number (%s, %s).' % (option_name, section_name, value_from_config)
+        general_utils.log_error(-412, details, str(e))
+
+        #####################
+        return default_value
+        #####################
+
+    # Tests if value in configuration is valid (positive number)
+    if candidate_value <= 0:
+
+        details = '%s must be positive (%s, %s).' % (option_name, section_name, value_from_config)
+        general_utils.log_error(-412, details)
+
+        #####################
+        return default_value
+        #####################
+
+    #######################
+    return candidate_value
+    #######################
+
+############################
+# END parse_positive_option
+############################
+
+
 ####################################################################################################
 # Function (parse_sensor_config)
 ####################################################################################################
 # Revision History:
 #   2016-10-27 AB - Function Created
 #   2016-11-05 AB - Added SenseHat + Made function more general
+#   2026-10-19 AB - Added per-sensor sample_interval and n_sample_for_average
+#   2026-10-19 AB - Added outlier filter options
+#   2026-10-19 AB - Driver imported on first sensor of its type
+#   2026-10-19 AB - Sensor added to a given list (reloads). Keeps its configuration options.
 ####################################################################################################
-def parse_sensor_config(parsed_config, sensor_name, sensor_type):
+def parse_sensor_config(parsed_config, sensor_name, sensor_type, all_parsed_sensors):
     """
     Parses information for a given sensor from the configuration file.
     
@@ -130,6 +239,7 @@ def parse_sensor_config(parsed_config, sensor_name, sensor_type):
         parsed_config (ConfigParser object) : configuration parsed by ConfigParser
         sensor_name (str) : name of the sensor to parse (SensorX with X integer)
         sensor_type (str) : type of the sensor to parse
+        all_parsed_sensors (Sensor[]) : sensors parsed so far, to which sensor is added
         
     OUTPUT
         (int) 0 if sensor was parsed normally, negative number if parsing reached fatal error
@@ -162,9 +272,19 @@ def parse_sensor_config(parsed_config, sensor_name, sensor_type):
         # Parse the address as a string (checked later)
         sensor_address = parsed_config.get(sensor_name, 'address')
 
+    # Driver is imported with the first sensor of its type. Sensor is ignored if import failed.
+    sensor_driver = sensor_to_driver.get(sensor_type)
+
+    if sensor_driver is None:
+
+        details = '(%s, %s)' % (sensor_name, sensor_type)
+        python_message = sensor_to_driver.import_errors.get(sensor_type)
+        #############################################################
+        return general_utils.log_error(-418, details, python_message)
+        #############################################################
+
     # Tests if address provided is valid using relevant drivers and converts to appropriate format
-    valid_address, converted_address = sensor_to_driver.get(sensor_type)\
-        .is_valid_address(sensor_address)
+    valid_address, converted_address = sensor_driver.is_valid_address(sensor_address)
 
     # Reports problem with address in case it is invalid
     if not valid_address:
@@ -238,6 +358,75 @@ def parse_sensor_config(parsed_config, sensor_name, sensor_type):
         # Could not parse location (also used for output directory), so uses sensor name as default.
         general_utils.log_error(-407, sensor_name)
 
+    ###########################################################
+    # Sampling interval / Number of samples averaged (optional)
+    ###########################################################
+    # Defaults to general parameters. Cheap sensors can be sampled faster than slow ones.
+    sensor_sample_interval = parse_positive_option(parsed_config, sensor_name, 'sample_interval',
+                                                   sample_interval)
+    sensor_n_sample_for_average = parse_positive_option(parsed_config, sensor_name,
+                                                        'n_sample_for_average',
+                                                        n_sample_for_average, is_integer=True)
+
+    ###########################
+    # Outlier filter (optional)
+    ###########################
+    # No filter by default. Unknown filter names are ignored (samples not filtered).
+    outlier_filter_name = None
+    if parsed_config.has_option(sensor_name, 'outlier_filter'):
+
+        outlier_filter_name = parsed_config.get(sensor_name, 'outlier_filter').strip().lower()
+
+        if outlier_filter_name not in outlier_filters.all_filter_types:
+
+            details = 'outlier_filter must be one of %s (%s, %s).' % (
+                ', '.join(sorted(outlier_filters.all_filter_types)), sensor_name,
+                outlier_filter_name)
+            general_utils.log_error(-412, details)
+            outlier_filter_name = None
+
+    outlier_window = parse_positive_option(parsed_config, sensor_name, 'outlier_window',
+                                           outlier_filters.default_window_size, is_integer=True)
+    outlier_threshold = parse_positive_option(parsed_config, sensor_name, 'outlier_threshold',
+                                              outlier_filters.default_threshold)
+    outlier_min_deviation = parse_positive_option(parsed_config, sensor_name,
+                                                  'outlier_min_deviation', None)
+
+    #############################################
+    # Circuit breaker for failed reads (optional)
+    #############################################
+    breaker_failures = parse_positive_option(parsed_config, sensor_name, 'breaker_failures',
+                                             circuit_breaker.default_failure_threshold,
+                                             is_integer=True)
+    breaker_backoff = parse_positive_option(parsed_config, sensor_name, 'breaker_backoff',
+                                            circuit_breaker.default_backoff)
+    breaker_max_backoff = parse_positive_option(parsed_config, sensor_name, 'breaker_max_backoff',
+                                                circuit_breaker.default_max_backoff)
+
+    #######################################
+    # Adaptive sampling interval (optional)
+    #######################################
+    # Longest interval is at most the averaging interval, so that each average gets a sample
+    is_adaptive_sampling = False
+    if parsed_config.has_option(sensor_name, 'adaptive_sampling'):
+
+        try:
+
+            is_adaptive_sampling = parsed_config.getboolean(sensor_name, 'adaptive_sampling')
+
+        except ValueError as e:
+
+            details = 'adaptive_sampling must be yes/no (%s, %s).' % (
+                sensor_name, parsed_config.get(sensor_name, 'adaptive_sampling'))
+            general_utils.log_error(-412, details, str(e))
+
+    averaging_interval = sensor_sample_interval * sensor_n_sample_for_average
+    min_sample_interval = parse_positive_option(parsed_config, sensor_name, 'min_sample_interval',
+                                                sensor_sample_interval)
+    max_sample_interval = parse_positive_option(parsed_config, sensor_name, 'max_sample_interval',
+                                                averaging_interval)
+    max_sample_interval = min(max_sample_interval, averaging_interval)
+
     ############################
     #  Parsing done : now apply
     # Combines output_directory and sensor_location to get actual directory where output is made
@@ -256,41 +445,50 @@ def parse_sensor_config(parsed_config, sensor_name, sensor_type):
     ######################################
 
     # Only adds sensor if its unique identifiers (output_directory) have not been added before
-    if output_directory not in list_all_output_directories:
-
-        # Gets list of all different measures sensor can colllect, to initialze dictionnaries
-        all_measurement_types = sensor_to_driver.get(sensor_type).get_measurement_types()
-
-        # Initializes list for collected samples (before average)
-        sample_to_average_init = {measurement: [] for measurement in all_measurement_types}
-
-        # Initializes list for computed average (before smoothing). This starts an array with n None
-        #  entries for eachmeasurement type
-        n_last_averages_init = {measurement: [None for _ in range(n_average_for_smooth)] for 
-                                measurement in all_measurement_types}
-
-        # Initializes list for computed smoothed average
-        smoothed_average = {measurement: 0.0 for measurement in all_measurement_types}
-
-        sensor = {
-            # Base information
-            'name': sensor_location,
-            'type': sensor_type,
-            'address': converted_address,
-            'correction': temperature_correction,
-            'warmup': sensor_warmup,
-            'output_directory': output_directory,
-            # Last time a BME280 measurement failed. Used to incorporate warm-up time.
-            'last_failed_measure_time': time.time(),
-            # Samples to use for averaging
-            'samples_to_average': sample_to_average_init,
-            # Averages to use for smoothing
-            'n_last_averages': n_last_averages_init,
-            # Latest value outputed
-            'smoothed_average': smoothed_average
-        }
-
-        all_sensors.append(sensor)
+    if output_directory not in [parsed_sensor.output_directory for parsed_sensor in
+                                all_parsed_sensors]:
+
+        # Gets list of all different measures sensor can colllect, to initialze buffers
+        all_measurement_types = sensor_driver.get_measurement_types()
+
+        sensor_outlier_filters = None
+        if outlier_filter_name is not None:
+
+            sensor_outlier_filters = outlier_filters.create_filters(
+                outlier_filter_name, all_measurement_types, outlier_window, outlier_threshold,
+                outlier_min_deviation)
+
+        # Thresholds for all measurements of the sensor with a default (others do not count)
+        sensor_adaptive_interval = None
+        if is_adaptive_sampling:
+
+            all_thresholds = {}
+            for measurement in all_measurement_types:
+
+                all_thresholds[measurement] = parse_positive_option(
+                    parsed_config, sensor_name, 'adaptive_threshold_' + measurement,
+                    adaptive_sampling.default_thresholds.get(measurement))
+
+            all_thresholds = {measurement: threshold for measurement, threshold in
+                              all_thresholds.items() if threshold is not None}
+            sensor_adaptive_interval = adaptive_sampling.AdaptiveInterval(
+                min_sample_interval, max_sample_interval, all_thresholds)
+
+        # Sample accumulators and smoothing ring buffers (n_average_for_smooth missing values) are
+        # created by the record. Last failed measure time starts now, to incorporate warm-up time.
+        sensor = sensor_record.Sensor(sensor_location, sensor_type, converted_address,
+                                      temperature_correction, sensor_warmup,
+                                      sensor_sample_interval, sensor_n_sample_for_average,
+                                      output_directory, all_measurement_types,
+                                      n_average_for_smooth, time.time(),
+                                      sensor_outlier_filters,
+                                      circuit_breaker.CircuitBreaker(breaker_failures,
+                                                                     breaker_backoff,
+                                                                     breaker_max_backoff),
+                                      sensor_adaptive_interval,
+                                      dict(parsed_config.items(sensor_name)))
+
+        all_parsed_sensors.append(sensor)
 
     else:
 
@@ -308,249 +506,1046 @@ def parse_sensor_config(parsed_config, sensor_name, sensor_type):
 
 
 ####################################################################################################
-# Function (read_configuration)
+# Function (parse_thingspeak_config)
 ####################################################################################################
 # Revision History:
-#   2016-10-27 AB - Function Created
-#   2016-11-02 AB - Added heater configuration parsing
-#   1016-11-05 AB - Remove heater configuration (not relevant at home).
+#   2026-10-19 AB - Function Created (from read_configuration)
 ####################################################################################################
-def read_configuration(config_filename):
+def parse_thingspeak_config(parsed_config):
     """
-    Reads configuration file containing all sensor/heater information and updates internal 
-    parameters accordingly.
-    Parameters include:
-        General params (time between measurements, number of measurements for average, smoothing)
-        Sensor params (location, output, correction, ...)
+    Parses the optional thingspeak options of the General section, and creates the exporter of
+    averaged values to thingspeak if thingspeak_key exists.
+    Other options are thingspeak_channel (channel id, allows bulk updates), thingspeak_host,
+    thingspeak_port, thingspeak_https (yes/no) and thingspeak_spool (file keeping updates while
+    website can not be reached).
 
     INPUT
-        config_filename (str) name of configuration file
-        
-    OUTPUT:
-        error_code (int) 0 if no fatal error while reading config file, negative integer otherwise
+        parsed_config (ConfigParser object) : configuration parsed by ConfigParser
     """
 
-    # Deletes example sensor from code (in global variable)
-    all_sensors.pop()
+    global thingspeak
 
-    ########################################
-    # Creates configuration parser + parses
-    ########################################
-    parsed_config = configparser.RawConfigParser()
-    if not os.path.isfile(config_filename):
+    if not parsed_config.has_option('General', 'thingspeak_key'):
 
-        #####################################################
-        return general_utils.log_error(-401, config_filename)
-        #####################################################
+        #######
+        return
+        #######
 
-    else:
+    thingspeak_key = parsed_config.get('General', 'thingspeak_key')
+    thingspeak_channel = None
+    thingspeak_host = thingspeak_exporter.default_host
+    thingspeak_https = True
+    thingspeak_spool = '/home/pi/data/thingspeak_spool.jsonl'
 
-        parsed_config.read(config_filename)
+    if parsed_config.has_option('General', 'thingspeak_channel'):
 
-    ############################################################
-    # Gets general parameters for sample collection / averaging
-    ############################################################
-    if parsed_config.has_section('General'):
+        thingspeak_channel = parsed_config.get('General', 'thingspeak_channel')
 
-        ##################
-        # Sample Interval
-        ##################
-        if parsed_config.has_option('General', 'sample_interval'):
+    if parsed_config.has_option('General', 'thingspeak_host'):
 
-            try:
+        thingspeak_host = parsed_config.get('General', 'thingspeak_host')
 
-                # Reads value from config file.
-                candidate_sample_interval = parsed_config.getfloat('General', 'sample_interval')
+    thingspeak_port = parse_positive_option(parsed_config, 'General', 'thingspeak_port', None,
+                                            is_integer=True)
 
-                # Tests if value in configuration is valid (positive number)
-                if candidate_sample_interval > 0.0:
+    if parsed_config.has_option('General', 'thingspeak_https'):
 
-                    # Valid value : update internal parameters
-                    global sample_interval
-                    sample_interval = candidate_sample_interval
+        try:
 
-                else:
+            thingspeak_https = parsed_config.getboolean('General', 'thingspeak_https')
 
-                    # Value was number, but not positive
-                    value_from_config = parsed_config.get('General', 'sample_interval')
-                    details = 'sample_interval must be positive (%s).' % (value_from_config,)
-                    general_utils.log_error(-412, details)
+        except ValueError as e:
 
-            except ValueError as e:
+            details = 'thingspeak_https must be yes/no (%s).' % \
+                parsed_config.get('General', 'thingspeak_https')
+            general_utils.log_error(-412, details, str(e))
 
-                # Value was not a number
-                value_from_config = parsed_config.get('General', 'sample_interval')
-                details = 'sample_interval must be a number (%s).' % (value_from_config,)
-                general_utils.log_error(-412, details, str(e))
+    if parsed_config.has_option('General', 'thingspeak_spool'):
 
-        else:
+        thingspeak_spool = parsed_config.get('General', 'thingspeak_spool')
 
-            # Configuration file did not have parameter
-            general_utils.log_error(-412, 'sample_interval')
+    thingspeak = thingspeak_exporter.ThingspeakExporter(thingspeak_key, thingspeak_channel,
+                                                        thingspeak_host, thingspeak_port,
+                                                        thingspeak_https, thingspeak_spool)
 
-        ###################
-        # N Sample For Avg
-        ###################
-        if parsed_config.has_option('General', 'n_sample_for_average'):
+    #######
+    return
+    #######
 
-            try:
+##############################
+# END parse_thingspeak_config
+##############################
 
-                # Reads value from config file.
-                candidate_n_sample_for_average = parsed_config.getint('General', 
-                                                                      'n_sample_for_average')
 
-                # Tests if value in configuration is valid (positive integer)
-                if candidate_n_sample_for_average > 0:
+####################################################################################################
+# Function (parse_stream_config)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def parse_stream_config(parsed_config):
+    """
+    Parses the optional Stream section of the configuration file, and creates the publisher of
+    averaged values on RabbitMQ if the section exists.
+    Options are rabbit_config (RabbitMQ configuration file), exchange, max_interval, and
+    deadband_X for each measurement X (e.g. deadband_temperature = 0.1).
 
-                    global n_sample_for_average
-                    n_sample_for_average = candidate_n_sample_for_average
+    INPUT
+        parsed_config (ConfigParser object) : configuration parsed by ConfigParser
+    """
 
-                else:
+    global stream_publisher
 
-                    # Value was integer, but not positive
-                    value_from_config = parsed_config.get('General', 'n_sample_for_average')
-                    details = 'n_sample_for_average not positive int (%s).' % (value_from_config,)
-                    general_utils.log_error(-412, details)
+    if not parsed_config.has_section('Stream'):
 
-            except ValueError as e:
+        #######
+        return
+        #######
 
-                # Value was not an integer
-                value_from_config = parsed_config.get('General', 'n_sample_for_average')
-                details = 'n_sample_for_average not int (%s).' % (value_from_config,)
-                general_utils.log_error(-412, details, str(e))
+    rabbit_config_filename = '/home/pi/Home_Code/configs/RabbitMQConfig.ini'
+    exchange_name = sensor_stream_publisher.default_exchange_name
+    max_interval = sensor_stream_publisher.default_max_interval
+    all_deadbands = {}
 
-        else:
+    if parsed_config.has_option('Stream', 'rabbit_config'):
 
-            # Configuration file did not have parameter
-            general_utils.log_error(-412, 'n_sample_for_average')
+        rabbit_config_filename = parsed_config.get('Stream', 'rabbit_config')
 
-        ###################
-        # N Avg For Smooth
-        ###################
-        if parsed_config.has_option('General', 'n_average_for_smooth'):
+    if parsed_config.has_option('Stream', 'exchange'):
 
-            try:
+        exchange_name = parsed_config.get('Stream', 'exchange')
 
-                # Reads value from config file
-                candidate_n_average_for_smooth = parsed_config.getint('General', 
-                                                                      'n_average_for_smooth')
+    for option_name in parsed_config.options('Stream'):
 
-                # Tests if value in configuration is valid (positive integer)
-                if candidate_n_average_for_smooth > 0:
+        # Only max_interval and deadbands are numbers.
+        if option_name != 'max_interval' and not option_name.startswith('deadband_'):
 
-                    global n_average_for_smooth
-                    n_average_for_smooth = candidate_n_average_for_smooth
+            continue
 
-                else:
+        try:
 
-                    # Value was integer, but not positive
-                    value_from_config = parsed_config.get('General', 'n_average_for_smooth')
-                    details = 'n_average_for_smooth not positive int (%s).' % (value_from_config,)
-                    general_utils.log_error(-412, details)
+            option_value = parsed_config.getfloat('Stream', option_name)
 
-            except ValueError as e:
+            if option_value < 0.0:
 
-                # Value was not an integer
-                value_from_config = parsed_config.get('General', 'n_average_for_smooth')
-                details = 'n_average_for_smooth not int (%s).' % (value_from_config,)
-                general_utils.log_error(-412, details, str(e))
+                raise ValueError('Negative value.')
 
-        else:
+        except ValueError as e:
 
-            # Configuration file did not have parameter
-            general_utils.log_error(-412, 'n_average_for_smooth')
+            # Value was not a positive number, log error and keep default
+            details = '%s must be a positive number (%s).' % (
+                option_name, parsed_config.get('Stream', option_name))
+            general_utils.log_error(-412, details, str(e))
+            continue
 
-        ################################
-        # Thingspeak API URL (Optional)
-        ################################
-        if parsed_config.has_option('General', 'thingspeak_key'):
+        if option_name == 'max_interval':
 
-            # Configuration file only contains API key, so after parsing, merged it with base url.
-            global thingspeak_url
-            thingspeak_key = parsed_config.get('General', 'thingspeak_key')
-            thingspeak_url = 'https://api.thingspeak.com/update?api_key=%s' % thingspeak_key
+            max_interval = option_value
 
-    ######################################
-    # Gets all supported sensors to query
-    ######################################
-    sensor_index = 0
-    while True:
+        else:
 
-        sensor_name = 'Sensor' + str(sensor_index)
+            all_deadbands[option_name[len('deadband_'):]] = option_value
 
-        # Check if sensor exist. Assumes config file has sensor listed as 'Sensor17, 'Sensor2', ...
-        if parsed_config.has_section(sensor_name):
+    stream_publisher = sensor_stream_publisher.SensorStreamPublisher(
+        rabbit_config_filename, exchange_name, max_interval, all_deadbands)
 
-            # Check whether the sensor has the fundamental characteristics (type and address)
-            if parsed_config.has_option(sensor_name, 'type'):
+    #######
+    return
+    #######
 
-                # Checks if sensor is a supported i2c or 1wire sensor
-                sensor_type = parsed_config.get(sensor_name, 'type')
-                if sensor_type in sensor_to_driver.keys():
+##########################
+# END parse_stream_config
+##########################
 
-                    # If supported sensor, parses its information and adds it to sensor list
-                    parse_sensor_config(parsed_config, sensor_name, sensor_type)
 
-                else:
+####################################################################################################
+# Function (parse_history_config)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def parse_history_config(parsed_config):
+    """
+    Parses the optional History section of the configuration file, and creates the store keeping
+    the history of samples on disk if the section exists.
+    Options are directory, flush_size (bytes), flush_interval (seconds), retention_X (days) for
+    each resolution X (raw, minute, hour, day), and compress_after (days after which raw segments
+    are compressed).
 
-                    # Saw an unidentified sensor, print an error but keep parsing
-                    details = '(%s, %s)' % (sensor_name, sensor_type)
-                    general_utils.log_error(-402, details)
+    INPUT
+        parsed_config (ConfigParser object) : configuration parsed by ConfigParser
+    """
 
-            else:
+    global history_store
 
-                # Saw a sensor without required info, log error but keep parsing
-                general_utils.log_error(-403, sensor_name)
+    if not parsed_config.has_section('History'):
 
-            # Sensor processing finished. Moves on to the next sensor
-            sensor_index += 1
+        #######
+        return
+        #######
 
-        else:
+    history_directory = '/home/pi/data/history/'
 
-            # If the sensor did not exist, stop searching.
-            break
+    if parsed_config.has_option('History', 'directory'):
 
-    # No sensors could be detected if config file
-    if sensor_index == 0:
+        history_directory = parsed_config.get('History', 'directory')
 
-        #####################################################
-        return general_utils.log_error(-415, config_filename)
-        #####################################################
+    flush_size = parse_positive_option(parsed_config, 'History', 'flush_size',
+                                       sensor_history_store.default_flush_size, is_integer=True)
+    flush_interval = parse_positive_option(parsed_config, 'History', 'flush_interval',
+                                           sensor_history_store.default_flush_interval)
 
-    # No VALID sensor could be detected in config file
-    if len(all_sensors) == 0:
+    all_retention_days = {}
+    for resolution in sensor_history_store.all_resolutions:
 
-        ####################################
-        return general_utils.log_error(-423)
-        ####################################
+        all_retention_days[resolution] = parse_positive_option(
+            parsed_config, 'History', 'retention_' + resolution,
+            sensor_history_store.default_retention_days[resolution])
 
-    ########
-    return 0
-    ########
+    compress_after_days = parse_positive_option(parsed_config, 'History', 'compress_after',
+                                                sensor_history_store.default_compress_after_days)
 
-#########################
-# END read_configuration
-#########################
+    history_store = sensor_history_store.SensorHistoryStore(history_directory, flush_size,
+                                                            flush_interval, all_retention_days,
+                                                            compress_after_days)
+
+    #######
+    return
+    #######
+
+###########################
+# END parse_history_config
+###########################
 
 
 ####################################################################################################
-# Function (initialize_data_files)
+# Function (parse_output_config)
 ####################################################################################################
 # Revision History:
-#   2016-10-27 AB - Function Created
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Metrics file option
 ####################################################################################################
-def initialize_data_files():
+def parse_output_config(parsed_config):
     """
-    Initializes all required folders to export measurements from sensor.
-    
-    OUTPUT
-        (int) 0 if no fatal problem while initializing output folders, negative integer otherwise
+    Parses the optional Output section of the configuration file.
+    Options are dat_files (yes/no, one .dat file per sensor measurement, yes by default),
+    snapshot_file (JSON file with all smoothed values, not written if missing),
+    snapshot_refresh (seconds after which the snapshot is rewritten even if values did not change)
+    and metrics_file (Prometheus textfile with read metrics of all sensors, not written if missing).
+
+    INPUT
+        parsed_config (ConfigParser object) : configuration parsed by ConfigParser
     """
 
-    # For each i2c sensor registered
-    for sensor in all_sensors:
+    global write_dat_files, snapshot_file, snapshot_refresh, metrics_file
 
-        output_directory = sensor['output_directory']
+    if not parsed_config.has_section('Output'):
+
+        #######
+        return
+        #######
+
+    if parsed_config.has_option('Output', 'dat_files'):
+
+        try:
+
+            write_dat_files = parsed_config.getboolean('Output', 'dat_files')
+
+        except ValueError as e:
+
+            details = 'dat_files must be yes/no (%s).' % parsed_config.get('Output', 'dat_files')
+            general_utils.log_error(-412, details, str(e))
+
+    if parsed_config.has_option('Output', 'snapshot_file'):
+
+        snapshot_file = parsed_config.get('Output', 'snapshot_file')
+
+    snapshot_refresh = parse_positive_option(parsed_config, 'Output', 'snapshot_refresh',
+                                             snapshot_refresh)
+
+    if parsed_config.has_option('Output', 'metrics_file'):
+
+        metrics_file = parsed_config.get('Output', 'metrics_file')
+
+    #######
+    return
+    #######
+
+##########################
+# END parse_output_config
+##########################
+
+
+####################################################################################################
+# Function (parse_realtime_config)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def parse_realtime_config(parsed_config):
+    """
+    Parses the optional real-time options of the General section, used during timing-critical
+    captures (e.g. DHT11 pin polling).
+    Options are realtime_priority (SCHED_FIFO priority 1-99, needs root or CAP_SYS_NICE),
+    realtime_cpus (CPU indexes separated by commas) and realtime_disable_gc (yes/no, yes by
+    default).
+
+    INPUT
+        parsed_config (ConfigParser object) : configuration parsed by ConfigParser
+    """
+
+    realtime_priority = parse_positive_option(parsed_config, 'General', 'realtime_priority', None,
+                                              is_integer=True)
+    realtime_cpus = None
+    is_gc_disabled = True
+
+    if realtime_priority is not None and realtime_priority > 99:
+
+        details = 'realtime_priority must be between 1 and 99 (%d).' % (realtime_priority,)
+        general_utils.log_error(-412, details)
+        realtime_priority = None
+
+    if parsed_config.has_option('General', 'realtime_cpus'):
+
+        value_from_config = parsed_config.get('General', 'realtime_cpus')
+
+        try:
+
+            realtime_cpus = [int(cpu_index) for cpu_index in value_from_config.split(',')]
+
+            if len(realtime_cpus) == 0 or min(realtime_cpus) < 0:
+
+                raise ValueError('Negative CPU index.')
+
+        except ValueError as e:
+
+            details = 'realtime_cpus must be CPU indexes separated by commas (%s).' % \
+                (value_from_config,)
+            general_utils.log_error(-412, details, str(e))
+            realtime_cpus = None
+
+    if parsed_config.has_option('General', 'realtime_disable_gc'):
+
+        try:
+
+            is_gc_disabled = parsed_config.getboolean('General', 'realtime_disable_gc')
+
+        except ValueError as e:
+
+            details = 'realtime_disable_gc must be yes/no (%s).' % \
+                parsed_config.get('General', 'realtime_disable_gc')
+            general_utils.log_error(-412, details, str(e))
+
+    realtime_capture.configure(realtime_priority, realtime_cpus, is_gc_disabled)
+
+    #######
+    return
+    #######
+
+############################
+# END parse_realtime_config
+############################
+
+
+####################################################################################################
+# Function (parse_simulation_config)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - sensor_simulation only imported if section exists (imports hardware drivers)
+####################################################################################################
+def parse_simulation_config(parsed_config):
+    """
+    Parses the optional Simulation section of the configuration file. Must be called once the
+    drivers of all sensors are imported, before sensors are read.
+    Options are mode (replay : sensors replay a recorded trace, synthetic : sensors give synthetic
+    values, record : raw data of real sensors is recorded), trace_file, seed and failure_rate
+    (synthetic mode). See sensor_simulation.
+
+    INPUT
+        parsed_config (ConfigParser object) : configuration parsed by ConfigParser
+    """
+
+    global trace_recorder
+
+    if not parsed_config.has_option('Simulation', 'mode'):
+
+        #######
+        return
+        #######
+
+    # Imported here : simulation imports the drivers it emulates, which are otherwise only imported
+    # for configured sensors (see driver_registry)
+    from . import sensor_simulation
+
+    simulation_mode = parsed_config.get('Simulation', 'mode')
+    trace_filename = sensor_simulation.default_trace_file
+
+    if simulation_mode not in sensor_simulation.all_modes:
+
+        details = 'mode must be one of %s (%s).' % (', '.join(sensor_simulation.all_modes),
+                                                    simulation_mode)
+        general_utils.log_error(-412, details)
+
+        #######
+        return
+        #######
+
+    if parsed_config.has_option('Simulation', 'trace_file'):
+
+        trace_filename = parsed_config.get('Simulation', 'trace_file')
+
+    try:
+
+        if simulation_mode == 'replay':
+
+            sensor_source = sensor_simulation.TraceReplay(trace_filename)
+            sensor_simulation.install_simulated_drivers(sensor_to_driver, sensor_source, time)
+
+        elif simulation_mode == 'synthetic':
+
+            seed = parse_positive_option(parsed_config, 'Simulation', 'seed', 0, is_integer=True)
+            failure_rate = parse_positive_option(parsed_config, 'Simulation', 'failure_rate', 0.)
+            sensor_source = sensor_simulation.SyntheticSource(seed, min(failure_rate, 1.))
+            sensor_simulation.install_simulated_drivers(sensor_to_driver, sensor_source, time)
+
+        else:
+
+            trace_recorder = sensor_simulation.TraceRecorder(trace_filename)
+            trace_recorder.install(sensor_to_driver)
+
+    except IOError as e:
+
+        # Real sensors are read without the trace
+        general_utils.log_error(-412, 'trace_file can not be used (%s).' % trace_filename, str(e))
+
+    #######
+    return
+    #######
+
+##############################
+# END parse_simulation_config
+##############################
+
+
+####################################################################################################
+# Function (parse_rules_config)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def parse_rules_config(parsed_config):
+    """
+    Parses the optional automation rules of the configuration file (sections Rule0, Rule1, ...),
+    and replaces rules of the rule engine with them. Rules must watch a measurement of a current
+    sensor. Invalid rules are logged and skipped.
+
+    INPUT
+        parsed_config (ConfigParser object) : configuration parsed by ConfigParser
+    """
+
+    all_sensor_measurements = {sensor_object.name: sensor_object.measurement_types for
+                               sensor_object in all_sensors}
+    all_rules = []
+    rule_index = 0
+
+    # Assumes config file has rules listed as 'Rule0', 'Rule1', ... (as sensors)
+    while parsed_config.has_section('Rule' + str(rule_index)):
+
+        rule = automation_rules.parse_rule(parsed_config, 'Rule' + str(rule_index),
+                                           all_sensor_measurements)
+
+        if rule is not None:
+
+            all_rules.append(rule)
+
+        rule_index += 1
+
+    rule_engine.set_rules(all_rules)
+
+    #######
+    return
+    #######
+
+#########################
+# END parse_rules_config
+#########################
+
+
+####################################################################################################
+# Function (read_configuration)
+####################################################################################################
+# Revision History:
+#   2016-10-27 AB - Function Created
+#   2016-11-02 AB - Added heater configuration parsing
+#   1016-11-05 AB - Remove heater configuration (not relevant at home).
+#   2026-10-19 AB - Simulation section (once drivers of all sensors are imported)
+#   2026-10-19 AB - Sensors updated from differences with current ones (can be called again)
+#   2026-10-19 AB - Automation rules (also updated on reload)
+#   2026-10-19 AB - Read-only mode for workers (no exporter, recorder or rule created)
+####################################################################################################
+def read_configuration(config_filename, is_reload=False, is_read_only=False):
+    """
+    Reads configuration file containing all sensor/heater information and updates internal 
+    parameters accordingly.
+    Parameters include:
+        General params (time between measurements, number of measurements for average, smoothing)
+        Sensor params (location, output, correction, ...)
+    Can be called again : only differences with current sensors are applied (see update_sensors),
+    and current sensors are kept if new configuration has no valid sensor.
+
+    INPUT
+        config_filename (str) name of configuration file
+        is_reload (bool, opt) whether configuration is reloaded by the running script. Only
+            sampling parameters and sensors are updated (other sections need a restart).
+        is_read_only (bool, opt) whether configuration is only read to know sensors and output
+            files (e.g. by RabbitMQ workers). Only General, Output, History and sensor sections
+            are parsed : no exporter, publisher, trace recorder or automation rule is created.
+        
+    OUTPUT:
+        error_code (int) 0 if no fatal error while reading config file, negative integer otherwise
+    """
+
+    ########################################
+    # Creates configuration parser + parses
+    ########################################
+    parsed_config = configparser.RawConfigParser()
+    if not os.path.isfile(config_filename):
+
+        #####################################################
+        return general_utils.log_error(-401, config_filename)
+        #####################################################
+
+    else:
+
+        global config_mtime
+        config_mtime = os.path.getmtime(config_filename)
+        parsed_config.read(config_filename)
+
+    ############################################################
+    # Gets general parameters for sample collection / averaging
+    ############################################################
+    if parsed_config.has_section('General'):
+
+        ##################
+        # Sample Interval
+        ##################
+        if parsed_config.has_option('General', 'sample_interval'):
+
+            try:
+
+                # Reads value from config file.
+                candidate_sample_interval = parsed_config.getfloat('General', 'sample_interval')
+
+                # Tests if value in configuration is valid (positive number)
+                if candidate_sample_interval > 0.0:
+
+                    # Valid value : update internal parameters
+                    global sample_interval
+                    sample_interval = candidate_sample_interval
+
+                else:
+
+                    # Value was number, but not positive
+                    value_from_config = parsed_config.get('General', 'sample_interval')
+                    details = 'sample_interval must be positive (%s).' % (value_from_config,)
+                    general_utils.log_error(-412, details)
+
+            except ValueError as e:
+
+                # Value was not a number
+                value_from_config = parsed_config.get('General', 'sample_interval')
+                details = 'sample_interval must be a number (%s).' % (value_from_config,)
+                general_utils.log_error(-412, details, str(e))
+
+        else:
+
+            # Configuration file did not have parameter
+            general_utils.log_error(-412, 'sample_interval')
+
+        ###################
+        # N Sample For Avg
+        ###################
+        if parsed_config.has_option('General', 'n_sample_for_average'):
+
+            try:
+
+                # Reads value from config file.
+                candidate_n_sample_for_average = parsed_config.getint('General', 
+                                                                      'n_sample_for_average')
+
+                # Tests if value in configuration is valid (positive integer)
+                if candidate_n_sample_for_average > 0:
+
+                    global n_sample_for_average
+                    n_sample_for_average = candidate_n_sample_for_average
+
+                else:
+
+                    # Value was integer, but not positive
+                    value_from_config = parsed_config.get('General', 'n_sample_for_average')
+                    details = 'n_sample_for_average not positive int (%s).' % (value_from_config,)
+                    general_utils.log_error(-412, details)
+
+            except ValueError as e:
+
+                # Value was not an integer
+                value_from_config = parsed_config.get('General', 'n_sample_for_average')
+                details = 'n_sample_for_average not int (%s).' % (value_from_config,)
+                general_utils.log_error(-412, details, str(e))
+
+        else:
+
+            # Configuration file did not have parameter
+            general_utils.log_error(-412, 'n_sample_for_average')
+
+        ###################
+        # N Avg For Smooth
+        ###################
+        if parsed_config.has_option('General', 'n_average_for_smooth'):
+
+            try:
+
+                # Reads value from config file
+                candidate_n_average_for_smooth = parsed_config.getint('General', 
+                                                                      'n_average_for_smooth')
+
+                # Tests if value in configuration is valid (positive integer)
+                if candidate_n_average_for_smooth > 0:
+
+                    global n_average_for_smooth
+                    n_average_for_smooth = candidate_n_average_for_smooth
+
+                else:
+
+                    # Value was integer, but not positive
+                    value_from_config = parsed_config.get('General', 'n_average_for_smooth')
+                    details = 'n_average_for_smooth not positive int (%s).' % (value_from_config,)
+                    general_utils.log_error(-412, details)
+
+            except ValueError as e:
+
+                # Value was not an integer
+                value_from_config = parsed_config.get('General', 'n_average_for_smooth')
+                details = 'n_average_for_smooth not int (%s).' % (value_from_config,)
+                general_utils.log_error(-412, details, str(e))
+
+        else:
+
+            # Configuration file did not have parameter
+            general_utils.log_error(-412, 'n_average_for_smooth')
+
+        # Exporters and capture settings are only created at start
+        if not is_reload and not is_read_only:
+
+            ##############################
+            # Thingspeak export (Optional)
+            ##############################
+            parse_thingspeak_config(parsed_config)
+
+            #####################################
+            # Timing-critical captures (Optional)
+            #####################################
+            parse_realtime_config(parsed_config)
+
+    # Optional sections : exporters and output files are only created at start
+    if not is_reload:
+
+        ######################################
+        # Sensor stream on RabbitMQ (Optional)
+        ######################################
+        if not is_read_only:
+
+            parse_stream_config(parsed_config)
+
+        #########################################
+        # History of samples on disk (Optional)
+        #########################################
+        parse_history_config(parsed_config)
+
+        ##################################
+        # Output files format (Optional)
+        ##################################
+        parse_output_config(parsed_config)
+
+    ######################################
+    # Gets all supported sensors to query
+    ######################################
+    all_parsed_sensors = []
+    sensor_index = 0
+    while True:
+
+        sensor_name = 'Sensor' + str(sensor_index)
+
+        # Check if sensor exist. Assumes config file has sensor listed as 'Sensor17, 'Sensor2', ...
+        if parsed_config.has_section(sensor_name):
+
+            # Check whether the sensor has the fundamental characteristics (type and address)
+            if parsed_config.has_option(sensor_name, 'type'):
+
+                # Checks if sensor is a supported i2c or 1wire sensor
+                sensor_type = parsed_config.get(sensor_name, 'type')
+                if sensor_type in sensor_to_driver.keys():
+
+                    # If supported sensor, parses its information and adds it to sensor list
+                    parse_sensor_config(parsed_config, sensor_name, sensor_type,
+                                        all_parsed_sensors)
+
+                else:
+
+                    # Saw an unidentified sensor, print an error but keep parsing
+                    details = '(%s, %s)' % (sensor_name, sensor_type)
+                    general_utils.log_error(-402, details)
+
+            else:
+
+                # Saw a sensor without required info, log error but keep parsing
+                general_utils.log_error(-403, sensor_name)
+
+            # Sensor processing finished. Moves on to the next sensor
+            sensor_index += 1
+
+        else:
+
+            # If the sensor did not exist, stop searching.
+            break
+
+    # No sensors could be detected if config file
+    if sensor_index == 0:
+
+        #####################################################
+        return general_utils.log_error(-415, config_filename)
+        #####################################################
+
+    # No VALID sensor could be detected in config file
+    if len(all_parsed_sensors) == 0:
+
+        ####################################
+        return general_utils.log_error(-423)
+        ####################################
+
+    # Unchanged sensors keep their samples, smoothing buffers and open handles
+    update_sensors(all_parsed_sensors)
+
+    ###############################
+    # Automation rules (Optional)
+    ###############################
+    if not is_read_only:
+
+        parse_rules_config(parsed_config)
+
+    ###########################################
+    # Simulated or recorded sensors (Optional)
+    ###########################################
+    if not is_reload and not is_read_only:
+
+        parse_simulation_config(parsed_config)
+
+    ########
+    return 0
+    ########
+
+#########################
+# END read_configuration
+#########################
+
+
+####################################################################################################
+# Function (update_sensor)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def update_sensor(sensor_object, parsed_sensor):
+    """
+    Applies options of a sensor parsed again from configuration (same location, type and address)
+    to its current record, which keeps its samples, smoothing buffers and breaker state. Handle
+    is closed if correction changed (reopened with new correction at next read).
+
+    INPUT
+        sensor_object (Sensor) current record of the sensor
+        parsed_sensor (Sensor) record parsed from new configuration
+
+    OUTPUT
+        (str[]) names of the options that changed (empty if none)
+    """
+
+    all_current_options = sensor_object.config_options
+    all_parsed_options = parsed_sensor.config_options
+    all_changed_options = {option for option in set(all_current_options) | set(all_parsed_options)
+                           if all_current_options.get(option) != all_parsed_options.get(option)}
+
+    # Sampling parameters also change with defaults of the General section
+    if sensor_object.sample_interval != parsed_sensor.sample_interval:
+
+        all_changed_options.add('sample_interval')
+
+    if sensor_object.n_sample_for_average != parsed_sensor.n_sample_for_average:
+
+        all_changed_options.add('n_sample_for_average')
+
+    if sensor_object.correction != parsed_sensor.correction:
+
+        sensor_object.correction = parsed_sensor.correction
+        close_sensor_handle(sensor_object)
+
+    sensor_object.warmup = parsed_sensor.warmup
+    sensor_object.sample_interval = parsed_sensor.sample_interval
+    sensor_object.n_sample_for_average = parsed_sensor.n_sample_for_average
+    sensor_object.config_options = all_parsed_options
+
+    # Filters and adaptive interval start again with new options (breaker keeps its state)
+    if any(option.startswith('outlier_') for option in all_changed_options):
+
+        sensor_object.outlier_filters = parsed_sensor.outlier_filters
+
+    if any(option.startswith('adaptive_') or option in ('min_sample_interval',
+                                                         'max_sample_interval',
+                                                         'sample_interval',
+                                                         'n_sample_for_average')
+           for option in all_changed_options):
+
+        sensor_object.adaptive_interval = parsed_sensor.adaptive_interval
+
+    sensor_object.breaker.failure_threshold = parsed_sensor.breaker.failure_threshold
+    sensor_object.breaker.base_backoff = parsed_sensor.breaker.base_backoff
+    sensor_object.breaker.max_backoff = parsed_sensor.breaker.max_backoff
+
+    first_measurement = sensor_object.measurement_types[0]
+    if sensor_object.n_last_averages[first_measurement].capacity != n_average_for_smooth:
+
+        sensor_object.set_smoothing_size(n_average_for_smooth)
+        all_changed_options.add('n_average_for_smooth')
+
+    ###################################
+    return sorted(all_changed_options)
+    ###################################
+
+####################
+# END update_sensor
+####################
+
+
+####################################################################################################
+# Function (update_sensors)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Rollup buckets of removed sensors are written
+####################################################################################################
+def update_sensors(all_parsed_sensors):
+    """
+    Replaces current sensors with sensors parsed from configuration. Sensors are matched by output
+    directory (location) : records of sensors with the same type and address are kept, with their
+    changed options applied (see update_sensor). Other parsed sensors are added, and handles of
+    sensors no longer configured are closed. Changes are kept in last_sensor_changes.
+
+    INPUT
+        all_parsed_sensors (Sensor[]) sensors parsed from configuration, in configuration order
+    """
+
+    global last_sensor_changes
+
+    all_current_sensors = {sensor_object.output_directory: sensor_object for sensor_object in
+                           all_sensors}
+    is_first_configuration = len(all_current_sensors) == 0
+
+    all_new_sensors = []
+    all_added_sensors = []
+    all_removed_sensors = []
+    all_updated_sensors = []
+
+    for parsed_sensor in all_parsed_sensors:
+
+        sensor_object = all_current_sensors.pop(parsed_sensor.output_directory, None)
+
+        # New location, or another device at this location : new record
+        if sensor_object is None or sensor_object.type != parsed_sensor.type or \
+                sensor_object.address != parsed_sensor.address:
+
+            if sensor_object is not None:
+
+                all_removed_sensors.append(sensor_object)
+
+            all_added_sensors.append(parsed_sensor)
+            all_new_sensors.append(parsed_sensor)
+
+            continue
+
+        all_changed_options = update_sensor(sensor_object, parsed_sensor)
+
+        if len(all_changed_options) > 0:
+
+            all_updated_sensors.append((sensor_object, all_changed_options))
+
+        all_new_sensors.append(sensor_object)
+
+    all_removed_sensors.extend(all_current_sensors.values())
+
+    for sensor_object in all_removed_sensors:
+
+        close_sensor_handle(sensor_object)
+        read_metrics.remove_sensor(sensor_object.name)
+
+        # Rollups in progress would be lost (written by flush once a sample falls in next bucket)
+        if history_store is not None:
+
+            history_store.close_buckets(sensor_object.name)
+
+    # Same list object : other modules (worker, simulation) keep a reference to it
+    all_sensors[:] = all_new_sensors
+
+    last_sensor_changes = {'added': all_added_sensors, 'removed': all_removed_sensors,
+                           'updated': all_updated_sensors}
+
+    if not is_first_configuration and \
+            len(all_added_sensors) + len(all_removed_sensors) + len(all_updated_sensors) > 0:
+
+        general_utils.log_message('Sensors reconfigured. Added: %s. Removed: %s. Updated: %s.' % (
+            [sensor_object.name for sensor_object in all_added_sensors],
+            [sensor_object.name for sensor_object in all_removed_sensors],
+            ['%s (%s)' % (sensor_object.name, ', '.join(all_changed_options)) for
+             sensor_object, all_changed_options in all_updated_sensors]))
+
+    #######
+    return
+    #######
+
+#####################
+# END update_sensors
+#####################
+
+
+####################################################################################################
+# Function (is_config_changed)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def is_config_changed():
+    """
+    Checks whether configuration file was modified since it was last read.
+
+    OUTPUT
+        (bool) True if modification time changed, False otherwise (or if file can not be read)
+    """
+
+    try:
+
+        ########################################################
+        return os.path.getmtime(config_file_url) != config_mtime
+        ########################################################
+
+    except OSError:
+
+        #############
+        return False
+        #############
+
+########################
+# END is_config_changed
+########################
+
+
+####################################################################################################
+# Function (request_reload)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def request_reload(signal_number, _):
+    """
+    Signal handler (SIGHUP) : configuration is reloaded by the main loop at its next deadline.
+
+    INPUT
+        signal_number (int) signal received
+    """
+
+    del signal_number
+
+    reload_requested.set()
+
+    #######
+    return
+    #######
+
+#####################
+# END request_reload
+#####################
+
+
+####################################################################################################
+# Function (reload_configuration)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def reload_configuration(scheduler):
+    """
+    Reads configuration file again (SIGHUP, or file modified) and applies changes of sampling
+    parameters and sensors to the running script : sensors added/removed, new intervals,
+    corrections, ... Unchanged sensors keep their samples, smoothing buffers and open handles.
+    Current sensors are kept if new configuration has no valid sensor.
+
+    INPUT
+        scheduler (SamplingScheduler) scheduler of the main loop, updated with changed sensors
+
+    OUTPUT
+        (int) 0 if configuration was reloaded, negative integer otherwise
+    """
+
+    reload_requested.clear()
+    general_utils.log_message('Reloading configuration (%s).' % config_file_url)
+
+    error_code = read_configuration(config_file_url, is_reload=True)
+
+    if error_code != 0:
+
+        ##################
+        return error_code
+        ##################
+
+    # Output directories of added sensors
+    error_code = initialize_data_files()
+
+    reschedule_sensors(scheduler, last_sensor_changes)
+
+    ##################
+    return error_code
+    ##################
+
+###########################
+# END reload_configuration
+###########################
+
+
+####################################################################################################
+# Function (initialize_data_files)
+####################################################################################################
+# Revision History:
+#   2016-10-27 AB - Function Created
+#   2026-10-19 AB - Creates snapshot directory. Sensor directories only if .dat files are written.
+####################################################################################################
+def initialize_data_files():
+    """
+    Initializes all required folders to export measurements from sensor.
+    
+    OUTPUT
+        (int) 0 if no fatal problem while initializing output folders, negative integer otherwise
+    """
+
+    all_output_directories = []
+
+    if write_dat_files:
+
+        all_output_directories += [sensor.output_directory for sensor in all_sensors]
+
+    if snapshot_file is not None and os.path.dirname(snapshot_file) != '':
+
+        all_output_directories.append(os.path.dirname(snapshot_file))
+
+    # For each output directory (sensor .dat files, snapshot)
+    for output_directory in all_output_directories:
 
         # Creates necessary directories if they did not exist already
         if not os.path.exists(output_directory):
@@ -577,101 +1572,408 @@ def initialize_data_files():
 
 
 ####################################################################################################
-# Function (read_sensor_values)
+# Function (read_sensor)
 ####################################################################################################
 # Revision History:
-#   2016-10-27 AB - Function Created
+#   2016-10-27 AB - Function Created (as part of read_sensor_values)
 #   2016-10-28 AB - Added filter for outliers and warmup phase
+#   2026-10-19 AB - Split from read_sensor_values. Samples are stored with their timestamp.
+#   2026-10-19 AB - Sensor is not read during warmup. Samples go through outlier filters.
+#   2026-10-19 AB - Reads through a handle kept open, reopened after a failure
+#   2026-10-19 AB - Reads suspended by a circuit breaker after repeated failures
+#   2026-10-19 AB - Updates sampling interval of sensors with adaptive sampling
+#   2026-10-19 AB - Read time and skipped samples added to read metrics
+#   2026-10-19 AB - Unexpected driver errors logged and counted as failed reads
+#   2026-10-19 AB - Reads whose samples are all rejected count as failures for the breaker
 ####################################################################################################
-def read_sensor_values():
+def read_sensor(sensor_object):
     """
-    Collects sample from all registered sensors.
+    Collects one sample from a sensor, and adds it with its timestamp to its samples to average,
+    unless its outlier filter rejects it. Sensors failing again and again are only read when their
+    circuit breaker allows it. Read time and outcome (or reason for not reading) are added to the
+    read metrics of the sensor. Must be called while holding the lock of the sensor bus.
+    Any driver error counts as a failed read (unexpected ones are logged with their traceback).
+    For the circuit breaker, a read whose samples were all rejected by the outlier filters fails
+    as well : a sensor returning only discarded values is read less and less often.
+
+    INPUT
+        sensor_object (Sensor) information about a sensor, as shown in global variables
     """
 
-    # For each sensor registered
-    for sensor_object in all_sensors:
+    sensor_name = sensor_object.name
+    sensor_address = sensor_object.address
+    sensor_metrics = read_metrics.get_sensor_metrics(sensor_name, sensor_object.type)
 
-        sensor_name = sensor_object['name']
-        sensor_address = sensor_object['address']
+    # Values are ignored if sensor is in a warm-up phase, so sensor (and its bus) is not read.
+    current_time = time.time()
+    if current_time < sensor_object.last_failed_measure_time + sensor_object.warmup:
 
-        try:
+        sensor_metrics.add_skip('warmup')
+
+        #######
+        return
+        #######
+
+    # Sensor failed too many times in a row : only read again once its retry delay is over
+    if not sensor_object.breaker.allow_read():
+
+        sensor_metrics.add_skip('suspended')
+
+        #######
+        return
+        #######
+
+    is_read_successful = False  # Whether at least one measure was collected
+    all_accepted_values = {}  # Measures kept (not rejected by outlier filters)
+    read_start_time = time.perf_counter()
+
+    try:
+
+        # Opens sensor with its driver on first read, or after a failure. Kept open afterwards.
+        if sensor_object.handle is None:
+
+            appropriate_driver = sensor_to_driver.get(sensor_object.type)
+            opened_handle = sensor_handle.create_handle(appropriate_driver,
+                                                        sensor_object.correction)
+            opened_handle.open(sensor_address)
+            sensor_object.handle = opened_handle
 
-            # Fetch sensor-relevant module and calls its get_measurements function.
-            appropriate_driver = sensor_to_driver.get(sensor_object['type'])
-            all_values = appropriate_driver.get_measurements(sensor_address,
-                                                             sensor_object['correction'])
+        all_values = sensor_object.handle.read()
+        current_time = time.time()
 
-            # Ignore value if sensor is in a warm-up phase.
-            current_time = time.time()
-            in_warmup = current_time < sensor_object['last_failed_measure_time'] + \
-                sensor_object['warmup']
+        # Drivers also report failures with missing values (e.g. DHT11 after all its retries)
+        is_read_successful = any(value is not None for value in all_values.values())
 
-            # Only adds if value must not be filtered
-            if not in_warmup:
+        # Adds all measurement collected by sensor. (Temperature, Humidity, Pressure, ...)
+        for measurement in all_values.keys():
 
-                # Adds all measurement collected by sensor. (Temperature, Humidity, Pressure, ...)
-                for measurement in all_values.keys():
+            measurement_value = all_values[measurement]
 
-                    # Only adds measure if it succeedeed
-                    if all_values[measurement] is not None:
+            # Only adds measure if it succeedeed and is not an outlier. Protected by sensor lock, as
+            # samples may be taken for averaging at the same time by the main thread.
+            if measurement_value is None or \
+                    sensor_object.is_outlier(measurement, measurement_value):
 
-                        sensor_object['samples_to_average'][measurement].append(
-                            all_values[measurement])
+                continue
 
-        except (IOError, ImportError) as e:
+            all_accepted_values[measurement] = measurement_value
+            sensor_object.add_sample(measurement, current_time, measurement_value)
 
-            # Measuring sensor failed => Assume disconnection, so warm-up must take place again
-            sensor_object['last_failed_measure_time'] = time.time()
+            if history_store is not None:
+
+                history_store.append(sensor_object.name, measurement, current_time,
+                                     measurement_value)
+
+        # Adaptive sampling : next sample sooner if values change, later if they are stable
+        adaptive_interval = sensor_object.adaptive_interval
+        if adaptive_interval is not None:
+
+            last_interval = adaptive_interval.interval
+
+            if adaptive_interval.update(all_accepted_values) != last_interval:
+
+                sampling_intervals_changed.set()
+
+    except Exception as e:
+
+        # Measuring sensor failed => Assume disconnection, so warm-up must take place again
+        sensor_object.last_failed_measure_time = time.time()
+
+        # Sensor is opened again after warm-up
+        if sensor_object.handle is not None:
+
+            sensor_object.handle.close()
+            sensor_object.handle = None
+
+        details = '(%s, %s)' % (sensor_name, str(sensor_address))
+
+        if isinstance(e, (IOError, ImportError)):
 
-            details = '(' + sensor_name + ', ' + hex(sensor_address) + ')'
             general_utils.log_error(-409, details, str(e))
 
+        else:
+
+            # Unexpected error (driver bug, wrong data, ...). Read runs in a pool thread, so it
+            # would otherwise only be stored in the future of the read.
+            general_utils.log_error(-999, details + '\n' + traceback.format_exc(), str(e))
+
+    # Time over the sampling interval counts as overrun (next sample skipped or late)
+    sample_interval = sensor_object.sample_interval
+    if sensor_object.adaptive_interval is not None:
+
+        sample_interval = sensor_object.adaptive_interval.interval
+
+    sensor_metrics.add_read(time.perf_counter() - read_start_time, is_read_successful,
+                            sample_interval)
+
+    # Samples all discarded downstream : reading sensor at full rate is useless
+    if len(all_accepted_values) > 0:
+
+        if sensor_object.breaker.record_success():
+
+            general_utils.log_message('Sensor %s is back, reads resumed.' % sensor_name)
+
+    elif sensor_object.breaker.record_failure():
+
+        details = '(%s, %s). %d failed or rejected reads in a row, next read in %.0f s.' % (
+            sensor_name, str(sensor_address), sensor_object.breaker.n_consecutive_failures,
+            sensor_object.breaker.current_backoff)
+        general_utils.log_error(-430, details)
+
+    #######
+    return
+    #######
+
+##################
+# END read_sensor
+##################
+
+
+####################################################################################################
+# Function (get_bus_lock)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Locks shared with other processes (flock)
+####################################################################################################
+def get_bus_lock(sensor_object):
+    """
+    Returns the lock of the bus a sensor communicates through (as given by its driver). Sensors on
+    the same bus can not be read at the same time, by this script or by other processes (e.g.
+    worker sending infrared signals).
+
+    INPUT
+        sensor_object (Sensor) information about a sensor, as shown in global variables
+
+    OUTPUT
+        (bus_lock_manager.BusLock) lock for the bus of the sensor
+    """
+
+    appropriate_driver = sensor_to_driver.get(sensor_object.type)
+    bus_name = appropriate_driver.get_bus_name(sensor_object.address)
+
+    bus_lock = bus_lock_manager.get_lock(bus_name)
+
+    ################
+    return bus_lock
+    ################
+
+###################
+# END get_bus_lock
+###################
+
+
+####################################################################################################
+# Function (read_sensor_on_bus)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Sample skipped if bus is busy for too long
+#   2026-10-19 AB - Bus timeouts added to read metrics
+####################################################################################################
+def read_sensor_on_bus(sensor_object):
+    """
+    Collects one sample from a sensor once its bus is free. Runs in the sensor thread pool. Sample
+    is skipped if bus is still busy after bus_lock_timeout.
+
+    INPUT
+        sensor_object (Sensor) information about a sensor, as shown in global variables
+    """
+
+    bus_lock = get_bus_lock(sensor_object)
+
+    if not bus_lock.acquire(timeout=bus_lock_timeout):
+
+        details = '(%s, %s). %d timeouts.' % (sensor_object.name, bus_lock.bus_name,
+                                              bus_lock.n_timeouts)
+        general_utils.log_error(-431, details)
+
+        read_metrics.get_sensor_metrics(sensor_object.name, sensor_object.type).add_skip(
+            'bus_timeout')
+
+        #######
+        return
+        #######
+
+    try:
+
+        read_sensor(sensor_object)
+
+    finally:
+
+        bus_lock.release()
+
     #######
     return
     #######
 
 #########################
-# END read_sensor_values
+# END read_sensor_on_bus
+#########################
+
+
+####################################################################################################
+# Function (submit_sensor_reads)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Skipped samples added to read metrics
+#   2026-10-19 AB - Errors escaping reads are logged when they finish
+####################################################################################################
+def submit_sensor_reads(all_sensor_objects):
+    """
+    Starts reading sensors in the sensor thread pool, without waiting for the results. Each bus
+    (I2C, GPIO pin, one-wire sensor) can be read at the same time as others, so a slow sensor
+    (DHT11 retries, one-wire conversion) does not delay sensors on other buses.
+    A sensor whose previous read is not over yet is skipped. Errors escaping a read are logged
+    once it finishes (see log_read_exception).
+
+    INPUT
+        all_sensor_objects (Sensor[]) sensors to read
+
+    OUTPUT
+        (concurrent.futures.Future[]) one future for each read started
+    """
+
+    # Thread pool is created on first use, and grows with the number of sensors.
+    if sensor_read_pool is None or sensor_read_pool_size < len(all_sensors):
+
+        create_sensor_read_pool(max(1, len(all_sensors)))
+
+    all_futures = []
+
+    for sensor_object in all_sensor_objects:
+
+        pending_read = sensor_object.pending_read
+
+        # Previous read still running or waiting for its bus => skip sample
+        if pending_read is not None and not pending_read.done():
+
+            read_metrics.get_sensor_metrics(sensor_object.name, sensor_object.type).add_skip(
+                'overrun')
+
+            continue
+
+        sensor_object.pending_read = sensor_read_pool.submit(read_sensor_on_bus, sensor_object)
+        sensor_object.pending_read.add_done_callback(log_read_exception)
+        all_futures.append(sensor_object.pending_read)
+
+    ###################
+    return all_futures
+    ###################
+
+##########################
+# END submit_sensor_reads
+##########################
+
+
+####################################################################################################
+# Function (log_read_exception)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def log_read_exception(finished_read):
+    """
+    Logs the error of a read which ended with an exception (read_sensor already handles driver
+    errors, so only errors outside of it end here, e.g. while waiting for the bus). Done callback
+    of the futures of submit_sensor_reads.
+
+    INPUT
+        finished_read (concurrent.futures.Future) finished read of a sensor
+    """
+
+    if finished_read.cancelled():
+
+        #######
+        return
+        #######
+
+    read_exception = finished_read.exception()
+
+    if read_exception is not None:
+
+        error_details = ''.join(traceback.format_exception(type(read_exception), read_exception,
+                                                           read_exception.__traceback__))
+        general_utils.log_error(-999, error_details, str(read_exception))
+
+    #######
+    return
+    #######
+
+#########################
+# END log_read_exception
 #########################
 
 
 ####################################################################################################
-# Function (remove_obsolete_data)
+# Function (read_sensor_values)
 ####################################################################################################
 # Revision History:
 #   2016-10-27 AB - Function Created
-#   2016-11-05 AB - Generalized function (measure-independent)
+#   2016-10-28 AB - Added filter for outliers and warmup phase
+#   2026-10-19 AB - Sensors on different buses are read in parallel
 ####################################################################################################
-def remove_obsolete_data():
+def read_sensor_values(all_sensor_objects=None):
     """
-    Removes data from more than N averaged samples ago (if it exists).
-    This is only used for the smoothing function
+    Collects sample from all registered sensors, reading sensors on different buses in parallel,
+    and waits until all samples are collected.
+
+    INPUT
+        all_sensor_objects (Sensor[], opt) sensors to read. All registered sensors by default.
     """
 
-    # Removes "too-old" values for all of the registered sensors.
-    for sensor_object in all_sensors:
+    if all_sensor_objects is None:
 
-        try:
+        all_sensor_objects = all_sensors
 
-            # Removes oldest value for all types of measurements.
-            for measurement in sensor_object['n_last_averages'].keys():
+    # Waits for all reads. result() re-raises unhandled errors from reading threads.
+    for future in submit_sensor_reads(all_sensor_objects):
 
-                # Removes oldest average in memory, to keep constant number of entries in array
-                sensor_object['n_last_averages'][measurement].pop(0)
+        future.result()
 
-        except IndexError:
+    #######
+    return
+    #######
 
-            # The list was empty, so there is nothing to remove.
-            # This should NEVER happen, since number of entries should be constant
-            pass
+#########################
+# END read_sensor_values
+#########################
 
-    ######
+
+####################################################################################################
+# Function (create_sensor_read_pool)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def create_sensor_read_pool(n_threads):
+    """
+    Creates (or replaces) the thread pool used to read sensors in parallel. One thread per sensor
+    is used, as threads waiting for a busy bus must not prevent other buses from being read.
+
+    INPUT
+        n_threads (int) number of threads in the pool
+    """
+
+    global sensor_read_pool
+    global sensor_read_pool_size
+
+    if sensor_read_pool is not None:
+
+        sensor_read_pool.shutdown(wait=True)
+
+    sensor_read_pool = concurrent.futures.ThreadPoolExecutor(max_workers=n_threads,
+                                                             thread_name_prefix='sensor-bus')
+    sensor_read_pool_size = n_threads
+
+    #######
     return
-    ######
+    #######
 
-###########################
-# END remove_obsolete_data
-###########################
+##############################
+# END create_sensor_read_pool
+##############################
 
 
 ####################################################################################################
@@ -680,24 +1982,45 @@ def remove_obsolete_data():
 # Revision History:
 #   2016-10-27 AB - Function Created
 #   2016-11-05 AB - Generalized function (measure-independent)
+#   2026-10-19 AB - Optional. Files whose value did not change are not rewritten.
 ####################################################################################################
-def output_data(sensor_dictionnary_object):
+def output_data(sensor_object):
     """
     Creates .dat files for data to output for a given sensor, and write said output in these files.
+    Does nothing if .dat files are disabled. Files are only rewritten when their value changed.
     
     INPUT
-        sensor_dictionnary_object {Dict} information about a sensor, as shown in global variables
+        sensor_object (Sensor) information about a sensor, as shown in global variables
     """
 
+    if not write_dat_files:
+
+        #######
+        return
+        #######
+
     # Gets the output directories, where the file must be created
-    output_directory = sensor_dictionnary_object['output_directory']
+    output_directory = sensor_object.output_directory
 
     # For every type of measurement, create a dat.file as  output_directory/measurement_name.dat
-    for measurement in sensor_dictionnary_object['smoothed_average'].keys():
+    for measurement in sensor_object.smoothed_average.keys():
+
+        if sensor_object.smoothed_average[measurement] is None:
+
+            continue
+
+        value_to_export = '%0.3f' % (sensor_object.smoothed_average[measurement],)
+
+        # Same value already in file (e.g. stable temperature) : spares a write on the SD card
+        if sensor_object.last_output_values.get(measurement) == value_to_export:
+
+            continue
 
         output_filename = '%s%s.dat' % (output_directory, measurement)
-        value_to_export = '%0.3f' % (sensor_dictionnary_object['smoothed_average'][measurement],)
-        general_utils.create_os_file(output_filename, value_to_export)
+
+        if general_utils.create_os_file(output_filename, value_to_export) == 0:
+
+            sensor_object.last_output_values[measurement] = value_to_export
 
     #######
     return
@@ -715,25 +2038,34 @@ def output_data(sensor_dictionnary_object):
 #   2016-10-27 AB - Function Created
 #   2016-11-05 AB - Generalized function (measure-independent)
 ####################################################################################################
-def delete_output_files(sensor_dictionnary_object):
+def delete_output_files(sensor_object):
     """
     Deletes .dat files that were created by this script.
     Used when failing to get value from the sensors => avoid having a file that gives impression 
     that code is still working fine
     
     INPUT
-        sensor_dictionnary_object {Dict} information about a sensor, as shown in global variables
+        sensor_object (Sensor) information about a sensor, as shown in global variables
     """
 
+    if not write_dat_files:
+
+        #######
+        return
+        #######
+
     # Gets the output directories, where the files were created
-    output_directory = sensor_dictionnary_object['output_directory']
+    output_directory = sensor_object.output_directory
 
     # For every type of measurement, removes dat.file
-    for measurement in sensor_dictionnary_object['smoothed_average'].keys():
+    for measurement in sensor_object.smoothed_average.keys():
 
         output_filename = '%s%s.dat' % (output_directory, measurement)
         general_utils.delete_os_file(output_filename)
 
+    # Next value must be written again
+    sensor_object.last_output_values.clear()
+
     #######
     return
     #######
@@ -744,103 +2076,220 @@ def delete_output_files(sensor_dictionnary_object):
 
 
 ####################################################################################################
-# Function (average_ignore_none)
+# Function (output_snapshot)
 ####################################################################################################
 # Revision History:
-#   2016-10-27 AB - Function Created
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Circuit breaker stats of each sensor
+#   2026-10-19 AB - Contention metrics of bus locks
+#   2026-10-19 AB - Capture statistics of timing-critical drivers
+#   2026-10-19 AB - Read metrics of each sensor
 ####################################################################################################
-def average_ignore_none(array_with_none):
+def output_snapshot():
     """
-    Computes average of an array that may contain None entries, by filtering these entries then 
-    averaging on the residue.
-    
+    Writes smoothed values of all sensors into the snapshot file, as
+    {"time": epoch, "sensors": {location: {"type": ..., "values": {measurement: value|null},
+    "reads": {circuit breaker state and read counts}, "metrics": {read times, skipped samples},
+    "capture": {first-try success, jitter} (timing-critical drivers only)}},
+    "buses": {bus name: {contention metrics}}}.
+    Failed measurements are null. File is replaced atomically, and only rewritten if a value (or
+    breaker state) changed or if it is older than snapshot_refresh (so that readers can check it is
+    up to date).
+    """
+
+    global last_snapshot_values, last_snapshot_time
+
+    all_sensor_values = {}
+    all_compared_values = {}
+
+    for sensor_object in all_sensors:
+
+        all_measurement_values = {}
+
+        for measurement, smoothed_value in sensor_object.smoothed_average.items():
+
+            if smoothed_value is not None:
+
+                smoothed_value = round(smoothed_value, 3)
+
+            all_measurement_values[measurement] = smoothed_value
+
+        sensor_metrics = read_metrics.get_sensor_metrics(sensor_object.name, sensor_object.type)
+        all_sensor_values[sensor_object.name] = {'type': sensor_object.type,
+                                                 'values': all_measurement_values,
+                                                 'reads': sensor_object.breaker.get_stats(),
+                                                 'metrics': sensor_metrics.get_stats()}
+
+        # Timing-critical drivers (e.g. DHT11) also report first-try success and sampling jitter
+        sensor_driver = sensor_to_driver.get(sensor_object.type)
+        get_capture_stats = getattr(sensor_driver, 'get_capture_stats', None)
+
+        if get_capture_stats is not None:
+
+            all_sensor_values[sensor_object.name]['capture'] = \
+                get_capture_stats(sensor_object.address)
+
+        # Read counts change at each sample : only values and breaker state trigger a rewrite
+        all_compared_values[sensor_object.name] = (all_measurement_values,
+                                                   sensor_object.breaker.state)
+
+    current_time = time.time()
+
+    if all_compared_values == last_snapshot_values and \
+            current_time < last_snapshot_time + snapshot_refresh:
+
+        #######
+        return
+        #######
+
+    snapshot_content = json.dumps({'time': round(current_time, 3), 'sensors': all_sensor_values,
+                                   'buses': bus_lock_manager.get_stats()}, sort_keys=True)
+
+    if general_utils.create_os_file(snapshot_file, snapshot_content) == 0:
+
+        last_snapshot_values = all_compared_values
+        last_snapshot_time = current_time
+
+    #######
+    return
+    #######
+
+######################
+# END output_snapshot
+######################
+
+
+####################################################################################################
+# Function (get_sensor_counters)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_sensor_counters(sensor_object):
+    """
+    Returns counters of a sensor kept outside of the read metrics : samples rejected by outlier
+    filters, and retries/failed tries of timing-critical drivers (e.g. DHT11).
+
     INPUT
-        array_with_none ((float|int|None)[]) : array of values for average computation
-        
+        sensor_object (Sensor) information about a sensor, as shown in global variables
+
     OUTPUT
-        (float) : average value in array, discarding None values
+        (Dict) counter name => cumulative value (see sensor_metrics.counter_descriptions)
     """
 
-    not_none_count = 0
-    array_average = 0.0
-
-    # Only count/add non-None elements
-    for element in array_with_none:
+    all_counters = {'rejected_outliers': sensor_object.n_rejected_samples}
 
-        if element is not None:
+    sensor_driver = sensor_to_driver.get(sensor_object.type)
+    get_capture_stats = getattr(sensor_driver, 'get_capture_stats', None)
+    all_capture_stats = None
 
-            array_average += element
-            not_none_count += 1
+    if get_capture_stats is not None:
 
-    # Returns zero if the array contains nothing but None
-    if not_none_count == 0:
+        all_capture_stats = get_capture_stats(sensor_object.address)
 
-        array_average = 0.0
+    if all_capture_stats is not None:
 
-    # Else return the average of entries grabbed
-    else:
+        for counter_name in ('retries', 'checksum_failures', 'incomplete_frames'):
 
-        array_average /= not_none_count
+            all_counters[counter_name] = all_capture_stats[counter_name]
 
     ####################
-    return array_average
+    return all_counters
     ####################
 
 ##########################
-# END average_ignore_none
+# END get_sensor_counters
 ##########################
 
 
+####################################################################################################
+# Function (output_metrics)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def output_metrics(scheduler=None):
+    """
+    Writes read metrics of all sensors into the metrics file, in the Prometheus text format (for
+    node_exporter textfile collector). File is replaced atomically.
+
+    INPUT
+        scheduler (SamplingScheduler, opt) scheduler of the main loop, whose lateness is exported
+    """
+
+    all_sensor_counters = {sensor_object.name: get_sensor_counters(sensor_object) for
+                           sensor_object in all_sensors}
+
+    all_loop_stats = None
+    if scheduler is not None:
+
+        all_loop_stats = scheduler.get_stats()
+
+    general_utils.create_os_file(metrics_file,
+                                 read_metrics.format_prometheus(all_sensor_counters,
+                                                                all_loop_stats))
+
+    #######
+    return
+    #######
+
+#####################
+# END output_metrics
+#####################
+
+
 ####################################################################################################
 # Function (average_sensor_measures)
 ####################################################################################################
 # Revision History:
 #   2016-10-27 AB - Function Created
 #   2016-11-05 AB - Generalized function (measure-independent)
+#   2026-10-19 AB - Samples taken out of sensor by caller. Running sums and ring buffers (O(1)).
+#   2026-10-19 AB - Evaluates automation rules depending on each new smoothed average
 ####################################################################################################
-def average_sensor_measures(sensor_dictionnary_object):
+def average_sensor_measures(sensor_object, collected_samples):
     """
     Averages successive sample values into on intermediary average, smoothes it using previous 
-    averages, then outputs it
+    averages, then outputs it. Automation rules depending on the new values are evaluated.
 
     INPUT
-        sensor_dictionnary_object {Dict} information about a sensor, as shown in global variables
+        sensor_object (Sensor) information about a sensor, as shown in global variables
+        collected_samples {Dict} measurement => SampleAccumulator with samples to average
     """
 
+    average_time = time.time()
+
     # Applies the process to all types of measurements made
-    for measurement in sensor_dictionnary_object['samples_to_average'].keys():
+    for measurement in collected_samples.keys():
+
+        # Computes average (before smoothing) from running sum of samples
+        sample_average = collected_samples[measurement].get_mean()
+
+        # Adds newly computed average to ring buffer of averages, replacing the oldest one. Missing
+        # averages are kept (as NaN) so that the buffer always covers the same number of cycles.
+        n_last_averages = sensor_object.n_last_averages[measurement]
+        n_last_averages.push(sample_average)
 
         # One of the measure could never be collected.
-        if len(sensor_dictionnary_object) == 0:
+        if sample_average is None:
 
-            details = '(%s, %s)' % (sensor_dictionnary_object['name'], measurement)
+            details = '(%s, %s)' % (sensor_object.name, measurement)
             general_utils.log_error(-424, details)
             continue
 
-        # Gets all samples to create average (before smoothing)
-        latest_data_samples = sensor_dictionnary_object['samples_to_average'][measurement]
-
-        # Computes average (before smoothing)
-        sample_average = 1.0 * sum(latest_data_samples) / len(latest_data_samples)
-
-        # Deletes samples used (will not be used later)
-        sensor_dictionnary_object['samples_to_average'][measurement] = []
-
-        # Adds newly computed average to list of averages
-        sensor_dictionnary_object['n_last_averages'][measurement].append(sample_average)
-
         ############
         # Smoothing
         ############
 
-        # Gets sequence of last averages computed
-        n_last_averages = sensor_dictionnary_object['n_last_averages'][measurement]
-
-        # Smoothes these average by computing their own average (discarding None)
-        smoothed_average = average_ignore_none(n_last_averages)
+        # Smoothes averages by computing their own average (discarding missing ones). Never None,
+        # as the average just added is valid.
+        smoothed_average = n_last_averages.get_mean()
 
         # Updates smoothed_average value in sensor info.
-        sensor_dictionnary_object['smoothed_average'][measurement] = smoothed_average
+        sensor_object.smoothed_average[measurement] = smoothed_average
+
+        # Only rules watching this measurement are evaluated. Never blocks (signals are queued).
+        rule_engine.on_average(sensor_object.name, measurement, smoothed_average, average_time)
 
         #########
         # Output
@@ -850,7 +2299,7 @@ def average_sensor_measures(sensor_dictionnary_object):
         print("Smoothed Average %s : %2.2f" % (measurement, smoothed_average))
 
     # Writes all new measures into appropriate files once all computations are over
-    output_data(sensor_dictionnary_object)
+    output_data(sensor_object)
 
     #######
     return
@@ -866,34 +2315,56 @@ def average_sensor_measures(sensor_dictionnary_object):
 ####################################################################################################
 # Revision History:
 #   2016-10-27 AB - Function Created
+#   2026-10-19 AB - Can be applied to a subset of sensors. Samples taken out under sensor lock.
+#   2026-10-19 AB - Reports samples rejected by outlier filters
 ####################################################################################################
-def post_collection_actions():
+def post_collection_actions(all_sensor_objects=None):
     """
     Applies post-sample-collection actions. If samples successfully collected, averages, smoothes, 
     and prints them. If samples failed to be collected, deletes all output_files to show failure.
+    Samples rejected by outlier filters since last cycle are logged once for each sensor.
 
+    INPUT
+        all_sensor_objects (Sensor[], opt) sensors to process. All registered sensors by default.
     """
 
+    if all_sensor_objects is None:
+
+        all_sensor_objects = all_sensors
+
     # For each  sensor registered
-    for sensor_object in all_sensors:
+    for sensor_object in all_sensor_objects:
+
+        print("== Sensor %s ==" % sensor_object.name)
 
-        print("== Sensor %s ==" % sensor_object["name"])
+        # Takes collected samples out of the sensor (reading threads may be adding samples)
+        collected_samples = sensor_object.take_samples()
+
+        # One error per cycle (not per sample), with total counts to spot sensors always rejected
+        n_rejected_samples = sensor_object.n_rejected_samples
+        if n_rejected_samples > sensor_object.n_rejected_reported:
+
+            details = '(%s, %d samples this cycle, %d rejected / %d accepted since start)' % (
+                sensor_object.name, n_rejected_samples - sensor_object.n_rejected_reported,
+                n_rejected_samples, sensor_object.n_accepted_samples)
+            general_utils.log_error(-413, details)
+            sensor_object.n_rejected_reported = n_rejected_samples
 
         # Only computes/print smoothed average if last sample_collection was successfull
-        first_key = list(sensor_object['samples_to_average'].keys())[0]
-        if len(sensor_object['samples_to_average'][first_key]) > 0:
+        first_key = sensor_object.measurement_types[0]
+        if collected_samples[first_key].n_samples > 0:
 
-            print("Number of Samples: " + str(len(sensor_object['samples_to_average'])))
+            print("Number of Samples: " + str(collected_samples[first_key].n_samples))
 
-            average_sensor_measures(sensor_object)
+            average_sensor_measures(sensor_object, collected_samples)
 
-        # Otherwise, append None to the average list (to balance the remove_obsolete_data function)
+        # Otherwise, adds missing average (oldest average leaves the smoothing window)
         else:
 
-            for measurement in sensor_object['samples_to_average'].keys():
+            for measurement in collected_samples.keys():
 
-                sensor_object['n_last_averages'][measurement].append(None)
-                sensor_object['smoothed_average'][measurement] = None
+                sensor_object.n_last_averages[measurement].push(None)
+                sensor_object.smoothed_average[measurement] = None
 
             # Deletes the .dat files.
             delete_output_files(sensor_object)
@@ -904,7 +2375,6 @@ def post_collection_actions():
     return
     ######
 
-##############################
 # END post_collection_actions
 ##############################
 
@@ -912,24 +2382,28 @@ def post_collection_actions():
 ####################################################################################################
 # Function(output_measures_to_web)
 ####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Update is queued for the exporter thread (no more blocking request)
+####################################################################################################
 def output_measures_to_web():
     """
-    Exports all smoothes averages collected from each sensor to thingspeak website.
+    Exports all smoothes averages collected from each sensor to thingspeak website. Only queues
+    the update : it is sent by the exporter thread.
     """
 
-    all_fields_as_string = ''  # String containing all measure values (arguments for request)
+    all_field_values = {}  # Field name => measure value (arguments for request)
     field_index = 1  # Current index of argument to send
 
-    # Goes through each measurement or each sensor to construct the string
+    # Goes through each measurement or each sensor to construct the fields
     for sensor_object in all_sensors:
 
-        for measurement in sensor_object['smoothed_average'].keys():
+        for measurement in sensor_object.smoothed_average.keys():
 
-            # Augments string with '&fieldX=YY.YYY', with X index and YY.YYY values. (ignore None)
+            # Adds 'fieldX': 'YY.YYY', with X index and YY.YYY values. (ignore None)
             try:
 
-                measurement_value = float(sensor_object['smoothed_average'][measurement])
-                all_fields_as_string += '&field%d=%0.3f' % (field_index, measurement_value)
+                measurement_value = float(sensor_object.smoothed_average[measurement])
+                all_field_values['field%d' % field_index] = '%0.3f' % measurement_value
 
             except TypeError:
 
@@ -939,26 +2413,300 @@ def output_measures_to_web():
             # Increments field_index for following arguments
             field_index += 1
 
-    # Constructs URL to use to post data.
-    update_url = thingspeak_url + all_fields_as_string
+    thingspeak.queue_update(all_field_values)
 
-    try:
+    #######
+    return
+    #######
+
+#############################
+# END output_measures_to_web
+#############################
+
+
+####################################################################################################
+# Function(create_sampling_scheduler)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Adaptive sampling intervals, wait interrupted when they change
+#   2026-10-19 AB - Clock and sleep functions as arguments (simulated time)
+####################################################################################################
+def create_sampling_scheduler(clock_function=None, sleep_function=None):
+    """
+    Creates the scheduler for the main loop, with for each sensor a sampling task (every
+    sample_interval, or adaptive interval) and an averaging task (every sample_interval *
+    n_sample_for_average), plus an output task (thingspeak, sensor stream) using the general
+    parameters.
 
-        # GET request for url to update data.
-        request.urlopen(update_url)
+    INPUT
+        clock_function (function, opt) monotonic clock. time.monotonic by default.
+        sleep_function (function, opt) waits until next deadline. By default, waits until a
+            sampling interval changes (sampling_intervals_changed).
+
+    OUTPUT
+        (SamplingScheduler) scheduler with all tasks registered
+    """
+
+    if clock_function is None:
+
+        clock_function = time.monotonic
+
+    # Waiting for next deadline is interrupted when a sampling interval changes
+    if sleep_function is None:
+
+        sleep_function = sampling_intervals_changed.wait
+
+    scheduler = sampling_scheduler.SamplingScheduler(clock_function, sleep_function)
+    start_time = scheduler.clock_function()
+
+    for sensor_object in all_sensors:
+
+        schedule_sensor(scheduler, sensor_object, start_time)
+
+    # Outputs happen shortly after averages (which come before samples due at the same time)
+    output_interval = sample_interval * n_sample_for_average
+    scheduler.add_task(('output', None), output_interval, start_time + output_interval)
+
+    #################
+    return scheduler
+    #################
 
-    except (request.URLError, http.client.BadStatusLine):
+################################
+# END create_sampling_scheduler
+################################
 
-        # Failed to send request to update data. Log error but continue
-        general_utils.log_error(-419, update_url)
+
+####################################################################################################
+# Function(schedule_sensor)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created (from create_sampling_scheduler)
+####################################################################################################
+def schedule_sensor(scheduler, sensor_object, start_time):
+    """
+    Adds sampling and averaging tasks of a sensor to the scheduler. First sample is taken at
+    start_time, first average one averaging interval later.
+
+    INPUT
+        scheduler (SamplingScheduler) scheduler of the main loop
+        sensor_object (Sensor) sensor to schedule
+        start_time (float) time of first sample (scheduler clock)
+    """
+
+    sensor_key = sensor_object.output_directory
+    averaging_interval = sensor_object.sample_interval * sensor_object.n_sample_for_average
+
+    # Adaptive sampling starts with its shortest interval
+    sensor_sample_interval = sensor_object.sample_interval
+    if sensor_object.adaptive_interval is not None:
+
+        sensor_sample_interval = sensor_object.adaptive_interval.interval
+
+    scheduler.add_task(('sample', sensor_key), sensor_sample_interval, start_time)
+    scheduler.add_task(('average', sensor_key), averaging_interval,
+                       start_time + averaging_interval)
 
     #######
     return
     #######
 
-#############################
-# END output_measures_to_web
-#############################
+######################
+# END schedule_sensor
+######################
+
+
+####################################################################################################
+# Function(reschedule_sensors)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def reschedule_sensors(scheduler, all_sensor_changes):
+    """
+    Updates scheduler after sensors were reconfigured : tasks of removed sensors are removed,
+    added sensors are scheduled from now, and intervals of updated sensors (and of outputs) are
+    changed from their next deadline.
+
+    INPUT
+        scheduler (SamplingScheduler) scheduler of the main loop
+        all_sensor_changes (Dict) sensors added, removed and updated (see last_sensor_changes)
+    """
+
+    # Removed first : a sensor replaced at the same location has the same task keys
+    for sensor_object in all_sensor_changes['removed']:
+
+        scheduler.remove_task(('sample', sensor_object.output_directory))
+        scheduler.remove_task(('average', sensor_object.output_directory))
+
+    start_time = scheduler.clock_function()
+
+    for sensor_object in all_sensor_changes['added']:
+
+        schedule_sensor(scheduler, sensor_object, start_time)
+
+    for sensor_object, _ in all_sensor_changes['updated']:
+
+        sensor_sample_interval = sensor_object.sample_interval
+        if sensor_object.adaptive_interval is not None:
+
+            sensor_sample_interval = sensor_object.adaptive_interval.interval
+
+        scheduler.set_interval(('sample', sensor_object.output_directory), sensor_sample_interval)
+        scheduler.set_interval(('average', sensor_object.output_directory),
+                               sensor_object.sample_interval * sensor_object.n_sample_for_average)
+
+    scheduler.set_interval(('output', None), sample_interval * n_sample_for_average)
+
+    #######
+    return
+    #######
+
+#########################
+# END reschedule_sensors
+#########################
+
+
+####################################################################################################
+# Function(update_sampling_intervals)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def update_sampling_intervals(scheduler):
+    """
+    Moves sampling deadlines of sensors with adaptive sampling whose interval changed since they
+    were scheduled.
+
+    INPUT
+        scheduler (SamplingScheduler) scheduler of the main loop
+    """
+
+    # Cleared first : a change made while updating wakes up the next wait
+    sampling_intervals_changed.clear()
+
+    for sensor_object in all_sensors:
+
+        if sensor_object.adaptive_interval is not None:
+
+            scheduler.set_interval(('sample', sensor_object.output_directory),
+                                   sensor_object.adaptive_interval.interval)
+
+    #######
+    return
+    #######
+
+################################
+# END update_sampling_intervals
+################################
+
+
+####################################################################################################
+# Function(close_sensor_handle)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created (from close_sensor_handles)
+####################################################################################################
+def close_sensor_handle(sensor_object):
+    """
+    Closes an open sensor, once its read in progress is over (a read not started yet is
+    cancelled). Sensor is opened again by its next read, if any.
+
+    INPUT
+        sensor_object (Sensor) sensor to close
+    """
+
+    pending_read = sensor_object.pending_read
+
+    if pending_read is not None and not pending_read.cancel():
+
+        concurrent.futures.wait([pending_read], timeout=bus_lock_timeout)
+
+    if sensor_object.handle is None:
+
+        #######
+        return
+        #######
+
+    # Closed anyway if a read is stuck on the bus
+    bus_lock = get_bus_lock(sensor_object)
+    is_bus_acquired = bus_lock.acquire(timeout=bus_lock_timeout)
+
+    sensor_object.handle.close()
+    sensor_object.handle = None
+
+    if is_bus_acquired:
+
+        bus_lock.release()
+
+    #######
+    return
+    #######
+
+##########################
+# END close_sensor_handle
+##########################
+
+
+####################################################################################################
+# Function(close_sensor_handles)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Each sensor closed by close_sensor_handle
+####################################################################################################
+def close_sensor_handles():
+    """
+    Closes all open sensors, once reads in progress on their bus are over. Called when the script
+    stops.
+    """
+
+    for sensor_object in all_sensors:
+
+        close_sensor_handle(sensor_object)
+
+    #######
+    return
+    #######
+
+###########################
+# END close_sensor_handles
+###########################
+
+
+####################################################################################################
+# Function (stop_outputs)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Rollup buckets in progress are written
+####################################################################################################
+def stop_outputs():
+    """
+    Writes history samples and rollups still buffered, spools thingspeak updates not sent yet
+    and publishes the last stream messages. Called when the script stops, so that a restart
+    loses nothing.
+    """
+
+    if history_store is not None:
+
+        history_store.flush(include_open_buckets=True)
+
+    if thingspeak is not None:
+
+        thingspeak.stop()
+
+    if stream_publisher is not None:
+
+        stream_publisher.stop()
+
+    #######
+    return
+    #######
+
+###################
+# END stop_outputs
+###################
 
 
 ####################################################################################################
@@ -967,6 +2715,14 @@ def output_measures_to_web():
 # Revision History:
 #   2016-11-02 AB - Function Created
 #   2017-02-10 AB - Added custom log file
+#   2026-10-19 AB - Deadline scheduler (no drift, per-sensor sampling interval)
+#   2026-10-19 AB - Optional snapshot file written after each averaging cycle
+#   2026-10-19 AB - Thingspeak export in background thread
+#   2026-10-19 AB - Logs driver import times
+#   2026-10-19 AB - Sampling deadlines follow adaptive intervals
+#   2026-10-19 AB - Optional metrics file written after each averaging cycle
+#   2026-10-19 AB - Configuration reloaded on SIGHUP or when file is modified
+#   2026-10-19 AB - Starts thread sending remote configurations of automation rules
 ####################################################################################################
 def main():
     """
@@ -995,9 +2751,11 @@ def main():
     # Logs configuration for easier debugging
     general_utils.log_message(str(all_sensors))
 
-    # Deletes temporary variables now that config has been processed properly
-    global list_all_output_directories
-    del list_all_output_directories
+    # Logs time spent importing drivers of configured sensors (startup time)
+    general_utils.log_message('Driver imports:\n' + sensor_to_driver.get_import_report())
+
+    # Configuration is reloaded on SIGHUP (also when configuration file is modified)
+    signal.signal(signal.SIGHUP, request_reload)
 
     # Initializes the data files in which to write to
     print('Checking files...'),
@@ -1012,48 +2770,86 @@ def main():
         general_utils.get_welcome_end_message(script_class_name, is_start=False)
         exit(success_status)
 
-    # Computes sampling time
-    total_waiting_time = sample_interval * n_sample_for_average
+    # Starts export of averaged values to thingspeak (requests never block the main loop)
+    if thingspeak is not None:
+
+        thingspeak.start()
+
+    # Starts publication of averaged values on RabbitMQ. Failure only disables the stream.
+    global stream_publisher
+    if stream_publisher is not None and stream_publisher.start() != 0:
+
+        stream_publisher = None
+
+    # Starts thread sending remote configurations of triggered rules (also for rules added later)
+    rule_engine.start()
+
+    # Each sensor is sampled and averaged on its own schedule. Web outputs use general parameters.
+    scheduler = create_sampling_scheduler()
 
     # Infinite loop of sample-collection, averaging, printing
     while True:
 
-        # Current time
-        sample_collection_start_time = time.time()
+        # New configuration : only differences with current sensors are applied
+        if reload_requested.is_set() or is_config_changed():
+
+            reload_configuration(scheduler)
+
+        # Sampling intervals changed by last reads (adaptive sampling)
+        if sampling_intervals_changed.is_set():
+
+            update_sampling_intervals(scheduler)
+
+        # Sleeps until next deadline (sensor sample, sensor average or output), or until a
+        # sampling interval changes
+        all_due_tasks = scheduler.wait_for_due_tasks()
 
-        # Time until sample collection stops and aggregation starts
-        sample_collection_end_time = sample_collection_start_time + total_waiting_time
+        all_sensors_to_average = [sensor_object for sensor_object in all_sensors if
+                                  ('average', sensor_object.output_directory) in all_due_tasks]
+        all_sensors_to_read = [sensor_object for sensor_object in all_sensors if
+                               ('sample', sensor_object.output_directory) in all_due_tasks]
 
-        # Time to print in the output (average of start and end)
-        sample_collection_half_time = time.localtime(0.5 * (sample_collection_start_time +
-                                                            sample_collection_end_time))
+        ############################################################################
+        # Averaging window over for some sensors. Process the samples retrieved first,
+        # as samples due at the same time belong to the next window.
+        ############################################################################
+        if len(all_sensors_to_average) > 0:
 
-        # Loop while sample time is within the same minute
-        while time.time() < sample_collection_end_time:
+            print("==========================")
+            print("=== %s ===" % convert_localtime_to_string(time.localtime()))
+            print("==========================")
 
-            # Reads sensor values and appends them to sample list if value must not be filtered
-            read_sensor_values()
+            # Processes new samples
+            post_collection_actions(all_sensors_to_average)
 
-            # Pause and re-read sensor value
-            time.sleep(sample_interval)
+            # All values of the cycle in a single file (one write instead of one per measurement)
+            if snapshot_file is not None:
 
-        ##################################################################################
-        # All samples recorded for the current minute value. Process the samples retrieved
-        ##################################################################################
+                output_snapshot()
 
-        # Remove data that has become to old to be used in smoothing
-        remove_obsolete_data()
+            if metrics_file is not None:
 
-        print("==========================")
-        print("=== %s ===" % convert_localtime_to_string(sample_collection_half_time))
-        print("==========================")
+                output_metrics(scheduler)
 
-        # Processes new samples
-        post_collection_actions()
+        # Starts reading sensors whose sample is due (does not wait for them to finish)
+        if len(all_sensors_to_read) > 0:
 
-        if thingspeak_url is not None:
+            submit_sensor_reads(all_sensors_to_read)
 
-            output_measures_to_web()
+        if ('output', None) in all_due_tasks:
+
+            if thingspeak is not None:
+
+                output_measures_to_web()
+
+            if stream_publisher is not None:
+
+                stream_publisher.publish_cycle(all_sensors)
+
+            # Writes history with few large appends (only when enough samples accumulated)
+            if history_store is not None:
+
+                history_store.flush_if_due()
 
 ###########
 # END main
@@ -1071,3 +2867,9 @@ if __name__ == "__main__":
 
         error_details = traceback.format_exc(limit=None)
         general_utils.log_error(-999, error_details, str(unhandled_exception))
+
+    finally:
+
+        # Saves buffered outputs, then releases sensors (also when stopped with Ctrl+C)
+        stop_outputs()
+        close_sensor_handles()
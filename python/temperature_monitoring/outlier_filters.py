@@ -0,0 +1,320 @@
+"""
+Streaming outlier filters, applied to each sample between sensor reads and averaging.
+
+Filters are registered by name in all_filter_types, and chosen for each sensor in its
+configuration section :
+    outlier_filter = hampel        (filter name, no filtering if missing)
+    outlier_window = 7             (number of last samples used as reference)
+    outlier_threshold = 3.0        (number of scaled MADs a sample can be away from median)
+    outlier_min_deviation = 2.0    (smallest deviation ever rejected, in measurement unit)
+
+A filter has a single method, is_outlier(value), which also updates its window.
+
+The sorted window of HampelFilter is a plain list : finding a value is O(log n), but inserting
+and removing one shift the list, so each sample costs O(n) in the window size. Windows are a
+few samples to a few tens of samples, for which this shift is a single short memmove, faster
+than the pointer chasing and allocations of a skip list or of two heaps (O(log n)). Those only
+pay off for windows of thousands of samples.
+"""
+
+#########################
+# Import global packages
+#########################
+
+import bisect  # Keeps window values sorted for rolling median
+import collections  # Window of last samples in order of arrival
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+default_window_size = 7
+default_threshold = 3.0
+mad_to_standard_deviation = 1.4826  # Scales MAD to a standard deviation for normal noise
+
+# Smallest deviation ever rejected for each measurement. Avoids rejecting every change when the
+# window is flat (e.g. integer DHT11 values give a MAD of 0, and must still change by 1 unit).
+default_min_deviations = {
+    'temperature': 2.0,
+    'humidity': 5.0,
+    'pressure': 5.0,
+    'luminosity': 50.0
+}
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# Function (find_kth_smallest)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def find_kth_smallest(get_first, n_first, get_second, n_second, k):
+    """
+    Finds the k-th smallest value (0-based) among two sorted sequences, without merging them, in
+    O(log n) accesses.
+
+    INPUT:
+        get_first (fun) index => value, for first sequence (increasing)
+        n_first (int) length of first sequence
+        get_second (fun) index => value, for second sequence (increasing)
+        n_second (int) length of second sequence
+        k (int) rank of value to find, 0 <= k < n_first + n_second
+
+    RETURNS:
+        (float) k-th smallest value
+    """
+
+    # Searches how many values come from first sequence among the k + 1 smallest ones
+    low_count = max(0, k + 1 - n_second)
+    high_count = min(k + 1, n_first)
+
+    while low_count < high_count:
+
+        first_count = (low_count + high_count) // 2
+        second_count = k + 1 - first_count
+
+        if get_first(first_count) < get_second(second_count - 1):
+
+            low_count = first_count + 1
+
+        else:
+
+            high_count = first_count
+
+    first_count = low_count
+    second_count = k + 1 - first_count
+
+    if first_count == 0:
+
+        ####################################
+        return get_second(second_count - 1)
+        ####################################
+
+    if second_count == 0:
+
+        ##################################
+        return get_first(first_count - 1)
+        ##################################
+
+    ######################################################################
+    return max(get_first(first_count - 1), get_second(second_count - 1))
+    ######################################################################
+
+########################
+# END find_kth_smallest
+########################
+
+
+####################################################################################################
+# HampelFilter
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class HampelFilter:
+    """
+    Rejects samples further than threshold scaled MADs (median absolute deviation) from the
+    median of the last samples. Every sample, rejected or not, enters the window, so that a real
+    step change is accepted once it makes up half of the window.
+
+    The window is kept sorted with bisection. The MAD is found as a k-th smallest value among the
+    deviations below and above the median, which are both sorted, so no sort is done per sample.
+    """
+
+    __slots__ = ('window_size', 'threshold', 'min_deviation', 'window_in_order', 'window_sorted')
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, window_size=default_window_size, threshold=default_threshold,
+                 min_deviation=0.0):
+        """
+        Creates filter with empty window. No sample is rejected until window is full.
+
+        INPUT:
+            window_size (int) number of last samples used as reference
+            threshold (float) number of scaled MADs a sample can be away from median
+            min_deviation (float) smallest deviation from median ever rejected
+        """
+
+        self.window_size = window_size
+        self.threshold = threshold
+        self.min_deviation = min_deviation
+        self.window_in_order = collections.deque()
+        self.window_sorted = []
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_median_and_mad
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_median_and_mad(self):
+        """
+        Computes median and median absolute deviation of window. Window must not be empty.
+
+        RETURNS:
+            (float, float) median, MAD
+        """
+
+        window_sorted = self.window_sorted
+        n_values = len(window_sorted)
+        half_index = n_values // 2
+
+        if n_values % 2 == 1:
+
+            median = window_sorted[half_index]
+
+        else:
+
+            median = (window_sorted[half_index - 1] + window_sorted[half_index]) / 2.
+
+        # Deviations below median (closest first) and above median (closest first)
+        n_below = half_index
+
+        def get_deviation_below(index):
+
+            return median - window_sorted[n_below - 1 - index]
+
+        def get_deviation_above(index):
+
+            return window_sorted[n_below + index] - median
+
+        n_above = n_values - n_below
+
+        if n_values % 2 == 1:
+
+            mad = find_kth_smallest(get_deviation_below, n_below, get_deviation_above, n_above,
+                                    half_index)
+
+        else:
+
+            mad = (find_kth_smallest(get_deviation_below, n_below, get_deviation_above, n_above,
+                                     half_index - 1) +
+                   find_kth_smallest(get_deviation_below, n_below, get_deviation_above, n_above,
+                                     half_index)) / 2.
+
+        ####################
+        return median, mad
+        ####################
+
+    #########################
+    # END get_median_and_mad
+    #########################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # is_outlier
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def is_outlier(self, value):
+        """
+        Tests a new sample against the window, then adds it to the window.
+
+        INPUT:
+            value (float) new sample
+
+        RETURNS:
+            (bool) True if sample must be discarded
+        """
+
+        is_rejected = False
+
+        if len(self.window_in_order) >= self.window_size:
+
+            median, mad = self.get_median_and_mad()
+            allowed_deviation = max(self.threshold * mad_to_standard_deviation * mad,
+                                    self.min_deviation)
+            is_rejected = abs(value - median) > allowed_deviation
+
+            # Oldest sample leaves window
+            oldest_value = self.window_in_order.popleft()
+            del self.window_sorted[bisect.bisect_left(self.window_sorted, oldest_value)]
+
+        self.window_in_order.append(value)
+        bisect.insort(self.window_sorted, value)
+
+        ####################
+        return is_rejected
+        ####################
+
+    #################
+    # END is_outlier
+    #################
+
+#####################
+# END HampelFilter
+#####################
+
+
+# Filter name (outlier_filter option) => filter class
+all_filter_types = {
+    'hampel': HampelFilter
+}
+
+
+####################################################################################################
+# Function (create_filters)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def create_filters(filter_name, all_measurement_types, window_size=default_window_size,
+                   threshold=default_threshold, min_deviation=None):
+    """
+    Creates one filter per measurement of a sensor.
+
+    INPUT:
+        filter_name (str) name of filter, in all_filter_types
+        all_measurement_types (str[]) measurements of the sensor
+        window_size (int) number of last samples used as reference
+        threshold (float) number of scaled MADs a sample can be away from median
+        min_deviation (float|None) smallest deviation ever rejected. None : default for each
+            measurement (default_min_deviations)
+
+    RETURNS:
+        (Dict) measurement => filter
+    """
+
+    filter_class = all_filter_types[filter_name]
+    all_filters = {}
+
+    for measurement in all_measurement_types:
+
+        measurement_min_deviation = min_deviation
+        if measurement_min_deviation is None:
+
+            measurement_min_deviation = default_min_deviations.get(measurement, 0.0)
+
+        all_filters[measurement] = filter_class(window_size, threshold, measurement_min_deviation)
+
+    ###################
+    return all_filters
+    ###################
+
+#####################
+# END create_filters
+#####################
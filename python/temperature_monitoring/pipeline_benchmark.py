@@ -0,0 +1,825 @@
+"""
+Benchmark of the sensor pipeline (home_environment_sensors) with simulated sensors and time.
+
+Each case runs the main loop for a simulated duration (see sensor_simulation.run_simulation), with
+a number of synthetic sensors (DHT11, DS18B20 and BME280 in turn) and an averaging window size.
+Each pipeline stage is timed at each call :
+    read (read_sensor_on_bus), post_collection (post_collection_actions, including output_data),
+    output_data, snapshot (output_snapshot), web (output_measures_to_web).
+Stages report latency percentiles, read/write syscalls (from /proc/self/io, Linux only) and, in a
+second run with tracemalloc, memory allocated by each call. Cases run in their own process, so
+that they start from the same state.
+
+Load is the share of time the pipeline is busy (CPU time of the stages, without hardware waits
+such as DHT11 start signals, as simulated reads do not wait). Sensors one machine can handle are
+estimated from it, and bounded by the modelled hardware time of reads on each bus (see
+all_hardware_times) : a bus can not be busy more than max_load of each sample interval either.
+
+    python -m temperature_monitoring.pipeline_benchmark --sensors 1,4,16 --windows 6,60 \\
+        --output benchmark.json [--compare previous_benchmark.json]
+"""
+
+#########################
+# Import global packages
+#########################
+
+import argparse  # Command line
+import json  # Benchmark results
+import math  # Percentiles
+import multiprocessing  # One process per case
+import os  # Configuration of each case, in a temporary directory
+import platform  # Machine of the benchmark
+import subprocess  # Version (git commit) of the benchmarked code
+import sys  # Command line arguments
+import tempfile  # Directory of each case (configuration and outputs)
+import time  # Stage durations
+import tracemalloc  # Memory allocated by stages
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+# Stage name => function of home_environment_sensors. Stages may call each other (post_collection
+# calls output_data) : time of inner stages is also part of outer stages.
+all_stage_functions = {
+    'read': 'read_sensor_on_bus',
+    'post_collection': 'post_collection_actions',
+    'output_data': 'output_data',
+    'snapshot': 'output_snapshot',
+    'web': 'output_measures_to_web'
+}
+all_outer_stages = ('read', 'post_collection', 'snapshot', 'web')  # Busy time, without overlaps
+
+default_sensor_counts = (1, 4, 16, 32)
+default_window_sizes = (6, 60)  # Samples averaged together (n_sample_for_average)
+default_hours = 1.  # Simulated hours of each case
+all_percentiles = (50, 90, 99)
+
+all_benchmark_types = ('DHT11', 'DS18B20', 'BME280')  # Sensors with raw data decoding
+benchmark_sample_interval = 5.  # Seconds between two samples of each sensor
+benchmark_failure_rate = 0.02  # Share of failed synthetic reads
+max_load = 0.5  # Share of time the pipeline (or a bus) may be busy on a machine said to handle it
+
+# Sensor type => (bus, seconds per read, seconds per sample interval) of hardware time of reads.
+# Bus None is the own bus of each sensor. Read times are those of the drivers without pigpio.
+all_hardware_times = {
+    'DHT11': [
+        (None, 0.545, 0.),  # 500ms HIGH then 20ms start signal on its pin, ~25ms response
+        ('DHT11 captures', 0.025, 0.)  # Busy-poll of response, serialized by section_lock
+    ],
+    'DS18B20': [
+        ('one-wire master', 0.015, 0.75)  # Scratchpad read, one bulk conversion (12 bits)
+    ],
+    'BME280': [
+        ('i2c-1', 0.018, 0.)  # Forced measurement (oversampling x1) and data registers read
+    ]
+}
+
+io_counters_file = '/proc/self/io'
+io_counters_buffer = bytearray(1024)  # Content of io counters file, read without new allocations
+io_counters_handle = None  # (process id, file descriptor) of io counters file, kept open
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# FUNCTION (read_syscall_counts)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - File kept open and read into a fixed buffer (almost no memory allocated)
+####################################################################################################
+def read_syscall_counts():
+    """
+    Returns the number of read and write syscalls made by this process since it started. Counters
+    are read from a file kept open into a fixed buffer : probes called inside measured stages
+    (inner stages) allocate almost no memory, which would be counted in the outer stage.
+
+    RETURNS:
+        (int, int) read and write syscalls. (0, 0) if counters are not available (not Linux).
+    """
+
+    global io_counters_handle
+
+    n_read_syscalls = 0
+    n_write_syscalls = 0
+
+    try:
+
+        # File of the process that opened it : opened again in processes of cases
+        if io_counters_handle is None or io_counters_handle[0] != os.getpid():
+
+            io_counters_handle = (os.getpid(), os.open(io_counters_file, os.O_RDONLY))
+
+        n_bytes = os.preadv(io_counters_handle[1], [io_counters_buffer], 0)
+
+        syscr_position = io_counters_buffer.find(b'syscr:', 0, n_bytes)
+        if syscr_position >= 0:
+
+            n_read_syscalls = int(io_counters_buffer[
+                syscr_position + 6:io_counters_buffer.find(b'\n', syscr_position)])
+
+        syscw_position = io_counters_buffer.find(b'syscw:', 0, n_bytes)
+        if syscw_position >= 0:
+
+            n_write_syscalls = int(io_counters_buffer[
+                syscw_position + 6:io_counters_buffer.find(b'\n', syscw_position)])
+
+    except (AttributeError, OSError, ValueError):
+
+        # No preadv (not Linux) or no counters file
+        pass
+
+    #########################################
+    return n_read_syscalls, n_write_syscalls
+    #########################################
+
+##########################
+# END read_syscall_counts
+##########################
+
+
+####################################################################################################
+# FUNCTION (get_percentile)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_percentile(all_sorted_values, percentile):
+    """
+    Returns a percentile of sorted values (nearest rank).
+
+    INPUT:
+        all_sorted_values (float[]) values in increasing order (at least one)
+        percentile (float) percentile, from 0 to 100
+
+    RETURNS:
+        (float) value at the percentile
+    """
+
+    value_index = max(int(math.ceil(percentile / 100. * len(all_sorted_values))) - 1, 0)
+
+    #####################################
+    return all_sorted_values[value_index]
+    #####################################
+
+#####################
+# END get_percentile
+#####################
+
+
+####################################################################################################
+# StageProbe
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class StageProbe:
+    """
+    Measures each call of the function of a stage : duration, syscalls, and memory allocated (if
+    tracemalloc is tracing). Syscalls made by the probes themselves (reading io counters) are not
+    counted. Probes read io counters outside of the window in which memory is measured (only
+    probes of inner stages read them inside the window of outer stages, allocating a few bytes).
+    """
+
+    n_probe_reads = 0  # Reads of io counters by all probes (made during calls of outer stages)
+    read_syscalls_per_probe = 0  # Read syscalls made by one read of io counters
+    depth = 0  # Number of stages being measured (only outer stages reset the memory peak)
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, stage_name):
+        """
+        Creates probe without measurements.
+
+        INPUT:
+            stage_name (str) name of the stage
+        """
+
+        self.stage_name = stage_name
+        self.all_durations = []  # Seconds, one per call
+        self.n_read_syscalls = 0
+        self.n_write_syscalls = 0
+        self.all_allocated_sizes = []  # Bytes, one per call (tracemalloc only)
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # wrap
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    #   2026-10-19 AB - Io counters read outside of the memory window
+    ################################################################################################
+    def wrap(self, stage_function):
+        """
+        Returns function measuring each call of the stage function.
+
+        INPUT:
+            stage_function (function) function of the stage
+
+        RETURNS:
+            (function) function with the same arguments and results
+        """
+
+        def measured_function(*all_arguments):
+
+            is_tracing = tracemalloc.is_tracing()
+            is_outer_stage = StageProbe.depth == 0
+            StageProbe.depth += 1
+
+            # Io counters are read before memory window starts (and after it ends)
+            n_probe_reads_before = StageProbe.n_probe_reads
+            n_read_syscalls_before, n_write_syscalls_before = read_syscall_counts()
+
+            if is_tracing and is_outer_stage and hasattr(tracemalloc, 'reset_peak'):
+
+                tracemalloc.reset_peak()
+
+            allocated_before = tracemalloc.get_traced_memory()[0] if is_tracing else 0
+            start_time = time.perf_counter()
+
+            try:
+
+                return stage_function(*all_arguments)
+
+            finally:
+
+                self.all_durations.append(time.perf_counter() - start_time)
+
+                if is_tracing:
+
+                    # Outer stages : peak of the call. Inner stages : memory kept after the call.
+                    if is_outer_stage and hasattr(tracemalloc, 'reset_peak'):
+
+                        allocated_size = tracemalloc.get_traced_memory()[1] - allocated_before
+
+                    else:
+
+                        allocated_size = tracemalloc.get_traced_memory()[0] - allocated_before
+
+                    self.all_allocated_sizes.append(max(allocated_size, 0))
+
+                n_read_syscalls_after, n_write_syscalls_after = read_syscall_counts()
+                n_inner_probe_reads = StageProbe.n_probe_reads - n_probe_reads_before + 1
+                StageProbe.n_probe_reads += 2
+
+                self.n_read_syscalls += max(n_read_syscalls_after - n_read_syscalls_before -
+                                            n_inner_probe_reads *
+                                            StageProbe.read_syscalls_per_probe, 0)
+                self.n_write_syscalls += n_write_syscalls_after - n_write_syscalls_before
+
+                StageProbe.depth -= 1
+
+        #########################
+        return measured_function
+        #########################
+
+    ###########
+    # END wrap
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_stats
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_stats(self):
+        """
+        Returns measurements of the stage.
+
+        RETURNS:
+            (Dict) calls, total seconds, latency percentiles and max (microseconds), syscalls per
+                call, and mean/max allocated bytes per call (tracemalloc only)
+        """
+
+        n_calls = len(self.all_durations)
+        all_stats = {'calls': n_calls, 'total': round(sum(self.all_durations), 6)}
+
+        if n_calls == 0:
+
+            #################
+            return all_stats
+            #################
+
+        all_sorted_durations = sorted(self.all_durations)
+
+        for percentile in all_percentiles:
+
+            all_stats['p%d_us' % percentile] = round(
+                1e6 * get_percentile(all_sorted_durations, percentile), 1)
+
+        all_stats['max_us'] = round(1e6 * all_sorted_durations[-1], 1)
+        all_stats['read_syscalls'] = round(float(self.n_read_syscalls) / n_calls, 2)
+        all_stats['write_syscalls'] = round(float(self.n_write_syscalls) / n_calls, 2)
+
+        if len(self.all_allocated_sizes) > 0:
+
+            all_stats['allocated_mean'] = int(sum(self.all_allocated_sizes) /
+                                              len(self.all_allocated_sizes))
+            all_stats['allocated_max'] = max(self.all_allocated_sizes)
+
+        #################
+        return all_stats
+        #################
+
+    ################
+    # END get_stats
+    ################
+
+###########################
+# END StageProbe
+###########################
+
+
+####################################################################################################
+# FUNCTION (create_benchmark_config)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def create_benchmark_config(case_directory, n_sensors, n_sample_for_average):
+    """
+    Writes the configuration of a case : synthetic sensors, with all outputs in the case directory.
+
+    INPUT:
+        case_directory (str) directory of the case
+        n_sensors (int) number of sensors (DHT11, DS18B20 and BME280 in turn, at most 26 each)
+        n_sample_for_average (int) samples averaged together
+
+    RETURNS:
+        (str) configuration file
+    """
+
+    all_config_lines = [
+        '[General]',
+        'sample_interval = %s' % benchmark_sample_interval,
+        'n_sample_for_average = %d' % n_sample_for_average,
+        'n_average_for_smooth = 5',
+        'thingspeak_key = BENCHMARK',
+        '',
+        '[Output]',
+        'snapshot_file = %s' % os.path.join(case_directory, 'snapshot.json'),
+        '',
+        '[Simulation]',
+        'mode = synthetic',
+        'seed = 1',
+        'failure_rate = %s' % benchmark_failure_rate,
+        ''
+    ]
+
+    for sensor_index in range(n_sensors):
+
+        sensor_type = all_benchmark_types[sensor_index % len(all_benchmark_types)]
+        type_index = sensor_index // len(all_benchmark_types)
+
+        if sensor_type == 'DHT11':
+
+            sensor_address = str(type_index + 1)
+
+        elif sensor_type == 'DS18B20':
+
+            sensor_address = '28-%012x' % type_index
+
+        else:
+
+            sensor_address = '0x%02x' % (type_index + 0x10)
+
+        all_config_lines += [
+            '[Sensor%d]' % sensor_index,
+            'type = %s' % sensor_type,
+            'address = %s' % sensor_address,
+            'output_directory = %s' % os.path.join(case_directory, 'sensor%d' % sensor_index, ''),
+            'location = Room%d' % sensor_index,
+            ''
+        ]
+
+    config_filename = os.path.join(case_directory, 'benchmark.ini')
+
+    with open(config_filename, 'w') as config_file:
+
+        config_file.write('\n'.join(all_config_lines))
+
+    #######################
+    return config_filename
+    #######################
+
+##############################
+# END create_benchmark_config
+##############################
+
+
+####################################################################################################
+# FUNCTION (run_case)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def run_case(n_sensors, n_sample_for_average, duration, is_tracing_allocations):
+    """
+    Runs one case of the benchmark. Must run in its own process (pipeline state is global).
+
+    INPUT:
+        n_sensors (int) number of sensors
+        n_sample_for_average (int) samples averaged together
+        duration (float) simulated seconds
+        is_tracing_allocations (bool) whether memory allocations are traced (slower)
+
+    RETURNS:
+        (Dict|None) simulation results and stats of each stage. None if simulation failed.
+    """
+
+    from . import home_environment_sensors
+    from . import sensor_simulation
+
+    # Read syscalls made by the probes themselves
+    first_read_syscalls = read_syscall_counts()[0]
+    StageProbe.read_syscalls_per_probe = read_syscall_counts()[0] - first_read_syscalls
+
+    all_probes = {}
+    for stage_name, function_name in all_stage_functions.items():
+
+        all_probes[stage_name] = StageProbe(stage_name)
+        setattr(home_environment_sensors, function_name,
+                all_probes[stage_name].wrap(getattr(home_environment_sensors, function_name)))
+
+    with tempfile.TemporaryDirectory(prefix='pipeline_benchmark_') as case_directory:
+
+        config_filename = create_benchmark_config(case_directory, n_sensors,
+                                                  n_sample_for_average)
+
+        if is_tracing_allocations:
+
+            tracemalloc.start()
+
+        try:
+
+            simulation_results = sensor_simulation.run_simulation(config_filename, duration)
+
+        finally:
+
+            if is_tracing_allocations:
+
+                tracemalloc.stop()
+
+    if simulation_results is None:
+
+        ############
+        return None
+        ############
+
+    simulation_results['stages'] = {stage_name: stage_probe.get_stats() for
+                                    stage_name, stage_probe in all_probes.items()}
+
+    ##########################
+    return simulation_results
+    ##########################
+
+###############
+# END run_case
+###############
+
+
+####################################################################################################
+# FUNCTION (run_case_in_process)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def run_case_in_process(*all_case_arguments):
+    """
+    Runs one case of the benchmark in a new process (see run_case for arguments).
+
+    RETURNS:
+        (Dict|None) results of run_case
+    """
+
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as case_pool:
+
+        case_results = case_pool.apply(run_case, all_case_arguments)
+
+    ####################
+    return case_results
+    ####################
+
+##########################
+# END run_case_in_process
+##########################
+
+
+####################################################################################################
+# FUNCTION (get_code_version)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_code_version():
+    """
+    Returns the git commit of the benchmarked code, to compare results between versions.
+
+    RETURNS:
+        (str|None) commit (with -dirty if files were modified), None if not in a git repository
+    """
+
+    try:
+
+        code_version = subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'], cwd=os.path.dirname(__file__),
+            stderr=subprocess.DEVNULL).decode().strip()
+
+    except (OSError, subprocess.CalledProcessError):
+
+        code_version = None
+
+    ####################
+    return code_version
+    ####################
+
+#######################
+# END get_code_version
+#######################
+
+
+####################################################################################################
+# FUNCTION (run_benchmark)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def run_benchmark(all_sensor_counts=default_sensor_counts, all_window_sizes=default_window_sizes,
+                  duration=3600. * default_hours, is_tracing_allocations=True):
+    """
+    Runs all cases (each sensor count with each window size).
+
+    INPUT:
+        all_sensor_counts (int[]) numbers of sensors
+        all_window_sizes (int[]) samples averaged together
+        duration (float) simulated seconds of each case
+        is_tracing_allocations (bool) whether each case runs a second time, tracing allocations
+
+    RETURNS:
+        (Dict) machine, code version and results of each case
+    """
+
+    all_case_results = []
+
+    for n_sensors in all_sensor_counts:
+
+        for n_sample_for_average in all_window_sizes:
+
+            case_results = run_case_in_process(n_sensors, n_sample_for_average, duration, False)
+
+            if case_results is None:
+
+                continue
+
+            case_results['window'] = n_sample_for_average
+            case_results['load'] = round(sum(case_results['stages'][stage_name]['total'] for
+                                             stage_name in all_outer_stages) / duration, 6)
+
+            # Tracing slows calls down : allocations come from their own run
+            if is_tracing_allocations:
+
+                allocation_results = run_case_in_process(n_sensors, n_sample_for_average,
+                                                         duration, True)
+
+                if allocation_results is not None:
+
+                    for stage_name, all_stage_stats in case_results['stages'].items():
+
+                        all_allocation_stats = allocation_results['stages'][stage_name]
+
+                        for stats_name in ('allocated_mean', 'allocated_max'):
+
+                            if stats_name in all_allocation_stats:
+
+                                all_stage_stats[stats_name] = all_allocation_stats[stats_name]
+
+            all_case_results.append(case_results)
+
+    all_benchmark_results = {
+        'time': round(time.time(), 3),
+        'version': get_code_version(),
+        'machine': platform.machine(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'cases': all_case_results
+    }
+
+    #############################
+    return all_benchmark_results
+    #############################
+
+####################
+# END run_benchmark
+####################
+
+
+####################################################################################################
+# FUNCTION (get_max_sensors)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Bounded by modelled hardware time of each bus
+####################################################################################################
+def get_max_sensors(all_benchmark_results):
+    """
+    Estimates how many sensors (benchmark types in turn) the benchmark machine can handle. The
+    pipeline must be busy at most max_load of the time, from the CPU load per sensor of the case
+    with the most sensors (largest window size). Each bus must also be busy at most max_load of
+    each sample interval, from the modelled hardware time of reads (all_hardware_times).
+
+    INPUT:
+        all_benchmark_results (Dict) results of run_benchmark
+
+    RETURNS:
+        (int, str, int|None) number of sensors, what limits it (CPU or a bus), and number of
+            sensors from CPU load alone (None if no case has a load)
+    """
+
+    max_cpu_sensors = None
+
+    all_loaded_cases = [case_results for case_results in all_benchmark_results['cases'] if
+                        case_results['load'] > 0]
+
+    if len(all_loaded_cases) > 0:
+
+        largest_case = max(all_loaded_cases, key=lambda case_results: (case_results['sensors'],
+                                                                       case_results['window']))
+        load_per_sensor = largest_case['load'] / largest_case['sensors']
+        max_cpu_sensors = int(max_load / load_per_sensor)
+
+    max_sensors = max_cpu_sensors
+    limiting_resource = 'CPU'
+    available_time = max_load * benchmark_sample_interval
+
+    for type_index, sensor_type in enumerate(all_benchmark_types):
+
+        for bus_name, read_time, interval_time in all_hardware_times[sensor_type]:
+
+            # Own bus of each sensor : any number of sensors, unless one is already too slow
+            if bus_name is None:
+
+                if read_time + interval_time <= available_time:
+
+                    continue
+
+                max_type_sensors = 0
+                bus_name = '%s bus' % sensor_type
+
+            else:
+
+                max_type_sensors = max(0, int((available_time - interval_time) / read_time))
+
+            # Types in turn : sensor i has type i % n_types
+            max_bus_sensors = max_type_sensors * len(all_benchmark_types) + type_index
+
+            if max_sensors is None or max_bus_sensors < max_sensors:
+
+                max_sensors = max_bus_sensors
+                limiting_resource = bus_name
+
+    ######################################################
+    return max_sensors, limiting_resource, max_cpu_sensors
+    ######################################################
+
+######################
+# END get_max_sensors
+######################
+
+
+####################################################################################################
+# FUNCTION (format_report)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def format_report(all_benchmark_results, all_previous_results=None):
+    """
+    Describes benchmark results, one line per case and stage. If previous results are given,
+    median latencies are compared with the same case and stage.
+
+    INPUT:
+        all_benchmark_results (Dict) results of run_benchmark
+        all_previous_results (Dict, opt) results of an earlier run (e.g. previous version)
+
+    RETURNS:
+        (str) report
+    """
+
+    all_previous_stages = {}
+    if all_previous_results is not None:
+
+        for case_results in all_previous_results['cases']:
+
+            for stage_name, all_stage_stats in case_results['stages'].items():
+
+                all_previous_stages[(case_results['sensors'], case_results['window'],
+                                     stage_name)] = all_stage_stats
+
+    all_report_lines = ['Version %s, %s, Python %s' % (all_benchmark_results['version'],
+                                                       all_benchmark_results['machine'],
+                                                       all_benchmark_results['python']),
+                        '%7s %6s %8s %-16s %6s %9s %9s %9s %8s %8s %10s' % (
+                            'sensors', 'window', 'load', 'stage', 'calls', 'p50_us', 'p90_us',
+                            'p99_us', 'reads', 'writes', 'alloc_B')]
+
+    for case_results in all_benchmark_results['cases']:
+
+        for stage_name, all_stage_stats in sorted(case_results['stages'].items()):
+
+            if all_stage_stats['calls'] == 0:
+
+                continue
+
+            report_line = '%7d %6d %7.3f%% %-16s %6d %9.1f %9.1f %9.1f %8.2f %8.2f %10s' % (
+                case_results['sensors'], case_results['window'], 100. * case_results['load'],
+                stage_name, all_stage_stats['calls'], all_stage_stats['p50_us'],
+                all_stage_stats['p90_us'], all_stage_stats['p99_us'],
+                all_stage_stats['read_syscalls'], all_stage_stats['write_syscalls'],
+                all_stage_stats.get('allocated_mean', '-'))
+
+            previous_stage_stats = all_previous_stages.get((case_results['sensors'],
+                                                            case_results['window'], stage_name))
+
+            if previous_stage_stats is not None and previous_stage_stats.get('p50_us'):
+
+                report_line += '  p50 x%.2f' % (all_stage_stats['p50_us'] /
+                                                previous_stage_stats['p50_us'])
+
+            all_report_lines.append(report_line)
+
+    max_sensors, limiting_resource, max_cpu_sensors = get_max_sensors(all_benchmark_results)
+    all_report_lines.append(
+        'About %d sensors (%s in turn, every %.0f s), limited by %s busy %d%% of the time. '
+        'CPU alone: %s sensors.' % (max_sensors, ', '.join(all_benchmark_types),
+                                    benchmark_sample_interval, limiting_resource, 100 * max_load,
+                                    max_cpu_sensors))
+
+    #################################
+    return '\n'.join(all_report_lines)
+    #################################
+
+####################
+# END format_report
+####################
+
+
+if __name__ == "__main__":
+
+    argument_parser = argparse.ArgumentParser(
+        description='Benchmarks the sensor pipeline with simulated sensors and time.')
+    argument_parser.add_argument('--sensors', default=','.join(map(str, default_sensor_counts)),
+                                 help='numbers of sensors, separated by commas')
+    argument_parser.add_argument('--windows', default=','.join(map(str, default_window_sizes)),
+                                 help='samples averaged together, separated by commas')
+    argument_parser.add_argument('--hours', type=float, default=default_hours,
+                                 help='simulated hours of each case')
+    argument_parser.add_argument('--no-allocations', action='store_true',
+                                 help='does not trace memory allocations (twice faster)')
+    argument_parser.add_argument('--output', help='JSON file in which results are written')
+    argument_parser.add_argument('--compare', help='JSON results of a previous benchmark')
+    all_arguments = argument_parser.parse_args(sys.argv[1:])
+
+    # Runs with the package module (cases are run by name in their own process)
+    from temperature_monitoring import pipeline_benchmark
+
+    benchmark_results = pipeline_benchmark.run_benchmark(
+        [int(n_sensors) for n_sensors in all_arguments.sensors.split(',')],
+        [int(window_size) for window_size in all_arguments.windows.split(',')],
+        3600. * all_arguments.hours, not all_arguments.no_allocations)
+
+    previous_results = None
+    if all_arguments.compare is not None:
+
+        with open(all_arguments.compare, 'r') as previous_file:
+
+            previous_results = json.load(previous_file)
+
+    if all_arguments.output is not None:
+
+        with open(all_arguments.output, 'w') as output_file:
+
+            json.dump(benchmark_results, output_file, indent=2, sort_keys=True)
+
+    print(pipeline_benchmark.format_report(benchmark_results, previous_results))
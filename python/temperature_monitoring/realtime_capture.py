@@ -0,0 +1,415 @@
+"""
+Real-time settings for timing-critical captures (e.g. DHT11 pin polling), and capture statistics.
+
+During a capture window (with RealtimeSection()), the calling thread can get :
+    - SCHED_FIFO priority (not preempted by normal processes). Needs root or CAP_SYS_NICE.
+    - CPU affinity (e.g. a core kept free of other work with isolcpus).
+    - garbage collector disabled (no collection pause in the middle of a frame).
+    - a long interpreter switch interval (other Python threads do not take the GIL mid-capture).
+Everything is restored at the end of the window. Settings which can not be applied are ignored.
+
+Options in General section of configuration file (home_environment_sensors) :
+    realtime_priority = 50      (SCHED_FIFO priority 1-99, no real-time priority if missing)
+    realtime_cpus = 3           (CPU indexes separated by commas, no affinity if missing)
+    realtime_disable_gc = yes   (whether the garbage collector is disabled during captures, yes by
+                                default)
+"""
+
+#########################
+# Import global packages
+#########################
+
+import gc  # Disabled during captures
+import math  # Standard deviation of sampling periods
+import os  # Scheduling policy and affinity of calling thread
+import sys  # Interpreter switch interval
+import threading  # Only one capture window changes process-wide settings at a time
+
+########################
+# Import local packages
+########################
+
+from global_libraries import general_utils
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+realtime_priority = None  # SCHED_FIFO priority during captures (None : normal scheduling)
+realtime_cpus = None  # CPUs the capturing thread runs on during captures (None : unchanged)
+is_gc_disabled = True  # Whether garbage collector is disabled during captures
+capture_switch_interval = 0.05  # Seconds before another Python thread can take the GIL (5ms usual)
+
+section_lock = threading.Lock()  # gc and switch interval are process-wide
+all_refused_settings = set()  # Settings refused by the system (logged once, not tried again)
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# FUNCTION (configure)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def configure(priority=None, cpus=None, disable_gc=True):
+    """
+    Sets real-time settings of the following capture windows.
+
+    INPUT:
+        priority (int|None) SCHED_FIFO priority (1-99). None for normal scheduling.
+        cpus (int[]|None) CPUs to run captures on. None to keep current affinity.
+        disable_gc (bool) whether garbage collector is disabled during captures
+    """
+
+    global realtime_priority, realtime_cpus, is_gc_disabled
+
+    realtime_priority = priority
+    realtime_cpus = None if cpus is None else set(cpus)
+    is_gc_disabled = disable_gc
+    all_refused_settings.clear()
+
+    ######
+    return
+    ######
+
+################
+# END configure
+################
+
+
+####################################################################################################
+# FUNCTION (refuse_setting)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def refuse_setting(setting_name, error):
+    """
+    Logs (once) that a real-time setting could not be applied. It is not tried again until next
+    configure.
+
+    INPUT:
+        setting_name (str) name of the setting (priority, affinity)
+        error (OSError|AttributeError) error raised when applying it
+    """
+
+    if setting_name not in all_refused_settings:
+
+        all_refused_settings.add(setting_name)
+        general_utils.log_message('Real-time %s not applied for captures (%s).' % (setting_name,
+                                                                                   str(error)))
+
+    ######
+    return
+    ######
+
+#####################
+# END refuse_setting
+#####################
+
+
+####################################################################################################
+# RealtimeSection
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class RealtimeSection:
+    """
+    Capture window (with statement) : applies real-time settings to the calling thread, and
+    restores previous ones at the end.
+    """
+
+    ################################################################################################
+    # __enter__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __enter__(self):
+        """
+        Applies real-time settings.
+        """
+
+        section_lock.acquire()
+
+        self.previous_scheduler = None  # (policy, priority) before capture, if changed
+        self.previous_cpus = None  # Affinity before capture, if changed
+        self.previous_switch_interval = sys.getswitchinterval()
+        self.was_gc_enabled = gc.isenabled()
+
+        if realtime_priority is not None and 'priority' not in all_refused_settings:
+
+            try:
+
+                # Thread id 0 : on Linux, scheduling policy is set for the calling thread only
+                self.previous_scheduler = (os.sched_getscheduler(0), os.sched_getparam(0))
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(realtime_priority))
+
+            except (OSError, AttributeError) as e:
+
+                self.previous_scheduler = None
+                refuse_setting('priority', e)
+
+        if realtime_cpus is not None and 'affinity' not in all_refused_settings:
+
+            try:
+
+                self.previous_cpus = os.sched_getaffinity(0)
+                os.sched_setaffinity(0, realtime_cpus)
+
+            except (OSError, AttributeError) as e:
+
+                self.previous_cpus = None
+                refuse_setting('affinity', e)
+
+        if is_gc_disabled:
+
+            gc.disable()
+
+        sys.setswitchinterval(capture_switch_interval)
+
+        ############
+        return self
+        ############
+
+    ################
+    # END __enter__
+    ################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # __exit__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        """
+        Restores settings from before the capture.
+        """
+
+        sys.setswitchinterval(self.previous_switch_interval)
+
+        if self.was_gc_enabled:
+
+            gc.enable()
+
+        try:
+
+            if self.previous_cpus is not None:
+
+                os.sched_setaffinity(0, self.previous_cpus)
+
+            if self.previous_scheduler is not None:
+
+                os.sched_setscheduler(0, *self.previous_scheduler)
+
+        except OSError as e:
+
+            general_utils.log_message('Could not restore scheduling after capture (%s).' % str(e))
+
+        section_lock.release()
+
+        #############
+        return False
+        #############
+
+    ###############
+    # END __exit__
+    ###############
+
+###########################
+# END RealtimeSection
+###########################
+
+
+####################################################################################################
+# CaptureStats
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class CaptureStats:
+    """
+    Statistics of the captures of a sensor : sampling jitter of polling loops, first-try success
+    rate of reads, time spent in retries, and causes of failed tries.
+    """
+
+    __slots__ = ('n_reads', 'n_first_try_successes', 'n_failed_reads', 'n_retries',
+                 'total_retry_time', 'n_captures', 'n_periods', 'period_sum', 'period_square_sum',
+                 'max_period', 'n_checksum_failures', 'n_incomplete_frames')
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self):
+        """
+        Creates empty statistics.
+        """
+
+        self.n_reads = 0  # Reads (each with one or more tries)
+        self.n_first_try_successes = 0  # Reads successful without retry
+        self.n_failed_reads = 0  # Reads which failed after all retries
+        self.n_retries = 0  # Tries after the first one, all reads
+        self.total_retry_time = 0.  # Seconds spent in retries (including sleeps before them)
+        self.n_captures = 0  # Captures with timing information (polling loops)
+        self.n_periods = 0  # Sampling periods measured in captures
+        self.period_sum = 0.  # Sum of sampling periods, in seconds
+        self.period_square_sum = 0.  # Sum of squared sampling periods
+        self.max_period = 0.  # Longest sampling period, in seconds
+        self.n_checksum_failures = 0  # Tries whose data did not match its checksum
+        self.n_incomplete_frames = 0  # Tries without a full data frame (e.g. not 40 bits)
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # add_capture
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def add_capture(self, all_block_times, n_samples_per_block):
+        """
+        Adds sampling periods of a polling capture.
+
+        INPUT:
+            all_block_times (float[]) time (perf_counter) at the start of each block of samples
+            n_samples_per_block (int) number of samples between two block times
+        """
+
+        self.n_captures += 1
+
+        for block_index in range(1, len(all_block_times)):
+
+            sampling_period = (all_block_times[block_index] - all_block_times[block_index - 1]) / \
+                n_samples_per_block
+
+            self.n_periods += 1
+            self.period_sum += sampling_period
+            self.period_square_sum += sampling_period ** 2
+            self.max_period = max(self.max_period, sampling_period)
+
+        ######
+        return
+        ######
+
+    ##################
+    # END add_capture
+    ##################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # add_read
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def add_read(self, n_tries, is_successful, retry_time):
+        """
+        Adds outcome of a read.
+
+        INPUT:
+            n_tries (int) number of tries made
+            is_successful (bool) whether last try succeeded
+            retry_time (float) seconds spent after the first try
+        """
+
+        self.n_reads += 1
+        self.n_retries += n_tries - 1
+        self.total_retry_time += retry_time
+
+        if not is_successful:
+
+            self.n_failed_reads += 1
+
+        elif n_tries == 1:
+
+            self.n_first_try_successes += 1
+
+        ######
+        return
+        ######
+
+    ###############
+    # END add_read
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_stats
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_stats(self):
+        """
+        Returns statistics since start. Periods are in microseconds.
+
+        RETURNS:
+            (Dict) reads, first-try success rate, retries, retry time, failed tries by cause, and
+                sampling period (mean, jitter as standard deviation, max) of polling captures
+        """
+
+        all_stats = {
+            'reads': self.n_reads,
+            'first_try_rate': None,
+            'failed_reads': self.n_failed_reads,
+            'retries': self.n_retries,
+            'retry_time': round(self.total_retry_time, 2),
+            'checksum_failures': self.n_checksum_failures,
+            'incomplete_frames': self.n_incomplete_frames,
+            'captures': self.n_captures,
+            'period_us': None,
+            'jitter_us': None,
+            'max_period_us': None
+        }
+
+        if self.n_reads > 0:
+
+            all_stats['first_try_rate'] = round(float(self.n_first_try_successes) / self.n_reads,
+                                                3)
+
+        if self.n_periods > 0:
+
+            mean_period = self.period_sum / self.n_periods
+            period_variance = max(self.period_square_sum / self.n_periods - mean_period ** 2, 0.)
+
+            all_stats['period_us'] = round(1e6 * mean_period, 2)
+            all_stats['jitter_us'] = round(1e6 * math.sqrt(period_variance), 2)
+            all_stats['max_period_us'] = round(1e6 * self.max_period, 2)
+
+        #################
+        return all_stats
+        #################
+
+    ################
+    # END get_stats
+    ################
+
+###########################
+# END CaptureStats
+###########################
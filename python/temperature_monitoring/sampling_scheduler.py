@@ -0,0 +1,371 @@
+"""
+Deadline scheduler for periodic tasks (sensor sampling, averaging, web output).
+
+Each task has its own interval. Deadlines are computed from the previous deadline (not from the
+time the task actually ran), using the monotonic clock, so the time spent reading sensors does not
+accumulate as drift, and system clock changes (NTP) do not disturb sampling.
+Pending deadlines are kept in a heap, so finding the next task costs O(log n) whatever the number
+of sensors.
+"""
+
+#########################
+# Import global packages
+#########################
+
+import heapq  # Keeps task deadlines sorted
+import itertools  # Tie-breaker between tasks with the same deadline
+import math  # Computes how many periods were missed on overrun
+import time  # Monotonic clock and sleep
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+late_tolerance = 0.1  # Seconds after its deadline from which a task counts as late
+
+
+####################################################################################################
+# SamplingScheduler
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class SamplingScheduler:
+    """
+    Schedules periodic tasks on monotonic deadlines. Tasks are identified by a hashable key.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, clock_function=time.monotonic, sleep_function=time.sleep):
+        """
+        Creates an empty scheduler.
+
+        INPUT:
+            clock_function (fun) returns current time in seconds (monotonic)
+            sleep_function (fun) waits a given number of seconds
+        """
+
+        self.clock_function = clock_function
+        self.sleep_function = sleep_function
+
+        # Heap of [deadline, sequence_number, task_key]. Entries of removed/rescheduled tasks stay
+        # in the heap and are skipped when popped (their deadline no longer matches).
+        self.deadline_heap = []
+        self.sequence_counter = itertools.count()
+
+        # task_key => [interval, deadline]
+        self.all_tasks = {}
+
+        # Total number of deadlines skipped because a task ran later than a full interval
+        self.n_missed_deadlines = 0
+
+        # Tasks which ran later than late_tolerance after their deadline, and their total delay
+        self.n_late_tasks = 0
+        self.total_late_time = 0.
+        self.max_late_time = 0.
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # add_task
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def add_task(self, task_key, interval, first_deadline=None):
+        """
+        Adds (or replaces) a periodic task.
+
+        INPUT:
+            task_key (hashable) identifier of the task
+            interval (float) seconds between two executions of the task
+            first_deadline (float, opt) first execution time (clock_function time). Now by default.
+        """
+
+        if first_deadline is None:
+
+            first_deadline = self.clock_function()
+
+        self.all_tasks[task_key] = [interval, first_deadline]
+        heapq.heappush(self.deadline_heap, [first_deadline, next(self.sequence_counter), task_key])
+
+        ######
+        return
+        ######
+
+    ###############
+    # END add_task
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # remove_task
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def remove_task(self, task_key):
+        """
+        Removes a task. Does nothing if task does not exist.
+
+        INPUT:
+            task_key (hashable) identifier of the task
+        """
+
+        # Heap entry is skipped later, as task is no longer registered.
+        self.all_tasks.pop(task_key, None)
+
+        ######
+        return
+        ######
+
+    ##################
+    # END remove_task
+    ##################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # set_interval
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def set_interval(self, task_key, interval):
+        """
+        Changes interval of a task. Its next deadline is moved to one new interval after its
+        previous deadline (or now, if that is already over). Does nothing if task does not exist.
+
+        INPUT:
+            task_key (hashable) identifier of the task
+            interval (float) seconds between two executions of the task
+        """
+
+        task_info = self.all_tasks.get(task_key, None)
+
+        if task_info is None or task_info[0] == interval:
+
+            #######
+            return
+            #######
+
+        previous_deadline = task_info[1] - task_info[0]
+        new_deadline = max(previous_deadline + interval, self.clock_function())
+
+        # Old heap entry is skipped later, as its deadline no longer matches.
+        self.all_tasks[task_key] = [interval, new_deadline]
+        heapq.heappush(self.deadline_heap, [new_deadline, next(self.sequence_counter), task_key])
+
+        ######
+        return
+        ######
+
+    ###################
+    # END set_interval
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_next_deadline
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_next_deadline(self):
+        """
+        Returns deadline of the next task to execute, discarding obsolete heap entries.
+
+        RETURNS:
+            (float|None) next deadline, None if no task is scheduled
+        """
+
+        while len(self.deadline_heap) > 0:
+
+            deadline, _, task_key = self.deadline_heap[0]
+            task_info = self.all_tasks.get(task_key, None)
+
+            # Entry still valid : it is the next deadline
+            if task_info is not None and task_info[1] == deadline:
+
+                ################
+                return deadline
+                ################
+
+            # Task removed or rescheduled since entry was pushed
+            heapq.heappop(self.deadline_heap)
+
+        ############
+        return None
+        ############
+
+    ########################
+    # END get_next_deadline
+    ########################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # pop_due_tasks
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    #   2026-10-19 AB - Counts late tasks
+    ################################################################################################
+    def pop_due_tasks(self, current_time=None):
+        """
+        Returns all tasks whose deadline has been reached, and schedules their next execution one
+        interval after their previous deadline. If a task is late by more than one interval, missed
+        executions are skipped (not executed in a burst).
+
+        INPUT:
+            current_time (float, opt) time to compare deadlines to. Now by default.
+
+        RETURNS:
+            (hashable[]) keys of due tasks, by order of deadline
+        """
+
+        if current_time is None:
+
+            current_time = self.clock_function()
+
+        all_due_tasks = []
+
+        while True:
+
+            next_deadline = self.get_next_deadline()
+
+            if next_deadline is None or next_deadline > current_time:
+
+                break
+
+            _, _, task_key = heapq.heappop(self.deadline_heap)
+            all_due_tasks.append(task_key)
+
+            late_time = current_time - next_deadline
+            if late_time > late_tolerance:
+
+                self.n_late_tasks += 1
+                self.total_late_time += late_time
+                self.max_late_time = max(self.max_late_time, late_time)
+
+            # Next deadline is based on previous deadline, not on current time => no drift
+            interval = self.all_tasks[task_key][0]
+            new_deadline = next_deadline + interval
+
+            if new_deadline <= current_time:
+
+                n_missed_periods = math.floor((current_time - next_deadline) / interval)
+                self.n_missed_deadlines += n_missed_periods
+                new_deadline = next_deadline + (n_missed_periods + 1) * interval
+
+            self.all_tasks[task_key][1] = new_deadline
+            heapq.heappush(self.deadline_heap,
+                           [new_deadline, next(self.sequence_counter), task_key])
+
+        #####################
+        return all_due_tasks
+        #####################
+
+    ####################
+    # END pop_due_tasks
+    ####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # wait_for_due_tasks
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def wait_for_due_tasks(self):
+        """
+        Sleeps until the next deadline, then returns all due tasks. If sleep_function returns early
+        (e.g. threading.Event.wait), only tasks already due are returned (possibly none).
+
+        RETURNS:
+            (hashable[]) keys of due tasks, by order of deadline. Empty if no task is scheduled.
+        """
+
+        next_deadline = self.get_next_deadline()
+
+        if next_deadline is None:
+
+            ##########
+            return []
+            ##########
+
+        waiting_time = next_deadline - self.clock_function()
+
+        if waiting_time > 0:
+
+            self.sleep_function(waiting_time)
+
+        ############################
+        return self.pop_due_tasks()
+        ############################
+
+    #########################
+    # END wait_for_due_tasks
+    #########################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_stats
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_stats(self):
+        """
+        Returns lateness of tasks since start.
+
+        RETURNS:
+            (Dict) late tasks, their total and longest delay (seconds), and missed deadlines
+        """
+
+        all_stats = {
+            'late_tasks': self.n_late_tasks,
+            'late_time': round(self.total_late_time, 3),
+            'max_late_time': round(self.max_late_time, 3),
+            'missed_deadlines': self.n_missed_deadlines
+        }
+
+        #################
+        return all_stats
+        #################
+
+    ################
+    # END get_stats
+    ################
+
+##########################
+# END SamplingScheduler
+##########################
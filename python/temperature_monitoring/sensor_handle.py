@@ -0,0 +1,233 @@
+"""
+Lifecycle of the hardware behind a sensor : opened once, read for each sample, closed on failure
+or when the process stops.
+
+A driver may define a Handle class (subclass of SensorHandle) holding what is costly to set up
+(device objects, calibration, ...). Drivers without one are read through SensorHandle itself,
+which calls their get_measurements function for each sample.
+
+    handle = create_handle(driver, correction)
+    handle.open(address)
+    all_values = handle.read()  # As many times as needed. IOError : close, then open again.
+    handle.close()
+"""
+
+__author__ = 'Baland Adrien'
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# SensorHandle
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class SensorHandle:
+    """
+    Open connection to a sensor. Base class for driver handles, and handle for drivers with
+    module functions only (get_measurements called for each read).
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, correction=0., driver=None):
+        """
+        Creates handle. Sensor is not opened.
+
+        INPUT:
+            correction (float, opt) correction to apply to temperature, to account for external
+                effects
+            driver (module, opt) driver with get_measurements function (handles defined by a
+                driver do not need it)
+        """
+
+        self.correction = correction
+        self.driver = driver
+        self.address = None
+        self.is_open = False
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # open
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def open(self, address):
+        """
+        Opens sensor. Raises IOError if sensor can not be reached.
+
+        INPUT:
+            address (int|str|None) sensor address, as converted by the driver
+        """
+
+        self.address = address
+        self.is_open = True
+
+        ######
+        return
+        ######
+
+    ###########
+    # END open
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # read
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def read(self):
+        """
+        Measures all values of the sensor. Raises IOError if sensor must be opened again.
+
+        RETURNS:
+            (Dict) measurement => value (None if measure failed)
+        """
+
+        ##################################################################
+        return self.driver.get_measurements(self.address, self.correction)
+        ##################################################################
+
+    ###########
+    # END read
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # close
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def close(self):
+        """
+        Releases sensor. Never raises.
+        """
+
+        self.is_open = False
+
+        ######
+        return
+        ######
+
+    ############
+    # END close
+    ############
+
+###########################
+# END SensorHandle
+###########################
+
+
+####################################################################################################
+# FUNCTION (create_handle)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def create_handle(driver, correction):
+    """
+    Creates handle for a sensor, from the Handle class of its driver if it has one.
+
+    INPUT:
+        driver (module) driver of the sensor type
+        correction (float) correction to apply to temperature
+
+    RETURNS:
+        (SensorHandle) handle, not opened yet
+    """
+
+    handle_class = getattr(driver, 'Handle', None)
+
+    if handle_class is None:
+
+        sensor_handle = SensorHandle(correction, driver)
+
+    else:
+
+        sensor_handle = handle_class(correction)
+
+    #####################
+    return sensor_handle
+    #####################
+
+####################
+# END create_handle
+####################
+
+
+####################################################################################################
+# FUNCTION (read_cached_handle)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def read_cached_handle(all_handles, handle_class, address, correction):
+    """
+    Reads a sensor through a handle kept between calls, for the get_measurements function of
+    drivers with a Handle class. Handle is closed and forgotten if read fails with IOError.
+
+    INPUT:
+        all_handles (Dict) address => open handle, kept by the driver
+        handle_class (class) Handle class of the driver
+        address (int|str|None) sensor address
+        correction (float) correction to apply to temperature
+
+    RETURNS:
+        (Dict) measurement => value (None if measure failed)
+    """
+
+    sensor_handle = all_handles.get(address)
+
+    if sensor_handle is None:
+
+        sensor_handle = handle_class(correction)
+        sensor_handle.open(address)
+        all_handles[address] = sensor_handle
+
+    sensor_handle.correction = correction
+
+    try:
+
+        all_values = sensor_handle.read()
+
+    except IOError:
+
+        del all_handles[address]
+        sensor_handle.close()
+
+        ######
+        raise
+        ######
+
+    ##################
+    return all_values
+    ##################
+
+#########################
+# END read_cached_handle
+#########################
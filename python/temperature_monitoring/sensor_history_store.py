@@ -0,0 +1,1062 @@
+"""
+Append-only time-series store keeping the history of sensor samples on the Raspberry Pi.
+
+Each location/measurement pair has its own series, stored at several resolutions :
+    - raw : every sample, as (timestamp, value) records,
+    - minute, hour, day : rollups, as (bucket_start, min, max, sum, count) records.
+Records are fixed-width binary structures, so a file can be memory-mapped and searched by time with
+a bisection. Files are split in segments covering a fixed time span, named after their start time :
+    base_directory/location/measurement/resolution/segment_start.seg
+
+To be gentle with SD cards, samples are buffered in memory and written with one large sequential
+append per file when enough data accumulated (or enough time went by). Segments older than the
+retention of their resolution are deleted as a whole (coarser rollups keep the information).
+Raw segments that are no longer written to are compacted with Gorilla compression (see
+gorilla_compression), which shrinks slowly-changing series several times.
+
+Rollup buckets in progress when the process stops (or when a sensor is removed) are written as
+partial records. A bucket can then be stored as several records with the same start (e.g. process
+restarted within the hour), which iter_records merges.
+"""
+
+#########################
+# Import global packages
+#########################
+
+import math  # Rounds timestamps down to bucket/segment starts
+import mmap  # Memory-maps segments for reads
+import os  # Creates directories, lists/deletes segments
+import struct  # Fixed-width binary records
+import threading  # Samples are appended from the sensor reading threads
+import time  # Flush/retention timing
+
+########################
+# Import local packages
+########################
+
+from global_libraries import general_utils
+from . import gorilla_compression  # Compacts old raw segments
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+# Resolution name => seconds per record (0 for raw samples), from finest to coarsest
+all_resolutions = ['raw', 'minute', 'hour', 'day']
+resolution_to_seconds = {'raw': 0, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Resolution name => seconds covered by each segment file
+resolution_to_segment_span = {
+    'raw': 86400,  # One file per day (~200 kB per measurement at one sample every 5 seconds)
+    'minute': 30 * 86400,  # One file per 30 days
+    'hour': 366 * 86400,  # One file per year
+    'day': 3660 * 86400  # One file per 10 years
+}
+
+# Default retention in days (None : kept forever)
+default_retention_days = {'raw': 730, 'minute': 730, 'hour': 3650, 'day': None}
+default_compress_after_days = 2.  # Age (days after segment end) of raw segments to compress
+
+raw_record = struct.Struct('<df')  # timestamp (s), value
+rollup_record = struct.Struct('<dffdI')  # bucket_start (s), min, max, sum, count
+timestamp_field = struct.Struct('<d')  # First field of both records, used for bisection
+
+segment_extension = '.seg'
+compressed_segment_extension = '.gor'  # Raw segments compacted with gorilla_compression
+default_flush_size = 65536  # Buffered bytes triggering a flush
+default_flush_interval = 600.  # Seconds after which buffered records are flushed anyway
+retention_check_interval = 3600.  # Seconds between two retention passes
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# Function (get_record_struct)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_record_struct(resolution):
+    """
+    Returns binary structure of records for a resolution.
+
+    INPUT:
+        resolution (str) one of all_resolutions
+
+    RETURNS:
+        (struct.Struct) raw_record for raw samples, rollup_record otherwise
+    """
+
+    if resolution == 'raw':
+
+        ##################
+        return raw_record
+        ##################
+
+    #####################
+    return rollup_record
+    #####################
+
+########################
+# END get_record_struct
+########################
+
+
+####################################################################################################
+# Function (get_series_directory)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_series_directory(base_directory, location, measurement, resolution):
+    """
+    Returns directory containing segments of a series.
+
+    INPUT:
+        base_directory (str) root directory of the store
+        location (str) sensor location
+        measurement (str) type of measurement
+        resolution (str) one of all_resolutions
+
+    RETURNS:
+        (str) directory path
+    """
+
+    series_directory = os.path.join(base_directory, location, measurement, resolution)
+
+    ########################
+    return series_directory
+    ########################
+
+###########################
+# END get_series_directory
+###########################
+
+
+####################################################################################################
+# Function (list_segments)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def list_segments(base_directory, location, measurement, resolution):
+    """
+    Lists segment files of a series, sorted by start time.
+
+    INPUT:
+        base_directory (str) root directory of the store
+        location (str) sensor location
+        measurement (str) type of measurement
+        resolution (str) one of all_resolutions
+
+    RETURNS:
+        ((int, str)[]) (segment_start, segment_filename) for each segment
+    """
+
+    series_directory = get_series_directory(base_directory, location, measurement, resolution)
+
+    try:
+
+        all_filenames = os.listdir(series_directory)
+
+    except OSError:
+
+        # Series never written
+        ##########
+        return []
+        ##########
+
+    all_segments = []
+
+    for filename in all_filenames:
+
+        segment_name, extension = os.path.splitext(filename)
+
+        if extension not in (segment_extension, compressed_segment_extension) or \
+                not segment_name.isdigit():
+
+            continue
+
+        all_segments.append((int(segment_name), os.path.join(series_directory, filename)))
+
+    all_segments.sort()
+
+    ####################
+    return all_segments
+    ####################
+
+####################
+# END list_segments
+####################
+
+
+####################################################################################################
+# Function (find_first_record)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def find_first_record(mapped_segment, record_size, n_records, timestamp):
+    """
+    Bisects a segment for the first record whose timestamp is not before a given time. Records
+    are sorted by timestamp.
+
+    INPUT:
+        mapped_segment (mmap|bytes) segment content
+        record_size (int) size of records in bytes
+        n_records (int) number of complete records in segment
+        timestamp (float) time to search for
+
+    RETURNS:
+        (int) index of first record with timestamp >= given time (n_records if none)
+    """
+
+    low_index = 0
+    high_index = n_records
+
+    while low_index < high_index:
+
+        middle_index = (low_index + high_index) // 2
+
+        if timestamp_field.unpack_from(mapped_segment, middle_index * record_size)[0] < timestamp:
+
+            low_index = middle_index + 1
+
+        else:
+
+            high_index = middle_index
+
+    #################
+    return low_index
+    #################
+
+########################
+# END find_first_record
+########################
+
+
+####################################################################################################
+# Function (iter_segment_records)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def iter_segment_records(segment_filename, record_struct, start_time, end_time):
+    """
+    Yields records of a segment with start_time <= timestamp < end_time. The segment is
+    memory-mapped, and the range is found by bisection, so only the pages in range are read.
+    A partial record at the end of the file (interrupted write) is ignored.
+    Compressed segments are decoded block by block, skipping blocks outside the range.
+
+    INPUT:
+        segment_filename (str) path of the segment
+        record_struct (struct.Struct) structure of records in segment
+        start_time (float) first time included
+        end_time (float) first time excluded
+
+    YIELDS:
+        (tuple) unpacked records, by increasing timestamp
+    """
+
+    record_size = record_struct.size
+
+    try:
+
+        segment_file = open(segment_filename, 'rb')
+
+    except OSError:
+
+        # Segment deleted by retention between listing and reading
+        ######
+        return
+        ######
+
+    with segment_file:
+
+        if segment_filename.endswith(compressed_segment_extension):
+
+            segment_size = os.fstat(segment_file.fileno()).st_size
+
+            if segment_size == 0:
+
+                ######
+                return
+                ######
+
+            with mmap.mmap(segment_file.fileno(), segment_size,
+                           access=mmap.ACCESS_READ) as mapped_segment:
+
+                yield from gorilla_compression.iter_series(mapped_segment, start_time, end_time)
+
+            ######
+            return
+            ######
+
+        n_records = os.fstat(segment_file.fileno()).st_size // record_size
+
+        # Empty files can not be mapped
+        if n_records == 0:
+
+            ######
+            return
+            ######
+
+        with mmap.mmap(segment_file.fileno(), n_records * record_size,
+                       access=mmap.ACCESS_READ) as mapped_segment:
+
+            first_index = find_first_record(mapped_segment, record_size, n_records, start_time)
+            last_index = find_first_record(mapped_segment, record_size, n_records, end_time)
+
+            if first_index >= last_index:
+
+                ######
+                return
+                ######
+
+            # Unpacks the whole range at once (copy of the range only, not of the segment)
+            yield from record_struct.iter_unpack(
+                mapped_segment[first_index * record_size:last_index * record_size])
+
+###########################
+# END iter_segment_records
+###########################
+
+
+####################################################################################################
+# Function (iter_records)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Partial rollup records of a bucket are merged
+####################################################################################################
+def iter_records(base_directory, location, measurement, resolution, start_time, end_time):
+    """
+    Yields records of a series with start_time <= timestamp < end_time, reading only segments
+    overlapping the range. Only data already flushed to disk is returned.
+
+    INPUT:
+        base_directory (str) root directory of the store
+        location (str) sensor location
+        measurement (str) type of measurement
+        resolution (str) one of all_resolutions
+        start_time (float) first time included
+        end_time (float) first time excluded
+
+    YIELDS:
+        (tuple) (timestamp, value) for raw resolution, (bucket_start, min, max, sum, count) for
+            rollups, by increasing timestamp. Partial records of a rollup bucket (written when
+            the process stopped within the bucket) are merged into one record.
+    """
+
+    record_struct = get_record_struct(resolution)
+    segment_span = resolution_to_segment_span[resolution]
+    open_record = None  # [bucket_start, min, max, sum, count] of rollup bucket being merged
+
+    for segment_start, segment_filename in list_segments(base_directory, location, measurement,
+                                                         resolution):
+
+        if segment_start + segment_span <= start_time or segment_start >= end_time:
+
+            continue
+
+        if resolution == 'raw':
+
+            yield from iter_segment_records(segment_filename, record_struct, start_time, end_time)
+            continue
+
+        # Records of a bucket have the same start, so they are consecutive in the same segment
+        for record in iter_segment_records(segment_filename, record_struct, start_time,
+                                           end_time):
+
+            if open_record is not None and open_record[0] == record[0]:
+
+                open_record[1] = min(open_record[1], record[1])
+                open_record[2] = max(open_record[2], record[2])
+                open_record[3] += record[3]
+                open_record[4] += record[4]
+                continue
+
+            if open_record is not None:
+
+                yield tuple(open_record)
+
+            open_record = list(record)
+
+    if open_record is not None:
+
+        yield tuple(open_record)
+
+###################
+# END iter_records
+###################
+
+
+####################################################################################################
+# Function (select_resolution)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def select_resolution(point_seconds):
+    """
+    Chooses the coarsest stored resolution that can be aggregated into points of a given length
+    (record length must divide point length), so that the fewest records are scanned.
+
+    INPUT:
+        point_seconds (int) seconds covered by each point requested (0 : raw samples)
+
+    RETURNS:
+        (str) one of all_resolutions
+    """
+
+    selected_resolution = 'raw'
+
+    for resolution in all_resolutions[1:]:
+
+        if point_seconds > 0 and point_seconds % resolution_to_seconds[resolution] == 0:
+
+            selected_resolution = resolution
+
+    ###########################
+    return selected_resolution
+    ###########################
+
+########################
+# END select_resolution
+########################
+
+
+####################################################################################################
+# Function (iter_aggregates)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def iter_aggregates(base_directory, location, measurement, start_time, end_time, point_seconds):
+    """
+    Yields aggregated points of a series over a time range, computed from the coarsest stored
+    resolution compatible with the point length. Points without data are not returned.
+
+    INPUT:
+        base_directory (str) root directory of the store
+        location (str) sensor location
+        measurement (str) type of measurement
+        start_time (float) first time included
+        end_time (float) first time excluded
+        point_seconds (int) seconds covered by each point (0 : one point per raw sample)
+
+    YIELDS:
+        (float, float, float, float, int) point_start, min, max, mean, count, by increasing time
+    """
+
+    resolution = select_resolution(point_seconds)
+    open_point = None  # [point_start, min, max, sum, count]
+
+    # Includes the rollup bucket containing start_time (rollups are stored by bucket start)
+    if resolution != 'raw':
+
+        start_time = math.floor(start_time / resolution_to_seconds[resolution]) * \
+            resolution_to_seconds[resolution]
+
+    for record in iter_records(base_directory, location, measurement, resolution, start_time,
+                               end_time):
+
+        # Raw samples are seen as buckets of one sample
+        if resolution == 'raw':
+
+            record_start, record_min, record_max, record_sum, record_count = \
+                record[0], record[1], record[1], record[1], 1
+
+        else:
+
+            record_start, record_min, record_max, record_sum, record_count = record
+
+        if point_seconds > 0:
+
+            point_start = math.floor(record_start / point_seconds) * point_seconds
+
+        else:
+
+            point_start = record_start
+
+        if open_point is not None and open_point[0] == point_start:
+
+            open_point[1] = min(open_point[1], record_min)
+            open_point[2] = max(open_point[2], record_max)
+            open_point[3] += record_sum
+            open_point[4] += record_count
+            continue
+
+        if open_point is not None:
+
+            yield (open_point[0], open_point[1], open_point[2], open_point[3] / open_point[4],
+                   open_point[4])
+
+        open_point = [point_start, record_min, record_max, record_sum, record_count]
+
+    if open_point is not None:
+
+        yield (open_point[0], open_point[1], open_point[2], open_point[3] / open_point[4],
+               open_point[4])
+
+######################
+# END iter_aggregates
+######################
+
+
+####################################################################################################
+# SensorHistoryStore
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class SensorHistoryStore:
+    """
+    Writer side of the store : buffers samples and rollups, flushes them to segments and applies
+    retention. Reads are done with iter_records (no instance needed, e.g. from the worker).
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    #   2026-10-19 AB - Added clock_function parameter (simulated runs)
+    ################################################################################################
+    def __init__(self, base_directory, flush_size=default_flush_size,
+                 flush_interval=default_flush_interval, all_retention_days=None,
+                 compress_after_days=default_compress_after_days, clock_function=time.time):
+        """
+        Creates the store. Nothing is written until samples are appended and flushed.
+
+        INPUT:
+            base_directory (str) root directory of the store
+            flush_size (int) buffered bytes after which records are flushed
+            flush_interval (float) seconds after which buffered records are flushed anyway
+            all_retention_days (Dict|None) resolution => days to keep (None : forever). Missing
+                resolutions use default_retention_days.
+            compress_after_days (float|None) days after their end after which raw segments are
+                compressed. None : never compressed.
+            clock_function (function) returns current time in seconds since epoch (time.time)
+        """
+
+        self.base_directory = base_directory
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self.all_retention_days = dict(default_retention_days)
+        if all_retention_days is not None:
+
+            self.all_retention_days.update(all_retention_days)
+
+        self.compress_after_days = compress_after_days
+        self.clock_function = clock_function
+
+        # Protects everything below. Samples come from the sensor reading threads.
+        self.lock = threading.Lock()
+
+        # segment_filename => bytearray of records waiting to be written
+        self.all_pending_records = {}
+        self.n_pending_bytes = 0
+
+        # (location, measurement, resolution) => [bucket_start, min, max, sum, count]
+        self.all_open_buckets = {}
+
+        # (location, measurement) => timestamp of last sample, to keep segments sorted
+        self.all_last_timestamps = {}
+
+        # Segments whose end was checked for partial records since process start
+        self.all_checked_segments = set()
+
+        self.last_flush_time = clock_function()
+        self.last_retention_time = 0.0
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_segment_filename
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_segment_filename(self, location, measurement, resolution, timestamp):
+        """
+        Returns segment file in which a record with a given timestamp is stored.
+
+        INPUT:
+            location (str) sensor location
+            measurement (str) type of measurement
+            resolution (str) one of all_resolutions
+            timestamp (float) time of record
+
+        RETURNS:
+            (str) path of segment
+        """
+
+        segment_span = resolution_to_segment_span[resolution]
+        segment_start = int(math.floor(timestamp / segment_span) * segment_span)
+
+        segment_filename = os.path.join(
+            get_series_directory(self.base_directory, location, measurement, resolution),
+            '%010d%s' % (segment_start, segment_extension))
+
+        ########################
+        return segment_filename
+        ########################
+
+    ###########################
+    # END get_segment_filename
+    ###########################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # buffer_record
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def buffer_record(self, location, measurement, resolution, record_values):
+        """
+        Adds a record to the write buffer of its segment. Lock must be held.
+
+        INPUT:
+            location (str) sensor location
+            measurement (str) type of measurement
+            resolution (str) one of all_resolutions
+            record_values (tuple) record fields, timestamp first
+        """
+
+        segment_filename = self.get_segment_filename(location, measurement, resolution,
+                                                     record_values[0])
+        packed_record = get_record_struct(resolution).pack(*record_values)
+
+        self.all_pending_records.setdefault(segment_filename, bytearray()).extend(packed_record)
+        self.n_pending_bytes += len(packed_record)
+
+        ######
+        return
+        ######
+
+    ####################
+    # END buffer_record
+    ####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # append
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def append(self, location, measurement, timestamp, value):
+        """
+        Adds a sample to the raw series and to the rollups. Samples older than the last one of
+        their series (system clock set back) are ignored, so that segments stay sorted.
+
+        INPUT:
+            location (str) sensor location
+            measurement (str) type of measurement
+            timestamp (float) time at which sample was collected (time.time())
+            value (float) sample value
+        """
+
+        series_key = (location, measurement)
+
+        with self.lock:
+
+            if timestamp < self.all_last_timestamps.get(series_key, 0.0):
+
+                ######
+                return
+                ######
+
+            self.all_last_timestamps[series_key] = timestamp
+            self.buffer_record(location, measurement, 'raw', (timestamp, value))
+
+            # Updates rollup buckets. A bucket is written once a sample falls in the next one.
+            for resolution in all_resolutions[1:]:
+
+                bucket_seconds = resolution_to_seconds[resolution]
+                bucket_start = math.floor(timestamp / bucket_seconds) * bucket_seconds
+                bucket_key = (location, measurement, resolution)
+                open_bucket = self.all_open_buckets.get(bucket_key, None)
+
+                if open_bucket is not None and open_bucket[0] == bucket_start:
+
+                    open_bucket[1] = min(open_bucket[1], value)
+                    open_bucket[2] = max(open_bucket[2], value)
+                    open_bucket[3] += value
+                    open_bucket[4] += 1
+                    continue
+
+                if open_bucket is not None:
+
+                    self.buffer_record(location, measurement, resolution, tuple(open_bucket))
+
+                self.all_open_buckets[bucket_key] = [bucket_start, value, value, value, 1]
+
+        ######
+        return
+        ######
+
+    #############
+    # END append
+    #############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # close_buckets
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def close_buckets(self, location=None):
+        """
+        Buffers rollup buckets in progress as partial records, and forgets them. Samples appended
+        later in the same bucket start a new partial record, merged on reads (see iter_records).
+        Called when the process stops, or when a sensor is removed.
+
+        INPUT:
+            location (str|None) sensor location whose buckets are closed (None : all locations)
+        """
+
+        with self.lock:
+
+            for bucket_key in list(self.all_open_buckets):
+
+                if location is not None and bucket_key[0] != location:
+
+                    continue
+
+                bucket_location, measurement, resolution = bucket_key
+                self.buffer_record(bucket_location, measurement, resolution,
+                                   tuple(self.all_open_buckets.pop(bucket_key)))
+
+        ######
+        return
+        ######
+
+    ####################
+    # END close_buckets
+    ####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # flush
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    #   2026-10-19 AB - Added include_open_buckets parameter
+    ################################################################################################
+    def flush(self, include_open_buckets=False):
+        """
+        Writes all buffered records, with one append per segment file.
+
+        INPUT:
+            include_open_buckets (bool) whether rollup buckets in progress are also written, as
+                partial records (see close_buckets). True when the process stops.
+
+        RETURNS:
+            (int) 0 if all records were written, negative number otherwise
+        """
+
+        if include_open_buckets:
+
+            self.close_buckets()
+
+        # Swaps buffers under lock, so that reading threads are not blocked by disk writes
+        with self.lock:
+
+            all_records_to_write = self.all_pending_records
+            self.all_pending_records = {}
+            self.n_pending_bytes = 0
+            self.last_flush_time = self.clock_function()
+
+        error_status = 0
+
+        for segment_filename, segment_records in all_records_to_write.items():
+
+            try:
+
+                if segment_filename not in self.all_checked_segments:
+
+                    self.prepare_segment(segment_filename)
+
+                with open(segment_filename, 'ab') as segment_file:
+
+                    segment_file.write(segment_records)
+
+            except OSError as e:
+
+                # Records are lost, but following flushes may work (e.g. disk full then cleaned)
+                error_status = general_utils.log_error(-427, segment_filename, str(e))
+
+        ####################
+        return error_status
+        ####################
+
+    ############
+    # END flush
+    ############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # prepare_segment
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def prepare_segment(self, segment_filename):
+        """
+        Creates directory of a segment if needed, and removes a partial record at the end of an
+        existing segment (write interrupted by a power loss), so that new records stay aligned.
+
+        INPUT:
+            segment_filename (str) path of segment
+        """
+
+        segment_directory = os.path.dirname(segment_filename)
+
+        if not os.path.isdir(segment_directory):
+
+            os.makedirs(segment_directory)
+
+        elif os.path.isfile(segment_filename):
+
+            resolution = os.path.basename(segment_directory)
+            record_size = get_record_struct(resolution).size
+            segment_size = os.path.getsize(segment_filename)
+
+            if segment_size % record_size != 0:
+
+                os.truncate(segment_filename, segment_size - segment_size % record_size)
+
+        self.all_checked_segments.add(segment_filename)
+
+        ######
+        return
+        ######
+
+    ######################
+    # END prepare_segment
+    ######################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # flush_if_due
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def flush_if_due(self, current_time=None):
+        """
+        Flushes buffered records if enough data accumulated or if they waited long enough, and
+        applies retention from time to time.
+
+        INPUT:
+            current_time (float, opt) current time.time(). Now (from clock_function) by default.
+        """
+
+        if current_time is None:
+
+            current_time = self.clock_function()
+
+        if self.n_pending_bytes >= self.flush_size or \
+                current_time - self.last_flush_time >= self.flush_interval:
+
+            self.flush()
+
+        if current_time - self.last_retention_time >= retention_check_interval:
+
+            self.apply_retention(current_time)
+
+        ######
+        return
+        ######
+
+    ###################
+    # END flush_if_due
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # apply_retention
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def apply_retention(self, current_time=None):
+        """
+        Deletes segments that only contain records older than the retention of their resolution,
+        and compresses raw segments that ended more than compress_after_days ago.
+
+        INPUT:
+            current_time (float, opt) current time.time(). Now (from clock_function) by default.
+        """
+
+        if current_time is None:
+
+            current_time = self.clock_function()
+
+        self.last_retention_time = current_time
+
+        try:
+
+            all_locations = os.listdir(self.base_directory)
+
+        except OSError:
+
+            # Nothing written yet
+            #######
+            return
+            #######
+
+        for location in all_locations:
+
+            location_directory = os.path.join(self.base_directory, location)
+
+            if not os.path.isdir(location_directory):
+
+                continue
+
+            for measurement in os.listdir(location_directory):
+
+                for resolution in all_resolutions:
+
+                    retention_days = self.all_retention_days.get(resolution, None)
+
+                    if retention_days is None:
+
+                        continue
+
+                    oldest_time_kept = current_time - retention_days * 86400.
+                    segment_span = resolution_to_segment_span[resolution]
+
+                    for segment_start, segment_filename in list_segments(
+                            self.base_directory, location, measurement, resolution):
+
+                        if segment_start + segment_span > oldest_time_kept:
+
+                            # Segments are sorted : following ones are more recent
+                            break
+
+                        general_utils.delete_os_file(segment_filename)
+                        self.all_checked_segments.discard(segment_filename)
+
+                if self.compress_after_days is None:
+
+                    continue
+
+                newest_end_compressed = current_time - self.compress_after_days * 86400.
+
+                for segment_start, segment_filename in list_segments(
+                        self.base_directory, location, measurement, 'raw'):
+
+                    if segment_start + resolution_to_segment_span['raw'] > newest_end_compressed:
+
+                        break
+
+                    if segment_filename.endswith(segment_extension):
+
+                        self.compress_segment(segment_filename)
+
+        ######
+        return
+        ######
+
+    ######################
+    # END apply_retention
+    ######################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # compress_segment
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def compress_segment(self, segment_filename):
+        """
+        Replaces a raw segment by its compressed version. The compressed file is written under a
+        temporary name, synced, then renamed, so that a power loss never loses the segment.
+
+        INPUT:
+            segment_filename (str) path of raw segment (no longer written to)
+
+        RETURNS:
+            (int) 0 if segment was compressed, negative number otherwise
+        """
+
+        all_points = list(iter_segment_records(segment_filename, raw_record, float('-inf'),
+                                               float('inf')))
+
+        compressed_filename = segment_filename[:-len(segment_extension)] + \
+            compressed_segment_extension
+        temporary_filename = compressed_filename + '.tmp'
+
+        try:
+
+            with open(temporary_filename, 'wb') as compressed_file:
+
+                compressed_file.write(gorilla_compression.encode_series(all_points))
+                compressed_file.flush()
+                os.fsync(compressed_file.fileno())
+
+            os.replace(temporary_filename, compressed_filename)
+
+        except OSError as e:
+
+            general_utils.delete_os_file(temporary_filename)
+
+            ##################################################################
+            return general_utils.log_error(-427, compressed_filename, str(e))
+            ##################################################################
+
+        self.all_checked_segments.discard(segment_filename)
+
+        #####################################################
+        return general_utils.delete_os_file(segment_filename)
+        #####################################################
+
+    #######################
+    # END compress_segment
+    #######################
+
+###########################
+# END SensorHistoryStore
+###########################
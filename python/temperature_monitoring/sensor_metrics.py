@@ -0,0 +1,543 @@
+"""
+Read metrics of each sensor : read latency histogram, failed reads, samples skipped (warmup,
+suspended by circuit breaker, bus busy, previous read still running) and time reads ran over their
+sampling interval. Metrics are exported in the Prometheus text format (node_exporter textfile
+collector), and summarized in the snapshot file.
+
+Option in Output section of configuration file (home_environment_sensors) :
+    metrics_file = /var/lib/node_exporter/home_sensors.prom   (not written if missing)
+
+Exported metrics (labels sensor and type) :
+    home_sensor_read_duration_seconds           histogram of read times (bus lock held)
+    home_sensor_reads_total{result}             reads, by result (success/failure)
+    home_sensor_skipped_samples_total{reason}   samples not read, by reason
+    home_sensor_overrun_seconds_total           time reads ran longer than sampling interval
+    home_sensor_<counter>_total                 driver/filter counters (retries, checksum failures)
+    home_sensor_loop_*                          main loop lateness (no sensor label)
+"""
+
+#########################
+# Import global packages
+#########################
+
+import threading  # Metrics updated by reading threads, exported by main thread
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+# Upper bounds of read duration buckets, in seconds (last bucket +Inf is implicit). From I2C reads
+# (few ms) to DHT11 retries and one-wire conversions (seconds).
+latency_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10.)
+
+metric_prefix = 'home_sensor_'
+
+# Reasons for which a sample is not read
+skip_reasons = ('warmup', 'suspended', 'bus_timeout', 'overrun')
+
+# Description of cumulative counters given by drivers and filters (see format_prometheus)
+counter_descriptions = {
+    'retries': 'Tries after the first one, all reads (driver retries).',
+    'checksum_failures': 'Tries whose data did not match its checksum.',
+    'incomplete_frames': 'Tries which did not receive a full data frame.',
+    'rejected_outliers': 'Samples rejected by outlier filters.'
+}
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# FUNCTION (escape_label)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def escape_label(label_value):
+    """
+    Escapes a label value for the Prometheus text format.
+
+    INPUT:
+        label_value (str) value to escape
+
+    RETURNS:
+        (str) value with backslashes, double quotes and line feeds escaped
+    """
+
+    ######################################################################################
+    return str(label_value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    ######################################################################################
+
+###################
+# END escape_label
+###################
+
+
+####################################################################################################
+# SensorMetrics
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class SensorMetrics:
+    """
+    Read metrics of one sensor. Updated by the reading thread of the sensor, and by the main thread
+    when a sample is skipped.
+    """
+
+    __slots__ = ('name', 'sensor_type', 'lock', 'all_bucket_counts', 'latency_sum', 'max_latency',
+                 'n_reads', 'n_failed_reads', 'all_skip_counts', 'overrun_time')
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, name, sensor_type):
+        """
+        Creates empty metrics.
+
+        INPUT:
+            name (str) sensor name (location)
+            sensor_type (str) sensor type (DHT11, BME280, ...)
+        """
+
+        self.name = name
+        self.sensor_type = sensor_type
+        self.lock = threading.Lock()
+        self.all_bucket_counts = [0] * (len(latency_buckets) + 1)  # Not cumulative, last is +Inf
+        self.latency_sum = 0.  # Sum of read durations, in seconds
+        self.max_latency = 0.  # Longest read, in seconds
+        self.n_reads = 0  # Reads made (successful or not)
+        self.n_failed_reads = 0  # Reads without any value
+        self.all_skip_counts = {skip_reason: 0 for skip_reason in skip_reasons}
+        self.overrun_time = 0.  # Seconds reads lasted longer than the sampling interval
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # add_read
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def add_read(self, duration, is_successful, sample_interval=None):
+        """
+        Adds a read made on the sensor.
+
+        INPUT:
+            duration (float) seconds spent reading
+            is_successful (bool) whether at least one value was read
+            sample_interval (float, opt) sampling interval. Read time over it counts as overrun.
+        """
+
+        bucket_index = 0
+        while bucket_index < len(latency_buckets) and duration > latency_buckets[bucket_index]:
+
+            bucket_index += 1
+
+        with self.lock:
+
+            self.all_bucket_counts[bucket_index] += 1
+            self.latency_sum += duration
+            self.max_latency = max(self.max_latency, duration)
+            self.n_reads += 1
+            self.n_failed_reads += int(not is_successful)
+
+            if sample_interval is not None and duration > sample_interval:
+
+                self.overrun_time += duration - sample_interval
+
+        ######
+        return
+        ######
+
+    ###############
+    # END add_read
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # add_skip
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def add_skip(self, skip_reason):
+        """
+        Adds a sample which was not read.
+
+        INPUT:
+            skip_reason (str) one of skip_reasons
+        """
+
+        with self.lock:
+
+            self.all_skip_counts[skip_reason] += 1
+
+        ######
+        return
+        ######
+
+    ###############
+    # END add_skip
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_latency_quantile
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_latency_quantile(self, quantile):
+        """
+        Returns an upper bound of a read duration quantile : upper bound of the histogram bucket it
+        falls in (longest read for the last bucket).
+
+        INPUT:
+            quantile (float) quantile to estimate (0-1)
+
+        RETURNS:
+            (float|None) seconds, None if sensor was never read
+        """
+
+        if self.n_reads == 0:
+
+            ############
+            return None
+            ############
+
+        n_reads_below = 0
+        for bucket_index, bucket_count in enumerate(self.all_bucket_counts[:-1]):
+
+            n_reads_below += bucket_count
+
+            if n_reads_below >= quantile * self.n_reads:
+
+                ###########################################################
+                return min(latency_buckets[bucket_index], self.max_latency)
+                ###########################################################
+
+        ########################
+        return self.max_latency
+        ########################
+
+    ###########################
+    # END get_latency_quantile
+    ###########################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_stats
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_stats(self):
+        """
+        Returns a summary of the metrics since start. Durations are in milliseconds.
+
+        RETURNS:
+            (Dict) reads, failed reads, mean/p95/max read duration, skipped samples by reason and
+                overrun time (seconds)
+        """
+
+        with self.lock:
+
+            mean_latency = None
+            if self.n_reads > 0:
+
+                mean_latency = round(1e3 * self.latency_sum / self.n_reads, 2)
+
+            p95_latency = self.get_latency_quantile(0.95)
+
+            all_stats = {
+                'reads': self.n_reads,
+                'failed_reads': self.n_failed_reads,
+                'mean_ms': mean_latency,
+                'p95_ms': None if p95_latency is None else round(1e3 * p95_latency, 2),
+                'max_ms': round(1e3 * self.max_latency, 2),
+                'skipped': dict(self.all_skip_counts),
+                'overrun_time': round(self.overrun_time, 3)
+            }
+
+        #################
+        return all_stats
+        #################
+
+    ################
+    # END get_stats
+    ################
+
+######################
+# END SensorMetrics
+######################
+
+
+####################################################################################################
+# MetricsRegistry
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class MetricsRegistry:
+    """
+    Read metrics of all sensors, by sensor name. Metrics are kept when a sensor is reopened.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self):
+        """
+        Creates registry without any sensor.
+        """
+
+        self.all_sensor_metrics = {}  # Sensor name => SensorMetrics
+        self.creation_lock = threading.Lock()
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_sensor_metrics
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_sensor_metrics(self, name, sensor_type):
+        """
+        Returns metrics of a sensor, creating them on first request (or if sensor type changed).
+
+        INPUT:
+            name (str) sensor name (location)
+            sensor_type (str) sensor type
+
+        RETURNS:
+            (SensorMetrics) metrics of the sensor
+        """
+
+        with self.creation_lock:
+
+            sensor_metrics = self.all_sensor_metrics.get(name)
+
+            if sensor_metrics is None or sensor_metrics.sensor_type != sensor_type:
+
+                sensor_metrics = SensorMetrics(name, sensor_type)
+                self.all_sensor_metrics[name] = sensor_metrics
+
+        ######################
+        return sensor_metrics
+        ######################
+
+    #########################
+    # END get_sensor_metrics
+    #########################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # remove_sensor
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def remove_sensor(self, name):
+        """
+        Removes metrics of a sensor no longer configured (no longer exported).
+
+        INPUT:
+            name (str) sensor name (location)
+        """
+
+        with self.creation_lock:
+
+            self.all_sensor_metrics.pop(name, None)
+
+        ######
+        return
+        ######
+
+    ####################
+    # END remove_sensor
+    ####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # format_prometheus
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def format_prometheus(self, all_sensor_counters=None, all_loop_stats=None):
+        """
+        Returns metrics of all sensors in the Prometheus text format.
+
+        INPUT:
+            all_sensor_counters (Dict, opt) sensor name => {counter name: cumulative value}, for
+                counters kept by drivers and filters (see counter_descriptions)
+            all_loop_stats (Dict, opt) main loop metrics : late_tasks, late_time (seconds),
+                max_late_time (seconds) and missed_deadlines (see SamplingScheduler.get_stats)
+
+        RETURNS:
+            (str) metrics, one sample per line
+        """
+
+        if all_sensor_counters is None:
+
+            all_sensor_counters = {}
+
+        with self.creation_lock:
+
+            all_sensor_metrics = sorted(self.all_sensor_metrics.values(),
+                                        key=lambda sensor_metrics: sensor_metrics.name)
+
+        duration_name = metric_prefix + 'read_duration_seconds'
+        all_lines = ['# HELP %s Time spent reading a sensor (bus lock held).' % duration_name,
+                     '# TYPE %s histogram' % duration_name]
+        all_read_lines = []
+        all_skip_lines = []
+        all_overrun_lines = []
+
+        for sensor_metrics in all_sensor_metrics:
+
+            labels = 'sensor="%s",type="%s"' % (escape_label(sensor_metrics.name),
+                                                escape_label(sensor_metrics.sensor_type))
+
+            with sensor_metrics.lock:
+
+                n_cumulated_reads = 0
+                for bucket_index, bucket_count in enumerate(sensor_metrics.all_bucket_counts):
+
+                    n_cumulated_reads += bucket_count
+                    bucket_bound = '+Inf'
+
+                    if bucket_index < len(latency_buckets):
+
+                        bucket_bound = repr(latency_buckets[bucket_index])
+
+                    all_lines.append('%s_bucket{%s,le="%s"} %d' % (duration_name, labels,
+                                                                     bucket_bound,
+                                                                     n_cumulated_reads))
+
+                all_lines.append('%s_sum{%s} %.6f' % (duration_name, labels,
+                                                      sensor_metrics.latency_sum))
+                all_lines.append('%s_count{%s} %d' % (duration_name, labels,
+                                                      sensor_metrics.n_reads))
+
+                n_failed_reads = sensor_metrics.n_failed_reads
+                all_read_lines.append('%sreads_total{%s,result="success"} %d' % (
+                    metric_prefix, labels, sensor_metrics.n_reads - n_failed_reads))
+                all_read_lines.append('%sreads_total{%s,result="failure"} %d' % (
+                    metric_prefix, labels, n_failed_reads))
+
+                for skip_reason in skip_reasons:
+
+                    all_skip_lines.append('%sskipped_samples_total{%s,reason="%s"} %d' % (
+                        metric_prefix, labels, skip_reason,
+                        sensor_metrics.all_skip_counts[skip_reason]))
+
+                all_overrun_lines.append('%soverrun_seconds_total{%s} %.3f' % (
+                    metric_prefix, labels, sensor_metrics.overrun_time))
+
+        all_lines.append('# HELP %sreads_total Sensor reads, by result.' % metric_prefix)
+        all_lines.append('# TYPE %sreads_total counter' % metric_prefix)
+        all_lines.extend(all_read_lines)
+
+        all_lines.append('# HELP %sskipped_samples_total Samples not read, by reason.' %
+                         metric_prefix)
+        all_lines.append('# TYPE %sskipped_samples_total counter' % metric_prefix)
+        all_lines.extend(all_skip_lines)
+
+        all_lines.append('# HELP %soverrun_seconds_total Time reads lasted longer than sampling '
+                         'interval.' % metric_prefix)
+        all_lines.append('# TYPE %soverrun_seconds_total counter' % metric_prefix)
+        all_lines.extend(all_overrun_lines)
+
+        # Counters kept outside of the registry, only for sensors which have them
+        for counter_name, counter_description in sorted(counter_descriptions.items()):
+
+            counter_metric_name = '%s%s_total' % (metric_prefix, counter_name)
+            all_counter_lines = []
+
+            for sensor_metrics in all_sensor_metrics:
+
+                counter_value = all_sensor_counters.get(sensor_metrics.name, {}).get(counter_name)
+
+                if counter_value is not None:
+
+                    all_counter_lines.append('%s{sensor="%s",type="%s"} %d' % (
+                        counter_metric_name, escape_label(sensor_metrics.name),
+                        escape_label(sensor_metrics.sensor_type), counter_value))
+
+            if len(all_counter_lines) > 0:
+
+                all_lines.append('# HELP %s %s' % (counter_metric_name, counter_description))
+                all_lines.append('# TYPE %s counter' % counter_metric_name)
+                all_lines.extend(all_counter_lines)
+
+        if all_loop_stats is not None:
+
+            all_lines.extend([
+                '# HELP %sloop_late_tasks_total Loop tasks (samples, averages, outputs) started '
+                'late.' % metric_prefix,
+                '# TYPE %sloop_late_tasks_total counter' % metric_prefix,
+                '%sloop_late_tasks_total %d' % (metric_prefix, all_loop_stats['late_tasks']),
+                '# HELP %sloop_late_seconds_total Delay of late loop tasks.' % metric_prefix,
+                '# TYPE %sloop_late_seconds_total counter' % metric_prefix,
+                '%sloop_late_seconds_total %.3f' % (metric_prefix, all_loop_stats['late_time']),
+                '# HELP %sloop_max_late_seconds Longest delay of a loop task.' % metric_prefix,
+                '# TYPE %sloop_max_late_seconds gauge' % metric_prefix,
+                '%sloop_max_late_seconds %.3f' % (metric_prefix, all_loop_stats['max_late_time']),
+                '# HELP %sloop_missed_deadlines_total Loop task executions skipped (late by more '
+                'than an interval).' % metric_prefix,
+                '# TYPE %sloop_missed_deadlines_total counter' % metric_prefix,
+                '%sloop_missed_deadlines_total %d' % (metric_prefix,
+                                                      all_loop_stats['missed_deadlines'])
+            ])
+
+        ##################################
+        return '\n'.join(all_lines) + '\n'
+        ##################################
+
+    ########################
+    # END format_prometheus
+    ########################
+
+########################
+# END MetricsRegistry
+########################
@@ -0,0 +1,571 @@
+"""
+Compact in-memory records for sensors handled by home_environment_sensors.
+
+Each sensor keeps, for each of its measurements :
+    - a SampleAccumulator for samples collected since the last average (running sum and count),
+    - a RingBuffer of the last averages used for smoothing (fixed capacity, NaN for missing).
+All updates are O(1) and memory stays constant whatever the length of the smoothing window.
+"""
+
+#########################
+# Import global packages
+#########################
+
+import array  # Fixed-size float storage for ring buffers
+import math  # NaN handling
+import threading  # Protects samples between reading threads and averaging
+
+########################
+# Import local packages
+########################
+
+from . import circuit_breaker  # Suspends reads of failing sensors
+
+__author__ = 'Baland Adrien'
+
+
+####################################################################################################
+# RingBuffer
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class RingBuffer:
+    """
+    Fixed-capacity buffer of floats, where pushing a new value overwrites the oldest one.
+    Missing values are stored as NaN and ignored in the mean. The mean of valid values is kept up
+    to date with a running sum, so it costs O(1) per push.
+    """
+
+    __slots__ = ('capacity', 'all_values', 'next_index', 'n_valid', 'running_sum',
+                 'n_push_since_resum')
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, capacity):
+        """
+        Creates buffer filled with missing values.
+
+        INPUT:
+            capacity (int) number of values kept in buffer
+        """
+
+        self.capacity = capacity
+        self.all_values = array.array('d', [math.nan]) * capacity
+        self.next_index = 0  # Index of the oldest value (next to be overwritten)
+        self.n_valid = 0  # Number of non-NaN values in buffer
+        self.running_sum = 0.0  # Sum of non-NaN values in buffer
+        self.n_push_since_resum = 0  # Pushes since running sum was last recomputed from scratch
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # push
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def push(self, value):
+        """
+        Adds a value to the buffer, removing the oldest one.
+
+        INPUT:
+            value (float|None) value to add. None for missing value.
+        """
+
+        oldest_value = self.all_values[self.next_index]
+
+        # Removes oldest value from running sum (NaN is the only value not equal to itself)
+        if oldest_value == oldest_value:
+
+            self.running_sum -= oldest_value
+            self.n_valid -= 1
+
+        if value is None or value != value:
+
+            self.all_values[self.next_index] = math.nan
+
+        else:
+
+            self.all_values[self.next_index] = value
+            self.running_sum += value
+            self.n_valid += 1
+
+        self.next_index = (self.next_index + 1) % self.capacity
+
+        # Recomputes sum from scratch once per buffer length, so that float rounding errors from
+        # additions/subtractions do not accumulate (amortized O(1)).
+        self.n_push_since_resum += 1
+        if self.n_push_since_resum >= self.capacity:
+
+            self.running_sum = math.fsum(value for value in self.all_values if value == value)
+            self.n_push_since_resum = 0
+
+        ######
+        return
+        ######
+
+    ###########
+    # END push
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_mean
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_mean(self):
+        """
+        Returns mean of valid values in buffer.
+
+        RETURNS:
+            (float|None) mean of non-missing values, None if all values are missing
+        """
+
+        if self.n_valid == 0:
+
+            ############
+            return None
+            ############
+
+        ######################################
+        return self.running_sum / self.n_valid
+        ######################################
+
+    ###############
+    # END get_mean
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_values
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_values(self):
+        """
+        Returns all values in buffer, from oldest to newest.
+
+        RETURNS:
+            (float[]) values, NaN for missing values
+        """
+
+        all_ordered_values = list(self.all_values[self.next_index:]) + \
+            list(self.all_values[:self.next_index])
+
+        ##########################
+        return all_ordered_values
+        ##########################
+
+    #################
+    # END get_values
+    #################
+
+#####################
+# END RingBuffer
+#####################
+
+
+####################################################################################################
+# SampleAccumulator
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class SampleAccumulator:
+    """
+    Running sum/count of samples collected for one measurement since the last average.
+    """
+
+    __slots__ = ('sample_sum', 'n_samples', 'first_time', 'last_time')
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self):
+        """
+        Creates an empty accumulator.
+        """
+
+        self.sample_sum = 0.0
+        self.n_samples = 0
+        self.first_time = None  # Timestamp of first sample
+        self.last_time = None  # Timestamp of last sample
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # add
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def add(self, timestamp, value):
+        """
+        Adds one sample.
+
+        INPUT:
+            timestamp (float) time at which sample was collected
+            value (float) sample value
+        """
+
+        self.sample_sum += value
+        self.n_samples += 1
+
+        if self.first_time is None:
+
+            self.first_time = timestamp
+
+        self.last_time = timestamp
+
+        ######
+        return
+        ######
+
+    ##########
+    # END add
+    ##########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_mean
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_mean(self):
+        """
+        Returns mean of samples added.
+
+        RETURNS:
+            (float|None) mean of samples, None if no sample was added
+        """
+
+        if self.n_samples == 0:
+
+            ############
+            return None
+            ############
+
+        #######################################
+        return self.sample_sum / self.n_samples
+        #######################################
+
+    ###############
+    # END get_mean
+    ###############
+
+############################
+# END SampleAccumulator
+############################
+
+
+####################################################################################################
+# Sensor
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created (replaces sensor dictionnaries)
+#   2026-10-19 AB - Keeps its configuration options (compared on reload). Smoothing size change.
+####################################################################################################
+class Sensor:
+    """
+    Characteristics and collected data of a sensor plugged into the Raspberry Pi.
+    """
+
+    __slots__ = (
+        'name',  # Sensor location (additional info about sensor, e.g. where it is)
+        'type',  # Sensor type. One of BME280, DS18B20, Sensehat, DHT11, TSL2561
+        'address',  # Sensor address. BME280: I2C, DS18B20: 1wire, DHT11: GPIO, Sensehat: None
+        'correction',  # Sensor correction (only for temperature now, might be changed later)
+        'warmup',  # Time necessary for a sensor to warmup (measures ignored during warmup)
+        'sample_interval',  # Seconds between two samples
+        'n_sample_for_average',  # Number of samples per average
+        'output_directory',  # Where to create .dat files with measure values
+        'last_failed_measure_time',  # Last time a sensor measurement could not be made
+        'measurement_types',  # Types of measurements collected (temperature, humidity, ...)
+        'samples_to_average',  # measurement => SampleAccumulator, samples before being averaged
+        'n_last_averages',  # measurement => RingBuffer, averages used for smoothing
+        'smoothed_average',  # measurement => last smoothed average (None if last cycle failed)
+        'lock',  # Protects samples_to_average (filled by reading threads)
+        'pending_read',  # Future of the read in progress in the sensor thread pool
+        'outlier_filters',  # measurement => outlier filter (empty if samples are not filtered)
+        'n_accepted_samples',  # Number of samples that passed outlier filters since start
+        'n_rejected_samples',  # Number of samples rejected by outlier filters since start
+        'n_rejected_reported',  # Value of n_rejected_samples when rejections were last logged
+        'last_output_values',  # measurement => value last written in .dat file (writes coalesced)
+        'handle',  # Open SensorHandle of the sensor (None until first read, or after a failure)
+        'breaker',  # CircuitBreaker suspending reads of the sensor after repeated failures
+        'adaptive_interval',  # AdaptiveInterval if sample_interval follows variance (None if fixed)
+        'config_options'  # Options of the configuration section of the sensor (reload diff)
+    )
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, name, sensor_type, address, correction, warmup, sample_interval,
+                 n_sample_for_average, output_directory, measurement_types, n_average_for_smooth,
+                 last_failed_measure_time, outlier_filters=None, breaker=None,
+                 adaptive_interval=None, config_options=None):
+        """
+        Creates sensor record with empty data.
+
+        INPUT:
+            name (str) sensor location
+            sensor_type (str) sensor type
+            address (int|str|None) sensor address, as converted by its driver
+            correction (float) temperature correction
+            warmup (float) seconds during which measures are ignored after a failure
+            sample_interval (float) seconds between two samples
+            n_sample_for_average (int) number of samples per average
+            output_directory (str) where to create .dat files
+            measurement_types (str[]) types of measurements collected by the sensor
+            n_average_for_smooth (int) number of averages used for smoothing
+            last_failed_measure_time (float) time of last failure (start time, for warmup)
+            outlier_filters (Dict, opt) measurement => outlier filter (see outlier_filters)
+            breaker (CircuitBreaker, opt) breaker for reads of the sensor. Default settings if None.
+            adaptive_interval (AdaptiveInterval, opt) sampling interval following variance of
+                samples. Fixed sample_interval if None.
+            config_options (Dict, opt) option => value, as in the configuration section of the
+                sensor. Compared when configuration is reloaded.
+        """
+
+        self.name = name
+        self.type = sensor_type
+        self.address = address
+        self.correction = correction
+        self.warmup = warmup
+        self.sample_interval = sample_interval
+        self.n_sample_for_average = n_sample_for_average
+        self.output_directory = output_directory
+        self.last_failed_measure_time = last_failed_measure_time
+        self.measurement_types = tuple(measurement_types)
+        self.samples_to_average = {measurement: SampleAccumulator() for measurement in
+                                   self.measurement_types}
+        self.n_last_averages = {measurement: RingBuffer(n_average_for_smooth) for measurement in
+                                self.measurement_types}
+        self.smoothed_average = {measurement: 0.0 for measurement in self.measurement_types}
+        self.lock = threading.Lock()
+        self.pending_read = None
+        self.outlier_filters = outlier_filters or {}
+        self.n_accepted_samples = 0
+        self.n_rejected_samples = 0
+        self.n_rejected_reported = 0
+        self.last_output_values = {}
+        self.handle = None
+        self.breaker = breaker or circuit_breaker.CircuitBreaker()
+        self.adaptive_interval = adaptive_interval
+        self.config_options = config_options or {}
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # add_sample
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def add_sample(self, measurement, timestamp, value):
+        """
+        Adds a sample to average for a measurement. Called from reading threads.
+
+        INPUT:
+            measurement (str) type of measurement
+            timestamp (float) time at which sample was collected
+            value (float) sample value
+        """
+
+        with self.lock:
+
+            self.samples_to_average[measurement].add(timestamp, value)
+
+        ######
+        return
+        ######
+
+    #################
+    # END add_sample
+    #################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # is_outlier
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def is_outlier(self, measurement, value):
+        """
+        Passes a new sample through the outlier filter of its measurement, and counts it as
+        accepted or rejected. Called from reading threads (one read at a time for a sensor).
+
+        INPUT:
+            measurement (str) type of measurement
+            value (float) sample value
+
+        RETURNS:
+            (bool) True if sample must be discarded
+        """
+
+        outlier_filter = self.outlier_filters.get(measurement)
+        is_rejected = outlier_filter is not None and outlier_filter.is_outlier(value)
+
+        if is_rejected:
+
+            self.n_rejected_samples += 1
+
+        else:
+
+            self.n_accepted_samples += 1
+
+        ####################
+        return is_rejected
+        ####################
+
+    #################
+    # END is_outlier
+    #################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # take_samples
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def take_samples(self):
+        """
+        Takes out all samples collected since last call, and starts new empty accumulators.
+
+        RETURNS:
+            (Dict) measurement => SampleAccumulator with collected samples
+        """
+
+        new_accumulators = {measurement: SampleAccumulator() for measurement in
+                            self.measurement_types}
+
+        with self.lock:
+
+            collected_samples = self.samples_to_average
+            self.samples_to_average = new_accumulators
+
+        #########################
+        return collected_samples
+        #########################
+
+    ###################
+    # END take_samples
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # set_smoothing_size
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def set_smoothing_size(self, n_average_for_smooth):
+        """
+        Changes the number of averages used for smoothing. Most recent averages are kept.
+
+        INPUT:
+            n_average_for_smooth (int) number of averages used for smoothing
+        """
+
+        for measurement, last_averages in self.n_last_averages.items():
+
+            new_last_averages = RingBuffer(n_average_for_smooth)
+
+            for average_value in last_averages.get_values()[-n_average_for_smooth:]:
+
+                new_last_averages.push(average_value)
+
+            self.n_last_averages[measurement] = new_last_averages
+
+        ######
+        return
+        ######
+
+    #########################
+    # END set_smoothing_size
+    #########################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # __repr__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __repr__(self):
+        """
+        Describes sensor configuration (for logs).
+        """
+
+        description = 'Sensor(name=%r, type=%r, address=%r, correction=%r, warmup=%r, ' \
+                      'sample_interval=%r, n_sample_for_average=%r, output_directory=%r)' % (
+                          self.name, self.type, self.address, self.correction, self.warmup,
+                          self.sample_interval, self.n_sample_for_average, self.output_directory)
+
+        ###################
+        return description
+        ###################
+
+    ###############
+    # END __repr__
+    ###############
+
+#################
+# END Sensor
+#################
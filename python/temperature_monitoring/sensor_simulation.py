@@ -0,0 +1,1435 @@
+"""
+Simulated sensor hardware : runs home_environment_sensors without RPi.GPIO, I2C or one-wire bus.
+
+Simulated drivers stand in for the real ones (same address checks, measurement types and buses),
+and get their raw data from a source instead of the hardware :
+    - replay : trace recorded on a Raspberry Pi, looped when it is over.
+    - synthetic : daily cycle of each measurement, with noise and failed reads.
+Raw data is decoded with the functions of the real drivers (DHT11 pin samples and edges, w1_slave
+content, BME280 compensation), so decoding costs and failures are part of the simulation.
+
+Trace file : one JSON record per line, {"time": seconds since start, "type": sensor type,
+"address": sensor address, "kind": kind of data, "data": raw data}. Kinds are
+    pins (DHT11 pin samples, as [level, count] runs), edges (DHT11 edges, as [tick, level]),
+    w1_slave (DS18B20 file lines), bme280 (calibration and raw ADC values), values (final values).
+
+Simulation section of the configuration file (home_environment_sensors) :
+    mode = synthetic            (replay, synthetic, or record : traces of real sensors written)
+    trace_file = /home/pi/data/sensor_trace.jsonl
+    seed = 0                    (synthetic : random generator seed)
+    failure_rate = 0.02         (synthetic : share of failed reads)
+
+Accelerated run (sensor_simulation.py config.ini --hours 24) : time is simulated, so hours of
+samples are collected in seconds, always with the same results for the same configuration.
+"""
+
+#########################
+# Import global packages
+#########################
+
+import argparse  # Command line of accelerated runs
+import bisect  # Finds the record of a trace at a given time
+import json  # Trace records
+import math  # Daily cycle of synthetic values
+import os  # Discards printed output of accelerated runs
+import random  # Noise and failures of synthetic values
+import sys  # Command line arguments
+import threading  # Records are written from sensor reading threads
+import time  # Real clock
+import zlib  # Seeds of synthetic sensors, identical from one run to the next
+
+########################
+# Import local packages
+########################
+
+from global_libraries import general_utils
+from . import BME280_Driver_Official_Adafruit  # BME280 compensation of raw values
+from . import DHT11_Driver  # Decoding of DHT11 pin samples and edges
+from . import DS18B20_Driver  # Parsing of w1_slave content
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+
+all_modes = ('replay', 'synthetic', 'record')
+default_trace_file = '/home/pi/data/sensor_trace.jsonl'
+bus_name_prefix = 'sim-'  # Simulated buses never wait for real sensors read by another process
+
+# Synthetic values : measurement => (mean, daily amplitude, noise standard deviation)
+day_duration = 86400.
+all_synthetic_profiles = {
+    'temperature': (20., 3., 0.05),
+    'humidity': (50., 10., 0.3),
+    'pressure': (101300., 300., 5.),  # Pascals (BME280)
+    'luminosity': (250., 250., 2.)
+}
+all_type_synthetic_profiles = {
+    ('Sensehat', 'pressure'): (1013., 3., 0.05)  # Millibars
+}
+
+# DHT11 pin samples, for a polling period of about 10us
+dht11_low_samples = 5  # LOW before each data bit (50us)
+dht11_zero_samples = 3  # HIGH of a 0-bit (27us)
+dht11_one_samples = 7  # HIGH of a 1-bit (70us)
+dht11_end_samples = 250  # HIGH after the last bit (collection stops on a long stable level)
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# SimulatedClock
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class SimulatedClock:
+    """
+    Clock of an accelerated run, standing in for the time module. Sleeping moves the clock forward
+    at once (or after a real sleep divided by speed). Other time functions are the real ones.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, speed=0., start_time=None):
+        """
+        Creates clock, starting at start_time.
+
+        INPUT:
+            speed (float) simulated seconds per real second. 0 to never really sleep.
+            start_time (float, opt) epoch time at which simulation starts. Now by default.
+        """
+
+        if start_time is None:
+
+            start_time = time.time()
+
+        self.speed = speed
+        self.start_time = start_time
+        self.elapsed_time = 0.
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # time
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def time(self):
+        """
+        Returns simulated epoch time (time.time).
+        """
+
+        ##########################################
+        return self.start_time + self.elapsed_time
+        ##########################################
+
+    ###########
+    # END time
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # monotonic
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def monotonic(self):
+        """
+        Returns seconds since start of simulation (time.monotonic).
+        """
+
+        #########################
+        return self.elapsed_time
+        #########################
+
+    ################
+    # END monotonic
+    ################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # sleep
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def sleep(self, seconds):
+        """
+        Moves clock forward (time.sleep, or threading.Event.wait never interrupted).
+
+        INPUT:
+            seconds (float) simulated seconds to wait
+
+        RETURNS:
+            (bool) False, as a wait that was not interrupted
+        """
+
+        if seconds > 0:
+
+            self.elapsed_time += seconds
+
+            if self.speed > 0:
+
+                time.sleep(seconds / self.speed)
+
+        #############
+        return False
+        #############
+
+    ############
+    # END sleep
+    ############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # localtime
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def localtime(self, seconds=None):
+        """
+        Converts seconds (simulated time by default) to local time (time.localtime).
+        """
+
+        if seconds is None:
+
+            seconds = self.time()
+
+        ###############################
+        return time.localtime(seconds)
+        ###############################
+
+    ################
+    # END localtime
+    ################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # __getattr__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __getattr__(self, name):
+        """
+        Other functions of the time module (strftime, perf_counter, ...) are the real ones.
+        """
+
+        ##########################
+        return getattr(time, name)
+        ##########################
+
+    ##################
+    # END __getattr__
+    ##################
+
+###########################
+# END SimulatedClock
+###########################
+
+
+####################################################################################################
+# FUNCTION (encode_runs)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def encode_runs(all_pin_values):
+    """
+    Encodes pin samples as runs of the same level (samples repeat the level many times).
+
+    INPUT:
+        all_pin_values (int[]) pin samples (0 or 1)
+
+    RETURNS:
+        (list) runs, as [level, number of samples]
+    """
+
+    all_runs = []
+
+    for pin_value in all_pin_values:
+
+        if len(all_runs) > 0 and all_runs[-1][0] == pin_value:
+
+            all_runs[-1][1] += 1
+
+        else:
+
+            all_runs.append([pin_value, 1])
+
+    ################
+    return all_runs
+    ################
+
+##################
+# END encode_runs
+##################
+
+
+####################################################################################################
+# FUNCTION (decode_runs)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def decode_runs(all_runs):
+    """
+    Decodes runs of the same level into pin samples.
+
+    INPUT:
+        all_runs (list) runs, as [level, number of samples]
+
+    RETURNS:
+        (int[]) pin samples (0 or 1)
+    """
+
+    all_pin_values = []
+
+    for pin_value, n_samples in all_runs:
+
+        all_pin_values.extend([pin_value] * n_samples)
+
+    ######################
+    return all_pin_values
+    ######################
+
+##################
+# END decode_runs
+##################
+
+
+####################################################################################################
+# FUNCTION (synthesize_dht11_runs)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def synthesize_dht11_runs(temperature, humidity, is_corrupted=False):
+    """
+    Creates the pin samples of a DHT11 response (as collected by DHT11_Driver.collect_pin_values).
+
+    INPUT:
+        temperature (int) temperature sent by sensor, in Celsius
+        humidity (int) relative humidity sent by sensor, in %
+        is_corrupted (bool) whether checksum is wrong (transmission error)
+
+    RETURNS:
+        (list) runs, as [level, number of samples]
+    """
+
+    all_data_bytes = [humidity & 0xFF, 0, temperature & 0xFF, 0]
+    checksum = DHT11_Driver.compute_checksum(all_data_bytes + [0])
+
+    if is_corrupted:
+
+        checksum ^= 0x01
+
+    all_runs = []
+
+    for data_byte in all_data_bytes + [checksum]:
+
+        for bit_index in range(7, -1, -1):
+
+            high_samples = dht11_one_samples if data_byte >> bit_index & 1 else dht11_zero_samples
+            all_runs.append([0, dht11_low_samples])
+            all_runs.append([1, high_samples])
+
+    # Sensor pulls the pin LOW after the last bit, then releases it
+    all_runs.append([0, dht11_low_samples])
+    all_runs.append([1, dht11_end_samples])
+
+    ################
+    return all_runs
+    ################
+
+############################
+# END synthesize_dht11_runs
+############################
+
+
+####################################################################################################
+# ReplayBME280
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class ReplayBME280(BME280_Driver_Official_Adafruit.BME280):
+    """
+    BME280 compensating recorded raw values with recorded calibration (no I2C device).
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, all_calibration, all_raw_values):
+        """
+        Creates sensor from a record.
+
+        INPUT:
+            all_calibration (Dict) calibration attributes (dig_T1, ..., dig_H6) => value
+            all_raw_values (int[3]) raw temperature, pressure and humidity
+        """
+
+        self._mode = BME280_Driver_Official_Adafruit.BME280_OSAMPLE_1
+        self.t_fine = 0.
+        self.all_raw_values = tuple(all_raw_values)
+
+        for calibration_name, calibration_value in all_calibration.items():
+
+            setattr(self, calibration_name, calibration_value)
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # read_raw_all
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def read_raw_all(self):
+        """
+        Returns recorded raw temperature, pressure and humidity (no measurement wait).
+        """
+
+        ###########################
+        return self.all_raw_values
+        ###########################
+
+    ###################
+    # END read_raw_all
+    ###################
+
+###########################
+# END ReplayBME280
+###########################
+
+
+####################################################################################################
+# FUNCTION (decode_record)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def decode_record(record, all_measurement_types, correction):
+    """
+    Converts the raw data of a trace record into measurement values, as the real driver would.
+
+    INPUT:
+        record (Dict) trace record (kind, data, address)
+        all_measurement_types (str[]) measurements of the sensor type
+        correction (float) correction to apply to temperature
+
+    RETURNS:
+        (Dict) measurement => value (None if measure failed)
+    """
+
+    all_values = {measurement: None for measurement in all_measurement_types}
+    record_kind = record['kind']
+    record_data = record['data']
+
+    if record_kind == 'values':
+
+        all_values.update(record_data)
+
+    elif record_kind in ('pins', 'edges'):
+
+        all_data_bits = None
+
+        if record_kind == 'edges':
+
+            all_data_bits = DHT11_Driver.decode_pulse_widths([tuple(edge) for edge in
+                                                              record_data])
+
+        else:
+
+            all_high_voltage_counts = DHT11_Driver.get_high_voltage_counts(
+                decode_runs(record_data))
+
+            if len(all_high_voltage_counts) == 40:
+
+                all_data_bits = DHT11_Driver.get_data_bits(all_high_voltage_counts)
+
+        if all_data_bits is not None:
+
+            all_data_bytes = DHT11_Driver.convert_data_bits(all_data_bits)
+
+            if all_data_bytes[4] == DHT11_Driver.compute_checksum(all_data_bytes):
+
+                all_values['temperature'] = all_data_bytes[2] + correction
+                all_values['humidity'] = all_data_bytes[0]
+
+    elif record_kind == 'w1_slave':
+
+        temperature = DS18B20_Driver.parse_slave_lines(record['address'], record_data)
+
+        if temperature is not None:
+
+            all_values['temperature'] = temperature - correction
+
+    elif record_kind == 'bme280':
+
+        replay_sensor = ReplayBME280(record_data['calibration'], record_data['raw'])
+        temperature, pressure, humidity = replay_sensor.read_all()
+
+        all_values['temperature'] = temperature + correction
+        all_values['humidity'] = humidity
+        all_values['pressure'] = pressure
+
+    else:
+
+        raise IOError('Unknown kind of trace record (%s).' % record_kind)
+
+    ##################
+    return all_values
+    ##################
+
+####################
+# END decode_record
+####################
+
+
+####################################################################################################
+# TraceReplay
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class TraceReplay:
+    """
+    Source of raw data from a recorded trace. The trace is looped : records come back after the
+    time of the last record.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, trace_filename):
+        """
+        Loads all records of a trace. Raises IOError if trace can not be read.
+
+        INPUT:
+            trace_filename (str) trace file (one JSON record per line)
+        """
+
+        self.all_record_times = {}  # (sensor type, address) => record times, in order
+        self.all_records = {}  # (sensor type, address) => records, in order
+        self.trace_duration = 0.
+
+        all_loaded_records = []
+
+        with open(trace_filename, 'r') as trace_file:
+
+            for line in trace_file:
+
+                if line.strip() == '':
+
+                    continue
+
+                try:
+
+                    all_loaded_records.append(json.loads(line))
+
+                except ValueError as e:
+
+                    raise IOError('Bad record in %s (%s).' % (trace_filename, str(e)))
+
+        for record in sorted(all_loaded_records, key=lambda loaded_record: loaded_record['time']):
+
+            record_key = (record['type'], str(record['address']))
+            self.all_record_times.setdefault(record_key, []).append(record['time'])
+            self.all_records.setdefault(record_key, []).append(record)
+            self.trace_duration = max(self.trace_duration, record['time'])
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_record
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_record(self, sensor_type, address, elapsed_time, _):
+        """
+        Returns the last record of a sensor at a given time. Raises IOError if sensor is not in
+        the trace (as a disconnected sensor).
+
+        INPUT:
+            sensor_type (str) type of sensor
+            address (int|str|None) address of sensor
+            elapsed_time (float) seconds since start of simulation
+            _ (str[]) measurements of the sensor type (not used)
+
+        RETURNS:
+            (Dict) trace record
+        """
+
+        record_key = (sensor_type, str(address))
+
+        if record_key not in self.all_records:
+
+            raise IOError('No recorded trace for %s %s.' % record_key)
+
+        if self.trace_duration > 0:
+
+            elapsed_time %= self.trace_duration
+
+        record_index = max(bisect.bisect_right(self.all_record_times[record_key], elapsed_time) - 1,
+                           0)
+
+        #################################################
+        return self.all_records[record_key][record_index]
+        #################################################
+
+    #################
+    # END get_record
+    #################
+
+###########################
+# END TraceReplay
+###########################
+
+
+####################################################################################################
+# SyntheticSource
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class SyntheticSource:
+    """
+    Source of synthetic raw data : daily cycle of each measurement, with noise and failed reads.
+    Each sensor has its own random generator, seeded from the source seed and the sensor, so runs
+    with the same configuration give the same values.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, seed=0, failure_rate=0.):
+        """
+        Creates source.
+
+        INPUT:
+            seed (int) seed of the random generators
+            failure_rate (float) share of failed reads (0 to 1)
+        """
+
+        self.seed = seed
+        self.failure_rate = failure_rate
+        self.all_generators = {}  # (sensor type, address) => (random.Random, phase)
+        self.lock = threading.Lock()
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_record
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_record(self, sensor_type, address, elapsed_time, all_measurement_types):
+        """
+        Returns synthetic raw data of a sensor at a given time. DHT11 and DS18B20 data is raw
+        (pin samples, w1_slave content), other sensors give values.
+
+        INPUT:
+            sensor_type (str) type of sensor
+            address (int|str|None) address of sensor
+            elapsed_time (float) seconds since start of simulation
+            all_measurement_types (str[]) measurements of the sensor type
+
+        RETURNS:
+            (Dict) trace record
+        """
+
+        record_key = (sensor_type, str(address))
+
+        with self.lock:
+
+            if record_key not in self.all_generators:
+
+                generator_seed = zlib.crc32(('%s-%s-%s' % ((self.seed,) + record_key)).encode())
+                generator = random.Random(generator_seed)
+                self.all_generators[record_key] = (generator, generator.uniform(0., 2. * math.pi))
+
+            generator, phase = self.all_generators[record_key]
+            is_failed = generator.random() < self.failure_rate
+
+            all_values = {}
+            for measurement in all_measurement_types:
+
+                default_profile = all_synthetic_profiles.get(measurement, (0., 0., 0.))
+                mean, amplitude, noise = all_type_synthetic_profiles.get((sensor_type, measurement),
+                                                                         default_profile)
+                cycle_angle = 2. * math.pi * elapsed_time / day_duration + phase
+                all_values[measurement] = max(mean + amplitude * math.sin(cycle_angle) +
+                                              generator.gauss(0., noise), 0.)
+
+        record = {'time': elapsed_time, 'type': sensor_type, 'address': address}
+
+        if sensor_type == 'DHT11':
+
+            record['kind'] = 'pins'
+            record['data'] = synthesize_dht11_runs(int(round(all_values['temperature'])),
+                                                   int(round(all_values['humidity'])), is_failed)
+
+        elif sensor_type == 'DS18B20':
+
+            crc_status = 'NO' if is_failed else 'YES'
+            record['kind'] = 'w1_slave'
+            record['data'] = ['50 01 4b 46 7f ff 0c 10 1c : crc=1c %s' % crc_status,
+                              '50 01 4b 46 7f ff 0c 10 1c t=%d' % round(
+                                  1000. * all_values['temperature'])]
+
+        else:
+
+            if is_failed:
+
+                all_values = {measurement: None for measurement in all_measurement_types}
+
+            record['kind'] = 'values'
+            record['data'] = all_values
+
+        ##############
+        return record
+        ##############
+
+    #################
+    # END get_record
+    #################
+
+###########################
+# END SyntheticSource
+###########################
+
+
+####################################################################################################
+# SimulatedDriver
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class SimulatedDriver:
+    """
+    Driver reading raw data from a source (trace or synthetic) instead of the hardware. Address
+    checks and measurement types are the ones of the real driver. Buses are simulated ones.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, sensor_type, real_driver, source, clock):
+        """
+        Creates driver.
+
+        INPUT:
+            sensor_type (str) type of sensor (BME280, DHT11, ...)
+            real_driver (module) driver of the real sensor
+            source (TraceReplay|SyntheticSource) source of raw data
+            clock (module|SimulatedClock) time module, or clock of an accelerated run
+        """
+
+        self.__name__ = 'simulated ' + real_driver.__name__
+        self.sensor_type = sensor_type
+        self.real_driver = real_driver
+        self.source = source
+        self.clock = clock
+        self.start_time = clock.time()
+        self.all_measurement_types = real_driver.get_measurement_types()
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # is_valid_address
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def is_valid_address(self, sensor_address):
+        """
+        Tests address as the real driver.
+        """
+
+        #########################################################
+        return self.real_driver.is_valid_address(sensor_address)
+        #########################################################
+
+    #######################
+    # END is_valid_address
+    #######################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_measurement_types
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_measurement_types(self):
+        """
+        Returns measurements of the real driver.
+        """
+
+        #######################################
+        return list(self.all_measurement_types)
+        #######################################
+
+    ############################
+    # END get_measurement_types
+    ############################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_bus_name
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_bus_name(self, address):
+        """
+        Returns simulated bus of the sensor (same grouping of sensors as the real driver).
+        """
+
+        ################################################################
+        return bus_name_prefix + self.real_driver.get_bus_name(address)
+        ################################################################
+
+    ###################
+    # END get_bus_name
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # get_measurements
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def get_measurements(self, address, temperature_correction):
+        """
+        Measures all values from the raw data of the source at current (simulated) time.
+
+        INPUT:
+            address (int|str|None) address of sensor
+            temperature_correction (float) correction to apply to temperature
+
+        RETURNS:
+            (Dict) measurement => value (None if measure failed)
+        """
+
+        record = self.source.get_record(self.sensor_type, address,
+                                        self.clock.time() - self.start_time,
+                                        self.all_measurement_types)
+
+        ################################################################################
+        return decode_record(record, self.all_measurement_types, temperature_correction)
+        ################################################################################
+
+    #######################
+    # END get_measurements
+    #######################
+
+###########################
+# END SimulatedDriver
+###########################
+
+
+####################################################################################################
+# FUNCTION (install_simulated_drivers)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def install_simulated_drivers(driver_registry, source, clock=time):
+    """
+    Replaces all imported drivers of a registry by simulated drivers. Must be done before sensors
+    are opened.
+
+    INPUT:
+        driver_registry (DriverRegistry) drivers of the sensors
+        source (TraceReplay|SyntheticSource) source of raw data
+        clock (module|SimulatedClock) time module, or clock of an accelerated run
+    """
+
+    for sensor_type, real_driver in list(driver_registry.all_loaded_drivers.items()):
+
+        if not isinstance(real_driver, SimulatedDriver):
+
+            driver_registry[sensor_type] = SimulatedDriver(sensor_type, real_driver, source, clock)
+
+    ######
+    return
+    ######
+
+################################
+# END install_simulated_drivers
+################################
+
+
+####################################################################################################
+# TraceRecorder
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class TraceRecorder:
+    """
+    Records raw data of real sensors in a trace file, for later replay. Functions of the drivers
+    reading the hardware are wrapped : readings are not changed.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, trace_filename):
+        """
+        Opens trace file (records are appended). Raises IOError if it can not be opened.
+
+        INPUT:
+            trace_filename (str) trace file (one JSON record per line)
+        """
+
+        self.trace_file = open(trace_filename, 'a', buffering=1)
+        self.start_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # record
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def record(self, sensor_type, address, record_kind, record_data):
+        """
+        Appends a record to the trace.
+
+        INPUT:
+            sensor_type (str) type of sensor
+            address (int|str|None) address of sensor
+            record_kind (str) kind of data (pins, edges, w1_slave, bme280, values)
+            record_data (any) raw data, as JSON
+        """
+
+        record_line = json.dumps({'time': round(time.monotonic() - self.start_time, 3),
+                                  'type': sensor_type, 'address': str(address),
+                                  'kind': record_kind, 'data': record_data})
+
+        with self.lock:
+
+            self.trace_file.write(record_line + '\n')
+
+        ######
+        return
+        ######
+
+    #############
+    # END record
+    #############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # install
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def install(self, driver_registry):
+        """
+        Wraps the hardware reads of all imported drivers of a registry. Must be done before
+        sensors are opened.
+
+        INPUT:
+            driver_registry (DriverRegistry) drivers of the sensors
+        """
+
+        for sensor_type, real_driver in list(driver_registry.all_loaded_drivers.items()):
+
+            if sensor_type == 'DHT11':
+
+                self.wrap_dht11(real_driver)
+
+            elif sensor_type == 'DS18B20':
+
+                self.wrap_ds18b20(real_driver)
+
+            elif sensor_type == 'BME280':
+
+                self.wrap_handle_read(sensor_type, real_driver.Handle, self.record_bme280)
+
+            elif getattr(real_driver, 'Handle', None) is not None:
+
+                self.wrap_handle_read(sensor_type, real_driver.Handle, None)
+
+        ######
+        return
+        ######
+
+    ##############
+    # END install
+    ##############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # wrap_dht11
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def wrap_dht11(self, dht11_driver):
+        """
+        Records pin samples (RPi.GPIO polling) and edges (pigpio) of each try.
+
+        INPUT:
+            dht11_driver (module) DHT11 driver
+        """
+
+        collect_pin_values = dht11_driver.collect_pin_values
+        collect_edges = dht11_driver.collect_edges
+
+        def record_pin_values(pin_gpio_id, capture_stats=None):
+
+            all_pin_values = collect_pin_values(pin_gpio_id, capture_stats)
+            self.record('DHT11', pin_gpio_id, 'pins', encode_runs(all_pin_values))
+
+            return all_pin_values
+
+        def record_edges(connection, pin_gpio_id):
+
+            all_edges = collect_edges(connection, pin_gpio_id)
+            self.record('DHT11', pin_gpio_id, 'edges', [list(edge) for edge in all_edges])
+
+            return all_edges
+
+        dht11_driver.collect_pin_values = record_pin_values
+        dht11_driver.collect_edges = record_edges
+
+        ######
+        return
+        ######
+
+    #################
+    # END wrap_dht11
+    #################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # wrap_ds18b20
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def wrap_ds18b20(self, ds18b20_driver):
+        """
+        Records content of w1_slave files.
+
+        INPUT:
+            ds18b20_driver (module) DS18B20 driver
+        """
+
+        parse_slave_lines = ds18b20_driver.parse_slave_lines
+
+        def record_slave_lines(address, slave_info):
+
+            self.record('DS18B20', address, 'w1_slave', list(slave_info))
+
+            return parse_slave_lines(address, slave_info)
+
+        ds18b20_driver.parse_slave_lines = record_slave_lines
+
+        ######
+        return
+        ######
+
+    ###################
+    # END wrap_ds18b20
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # wrap_handle_read
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def wrap_handle_read(self, sensor_type, handle_class, record_function):
+        """
+        Records each read of the handles of a driver.
+
+        INPUT:
+            sensor_type (str) type of sensor
+            handle_class (class) Handle class of the driver
+            record_function (function|None) records the read of a handle, as
+                record_function(handle, read_function), returning the values. None to record
+                values only.
+        """
+
+        read_handle = handle_class.read
+
+        def record_read(handle):
+
+            if record_function is not None:
+
+                return record_function(handle, read_handle)
+
+            all_values = read_handle(handle)
+            self.record(sensor_type, handle.address, 'values', all_values)
+
+            return all_values
+
+        handle_class.read = record_read
+
+        ######
+        return
+        ######
+
+    #######################
+    # END wrap_handle_read
+    #######################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # record_bme280
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def record_bme280(self, handle, read_handle):
+        """
+        Reads a BME280 handle, recording its calibration and raw ADC values.
+
+        INPUT:
+            handle (BME280_Driver.Handle) open handle
+            read_handle (function) read function of the handle class
+
+        RETURNS:
+            (Dict) values read by the handle
+        """
+
+        device = handle.device
+        read_raw_all = device.read_raw_all
+        all_raw_values = []
+
+        def record_raw_all():
+
+            raw_values = read_raw_all()
+            all_raw_values.append(list(raw_values))
+
+            return raw_values
+
+        device.read_raw_all = record_raw_all
+
+        try:
+
+            all_values = read_handle(handle)
+
+        finally:
+
+            del device.read_raw_all
+
+        if len(all_raw_values) > 0:
+
+            all_calibration = {attribute_name: attribute_value for attribute_name, attribute_value
+                               in vars(device).items() if attribute_name.startswith('dig_')}
+            self.record('BME280', handle.address, 'bme280', {'calibration': all_calibration,
+                                                             'raw': all_raw_values[0]})
+
+        ##################
+        return all_values
+        ##################
+
+    ####################
+    # END record_bme280
+    ####################
+
+###########################
+# END TraceRecorder
+###########################
+
+
+####################################################################################################
+# FUNCTION (run_simulation)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+#   2026-10-19 AB - Thingspeak updates queued (output cost is part of the simulation)
+#   2026-10-19 AB - Metrics file written after each averaging cycle
+#   2026-10-19 AB - History flushed on simulated time, and when simulation stops
+####################################################################################################
+def run_simulation(config_filename, duration, speed=0., is_quiet=True):
+    """
+    Runs the main loop of home_environment_sensors with simulated time, reading sensors one after
+    another (same results for the same configuration). Configuration must have a Simulation
+    section in replay or synthetic mode. Outputs (files, snapshot, history) are written as
+    configured. Thingspeak updates are queued but the exporter is not started (nothing is sent),
+    and the sensor stream is not used. Automation rules are evaluated, but their remote
+    configurations are only queued (never sent).
+
+    INPUT:
+        config_filename (str) configuration file of home_environment_sensors
+        duration (float) simulated seconds
+        speed (float) simulated seconds per real second. 0 to run as fast as possible.
+        is_quiet (bool) whether printed output of the main loop is discarded
+
+    RETURNS:
+        (Dict|None) simulated time, wall time (seconds), reads and accepted samples.
+            None if simulation could not start.
+    """
+
+    # Imported here : home_environment_sensors imports this module
+    from . import home_environment_sensors
+
+    clock = SimulatedClock(speed)
+    home_environment_sensors.time = clock
+    printed_output = open(os.devnull, 'w') if is_quiet else sys.stdout
+    standard_output = sys.stdout
+
+    try:
+
+        if home_environment_sensors.read_configuration(config_filename) != 0:
+
+            ############
+            return None
+            ############
+
+        all_sensors = home_environment_sensors.all_sensors
+
+        for sensor_object in all_sensors:
+
+            sensor_driver = home_environment_sensors.sensor_to_driver.get(sensor_object.type)
+
+            if not isinstance(sensor_driver, SimulatedDriver):
+
+                details = 'Simulation section with mode replay or synthetic needed (%s).' % \
+                    config_filename
+                general_utils.log_error(-412, details)
+
+                ############
+                return None
+                ############
+
+            # Suspended sensors are retried after simulated delays
+            sensor_object.breaker.clock_function = clock.monotonic
+
+        if home_environment_sensors.initialize_data_files() != 0:
+
+            ############
+            return None
+            ############
+
+        # History is flushed and cleaned on simulated time, as by the real script
+        history_store = home_environment_sensors.history_store
+        if history_store is not None:
+
+            history_store.clock_function = clock.time
+            history_store.last_flush_time = clock.time()
+
+        scheduler = home_environment_sensors.create_sampling_scheduler(clock.monotonic,
+                                                                       clock.sleep)
+        wall_start_time = time.perf_counter()
+        sys.stdout = printed_output
+
+        while clock.monotonic() < duration:
+
+            if home_environment_sensors.sampling_intervals_changed.is_set():
+
+                home_environment_sensors.update_sampling_intervals(scheduler)
+
+            all_due_tasks = scheduler.wait_for_due_tasks()
+
+            all_sensors_to_average = [sensor_object for sensor_object in all_sensors if
+                                      ('average', sensor_object.output_directory) in all_due_tasks]
+
+            if len(all_sensors_to_average) > 0:
+
+                home_environment_sensors.post_collection_actions(all_sensors_to_average)
+
+                if home_environment_sensors.snapshot_file is not None:
+
+                    home_environment_sensors.output_snapshot()
+
+                if home_environment_sensors.metrics_file is not None:
+
+                    home_environment_sensors.output_metrics(scheduler)
+
+            for sensor_object in all_sensors:
+
+                if ('sample', sensor_object.output_directory) in all_due_tasks:
+
+                    home_environment_sensors.read_sensor_on_bus(sensor_object)
+
+            if ('output', None) in all_due_tasks:
+
+                # Exporter is not started : updates are queued (oldest dropped), never sent
+                if home_environment_sensors.thingspeak is not None:
+
+                    home_environment_sensors.output_measures_to_web()
+
+                if home_environment_sensors.history_store is not None:
+
+                    home_environment_sensors.history_store.flush_if_due()
+
+        wall_time = time.perf_counter() - wall_start_time
+
+    finally:
+
+        sys.stdout = standard_output
+
+        # Samples and rollups still buffered are written, as when the real script stops
+        if home_environment_sensors.history_store is not None:
+
+            home_environment_sensors.history_store.flush(include_open_buckets=True)
+
+        home_environment_sensors.close_sensor_handles()
+        home_environment_sensors.time = time
+
+        if is_quiet:
+
+            printed_output.close()
+
+    n_reads = sum(sensor_object.breaker.n_successes + sensor_object.breaker.n_failures for
+                  sensor_object in all_sensors)
+    n_samples = sum(sensor_object.n_accepted_samples for sensor_object in all_sensors)
+
+    all_results = {
+        'simulated_time': round(clock.monotonic(), 3),
+        'wall_time': round(wall_time, 3),
+        'sensors': len(all_sensors),
+        'reads': n_reads,
+        'samples': n_samples
+    }
+
+    ###################
+    return all_results
+    ###################
+
+#####################
+# END run_simulation
+#####################
+
+
+if __name__ == "__main__":
+
+    argument_parser = argparse.ArgumentParser(
+        description='Runs home_environment_sensors with simulated sensors and time.')
+    argument_parser.add_argument('config_file', help='configuration with a Simulation section')
+    argument_parser.add_argument('--hours', type=float, default=24.,
+                                 help='simulated hours (24 by default)')
+    argument_parser.add_argument('--speed', type=float, default=0.,
+                                 help='simulated seconds per real second (0 : no real wait)')
+    argument_parser.add_argument('--verbose', action='store_true',
+                                 help='shows output of the main loop')
+    all_arguments = argument_parser.parse_args(sys.argv[1:])
+
+    # Runs with the package module (the one whose classes home_environment_sensors uses)
+    from temperature_monitoring import sensor_simulation
+
+    simulation_results = sensor_simulation.run_simulation(
+        all_arguments.config_file, 3600. * all_arguments.hours, all_arguments.speed,
+        not all_arguments.verbose)
+
+    if simulation_results is None:
+
+        sys.exit(1)
+
+    print(json.dumps(simulation_results, sort_keys=True))
@@ -0,0 +1,480 @@
+"""
+Publishes averaged sensor measurements to a RabbitMQ topic exchange, so that dashboards can
+subscribe to the measurement stream instead of polling every worker with the sensors instruction.
+
+Routing keys have the form location.measurement (e.g. 'window_dht.temperature'), so consumers can
+bind on '*.temperature' or 'window_dht.#'.
+To reduce broker traffic, a measurement is only published when it moved by more than its deadband
+since the last published value, or when max_interval seconds went by without publishing it.
+
+Publication happens in a background thread with a bounded queue : a slow or unreachable RabbitMQ
+server never delays sample collection (oldest messages are dropped if the queue is full).
+"""
+
+#########################
+# Import global packages
+#########################
+
+import queue  # Bounded queue between sampling loop and publication thread
+import threading  # Publication runs in its own thread (pika connection blocks when server is down)
+import time  # Timestamps messages
+
+try:
+
+    import pika  # RabbitMQ Python port
+    from lxml import etree  # Creates messages in the same XML format as other RabbitMQ messages
+
+except ImportError:
+
+    pika = None
+    etree = None
+
+########################
+# Import local packages
+########################
+
+from global_libraries import general_utils
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+default_exchange_name = 'sensor_stream'  # Topic exchange on which measurements are published
+default_max_interval = 300.  # Seconds after which a value is re-published even if unchanged
+max_queued_messages = 1000  # Messages waiting for publication before oldest ones are dropped
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# Function (get_routing_key)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def get_routing_key(location, measurement):
+    """
+    Builds routing key for a given sensor location and measurement. Dots are words separators in
+    topic exchanges, so they are replaced in names.
+
+    INPUT:
+        location (str) sensor location (name of the sensor in configuration)
+        measurement (str) type of measurement (temperature, humidity, ...)
+
+    RETURNS:
+        (str) routing key, as location.measurement
+    """
+
+    routing_key = '%s.%s' % (location.replace('.', '_'), measurement.replace('.', '_'))
+
+    ###################
+    return routing_key
+    ###################
+
+######################
+# END get_routing_key
+######################
+
+
+####################################################################################################
+# SensorStreamPublisher
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class SensorStreamPublisher:
+    """
+    Filters averaged sensor values with a per-measurement deadband and publishes the remaining
+    ones to a RabbitMQ topic exchange from a background thread.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, rabbit_configuration_filename, exchange_name=default_exchange_name,
+                 max_interval=default_max_interval, all_deadbands=None):
+        """
+        Creates the publisher. No connection is made until start() is called.
+
+        INPUT:
+            rabbit_configuration_filename (str) path to the RabbitMQ configuration file
+            exchange_name (str) name of the topic exchange to publish on
+            max_interval (float) seconds after which a value is re-published even if unchanged
+            all_deadbands (Dict|None) measurement => minimal change for a value to be published.
+                Measurements not in dictionnary are published on any change.
+        """
+
+        self.rabbit_configuration_filename = rabbit_configuration_filename
+        self.exchange_name = exchange_name
+        self.max_interval = max_interval
+        self.all_deadbands = all_deadbands if all_deadbands is not None else {}
+
+        # Last published (value, time) for each routing key. Only used by sampling thread.
+        self.last_published = {}
+
+        # Messages waiting to be published, as (routing_key, message_content, timestamp)
+        self.message_queue = queue.Queue(maxsize=max_queued_messages)
+        self.n_dropped_messages = 0
+
+        # Connexion with RabbitMQ server. Only used inside the publication thread.
+        self.pika_connector = None
+        self.publication_thread = None
+
+        # Working status. 0 : everything is fine. Other: contains code for fatal error that occured
+        self.error_status = 0
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # must_publish
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def must_publish(self, routing_key, measurement, value, current_time):
+        """
+        Applies the deadband filter : tests whether a new value differs enough from the last
+        published one (or is old enough) to be published.
+
+        INPUT:
+            routing_key (str) routing key for the value
+            measurement (str) type of measurement, to get the deadband
+            value (float) new averaged value
+            current_time (float) time at which value was computed
+
+        RETURNS:
+            (bool) whether value must be published
+        """
+
+        last_published = self.last_published.get(routing_key, None)
+
+        # Value was never published before
+        if last_published is None:
+
+            ############
+            return True
+            ############
+
+        last_value, last_time = last_published
+
+        # Value was not published for too long, so re-publishes it even if unchanged
+        if current_time - last_time >= self.max_interval:
+
+            ############
+            return True
+            ############
+
+        # Value must move by more than deadband to be published
+        deadband = self.all_deadbands.get(measurement, 0.0)
+
+        #############################################
+        return abs(value - last_value) > deadband
+        #############################################
+
+    ###################
+    # END must_publish
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # publish_cycle
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def publish_cycle(self, all_sensor_objects, current_time=None):
+        """
+        Queues latest smoothed averages of all sensors for publication, skipping values inside
+        their deadband. Never blocks.
+
+        INPUT:
+            all_sensor_objects (Sensor[]) sensors, as in home_environment_sensors.all_sensors
+            current_time (float, opt) time of the averaged cycle. Defaults to now.
+        """
+
+        if current_time is None:
+
+            current_time = time.time()
+
+        for sensor_object in all_sensor_objects:
+
+            for measurement, value in sensor_object.smoothed_average.items():
+
+                # Failed measurements are not published (deletion of .dat files shows failure)
+                if value is None:
+
+                    continue
+
+                routing_key = get_routing_key(sensor_object.name, measurement)
+
+                if not self.must_publish(routing_key, measurement, value, current_time):
+
+                    continue
+
+                self.last_published[routing_key] = (value, current_time)
+                self.queue_message(routing_key, sensor_object, measurement, value, current_time)
+
+        #######
+        return
+        #######
+
+    ####################
+    # END publish_cycle
+    ####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # queue_message
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def queue_message(self, routing_key, sensor_object, measurement, value, current_time):
+        """
+        Creates the message for a value and puts it in the publication queue. If the queue is full
+        (server unreachable for a long time), the oldest message is dropped.
+
+        INPUT:
+            routing_key (str) routing key for the value
+            sensor_object (Sensor) sensor the value comes from
+            measurement (str) type of measurement
+            value (float) value to publish
+            current_time (float) time at which value was computed
+        """
+
+        message_tree = etree.Element('sensor_measure', location=sensor_object.name,
+                                     type=sensor_object.type, measurement=measurement,
+                                     value='%0.3f' % (value,),
+                                     timestamp=general_utils.convert_localtime_to_string(
+                                         time.localtime(current_time)))
+
+        message_content = etree.tostring(message_tree)
+
+        while True:
+
+            try:
+
+                self.message_queue.put_nowait((routing_key, message_content, current_time))
+                break
+
+            except queue.Full:
+
+                # Drops oldest message to make space for the newest one
+                try:
+
+                    self.message_queue.get_nowait()
+                    self.n_dropped_messages += 1
+
+                except queue.Empty:
+
+                    pass
+
+        #######
+        return
+        #######
+
+    ####################
+    # END queue_message
+    ####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # start
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def start(self):
+        """
+        Starts the background publication thread.
+
+        RETURNS:
+            (int) 0 if thread started, negative number if publisher can not work
+        """
+
+        # pika and lxml are required to talk to RabbitMQ server
+        if pika is None or etree is None:
+
+            self.error_status = general_utils.log_error(-418, 'pika/lxml (sensor stream)')
+
+            #########################
+            return self.error_status
+            #########################
+
+        self.publication_thread = threading.Thread(target=self.run_publication_loop,
+                                                   name='sensor-stream')
+        self.publication_thread.daemon = True
+        self.publication_thread.start()
+
+        #########
+        return 0
+        #########
+
+    ############
+    # END start
+    ############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # on_connection_recovery
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def on_connection_recovery(self):
+        """
+        Recreates the exchange when connection to RabbitMQ server was lost and is recovered.
+        """
+
+        self.pika_connector.declare_exchange(self.exchange_name, 'topic')
+
+        ######
+        return
+        ######
+
+    #############################
+    # END on_connection_recovery
+    #############################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # run_publication_loop
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def run_publication_loop(self):
+        """
+        Connects to RabbitMQ server and publishes queued messages until stop() is called. Runs in
+        its own thread, as pika connection blocks while the server is not reachable.
+        """
+
+        # Imported here, as the connector requires pika at import.
+        from global_libraries import pika_connector_manager
+
+        self.pika_connector = pika_connector_manager.PikaConnectorManager(self)
+        self.pika_connector.load_config(self.rabbit_configuration_filename)
+        self.pika_connector.establish_rabbit_connection()
+
+        if self.pika_connector.error_status != 0:
+
+            self.error_status = general_utils.log_error(-426, 'Could not connect to server.')
+
+            #######
+            return
+            #######
+
+        self.pika_connector.declare_exchange(self.exchange_name, 'topic')
+
+        # Messages are transient : a dashboard only cares about current values.
+        while True:
+
+            try:
+
+                queued_message = self.message_queue.get(timeout=30.)
+
+            except queue.Empty:
+
+                # Keeps the connection alive (heartbeats) while nothing is published
+                self.pika_connector.process_data_events(0)
+                continue
+
+            # Queued by stop(), after all messages to publish
+            if queued_message is None:
+
+                self.pika_connector.stop_consume()
+
+                #######
+                return
+                #######
+
+            routing_key, message_content, message_time = queued_message
+
+            message_properties = pika.BasicProperties(delivery_mode=1,
+                                                      content_type='application/xml',
+                                                      timestamp=int(message_time))
+
+            # One message per measurement and output cycle : not logged (would flood syslog)
+            self.pika_connector.publish_message(self.exchange_name, routing_key, message_content,
+                                                message_properties, is_logged=False)
+
+    ###########################
+    # END run_publication_loop
+    ###########################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # stop
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def stop(self, timeout=5.):
+        """
+        Publishes messages still in the queue, then closes the connection to RabbitMQ server (on
+        shutdown). Waits at most timeout seconds, as the server may be unreachable.
+
+        INPUT:
+            timeout (float) seconds to wait for the publication thread
+        """
+
+        if self.publication_thread is None or not self.publication_thread.is_alive():
+
+            #######
+            return
+            #######
+
+        try:
+
+            self.message_queue.put(None, timeout=timeout)
+
+        except queue.Full:
+
+            #######
+            return
+            #######
+
+        self.publication_thread.join(timeout)
+
+        #######
+        return
+        #######
+
+    ###########
+    # END stop
+    ###########
+
+##############################
+# END SensorStreamPublisher
+##############################
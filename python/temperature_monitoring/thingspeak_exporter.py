@@ -0,0 +1,689 @@
+"""
+Exports averaged sensor measurements to ThingSpeak from a background thread, so that a slow or
+unreachable website never delays sample collection.
+
+Updates wait in a bounded queue (oldest ones are dropped if it is full). The exporter thread keeps
+one HTTP keep-alive connection open, and sends all updates waiting in the queue at once with the
+bulk update API when a channel id is configured (one request per update otherwise).
+Updates that could not be sent are appended to a spool file on disk, which is replayed (oldest
+first, with their original timestamps) once the website can be reached again. Only connection
+errors, 429 (too many requests) and 5XX replies mean the website is unreachable : updates
+rejected by the website (other 4XX replies, single update answered with 0) are logged and
+dropped, as sending them again would fail again.
+
+Host, port and protocol can be changed, e.g. to test against a local HTTP server.
+"""
+
+#########################
+# Import global packages
+#########################
+
+import http.client  # Keep-alive HTTP(S) connection to the website
+import json  # Bulk update requests and spool file lines
+import os  # Spool file size
+import queue  # Bounded queue between sampling loop and export thread
+import threading  # Export runs in its own thread
+import time  # Timestamps updates
+from urllib import parse  # Encodes single update requests
+
+########################
+# Import local packages
+########################
+
+from global_libraries import general_utils
+
+__author__ = 'Baland Adrien'
+
+###########################
+# Declare global variables
+###########################
+default_host = 'api.thingspeak.com'
+default_timeout = 10.  # Seconds to wait for the website before considering it unreachable
+default_retry_interval = 60.  # Seconds between two attempts to replay the spool after a failure
+min_update_interval = 15.  # ThingSpeak rejects single updates of a channel closer than this
+max_queued_updates = 100  # Updates waiting for export before oldest ones are dropped
+max_bulk_updates = 960  # Maximum number of updates in one bulk update request
+max_spooled_updates = 100000  # Updates kept on disk while website is unreachable (~10 MB)
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# Function (format_created_at)
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Function Created
+####################################################################################################
+def format_created_at(timestamp):
+    """
+    Formats an update time as expected by ThingSpeak (created_at field).
+
+    INPUT:
+        timestamp (float) epoch time of the update
+
+    RETURNS:
+        (str) time as 'YYYY-MM-DD hh:mm:ss +0000'
+    """
+
+    created_at = time.strftime('%Y-%m-%d %H:%M:%S +0000', time.gmtime(timestamp))
+
+    ##################
+    return created_at
+    ##################
+
+########################
+# END format_created_at
+########################
+
+
+####################################################################################################
+# ThingspeakExporter
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class ThingspeakExporter:
+    """
+    Sends field updates to a ThingSpeak channel from a background thread, with batching of waiting
+    updates and a disk spool for updates that could not be sent.
+    """
+
+    ################################################################################################
+    # __init__
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def __init__(self, api_key, channel_id=None, host=default_host, port=None, use_https=True,
+                 spool_filename=None, timeout=default_timeout,
+                 retry_interval=default_retry_interval):
+        """
+        Creates the exporter. No connection is made until start() is called.
+
+        INPUT:
+            api_key (str) write API key of the channel
+            channel_id (str|None) channel id, required for bulk updates (single updates otherwise)
+            host (str) website host name
+            port (int|None) website port. Default port of the protocol if None.
+            use_https (bool) whether to use HTTPS (HTTP otherwise)
+            spool_filename (str|None) file keeping updates that could not be sent. Updates are
+                dropped on failure if None.
+            timeout (float) seconds to wait for the website
+            retry_interval (float) seconds between two attempts to replay the spool
+        """
+
+        self.api_key = api_key
+        self.channel_id = channel_id
+        self.host = host
+        self.port = port
+        self.use_https = use_https
+        self.spool_filename = spool_filename
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+
+        # Updates waiting to be sent, as (timestamp, {fieldX: value})
+        self.update_queue = queue.Queue(maxsize=max_queued_updates)
+        self.n_dropped_updates = 0
+
+        # Only used inside the export thread
+        self.http_connection = None
+        self.last_single_update_time = 0.
+        self.n_spooled_updates = 0
+        self.is_offline = False
+        self.export_thread = None
+
+        if spool_filename is not None and os.path.isfile(spool_filename):
+
+            # Updates spooled before a restart are replayed as well
+            with open(spool_filename, 'r') as spool_file:
+
+                self.n_spooled_updates = sum(1 for _ in spool_file)
+
+    ###############
+    # END __init__
+    ###############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # queue_update
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def queue_update(self, all_field_values, timestamp=None):
+        """
+        Queues one channel update for export. Never blocks : if the queue is full, the oldest
+        update is dropped.
+
+        INPUT:
+            all_field_values (Dict) field name (field1, field2, ...) => value as string
+            timestamp (float, opt) time of the update. Defaults to now.
+        """
+
+        if timestamp is None:
+
+            timestamp = time.time()
+
+        while True:
+
+            try:
+
+                self.update_queue.put_nowait((timestamp, all_field_values))
+                break
+
+            except queue.Full:
+
+                # Drops oldest update to make space for the newest one
+                try:
+
+                    self.update_queue.get_nowait()
+                    self.n_dropped_updates += 1
+
+                except queue.Empty:
+
+                    pass
+
+        #######
+        return
+        #######
+
+    ###################
+    # END queue_update
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # start
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def start(self):
+        """
+        Starts the background export thread.
+
+        RETURNS:
+            (int) 0 if thread started
+        """
+
+        self.export_thread = threading.Thread(target=self.run_export_loop, name='thingspeak')
+        self.export_thread.daemon = True
+        self.export_thread.start()
+
+        #########
+        return 0
+        #########
+
+    ############
+    # END start
+    ############
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # stop
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def stop(self):
+        """
+        Moves updates still waiting in the queue to the spool file (on shutdown), so that they are
+        sent after a restart instead of being lost. Updates are dropped if there is no spool file.
+
+        RETURNS:
+            (int) number of updates taken out of the queue
+        """
+
+        all_updates = []
+
+        while True:
+
+            try:
+
+                all_updates.append(self.update_queue.get_nowait())
+
+            except queue.Empty:
+
+                break
+
+        if len(all_updates) > 0:
+
+            self.spool_updates(all_updates)
+
+        #########################
+        return len(all_updates)
+        #########################
+
+    ###########
+    # END stop
+    ###########
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # send_request
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    #   2026-10-19 AB - Requests rejected by the website told apart from unreachable website
+    ################################################################################################
+    def send_request(self, path, request_body, content_type):
+        """
+        Sends a POST request on the keep-alive connection (opened if needed). The connection is
+        closed on any failure, and reopened on the next request.
+        A request rejected by the website (4XX status other than 429) is logged, as sending it
+        again would fail again.
+
+        INPUT:
+            path (str) path of the request
+            request_body (str) body of the request
+            content_type (str) content type of the body
+
+        RETURNS:
+            (bool, bytes|None) whether website answered (False on connection errors, 429 and 5XX
+                status), and response body if request succeeded (2XX status, None otherwise)
+        """
+
+        try:
+
+            if self.http_connection is None:
+
+                if self.use_https:
+
+                    self.http_connection = http.client.HTTPSConnection(self.host, self.port,
+                                                                       timeout=self.timeout)
+
+                else:
+
+                    self.http_connection = http.client.HTTPConnection(self.host, self.port,
+                                                                      timeout=self.timeout)
+
+            self.http_connection.request('POST', path, request_body.encode('utf-8'),
+                                         {'Content-Type': content_type,
+                                          'Connection': 'keep-alive'})
+            http_response = self.http_connection.getresponse()
+
+            # Response must be fully read before connection can be reused
+            response_body = http_response.read()
+
+            if http_response.will_close:
+
+                self.close_connection()
+
+            # Too many requests or server error : website is considered unreachable for now
+            if http_response.status == 429 or http_response.status >= 500:
+
+                raise http.client.HTTPException('HTTP status %d' % http_response.status)
+
+        except (OSError, http.client.HTTPException) as e:
+
+            self.close_connection()
+
+            if not self.is_offline:
+
+                # Logged once per outage
+                general_utils.log_error(-419, '%s%s' % (self.host, path), str(e))
+
+            ###################
+            return False, None
+            ###################
+
+        if not 200 <= http_response.status < 300:
+
+            general_utils.log_error(-419, '%s%s' % (self.host, path),
+                                    'Request rejected (HTTP status %d): %s' % (
+                                        http_response.status,
+                                        response_body[:200].decode('utf-8', 'replace')))
+
+            ##################
+            return True, None
+            ##################
+
+        ###########################
+        return True, response_body
+        ###########################
+
+    ###################
+    # END send_request
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # close_connection
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def close_connection(self):
+        """
+        Closes the keep-alive connection, if open.
+        """
+
+        if self.http_connection is not None:
+
+            self.http_connection.close()
+            self.http_connection = None
+
+        #######
+        return
+        #######
+
+    #######################
+    # END close_connection
+    #######################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # send_updates
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    #   2026-10-19 AB - Updates rejected by the website are dropped instead of retried
+    ################################################################################################
+    def send_updates(self, all_updates):
+        """
+        Sends updates, oldest first. Several updates are sent in bulk requests if channel id is
+        known, otherwise one by one, at least min_update_interval apart. Updates rejected by the
+        website (bad API key, invalid update, ...) are dropped. Stops at the first update that
+        could not be sent because website is unreachable.
+
+        INPUT:
+            all_updates (list) updates to send, as (timestamp, {fieldX: value})
+
+        RETURNS:
+            (int) number of updates sent or dropped (first ones of the list)
+        """
+
+        n_sent_updates = 0
+
+        while n_sent_updates < len(all_updates):
+
+            if self.channel_id is not None and len(all_updates) - n_sent_updates > 1:
+
+                # Bulk update : all updates of the batch with their own time
+                all_batch_updates = all_updates[n_sent_updates:n_sent_updates + max_bulk_updates]
+                all_bulk_entries = []
+
+                for timestamp, all_field_values in all_batch_updates:
+
+                    bulk_entry = {'created_at': format_created_at(timestamp)}
+                    bulk_entry.update(all_field_values)
+                    all_bulk_entries.append(bulk_entry)
+
+                request_body = json.dumps({'write_api_key': self.api_key,
+                                           'updates': all_bulk_entries})
+                path = '/channels/%s/bulk_update.json' % self.channel_id
+
+                is_answered, response_body = self.send_request(path, request_body,
+                                                               'application/json')
+
+                if not is_answered:
+
+                    break
+
+                # Whole batch rejected (already logged)
+                if response_body is None:
+
+                    self.n_dropped_updates += len(all_batch_updates)
+
+                n_sent_updates += len(all_batch_updates)
+
+            else:
+
+                timestamp, all_field_values = all_updates[n_sent_updates]
+
+                # Single updates too close to each other are rejected by the website
+                waiting_time = self.last_single_update_time + min_update_interval - time.time()
+                if waiting_time > 0:
+
+                    time.sleep(waiting_time)
+
+                all_parameters = {'api_key': self.api_key,
+                                  'created_at': format_created_at(timestamp)}
+                all_parameters.update(all_field_values)
+                request_body = parse.urlencode(all_parameters)
+
+                is_answered, response_body = self.send_request(
+                    '/update', request_body, 'application/x-www-form-urlencoded')
+                self.last_single_update_time = time.time()
+
+                if not is_answered:
+
+                    break
+
+                # Website answers with the id of the new entry, 0 if update was rejected
+                if response_body is not None and response_body.strip() == b'0':
+
+                    general_utils.log_error(-419, '%s/update' % self.host,
+                                            'Update of %s rejected' % format_created_at(timestamp))
+                    response_body = None
+
+                # Update rejected (already logged)
+                if response_body is None:
+
+                    self.n_dropped_updates += 1
+
+                n_sent_updates += 1
+
+        ######################
+        return n_sent_updates
+        ######################
+
+    ###################
+    # END send_updates
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # spool_updates
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def spool_updates(self, all_updates):
+        """
+        Appends updates that could not be sent to the spool file (one JSON line per update).
+        Updates are dropped if there is no spool file, or if it is full.
+
+        INPUT:
+            all_updates (list) updates to keep, as (timestamp, {fieldX: value})
+        """
+
+        n_free_updates = max_spooled_updates - self.n_spooled_updates
+
+        if self.spool_filename is None or n_free_updates <= 0:
+
+            self.n_dropped_updates += len(all_updates)
+
+            #######
+            return
+            #######
+
+        all_kept_updates = all_updates[:n_free_updates]
+        self.n_dropped_updates += len(all_updates) - len(all_kept_updates)
+
+        try:
+
+            with open(self.spool_filename, 'a') as spool_file:
+
+                for timestamp, all_field_values in all_kept_updates:
+
+                    spool_file.write(json.dumps([timestamp, all_field_values]) + '\n')
+
+            self.n_spooled_updates += len(all_kept_updates)
+
+        except OSError as e:
+
+            self.n_dropped_updates += len(all_kept_updates)
+            general_utils.log_error(-410, self.spool_filename, str(e))
+
+        #######
+        return
+        #######
+
+    ####################
+    # END spool_updates
+    ####################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # replay_spool
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def replay_spool(self):
+        """
+        Sends updates of the spool file. Updates sent (or rejected by the website) are removed
+        from the spool.
+
+        RETURNS:
+            (bool) True if spool is now empty
+        """
+
+        try:
+
+            with open(self.spool_filename, 'r') as spool_file:
+
+                all_spooled_updates = []
+
+                for spool_line in spool_file:
+
+                    try:
+
+                        timestamp, all_field_values = json.loads(spool_line)
+                        all_spooled_updates.append((timestamp, all_field_values))
+
+                    except ValueError:
+
+                        # Line partially written (e.g. power cut while spooling)
+                        continue
+
+        except OSError:
+
+            all_spooled_updates = []
+
+        n_sent_updates = self.send_updates(all_spooled_updates)
+
+        if n_sent_updates < len(all_spooled_updates):
+
+            # Keeps updates that were not sent (spool is replaced atomically)
+            all_remaining_updates = all_spooled_updates[n_sent_updates:]
+            spool_content = ''.join(json.dumps([timestamp, all_field_values]) + '\n' for
+                                    timestamp, all_field_values in all_remaining_updates)
+            general_utils.create_os_file(self.spool_filename, spool_content)
+            self.n_spooled_updates = len(all_remaining_updates)
+
+            #############
+            return False
+            #############
+
+        general_utils.delete_os_file(self.spool_filename)
+        self.n_spooled_updates = 0
+
+        ############
+        return True
+        ############
+
+    ###################
+    # END replay_spool
+    ###################
+
+    #
+    #
+    #
+
+    ################################################################################################
+    # run_export_loop
+    ################################################################################################
+    # Revision History:
+    #   2026-10-19 AB - Function Created
+    ################################################################################################
+    def run_export_loop(self):
+        """
+        Sends queued updates forever. Runs in its own thread. All updates waiting in the queue are
+        sent together. While the website is unreachable, updates go to the spool file, which is
+        replayed before new updates once the website answers again.
+        """
+
+        while True:
+
+            # Wakes up regularly to retry the spool while website is unreachable
+            try:
+
+                if self.n_spooled_updates > 0:
+
+                    all_updates = [self.update_queue.get(timeout=self.retry_interval)]
+
+                else:
+
+                    all_updates = [self.update_queue.get()]
+
+            except queue.Empty:
+
+                all_updates = []
+
+            # Batches all updates accumulated while previous request was running
+            while True:
+
+                try:
+
+                    all_updates.append(self.update_queue.get_nowait())
+
+                except queue.Empty:
+
+                    break
+
+            # Spooled updates are older, so they go first. New updates wait if replay fails.
+            if self.n_spooled_updates > 0 and not self.replay_spool():
+
+                self.is_offline = True
+                self.spool_updates(all_updates)
+                continue
+
+            n_sent_updates = self.send_updates(all_updates)
+
+            if n_sent_updates < len(all_updates):
+
+                self.is_offline = True
+                self.spool_updates(all_updates[n_sent_updates:])
+
+            elif self.is_offline:
+
+                self.is_offline = False
+                general_utils.log_message('ThingSpeak reachable again (%d updates dropped).' %
+                                          self.n_dropped_updates)
+
+    ######################
+    # END run_export_loop
+    ######################
+
+###########################
+# END ThingspeakExporter
+###########################
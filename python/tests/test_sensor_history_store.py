@@ -0,0 +1,114 @@
+"""
+Tests of temperature_monitoring.sensor_history_store. Run from the python directory with :
+    python -m unittest discover tests
+"""
+
+#########################
+# Import global packages
+#########################
+
+import shutil  # Removes the temporary store
+import tempfile  # Temporary store directory
+import unittest
+
+########################
+# Import local packages
+########################
+
+from temperature_monitoring import sensor_history_store
+
+__author__ = 'Baland Adrien'
+
+
+####################################################################################################
+# CODE START
+####################################################################################################
+
+
+####################################################################################################
+# TestSensorHistoryStore
+####################################################################################################
+# Revision History:
+#   2026-10-19 AB - Class Created
+####################################################################################################
+class TestSensorHistoryStore(unittest.TestCase):
+
+    start_time = 1790000000 // 86400 * 86400  # Start of a day (and of an hour)
+    sample_interval = 5
+
+    def setUp(self):
+
+        self.base_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.base_directory)
+
+    def append_samples(self, history_store, first_time, duration, value):
+
+        for timestamp in range(first_time, first_time + duration, self.sample_interval):
+
+            history_store.append('Bedroom', 'temperature', float(timestamp), value)
+
+    def test_restart_within_bucket(self):
+        """
+        Process stopped after 30 minutes at 20 degrees, then restarted for 30 minutes at 22
+        degrees : the hour holds both halves.
+        """
+
+        history_store = sensor_history_store.SensorHistoryStore(self.base_directory)
+        self.append_samples(history_store, self.start_time, 1800, 20.0)
+        self.assertEqual(history_store.flush(include_open_buckets=True), 0)
+
+        history_store = sensor_history_store.SensorHistoryStore(self.base_directory)
+        self.append_samples(history_store, self.start_time + 1800, 1800, 22.0)
+        self.assertEqual(history_store.flush(include_open_buckets=True), 0)
+
+        all_points = list(sensor_history_store.iter_aggregates(
+            self.base_directory, 'Bedroom', 'temperature', self.start_time,
+            self.start_time + 3600, 3600))
+
+        self.assertEqual(len(all_points), 1)
+        point_start, point_min, point_max, point_mean, point_count = all_points[0]
+        self.assertEqual(point_start, self.start_time)
+        self.assertEqual((point_min, point_max, point_count), (20.0, 22.0, 720))
+        self.assertAlmostEqual(point_mean, 21.0)
+
+        # Partial records of the hour and of the day are merged
+        for resolution in ['hour', 'day']:
+
+            all_records = list(sensor_history_store.iter_records(
+                self.base_directory, 'Bedroom', 'temperature', resolution, self.start_time,
+                self.start_time + 86400))
+
+            self.assertEqual(len(all_records), 1)
+            self.assertEqual(all_records[0][4], 720)
+
+    def test_close_buckets_of_location(self):
+        """
+        Only buckets of the closed location are written.
+        """
+
+        history_store = sensor_history_store.SensorHistoryStore(self.base_directory)
+        self.append_samples(history_store, self.start_time, 30, 20.0)
+        history_store.append('Outside', 'temperature', float(self.start_time), 5.0)
+
+        history_store.close_buckets('Bedroom')
+        history_store.flush()
+
+        for location, n_expected_records in [('Bedroom', 1), ('Outside', 0)]:
+
+            all_records = list(sensor_history_store.iter_records(
+                self.base_directory, location, 'temperature', 'minute', self.start_time,
+                self.start_time + 60))
+
+            self.assertEqual(len(all_records), n_expected_records)
+
+#############################
+# END TestSensorHistoryStore
+#############################
+
+
+if __name__ == '__main__':
+
+    unittest.main()